@@ -0,0 +1,29 @@
+"""add_attachment_checksums
+
+Revision ID: a1c2e3f4b5d6
+Revises: e542ccc63f31
+Create Date: 2026-01-11 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c2e3f4b5d6'
+down_revision: Union[str, None] = 'e542ccc63f31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # sha256 computed while streaming the upload to storage
+    op.add_column('trip_attachments', sa.Column('checksum_sha256', sa.String(length=64), nullable=True), schema='expenses')
+    op.add_column('report_attachments', sa.Column('checksum_sha256', sa.String(length=64), nullable=True), schema='expenses')
+
+
+def downgrade() -> None:
+    op.drop_column('report_attachments', 'checksum_sha256', schema='expenses')
+    op.drop_column('trip_attachments', 'checksum_sha256', schema='expenses')
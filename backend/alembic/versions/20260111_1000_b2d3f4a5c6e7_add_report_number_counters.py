@@ -0,0 +1,43 @@
+"""add_report_number_counters
+
+Revision ID: b2d3f4a5c6e7
+Revises: a1c2e3f4b5d6
+Create Date: 2026-01-11 10:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d3f4a5c6e7'
+down_revision: Union[str, None] = 'a1c2e3f4b5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'report_number_counters',
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('last_value', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('year'),
+        schema='expenses'
+    )
+
+    # Seed counters from the numbers already issued (NS-{year}-{n})
+    op.execute("""
+        INSERT INTO expenses.report_number_counters (year, last_value)
+        SELECT split_part(report_number, '-', 2)::int,
+               max(split_part(report_number, '-', 3)::int)
+        FROM expenses.expense_reports
+        WHERE report_number ~ '^NS-[0-9]{4}-[0-9]+$'
+        GROUP BY 1
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('report_number_counters', schema='expenses')
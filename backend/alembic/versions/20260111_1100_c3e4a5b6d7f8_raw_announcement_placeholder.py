@@ -0,0 +1,40 @@
+"""raw_announcement_placeholder
+
+Email template variables are now HTML-escaped unless the placeholder uses
+triple braces. Announcements carry rich HTML, so their placeholder becomes
+{{{announcement_content}}}.
+
+Revision ID: c3e4a5b6d7f8
+Revises: b2d3f4a5c6e7
+Create Date: 2026-01-11 11:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e4a5b6d7f8'
+down_revision: Union[str, None] = 'b2d3f4a5c6e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE notifications.email_templates
+        SET html_content = replace(html_content, '{{announcement_content}}', '{{{announcement_content}}}'),
+            updated_at = now()
+        WHERE html_content LIKE '%{{announcement_content}}%'
+          AND html_content NOT LIKE '%{{{announcement_content}}}%'
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        UPDATE notifications.email_templates
+        SET html_content = replace(html_content, '{{{announcement_content}}}', '{{announcement_content}}'),
+            updated_at = now()
+        WHERE html_content LIKE '%{{{announcement_content}}}%'
+    """)
@@ -0,0 +1,56 @@
+"""email_retry_schedule
+
+Index failed emails by next_retry_at for the retry scheduler and schedule
+the existing backlog. Logs that already used up the old three retries are
+dead-lettered.
+
+Revision ID: d4f5a6b7c8e9
+Revises: c3e4a5b6d7f8
+Create Date: 2026-01-11 12:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f5a6b7c8e9'
+down_revision: Union[str, None] = 'c3e4a5b6d7f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_notifications_email_logs_retry_due',
+        'email_logs',
+        ['next_retry_at'],
+        unique=False,
+        schema='notifications',
+        postgresql_where=sa.text("status = 'failed'"),
+    )
+    op.execute("""
+        UPDATE notifications.email_logs
+        SET status = 'dead_letter', next_retry_at = NULL
+        WHERE status = 'failed' AND retry_count >= 3
+    """)
+    op.execute("""
+        UPDATE notifications.email_logs
+        SET next_retry_at = now()
+        WHERE status = 'failed' AND next_retry_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        UPDATE notifications.email_logs
+        SET status = 'failed'
+        WHERE status = 'dead_letter'
+    """)
+    op.drop_index(
+        'ix_notifications_email_logs_retry_due',
+        table_name='email_logs',
+        schema='notifications',
+    )
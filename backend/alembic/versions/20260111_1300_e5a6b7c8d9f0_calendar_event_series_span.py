@@ -0,0 +1,108 @@
+"""calendar_event_series_span
+
+Store the last day covered by each event series and index the event span
+for overlap queries. Recurring events bounded by COUNT/UNTIL get the end
+of their last occurrence; the others stay open-ended (NULL).
+
+Revision ID: e5a6b7c8d9f0
+Revises: d4f5a6b7c8e9
+Create Date: 2026-01-11 13:00:00.000000+00:00
+
+"""
+from collections import deque
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from dateutil.rrule import rrulestr
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a6b7c8d9f0'
+down_revision: Union[str, None] = 'd4f5a6b7c8e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copy of src.services.calendar.recurrence.series_end as of this revision
+
+def _normalize(rule):
+    rule = rule.strip()
+    if "\n" not in rule and not rule.upper().startswith(("RRULE:", "DTSTART")):
+        rule = f"RRULE:{rule}"
+    return rule
+
+
+def _is_finite(rule):
+    values = []
+    for line in _normalize(rule).splitlines():
+        name, _, value = line.strip().partition(":")
+        if name.split(";")[0].upper() == "RRULE":
+            values.append(value)
+    return bool(values) and all(
+        {part.split("=")[0].strip().upper() for part in value.split(";")} & {"COUNT", "UNTIL"}
+        for value in values
+    )
+
+
+def _series_end(start_date, end_date, rule):
+    if not _is_finite(rule):
+        return None
+    rule_set = rrulestr(
+        _normalize(rule),
+        dtstart=datetime.combine(start_date, datetime.min.time()),
+        forceset=True,
+        ignoretz=True,
+    )
+    tail = deque(rule_set, maxlen=1)
+    if not tail:
+        return end_date
+    return tail[0].date() + (end_date - start_date)
+
+
+def _backfill_finite_series() -> None:
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("""
+        SELECT id, start_date, end_date, recurrence_rule
+        FROM calendar.events
+        WHERE coalesce(is_recurring, false)
+          AND recurrence_rule ~* '(COUNT|UNTIL)='
+          AND series_end_date IS NULL
+    """)).all()
+    update = sa.text("UPDATE calendar.events SET series_end_date = :end WHERE id = :id")
+    for event_id, start_date, end_date, rule in rows:
+        try:
+            end = _series_end(start_date, end_date, rule)
+        except (ValueError, TypeError):
+            # Unparseable rule: leave the series open-ended
+            continue
+        if end is not None:
+            conn.execute(update, {"id": event_id, "end": end})
+
+
+def upgrade() -> None:
+    op.add_column(
+        'events',
+        sa.Column('series_end_date', sa.Date(), nullable=True),
+        schema='calendar'
+    )
+    op.execute("""
+        UPDATE calendar.events
+        SET series_end_date = end_date
+        WHERE NOT coalesce(is_recurring, false) OR recurrence_rule IS NULL
+    """)
+    _backfill_finite_series()
+    op.execute("""
+        CREATE INDEX ix_calendar_events_span ON calendar.events
+        USING gist (daterange(
+            start_date,
+            CASE WHEN series_end_date < start_date THEN start_date ELSE series_end_date END,
+            '[]'
+        ))
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_calendar_events_span', table_name='events', schema='calendar')
+    op.drop_column('events', 'series_end_date', schema='calendar')
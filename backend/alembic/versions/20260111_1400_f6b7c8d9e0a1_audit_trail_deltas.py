@@ -0,0 +1,88 @@
+"""audit_trail_deltas
+
+Store audit trail entries as JSON patches between periodic full checkpoints.
+Existing entries are kept as checkpoints. Duplicate (entity, version) pairs
+left by the old MAX()+1 numbering are renumbered before the unique
+constraint is added, and a head row per entity is seeded from its latest
+entry.
+
+Revision ID: f6b7c8d9e0a1
+Revises: e5a6b7c8d9f0
+Create Date: 2026-01-11 14:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b7c8d9e0a1'
+down_revision: Union[str, None] = 'e5a6b7c8d9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'audit_trail',
+        sa.Column('is_checkpoint', sa.Boolean(), nullable=False, server_default=sa.text('true')),
+        schema='audit'
+    )
+    op.add_column(
+        'audit_trail',
+        sa.Column('patch', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        schema='audit'
+    )
+
+    op.execute("""
+        UPDATE audit.audit_trail t
+        SET version = r.rn
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY entity_type, entity_id
+                ORDER BY version, changed_at, id
+            ) AS rn
+            FROM audit.audit_trail
+        ) r
+        WHERE t.id = r.id AND t.version <> r.rn
+    """)
+    op.create_unique_constraint(
+        'uq_audit_trail_entity_version',
+        'audit_trail',
+        ['entity_type', 'entity_id', 'version'],
+        schema='audit'
+    )
+
+    op.create_table(
+        'audit_trail_heads',
+        sa.Column('entity_type', sa.String(length=50), nullable=False),
+        sa.Column('entity_id', sa.String(length=100), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('checkpoint_version', sa.Integer(), nullable=False),
+        sa.Column('state', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('entity_type', 'entity_id'),
+        schema='audit'
+    )
+    op.execute("""
+        INSERT INTO audit.audit_trail_heads (entity_type, entity_id, version, checkpoint_version, state)
+        SELECT DISTINCT ON (entity_type, entity_id)
+            entity_type,
+            entity_id,
+            version,
+            version,
+            CASE WHEN operation = 'DELETE' THEN before_data ELSE after_data END
+        FROM audit.audit_trail
+        ORDER BY entity_type, entity_id, version DESC
+    """)
+
+
+def downgrade() -> None:
+    # Delta entries cannot be expanded back to snapshots in SQL: their patches are lost
+    op.drop_table('audit_trail_heads', schema='audit')
+    op.drop_constraint('uq_audit_trail_entity_version', 'audit_trail', schema='audit', type_='unique')
+    op.drop_column('audit_trail', 'patch', schema='audit')
+    op.drop_column('audit_trail', 'is_checkpoint', schema='audit')
@@ -0,0 +1,142 @@
+"""timesheet_dirty_days
+
+Track timesheet days made stale by changes to leave requests, business
+trips, closures and holidays, so the timesheet refresh only recomputes
+those days. Rows are written by triggers on the source tables, in the same
+transaction as the change.
+
+Revision ID: a7c8d9e0f1b2
+Revises: f6b7c8d9e0a1
+Create Date: 2026-01-11 15:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c8d9e0f1b2'
+down_revision: Union[str, None] = 'f6b7c8d9e0a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Employee id of company-wide marks (closures, holidays)
+ALL_EMPLOYEES = '00000000-0000-0000-0000-000000000000'
+
+TRIGGERS = [
+    ('leaves', 'leave_requests', 'trg_leave_requests_timesheet_dirty', 'timesheet_dirty_on_absence'),
+    ('expenses', 'business_trips', 'trg_business_trips_timesheet_dirty', 'timesheet_dirty_on_absence'),
+    ('calendar', 'closures', 'trg_closures_timesheet_dirty', 'timesheet_dirty_on_closure'),
+    ('calendar', 'holidays', 'trg_holidays_timesheet_dirty', 'timesheet_dirty_on_holiday'),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'timesheet_dirty_days',
+        sa.Column('employee_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('marked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('employee_id', 'day'),
+        schema='hr_reporting'
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION hr_reporting.mark_timesheet_days_dirty(
+            p_employee_id UUID, p_start DATE, p_end DATE
+        ) RETURNS VOID AS $$
+        BEGIN
+            IF p_employee_id IS NULL OR p_start IS NULL OR p_end IS NULL THEN
+                RETURN;
+            END IF;
+            INSERT INTO hr_reporting.timesheet_dirty_days (employee_id, day)
+            SELECT p_employee_id, d::date
+            FROM generate_series(p_start, p_end, interval '1 day') AS d
+            ON CONFLICT DO NOTHING;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Leave requests and business trips: user_id, start_date, end_date, status
+    op.execute("""
+        CREATE OR REPLACE FUNCTION hr_reporting.timesheet_dirty_on_absence()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                IF (OLD.user_id, OLD.start_date, OLD.end_date, OLD.status::text)
+                   IS NOT DISTINCT FROM
+                   (NEW.user_id, NEW.start_date, NEW.end_date, NEW.status::text) THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM hr_reporting.mark_timesheet_days_dirty(OLD.user_id, OLD.start_date, OLD.end_date);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM hr_reporting.mark_timesheet_days_dirty(NEW.user_id, NEW.start_date, NEW.end_date);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION hr_reporting.timesheet_dirty_on_closure()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                IF (OLD.start_date, OLD.end_date) IS NOT DISTINCT FROM (NEW.start_date, NEW.end_date) THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM hr_reporting.mark_timesheet_days_dirty('{ALL_EMPLOYEES}', OLD.start_date, OLD.end_date);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM hr_reporting.mark_timesheet_days_dirty('{ALL_EMPLOYEES}', NEW.start_date, NEW.end_date);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION hr_reporting.timesheet_dirty_on_holiday()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                IF (OLD.date, OLD.is_active) IS NOT DISTINCT FROM (NEW.date, NEW.is_active) THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM hr_reporting.mark_timesheet_days_dirty('{ALL_EMPLOYEES}', OLD.date, OLD.date);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM hr_reporting.mark_timesheet_days_dirty('{ALL_EMPLOYEES}', NEW.date, NEW.date);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    for schema, table, trigger, function in TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER {trigger}
+            AFTER INSERT OR UPDATE OR DELETE ON {schema}.{table}
+            FOR EACH ROW EXECUTE FUNCTION hr_reporting.{function}()
+        """)
+
+
+def downgrade() -> None:
+    for schema, table, trigger, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {schema}.{table}")
+    op.execute("DROP FUNCTION IF EXISTS hr_reporting.timesheet_dirty_on_holiday()")
+    op.execute("DROP FUNCTION IF EXISTS hr_reporting.timesheet_dirty_on_closure()")
+    op.execute("DROP FUNCTION IF EXISTS hr_reporting.timesheet_dirty_on_absence()")
+    op.execute("DROP FUNCTION IF EXISTS hr_reporting.mark_timesheet_days_dirty(UUID, DATE, DATE)")
+    op.drop_table('timesheet_dirty_days', schema='hr_reporting')
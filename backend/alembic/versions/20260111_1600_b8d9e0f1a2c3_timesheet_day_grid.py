@@ -0,0 +1,128 @@
+"""timesheet_day_grid
+
+Store monthly timesheet days as a packed day grid (status code byte +
+worked minutes per day) with sparse per-day notes, instead of a JSONB list
+of per-day dicts. Existing timesheets are converted.
+
+Revision ID: b8d9e0f1a2c3
+Revises: a7c8d9e0f1b2
+Create Date: 2026-01-11 16:00:00.000000+00:00
+
+"""
+import calendar
+import json
+import struct
+from datetime import date, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d9e0f1a2c3'
+down_revision: Union[str, None] = 'a7c8d9e0f1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copy of the src.services.hr_reporting.day_grid encoding as of this
+# revision: status code byte per day, then worked minutes per day (uint16 LE)
+
+_LABELS = ("", "Presente", "Trasferta", "Malattia", "Ferie", "ROL", "Permesso", "Assente", "Weekend", "Festività")
+_ABSENT = 7
+_NON_WORKING = (8, 9)
+
+
+def _status_code(label):
+    label = label or ""
+    if label in _LABELS:
+        return _LABELS.index(label)
+    if label.startswith(_LABELS[_ABSENT]):
+        return _ABSENT
+    raise ValueError(f"Unknown timesheet day status: {label!r}")
+
+
+def _pack(year, month, items):
+    size = calendar.monthrange(year, month)[1]
+    status = bytearray(size)
+    minutes = [0] * size
+    notes = {}
+    for item in items:
+        day = item["date"]
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        status[day.day - 1] = _status_code(item.get("status"))
+        minutes[day.day - 1] = round((item.get("hours_worked") or 0) * 60)
+        note = {key: item[key] for key in ("leave_type", "notes") if item.get(key) is not None}
+        if note:
+            notes[str(day.day)] = note
+        else:
+            notes.pop(str(day.day), None)
+    packed = bytes(status) + struct.pack(f"<{size}H", *minutes)
+    return packed, dict(sorted(notes.items(), key=lambda n: int(n[0]))) or None
+
+
+def _unpack(year, month, packed, notes):
+    size = calendar.monthrange(year, month)[1]
+    minutes = struct.unpack(f"<{size}H", packed[size:])
+    notes = {int(day): note for day, note in (notes or {}).items()}
+    first = date(year, month, 1)
+    items = []
+    for index, code in enumerate(packed[:size]):
+        current = first + timedelta(days=index)
+        note = notes.get(index + 1, {})
+        label = _LABELS[code]
+        if code == _ABSENT:
+            label = f"{label} ({note.get('leave_type') or ''})"
+        items.append({
+            "date": current.isoformat(),
+            "status": label,
+            "hours_worked": minutes[index] / 60,
+            "hours_expected": 0.0 if code in _NON_WORKING else 8.0,
+            "leave_type": note.get("leave_type"),
+            "notes": note.get("notes"),
+            "weekday": current.weekday(),
+        })
+    return items
+
+
+def upgrade() -> None:
+    op.add_column('monthly_timesheets', sa.Column('day_grid', sa.LargeBinary(), nullable=True), schema='hr_reporting')
+    op.add_column('monthly_timesheets', sa.Column('day_notes', postgresql.JSONB(astext_type=sa.Text()), nullable=True), schema='hr_reporting')
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT id, year, month, days FROM hr_reporting.monthly_timesheets WHERE days IS NOT NULL"
+    ))
+    for row in rows.fetchall():
+        packed, notes = _pack(row.year, row.month, row.days)
+        conn.execute(
+            sa.text(
+                "UPDATE hr_reporting.monthly_timesheets "
+                "SET day_grid = :grid, day_notes = CAST(:notes AS JSONB) WHERE id = :id"
+            ),
+            {"grid": packed, "notes": json.dumps(notes) if notes else None, "id": row.id},
+        )
+
+    op.drop_column('monthly_timesheets', 'days', schema='hr_reporting')
+
+
+def downgrade() -> None:
+    op.add_column('monthly_timesheets', sa.Column('days', postgresql.JSONB(astext_type=sa.Text()), nullable=True), schema='hr_reporting')
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT id, year, month, day_grid, day_notes FROM hr_reporting.monthly_timesheets "
+        "WHERE day_grid IS NOT NULL"
+    ))
+    for row in rows.fetchall():
+        items = _unpack(row.year, row.month, bytes(row.day_grid), row.day_notes)
+        conn.execute(
+            sa.text("UPDATE hr_reporting.monthly_timesheets SET days = CAST(:days AS JSONB) WHERE id = :id"),
+            {"days": json.dumps(items), "id": row.id},
+        )
+
+    op.drop_column('monthly_timesheets', 'day_notes', schema='hr_reporting')
+    op.drop_column('monthly_timesheets', 'day_grid', schema='hr_reporting')
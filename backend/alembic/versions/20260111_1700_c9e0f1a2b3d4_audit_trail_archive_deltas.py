@@ -0,0 +1,133 @@
+"""audit_trail_archive_deltas
+
+Make the daily archive job safe for delta-encoded audit trails. The archive
+table gets the ``is_checkpoint`` / ``patch`` columns, and
+``audit.archive_old_logs`` only moves whole checkpoint intervals: per
+entity, the entries before its latest checkpoint older than the cutoff.
+The live trail of every entity therefore still starts with a checkpoint
+(at most one interval older than the retention period stays live), and
+the archived entries can be replayed as well.
+
+Revision ID: c9e0f1a2b3d4
+Revises: b8d9e0f1a2c3
+Create Date: 2026-01-11 17:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e0f1a2b3d4'
+down_revision: Union[str, None] = 'b8d9e0f1a2c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_ARCHIVE_LOGS = """
+            -- Archive audit_logs
+            INSERT INTO audit.audit_logs_archive
+            SELECT
+                id, user_id, user_email, action, resource_type, resource_id,
+                description, request_data, response_data, ip_address, user_agent,
+                endpoint, http_method, status, error_message, service_name,
+                created_at, NOW()
+            FROM audit.audit_logs
+            WHERE created_at < cutoff_date;
+
+            GET DIAGNOSTICS archived_count = ROW_COUNT;
+
+            -- Delete archived records
+            DELETE FROM audit.audit_logs
+            WHERE created_at < cutoff_date;
+"""
+
+_FUNCTION = """
+        CREATE OR REPLACE FUNCTION audit.archive_old_logs(retention_days INTEGER DEFAULT 90)
+        RETURNS INTEGER AS $$
+        DECLARE
+            archived_count INTEGER;
+            cutoff_date TIMESTAMP WITH TIME ZONE;
+        BEGIN
+            cutoff_date := NOW() - (retention_days || ' days')::INTERVAL;
+            {archive_logs}
+            {archive_trail}
+            -- Refresh stats
+            REFRESH MATERIALIZED VIEW audit.audit_daily_stats;
+
+            RETURN archived_count;
+        END;
+        $$ LANGUAGE plpgsql;
+"""
+
+_ARCHIVE_TRAIL = """
+            -- Archive audit_trail by whole checkpoint intervals: keep each
+            -- entity's latest checkpoint older than the cutoff (and everything
+            -- after it) so the live trail can still be replayed
+            WITH boundary AS (
+                SELECT entity_type, entity_id, MAX(version) AS keep_from
+                FROM audit.audit_trail
+                WHERE is_checkpoint AND changed_at < cutoff_date
+                GROUP BY entity_type, entity_id
+            ), moved AS (
+                DELETE FROM audit.audit_trail t
+                USING boundary b
+                WHERE t.entity_type = b.entity_type
+                  AND t.entity_id = b.entity_id
+                  AND t.version < b.keep_from
+                RETURNING t.*
+            )
+            INSERT INTO audit.audit_trail_archive (
+                id, entity_type, entity_id, version, operation,
+                before_data, after_data, changed_fields,
+                changed_by, changed_by_email, changed_at,
+                change_reason, service_name, request_id, archived_at,
+                is_checkpoint, patch
+            )
+            SELECT
+                id, entity_type, entity_id, version, operation,
+                before_data, after_data, changed_fields,
+                changed_by, changed_by_email, changed_at,
+                change_reason, service_name, request_id, NOW(),
+                is_checkpoint, patch
+            FROM moved;
+"""
+
+# As created by 028_enterprise_audit
+_ARCHIVE_TRAIL_SNAPSHOTS = """
+            -- Archive audit_trail
+            INSERT INTO audit.audit_trail_archive
+            SELECT
+                id, entity_type, entity_id, version, operation,
+                before_data, after_data, changed_fields,
+                changed_by, changed_by_email, changed_at,
+                change_reason, service_name, request_id, NOW()
+            FROM audit.audit_trail
+            WHERE changed_at < cutoff_date;
+
+            DELETE FROM audit.audit_trail
+            WHERE changed_at < cutoff_date;
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        'audit_trail_archive',
+        sa.Column('is_checkpoint', sa.Boolean(), nullable=False, server_default=sa.text('true')),
+        schema='audit'
+    )
+    op.add_column(
+        'audit_trail_archive',
+        sa.Column('patch', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        schema='audit'
+    )
+    op.execute(_FUNCTION.format(archive_logs=_ARCHIVE_LOGS, archive_trail=_ARCHIVE_TRAIL))
+
+
+def downgrade() -> None:
+    op.execute(_FUNCTION.format(archive_logs=_ARCHIVE_LOGS, archive_trail=_ARCHIVE_TRAIL_SNAPSHOTS))
+    op.drop_column('audit_trail_archive', 'patch', schema='audit')
+    op.drop_column('audit_trail_archive', 'is_checkpoint', schema='audit')
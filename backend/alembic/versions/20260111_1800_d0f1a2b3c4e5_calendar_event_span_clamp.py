@@ -0,0 +1,41 @@
+"""calendar_event_span_clamp
+
+Rebuild ix_calendar_events_span with the upper bound clamped to
+start_date. daterange() raises on a reversed range, and events saved
+before end_date >= start_date was validated may have one.
+
+Revision ID: d0f1a2b3c4e5
+Revises: c9e0f1a2b3d4
+Create Date: 2026-01-11 18:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0f1a2b3c4e5'
+down_revision: Union[str, None] = 'c9e0f1a2b3d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS calendar.ix_calendar_events_span")
+    op.execute("""
+        CREATE INDEX ix_calendar_events_span ON calendar.events
+        USING gist (daterange(
+            start_date,
+            CASE WHEN series_end_date < start_date THEN start_date ELSE series_end_date END,
+            '[]'
+        ))
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_calendar_events_span', table_name='events', schema='calendar')
+    op.execute("""
+        CREATE INDEX ix_calendar_events_span ON calendar.events
+        USING gist (daterange(start_date, series_end_date, '[]'))
+    """)
@@ -13,10 +13,11 @@ from uuid import UUID
 
 from celery import shared_task
 from sqlalchemy import select, and_, text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import settings
+from src.core.database import async_session_factory
+from src.core.worker_runtime import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -171,13 +172,8 @@ def check_balance_consistency():
     
     Runs at 2 AM each day to detect inconsistencies.
     """
-    import asyncio
-    
     async def _run():
-        engine = create_async_engine(settings.database_url)
-        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-        
-        async with async_session() as session:
+        async with async_session_factory() as session:
             all_anomalies = []
             
             # Check leaves
@@ -216,10 +212,8 @@ def check_balance_consistency():
                 "expenses_anomalies": len([a for a in all_anomalies if a.entity_type in ("BUSINESS_TRIP", "EXPENSE_LEDGER")]),
                 "total_anomalies": len(all_anomalies),
             }
-        
-        await engine.dispose()
     
-    return asyncio.run(_run())
+    return run_async(_run())
 
 
 @shared_task(name="reconciliation.auto_fix_missing_ledger")
@@ -235,16 +229,11 @@ def auto_fix_missing_ledger_entries():
         logger.info("Auto-fix disabled, skipping")
         return {"status": "skipped", "reason": "auto_fix_disabled"}
     
-    import asyncio
-    
     async def _run():
-        engine = create_async_engine(settings.database_url)
-        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-        
         fixed_count = 0
         error_count = 0
         
-        async with async_session() as session:
+        async with async_session_factory() as session:
             # Query approved leave requests without ledger entries
             query = text("""
                 SELECT 
@@ -349,8 +338,6 @@ def auto_fix_missing_ledger_entries():
             
             await session.commit()
         
-        await engine.dispose()
-        
         result = {
             "status": "completed",
             "fixed": fixed_count,
@@ -365,5 +352,5 @@ def auto_fix_missing_ledger_entries():
         
         return result
     
-    return asyncio.run(_run())
+    return run_async(_run())
 
@@ -0,0 +1,1146 @@
+#!/usr/bin/env python3
+"""KRONOS - Synthetic Large-Tenant Dataset Generator.
+
+Fills a database with a realistically sized, fully synthetic tenant to
+measure performance against: an org tree (divisions, departments,
+services, managers), employees with contract histories on versioned
+CCNLs, multi-year time ledger histories, leave requests in every status
+with their history and interruptions, business trips and expense reports
+with items, team/location/personal calendars with events, company
+closures, notifications and audit logs.
+
+Everything is derived from ``--seed`` (ids included): the same seed,
+options and ``--as-of`` date produce the same rows. Rows are bulk loaded
+with COPY by ``--jobs`` worker processes, each loading fixed-size slices
+of employees or audit rows in one transaction per slice.
+
+The database must be initialized and the leave types seeded first:
+
+    python scripts/init_db.py
+    python -m scripts.seed_leave_types
+
+Usage:
+    python scripts/generate_dataset.py --employees 20000 --audit-rows 10000000
+    python scripts/generate_dataset.py --employees 500 --years 2 --seed 7 --reset
+
+Generated rows are recognizable (``GEN`` codes and names, users at
+``@gen.kronos.local``); ``--reset`` deletes them before generating. Run as
+a superuser to load with triggers disabled (``session_replication_role``);
+otherwise the timesheet dirty-day marks the triggers leave are purged.
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncpg
+from sqlalchemy import Numeric
+from sqlalchemy.engine import make_url
+
+from src.core.config import settings
+from src.core.database import get_db_context
+from src.services.audit.models import AuditLog
+from src.services.auth.models import (
+    Department,
+    EmployeeContract,
+    ExecutiveLevel,
+    Location,
+    OrganizationalService,
+    User,
+    WorkSchedule,
+)
+from src.services.calendar.models import Calendar, CalendarClosure, CalendarEvent
+from src.services.config.models import (
+    ContractType,
+    ExpenseType,
+    NationalContract,
+    NationalContractLevel,
+    NationalContractVersion,
+)
+from src.services.expenses.models import BusinessTrip, ExpenseItem, ExpenseReport
+from src.services.expenses.repository import ExpenseReportRepository, format_report_number
+from src.services.leaves.ledger.models import TimeLedgerEntry
+from src.services.leaves.models import LeaveInterruption, LeaveRequest, LeaveRequestHistory
+from src.services.notifications.models import Notification
+
+SETUP_DATA = Path(__file__).parent.parent / "setup_data"
+
+EMAIL_DOMAIN = "gen.kronos.local"
+CODE_PREFIX = "GEN-"
+NAME_PREFIX = "GEN "
+
+# Fixed slice sizes keep the output independent of --jobs
+EMPLOYEES_PER_CHUNK = 250
+AUDIT_ROWS_PER_CHUNK = 200_000
+# Report number block per employee and year (sequence = base + index * block + n)
+REPORTS_PER_EMPLOYEE_YEAR = 20
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# COPY
+# ═══════════════════════════════════════════════════════════════════════════
+
+class CopyTable:
+    """COPY target for a model.
+
+    Rows are tuples of ``columns``. Columns with a scalar Python default
+    are appended with that default (COPY only applies server defaults);
+    other omitted columns get their server default or NULL. Enum columns
+    take the member name, JSON columns a serialized string.
+    """
+
+    def __init__(self, model, *columns: str):
+        table = model.__table__
+        self.schema, self.name = table.schema, table.name
+        defaults = {}
+        for column in table.columns:
+            if column.name in columns or column.default is None or not column.default.is_scalar:
+                continue
+            value = column.default.arg
+            if hasattr(value, "name") and hasattr(value, "value"):  # enum member
+                value = value.name
+            elif isinstance(column.type, Numeric) and isinstance(value, (int, float)):
+                value = Decimal(str(value))
+            defaults[column.name] = value
+        self.columns = [*columns, *defaults]
+        self._defaults = tuple(defaults.values())
+
+    async def copy(self, conn: asyncpg.Connection, rows: list[tuple]) -> int:
+        if rows:
+            if self._defaults:
+                rows = [row + self._defaults for row in rows]
+            await conn.copy_records_to_table(self.name, schema_name=self.schema, columns=self.columns, records=rows)
+        return len(rows)
+
+
+T_LOCATIONS = CopyTable(Location, "id", "code", "name", "address", "city", "province", "patron_saint_name", "patron_saint_date")
+T_SCHEDULES = CopyTable(WorkSchedule, "id", "code", "name", "monday_hours", "tuesday_hours", "wednesday_hours", "thursday_hours", "friday_hours")
+T_CONTRACT_TYPES = CopyTable(ContractType, "id", "code", "name", "is_part_time", "part_time_percentage")
+T_NATIONAL_CONTRACTS = CopyTable(NationalContract, "id", "code", "name", "sector", "description")
+T_CONTRACT_LEVELS = CopyTable(NationalContractLevel, "id", "national_contract_id", "level_name", "description", "sort_order")
+T_CONTRACT_VERSIONS = CopyTable(
+    NationalContractVersion, "id", "national_contract_id", "version_name", "valid_from", "valid_to",
+    "weekly_hours_full_time", "annual_vacation_days", "annual_rol_hours",
+)
+T_EXECUTIVE_LEVELS = CopyTable(ExecutiveLevel, "id", "code", "title", "hierarchy_level", "escalates_to_id")
+T_EXPENSE_TYPES = CopyTable(ExpenseType, "id", "code", "name", "category", "km_reimbursement_rate")
+T_DEPARTMENTS = CopyTable(Department, "id", "code", "name", "parent_id", "hierarchy_level", "cost_center_code")
+T_SERVICES = CopyTable(OrganizationalService, "id", "code", "name", "department_id")
+T_USERS = CopyTable(
+    User, "id", "keycloak_id", "email", "first_name", "last_name", "username", "badge_number", "fiscal_code",
+    "hire_date", "contract_type_id", "work_schedule_id", "location_id", "department_id", "service_id",
+    "executive_level_id", "manager_id", "is_admin", "is_manager", "is_approver", "is_hr",
+)
+T_EMPLOYEE_CONTRACTS = CopyTable(
+    EmployeeContract, "id", "user_id", "contract_type_id", "national_contract_id", "level_id",
+    "start_date", "end_date", "weekly_hours", "job_title",
+)
+T_CALENDARS = CopyTable(Calendar, "id", "type", "name", "description", "color", "visibility", "owner_id")
+T_EVENTS = CopyTable(
+    CalendarEvent, "id", "calendar_id", "title", "start_date", "end_date", "series_end_date", "start_time", "end_time",
+    "is_all_day", "event_type", "visibility", "location", "user_id", "created_by", "created_at",
+)
+T_CLOSURES = CopyTable(CalendarClosure, "id", "name", "start_date", "end_date")
+T_LEDGER = CopyTable(
+    TimeLedgerEntry, "id", "user_id", "year", "entry_type", "balance_type", "amount",
+    "reference_type", "reference_id", "reference_status", "notes", "created_at",
+)
+T_LEAVES = CopyTable(
+    LeaveRequest, "id", "user_id", "leave_type_id", "leave_type_code", "start_date", "end_date",
+    "days_requested", "hours_requested", "status", "employee_notes", "approver_id", "approved_at",
+    "has_conditions", "condition_type", "condition_details", "condition_accepted", "condition_accepted_at",
+    "recalled_at", "recall_reason", "days_used_before_recall", "recall_date", "balance_deducted",
+    "deduction_details", "rejection_reason", "has_interruptions", "created_at", "updated_at",
+)
+T_LEAVE_HISTORY = CopyTable(LeaveRequestHistory, "id", "leave_request_id", "from_status", "to_status", "changed_by", "changed_at", "reason")
+T_INTERRUPTIONS = CopyTable(
+    LeaveInterruption, "id", "leave_request_id", "interruption_type", "start_date", "end_date",
+    "days_refunded", "protocol_number", "initiated_by", "reason", "refund_transaction_id", "created_at",
+)
+T_TRIPS = CopyTable(
+    BusinessTrip, "id", "user_id", "title", "destination", "destination_type", "start_date", "end_date",
+    "purpose", "project_code", "estimated_budget", "status", "approver_id", "approved_at", "created_at",
+)
+T_REPORTS = CopyTable(
+    ExpenseReport, "id", "trip_id", "is_standalone", "user_id", "report_number", "title", "period_start",
+    "period_end", "total_amount", "approved_amount", "status", "approver_id", "approved_at", "paid_at",
+    "payment_reference", "created_at",
+)
+T_ITEMS = CopyTable(
+    ExpenseItem, "id", "report_id", "expense_type_id", "expense_type_code", "date", "description",
+    "amount", "currency", "exchange_rate", "amount_eur", "km_distance", "km_rate", "merchant_name", "created_at",
+)
+T_NOTIFICATIONS = CopyTable(
+    Notification, "id", "user_id", "user_email", "notification_type", "title", "message", "channel",
+    "status", "sent_at", "read_at", "entity_type", "entity_id", "created_at",
+)
+T_AUDIT = CopyTable(
+    AuditLog, "id", "user_id", "user_email", "action", "resource_type", "resource_id", "description",
+    "request_data", "ip_address", "user_agent", "endpoint", "http_method", "status", "error_message",
+    "service_name", "created_at",
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Vocabulary
+# ═══════════════════════════════════════════════════════════════════════════
+
+FIRST_NAMES = [
+    "Marco", "Giulia", "Luca", "Francesca", "Alessandro", "Chiara", "Andrea", "Sara", "Matteo", "Elena",
+    "Davide", "Valentina", "Simone", "Martina", "Federico", "Laura", "Stefano", "Alessia", "Paolo", "Silvia",
+    "Giorgio", "Roberta", "Lorenzo", "Elisa", "Riccardo", "Anna", "Fabio", "Monica", "Nicola", "Paola",
+]
+LAST_NAMES = [
+    "Rossi", "Russo", "Ferrari", "Esposito", "Bianchi", "Romano", "Colombo", "Ricci", "Marino", "Greco",
+    "Bruno", "Gallo", "Conti", "DeLuca", "Mancini", "Costa", "Giordano", "Rizzo", "Lombardi", "Moretti",
+    "Barbieri", "Fontana", "Santoro", "Mariani", "Rinaldi", "Caruso", "Ferrara", "Galli", "Martini", "Leone",
+    "Longo", "Gentile", "Martinelli", "Vitale", "Lombardo", "Serra", "Coppola", "DeSantis", "Marchetti", "Parisi",
+]
+# city, province, patron saint, (month, day)
+CITIES = [
+    ("Roma", "RM", "Santi Pietro e Paolo", (6, 29)),
+    ("Milano", "MI", "Sant'Ambrogio", (12, 7)),
+    ("Torino", "TO", "San Giovanni Battista", (6, 24)),
+    ("Napoli", "NA", "San Gennaro", (9, 19)),
+    ("Bologna", "BO", "San Petronio", (10, 4)),
+    ("Firenze", "FI", "San Giovanni Battista", (6, 24)),
+    ("Bari", "BA", "San Nicola", (12, 6)),
+    ("Venezia", "VE", "San Marco", (4, 25)),
+]
+DIVISIONS = ["Operations", "Finance", "Commerciale", "Tecnologia", "Risorse Umane", "Legale", "Produzione", "Logistica"]
+FUNCTIONS = ["Pianificazione", "Controllo", "Sviluppo", "Supporto", "Qualità", "Acquisti", "Analisi", "Vendite"]
+JOB_TITLES = ["Impiegato", "Specialista", "Analista", "Tecnico", "Consulente", "Addetto", "Assistente"]
+
+DESTINATIONS = {
+    "NATIONAL": [("Milano", "EUR"), ("Roma", "EUR"), ("Torino", "EUR"), ("Napoli", "EUR"), ("Bologna", "EUR")],
+    "EU": [("Parigi", "EUR"), ("Berlino", "EUR"), ("Madrid", "EUR"), ("Bruxelles", "EUR"), ("Vienna", "EUR")],
+    "EXTRA_EU": [("Londra", "GBP"), ("New York", "USD"), ("Zurigo", "CHF"), ("Tokyo", "JPY")],
+}
+EXCHANGE_RATES = {"EUR": Decimal("1"), "GBP": Decimal("1.170000"), "USD": Decimal("0.920000"), "CHF": Decimal("1.040000"), "JPY": Decimal("0.006200")}
+
+# Codes as created by scripts/seed_trips_expenses.py
+EXPENSE_TYPES = [
+    ("HOTEL", "Hotel & Alloggio", "lodging"),
+    ("TRENO", "Biglietto Treno", "transport"),
+    ("AEREO", "Biglietto Aereo", "transport"),
+    ("TAXI", "Taxi / Uber", "transport"),
+    ("PASTO", "Pasto / Ristorante", "meals"),
+    ("AUTO", "Rimborso Km Auto", "transport"),
+    ("ALTRO", "Altro", "other"),
+]
+KM_RATE = Decimal("0.42")
+
+# (code, weight) of generated leave requests; codes missing from config.leave_types are skipped
+LEAVE_MIX = [("FER", 45), ("ROL", 25), ("MAL", 12), ("PAR", 8), ("EXFE", 4), ("STU", 2), ("DON", 2), ("L104", 2)]
+LEDGER_BALANCE = {"FER": "VACATION_AC", "ROL": "ROL", "EXFE": "PERMITS"}
+
+PAST_LEAVE_STATUSES = [
+    ("COMPLETED", 40), ("APPROVED", 33), ("REJECTED", 6), ("CANCELLED", 10),
+    ("RECALLED", 2), ("APPROVED_CONDITIONAL", 4), ("DRAFT", 1), ("PENDING", 4),
+]
+FUTURE_LEAVE_STATUSES = [("PENDING", 40), ("APPROVED", 35), ("DRAFT", 12), ("CANCELLED", 8), ("APPROVED_CONDITIONAL", 5)]
+PAST_TRIP_STATUSES = [("COMPLETED", 65), ("APPROVED", 10), ("REJECTED", 8), ("CANCELLED", 10), ("SUBMITTED", 4), ("DRAFT", 3)]
+FUTURE_TRIP_STATUSES = [("PENDING", 35), ("SUBMITTED", 15), ("APPROVED", 35), ("DRAFT", 15)]
+REPORT_STATUSES = [("PAID", 50), ("APPROVED", 20), ("SUBMITTED", 12), ("REJECTED", 5), ("DRAFT", 10), ("CANCELLED", 3)]
+
+NOTIFICATION_TYPES = {
+    "PENDING": ("leave_request_submitted", "Nuova richiesta da approvare"),
+    "APPROVED": ("leave_request_approved", "Richiesta approvata"),
+    "COMPLETED": ("leave_request_approved", "Richiesta approvata"),
+    "RECALLED": ("leave_request_approved", "Richiesta approvata"),
+    "APPROVED_CONDITIONAL": ("leave_conditional_approval", "Approvazione condizionata"),
+    "REJECTED": ("leave_request_rejected", "Richiesta rifiutata"),
+    "CANCELLED": ("leave_request_cancelled", "Richiesta annullata"),
+}
+
+# (service_name, resource_type, endpoint, weight)
+AUDIT_RESOURCES = [
+    ("leaves", "LEAVE_REQUEST", "/api/v1/leaves", 38),
+    ("approval", "APPROVAL_REQUEST", "/api/v1/approvals/decisions", 12),
+    ("calendar", "CALENDAR", "/api/v1/calendar/events", 12),
+    ("expense", "BUSINESS_TRIP", "/api/v1/trips", 8),
+    ("expense", "EXPENSE_REPORT", "/api/v1/expenses", 8),
+    ("auth", "USER", "/api/v1/users", 10),
+    ("notification", "NOTIFICATION", "/api/v1/notifications", 8),
+    ("config", "LEAVE_TYPE", "/api/v1/config/leave-types", 2),
+    ("config", "NATIONAL_CONTRACT_VERSION", "/api/v1/config/national-contracts/versions", 2),
+]
+# (action, http method, weight)
+AUDIT_ACTIONS = [
+    ("CREATE", "POST", 30), ("UPDATE", "PUT", 28), ("SUBMIT", "POST", 12), ("APPROVE", "POST", 10),
+    ("DELETE", "DELETE", 6), ("CANCEL", "POST", 5), ("REJECT", "POST", 3), ("UPLOAD_ATTACHMENT", "POST", 3),
+    ("ERROR", "POST", 3),
+]
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:127.0) Gecko/20100101 Firefox/127.0",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148",
+    "python-httpx/0.27.0",
+]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Plan (shared with the worker processes)
+# ═══════════════════════════════════════════════════════════════════════════
+
+class Employee(NamedTuple):
+    index: int
+    id: UUID
+    email: str
+    manager_id: Optional[UUID]
+    hire_date: date
+    part_time: int            # percentage of full time, from the current contract
+    annual_rol_hours: int
+    traveller: bool
+    has_personal_calendar: bool
+
+
+@dataclass
+class Plan:
+    seed: int
+    as_of: date
+    first_year: int
+    employees: list[Employee]
+    hr_id: UUID
+    leave_types: dict[str, UUID]
+    expense_types: dict[str, UUID]
+    report_base: dict[int, int] = field(default_factory=dict)
+    audit_rows: int = 0
+    skip_triggers: bool = False
+
+    @property
+    def start(self) -> date:
+        return date(self.first_year, 1, 1)
+
+    @property
+    def emails(self) -> dict[UUID, str]:
+        return {employee.id: employee.email for employee in self.employees}
+
+
+def _rng(seed: int, *scope) -> random.Random:
+    """Independent generator per (seed, section, slice); string seeds hash deterministically."""
+    return random.Random(":".join(map(str, (seed, *scope))))
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _weighted(rng: random.Random, choices: list[tuple]) -> tuple:
+    return rng.choices(choices, weights=[choice[-1] for choice in choices])[0]
+
+
+def _at(day: date, rng: random.Random, start_hour: int = 8, end_hour: int = 18) -> datetime:
+    """A timestamp during office hours of ``day``."""
+    seconds = rng.randrange(start_hour * 3600, end_hour * 3600)
+    return datetime.combine(day, dt_time(), tzinfo=timezone.utc) + timedelta(seconds=seconds)
+
+
+def _working_days(start: date, end: date) -> int:
+    days, day = 0, start
+    while day <= end:
+        days += day.weekday() < 5
+        day += timedelta(days=1)
+    return days
+
+
+def _add_working_days(start: date, count: int) -> date:
+    """Last day of ``count`` working days starting at ``start`` (a working day)."""
+    day = start
+    while count > 1:
+        day += timedelta(days=1)
+        count -= day.weekday() < 5
+    return day
+
+
+def _next_working_day(day: date) -> date:
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Reference data & org tree (main process)
+# ═══════════════════════════════════════════════════════════════════════════
+
+class Reference(NamedTuple):
+    plan: Plan
+    rows: dict[CopyTable, list[tuple]]
+
+
+def build_reference(
+    seed: int,
+    employees: int,
+    years: int,
+    as_of: date,
+    leave_types: dict[str, UUID],
+    expense_types: dict[str, UUID],
+) -> Reference:
+    rng = _rng(seed, "org")
+    first_year = as_of.year - years + 1
+    rows: dict[CopyTable, list[tuple]] = {table: [] for table in (
+        T_LOCATIONS, T_SCHEDULES, T_CONTRACT_TYPES, T_NATIONAL_CONTRACTS, T_CONTRACT_LEVELS, T_CONTRACT_VERSIONS,
+        T_EXECUTIVE_LEVELS, T_EXPENSE_TYPES, T_DEPARTMENTS, T_SERVICES, T_USERS, T_EMPLOYEE_CONTRACTS,
+        T_CALENDARS, T_EVENTS, T_CLOSURES,
+    )}
+
+    if not expense_types:
+        for code, name, category in EXPENSE_TYPES:
+            expense_types[code] = _uuid(rng)
+            rows[T_EXPENSE_TYPES].append((expense_types[code], code, name, category, KM_RATE if code == "AUTO" else None))
+
+    locations = []
+    for n, (city, province, saint, (month, day)) in enumerate(CITIES[:min(len(CITIES), max(1, employees // 2500))]):
+        locations.append(_uuid(rng))
+        rows[T_LOCATIONS].append((
+            locations[-1], f"{CODE_PREFIX}L{n + 1:02d}", f"{NAME_PREFIX}Sede {city}", f"Via Roma {n + 1}, {city}",
+            city, province, saint, date(2000, month, day),
+        ))
+
+    schedules = {}
+    for percentage, hours in ((100, 8), (75, 6), (50, 4)):
+        schedules[percentage] = _uuid(rng)
+        rows[T_SCHEDULES].append((schedules[percentage], f"{CODE_PREFIX}WS{percentage}", f"{NAME_PREFIX}{hours}h x 5", *([hours] * 5)))
+
+    contract_types = {}
+    for percentage in (100, 75, 50):
+        contract_types[percentage] = _uuid(rng)
+        name = "Tempo pieno" if percentage == 100 else f"Part-time {percentage}%"
+        rows[T_CONTRACT_TYPES].append((contract_types[percentage], f"{CODE_PREFIX}CT{percentage}", f"{NAME_PREFIX}{name}", percentage < 100, float(percentage)))
+
+    # CCNLs from setup_data, each with a version every three years since well before the history
+    national_contracts = []
+    for ccnl in json.loads((SETUP_DATA / "contracts.json").read_text(encoding="utf-8"))["contracts"]:
+        contract_id = _uuid(rng)
+        rows[T_NATIONAL_CONTRACTS].append((
+            contract_id, f"{CODE_PREFIX}{ccnl['code']}"[:20], f"{NAME_PREFIX}{ccnl['name']}"[:200],
+            ccnl.get("sector"), "Synthetic dataset",
+        ))
+        levels = []
+        for level in sorted(ccnl["levels"], key=lambda level: level["order"]):
+            levels.append(_uuid(rng))
+            rows[T_CONTRACT_LEVELS].append((levels[-1], contract_id, level["name"][:50], (level.get("description") or "")[:200] or None, level["order"]))
+        rol_hours = rng.choice([56, 72, 104])
+        starts = list(range(first_year - 6, as_of.year + 1, 3))
+        for n, year in enumerate(starts):
+            valid_to = date(starts[n + 1] - 1, 12, 31) if n + 1 < len(starts) else None
+            rows[T_CONTRACT_VERSIONS].append((
+                _uuid(rng), contract_id, f"Rinnovo {year}", date(year, 1, 1), valid_to,
+                Decimal("40.0") if n + 1 < len(starts) else Decimal(rng.choice(["38.0", "39.0", "40.0"])),
+                26, rol_hours,
+            ))
+        national_contracts.append((contract_id, levels, rol_hours))
+
+    executive_levels = {}
+    for code, title, level in (("CEO", "Amministratore Delegato", 1), ("DIR", "Direttore", 2), ("HEAD", "Responsabile", 3)):
+        executive_levels[code] = _uuid(rng)
+        escalates_to = executive_levels["CEO"] if code != "CEO" else None
+        rows[T_EXECUTIVE_LEVELS].append((executive_levels[code], f"{CODE_PREFIX}{code}", title, level, escalates_to))
+
+    # Org tree: CEO -> division directors -> department heads -> service coordinators -> staff
+    service_count = max(1, employees // 40)
+    department_count = max(1, service_count // 3)
+    division_count = min(len(DIVISIONS), max(1, department_count // 8))
+    if employees < 1 + division_count + department_count + service_count + 1:
+        raise ValueError("Too few employees for an org tree, use at least 10")
+
+    user_ids = [_uuid(rng) for _ in range(employees)]
+    divisions, departments, services = [], [], []  # (id, manager index, location)
+    for n in range(division_count):
+        divisions.append((_uuid(rng), 1 + n, locations[n % len(locations)]))
+        rows[T_DEPARTMENTS].append((divisions[-1][0], f"{CODE_PREFIX}DIV{n + 1:02d}", f"{NAME_PREFIX}{DIVISIONS[n]}", None, 1, f"CC{n + 1:02d}"))
+    for n in range(department_count):
+        division = divisions[n % division_count]
+        departments.append((_uuid(rng), 1 + division_count + n, division[2], n % division_count))
+        name = f"{NAME_PREFIX}{DIVISIONS[n % division_count]} - {FUNCTIONS[n // division_count % len(FUNCTIONS)]} {n + 1}"
+        rows[T_DEPARTMENTS].append((departments[-1][0], f"{CODE_PREFIX}D{n + 1:04d}", name[:100], division[0], 2, f"CC{n % division_count + 1:02d}{n + 1:04d}"))
+    for n in range(service_count):
+        department = departments[n % department_count]
+        services.append((_uuid(rng), 1 + division_count + department_count + n, department))
+        rows[T_SERVICES].append((services[-1][0], f"{CODE_PREFIX}S{n + 1:05d}", f"{NAME_PREFIX}Servizio {n + 1}", department[0]))
+
+    plan_employees = []
+    for index, user_id in enumerate(user_ids):
+        if index == 0:
+            department_id, service_id, manager, executive, location = divisions[0][0], None, None, "CEO", locations[0]
+        elif index <= division_count:
+            division = divisions[index - 1]
+            department_id, service_id, manager, executive, location = division[0], None, 0, "DIR", division[2]
+        elif index <= division_count + department_count:
+            department = departments[index - 1 - division_count]
+            department_id, service_id, manager, executive, location = department[0], None, divisions[department[3]][1], "HEAD", department[2]
+        elif index <= division_count + department_count + service_count:
+            service = services[index - 1 - division_count - department_count]
+            department_id, service_id, manager, executive, location = service[2][0], service[0], service[2][1], None, service[2][2]
+        else:
+            service = services[rng.randrange(service_count)]
+            department_id, service_id, manager, executive, location = service[2][0], service[0], service[1], None, service[2][2]
+        is_manager = index <= division_count + department_count + service_count
+        is_hr = not is_manager and index % 200 == 7
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        email = f"{first}.{last}.{index}@{EMAIL_DOMAIN}".lower()
+
+        if index == 0 or rng.random() < 0.15:
+            hire_date = date(first_year, 1, 1) - timedelta(days=rng.randrange(365, 365 * 20))
+        else:
+            hire_date = as_of - timedelta(days=rng.randrange(60, (as_of - date(first_year - 8, 1, 1)).days))
+
+        # Contract history: earlier contracts may be part-time, levels only go up
+        contract_id, levels, rol_hours = national_contracts[index % len(national_contracts)]
+        contract_count = 1 if (as_of - hire_date).days < 400 else rng.choice([1, 1, 2, 2, 3])
+        bounds = sorted(rng.sample(range(200, (as_of - hire_date).days - 30), contract_count - 1)) if contract_count > 1 else []
+        starts = [hire_date] + [hire_date + timedelta(days=days) for days in bounds]
+        level = rng.randrange(len(levels)) if not is_manager else 0
+        percentage = 100
+        for n, start in enumerate(starts):
+            end = starts[n + 1] - timedelta(days=1) if n + 1 < len(starts) else None
+            percentage = 100 if is_manager or (n == len(starts) - 1 and rng.random() < 0.85) else rng.choice([50, 75, 100])
+            rows[T_EMPLOYEE_CONTRACTS].append((
+                _uuid(rng), user_id, contract_types[percentage], contract_id, levels[level], start, end,
+                40 * percentage // 100, rng.choice(JOB_TITLES) if not is_manager else "Responsabile",
+            ))
+            level = max(0, level - rng.choice([0, 1]))
+
+        rows[T_USERS].append((
+            user_id, f"gen-{index:06d}", email, first, last, f"gen.{index:06d}", f"G{index:07d}",
+            f"GEN{index:013d}", hire_date, contract_types[percentage], schedules[percentage], location,
+            department_id, service_id, executive_levels.get(executive),
+            user_ids[manager] if manager is not None else None,
+            index == 0 or is_hr and index % 1000 == 7, is_manager, is_manager, is_hr,
+        ))
+        plan_employees.append(Employee(
+            index=index,
+            id=user_id,
+            email=email,
+            manager_id=user_ids[manager] if manager is not None else None,
+            hire_date=hire_date,
+            part_time=percentage,
+            annual_rol_hours=rol_hours,
+            traveller=is_manager or rng.random() < 0.3,
+            has_personal_calendar=rng.random() < 0.1,
+        ))
+    hr_id = next((employee.id for employee in plan_employees if rows[T_USERS][employee.index][-1]), user_ids[0])
+    plan = Plan(
+        seed=seed, as_of=as_of, first_year=first_year, employees=plan_employees, hr_id=hr_id,
+        leave_types=leave_types, expense_types=expense_types,
+    )
+
+    # Department and location calendars with their events, company closures
+    for n, (_, manager, _, _) in enumerate(departments):
+        calendar_id = _uuid(rng)
+        rows[T_CALENDARS].append((calendar_id, "TEAM", f"{NAME_PREFIX}Team {n + 1}", "Synthetic dataset", "#0EA5E9", "shared", user_ids[manager]))
+        rows[T_EVENTS].extend(_team_events(rng, plan, calendar_id, user_ids[manager]))
+    for city, *_ in CITIES[:len(locations)]:
+        rows[T_CALENDARS].append((_uuid(rng), "LOCATION", f"{NAME_PREFIX}Sede {city}", "Synthetic dataset", "#10B981", "public", None))
+    for year in range(first_year, as_of.year + 2):
+        summer = date(year, 8, 10)
+        rows[T_CLOSURES].append((_uuid(rng), f"{NAME_PREFIX}Chiusura estiva {year}", summer, summer + timedelta(days=11)))
+        rows[T_CLOSURES].append((_uuid(rng), f"{NAME_PREFIX}Chiusura natalizia {year}", date(year, 12, 27), date(year, 12, 31)))
+    return Reference(plan=plan, rows=rows)
+
+
+def _team_events(rng: random.Random, plan: Plan, calendar_id: UUID, owner_id: UUID) -> list[tuple]:
+    rows = []
+    day = plan.start
+    end = date(plan.as_of.year, 12, 31)
+    while True:
+        day = _next_working_day(day + timedelta(days=rng.randint(3, 12)))
+        if day > end:
+            return rows
+        hour = rng.randint(9, 16)
+        rows.append((
+            _uuid(rng), calendar_id, rng.choice(["Riunione di team", "Stand-up settimanale", "Revisione obiettivi", "Formazione"]),
+            day, day, day, dt_time(hour), dt_time(hour + 1), False, "meeting", "shared",
+            rng.choice(["Sala riunioni", "Teams", None]), owner_id, owner_id, _at(day - timedelta(days=7), rng),
+        ))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Employee histories (worker processes)
+# ═══════════════════════════════════════════════════════════════════════════
+
+class EmployeeHistory:
+    """Ledger, leaves, trips, expenses, events and notifications of one slice of employees."""
+
+    def __init__(self, plan: Plan, chunk: int):
+        self.plan = plan
+        self.rng = _rng(plan.seed, "employees", chunk)
+        self.emails = plan.emails
+        self.rows: dict[CopyTable, list[tuple]] = {table: [] for table in (
+            T_CALENDARS, T_EVENTS, T_LEDGER, T_LEAVES, T_LEAVE_HISTORY, T_INTERRUPTIONS,
+            T_TRIPS, T_REPORTS, T_ITEMS, T_NOTIFICATIONS,
+        )}
+        self.leave_mix = [(code, weight) for code, weight in LEAVE_MIX if code in plan.leave_types]
+
+    def generate(self, employee: Employee) -> None:
+        first_day = max(self.plan.start, employee.hire_date)
+        self._leaves_and_ledger(employee, first_day)
+        if employee.traveller:
+            self._trips(employee, first_day)
+        if self.rng.random() < 0.15:
+            self._standalone_reports(employee, first_day)
+        if employee.has_personal_calendar:
+            self._personal_calendar(employee, first_day)
+
+    # ── Leaves & ledger ──────────────────────────────────────────────────
+
+    def _ledger(self, user_id: UUID, year: int, entry_type: str, balance_type: str, amount: Decimal,
+                reference_type: str, reference_id: UUID, at: datetime, status: str = "APPROVED",
+                notes: Optional[str] = None) -> UUID:
+        entry_id = _uuid(self.rng)
+        self.rows[T_LEDGER].append((
+            entry_id, user_id, year, entry_type, balance_type, amount.quantize(Decimal("0.01")),
+            reference_type, reference_id, status, notes, at,
+        ))
+        return entry_id
+
+    def _leaves_and_ledger(self, employee: Employee, first_day: date) -> None:
+        rng, plan = self.rng, self.plan
+        scale = Decimal(employee.part_time) / 100
+        vacation_month = Decimal(26) * scale / 12
+        rol_month = Decimal(employee.annual_rol_hours) * scale / 12
+        balances = {"VACATION_AP": Decimal(0), "VACATION_AC": Decimal(0), "ROL": Decimal(0), "PERMITS": Decimal(0)}
+
+        for year in range(first_day.year, plan.as_of.year + 1):
+            year_start = date(year, 1, 1)
+            # Year end: vacation left moves to the previous-year balance, ROL carries over
+            if year > first_day.year:
+                job = uuid.uuid5(uuid.NAMESPACE_URL, f"kronos-gen-year-end-{year}")
+                at = datetime(year, 1, 1, 2, tzinfo=timezone.utc)
+                left = balances["VACATION_AP"] + balances["VACATION_AC"]
+                if left > 0:
+                    self._ledger(employee.id, year, "CARRY_OVER", "VACATION_AP", left, "YEAR_END_JOB", job, at, "COMPLETED")
+                if balances["ROL"] > 0:
+                    self._ledger(employee.id, year, "CARRY_OVER", "ROL", balances["ROL"], "YEAR_END_JOB", job, at, "COMPLETED")
+                balances = {**balances, "VACATION_AP": max(left, Decimal(0)), "VACATION_AC": Decimal(0), "PERMITS": Decimal(0)}
+
+            months = range(first_day.month if year == first_day.year else 1, (plan.as_of.month if year == plan.as_of.year else 12) + 1)
+            for month in months:
+                job = uuid.uuid5(uuid.NAMESPACE_URL, f"kronos-gen-accrual-{year}-{month}")
+                at = datetime(year, month, 1, 3, tzinfo=timezone.utc)
+                self._ledger(employee.id, year, "ACCRUAL", "VACATION_AC", vacation_month, "ACCRUAL_JOB", job, at, "COMPLETED")
+                self._ledger(employee.id, year, "ACCRUAL", "ROL", rol_month, "ACCRUAL_JOB", job, at, "COMPLETED")
+                balances["VACATION_AC"] += vacation_month
+                balances["ROL"] += rol_month
+                if month == 1:
+                    permits = (Decimal(32) * scale).quantize(Decimal("0.01"))
+                    self._ledger(employee.id, year, "ACCRUAL", "PERMITS", permits, "ACCRUAL_JOB", job, at, "COMPLETED")
+                    balances["PERMITS"] += permits
+
+            cursor = max(first_day, year_start) + timedelta(days=rng.randint(3, 20))
+            horizon = min(date(year, 12, 31), plan.as_of + timedelta(days=120))
+            expired = False
+            while True:
+                cursor = _next_working_day(cursor + timedelta(days=rng.randint(4, 28)))
+                if not expired and (cursor.month > 6 or cursor > horizon) and year > first_day.year:
+                    # Previous-year vacation not used by June 30 expires
+                    expired = True
+                    if balances["VACATION_AP"] > 0 and date(year, 6, 30) <= plan.as_of:
+                        job = uuid.uuid5(uuid.NAMESPACE_URL, f"kronos-gen-expiration-{year}")
+                        at = datetime(year, 7, 1, 4, tzinfo=timezone.utc)
+                        self._ledger(employee.id, year, "EXPIRED", "VACATION_AP", balances["VACATION_AP"], "EXPIRATION_JOB", job, at, "COMPLETED")
+                        balances["VACATION_AP"] = Decimal(0)
+                if cursor > horizon:
+                    break
+                cursor = self._leave(employee, cursor, balances)
+
+    def _leave(self, employee: Employee, start: date, balances: dict[str, Decimal]) -> date:
+        """One leave request from ``start``; returns its last day."""
+        rng, plan = self.rng, self.plan
+        code = _weighted(rng, self.leave_mix)[0]
+        hours = None
+        if code == "FER":
+            days = rng.choice([1, 1, 2, 3, 5, 5, 10]) if start.month != 8 else rng.choice([5, 10, 10, 15])
+        elif code == "MAL":
+            days = rng.choice([1, 1, 2, 3, 5, 7])
+        elif code in ("ROL", "PAR"):
+            days, hours = 1, Decimal(rng.choice([2, 3, 4, 4, 8]))
+        else:
+            days = 1
+        end = _add_working_days(start, days)
+        days_requested = Decimal(_working_days(start, end)) if hours is None else (hours / 8).quantize(Decimal("0.01"))
+
+        if end < plan.as_of:
+            status = _weighted(rng, PAST_LEAVE_STATUSES)[0]
+        elif start > plan.as_of:
+            status = _weighted(rng, FUTURE_LEAVE_STATUSES)[0]
+        else:
+            status = rng.choice(["APPROVED", "APPROVED", "APPROVED", "RECALLED"])
+        if status == "RECALLED" and days < 2:
+            status = "APPROVED"
+        if status == "COMPLETED" and end >= plan.as_of:
+            status = "APPROVED"
+
+        leave_id = _uuid(rng)
+        created_at = _at(min(start - timedelta(days=rng.randint(2, 45)), plan.as_of), rng)
+        approver_id = employee.manager_id or plan.hr_id
+        decided = status not in ("DRAFT", "PENDING")
+        approved = status in ("APPROVED", "APPROVED_CONDITIONAL", "COMPLETED", "RECALLED")
+        approved_at = created_at + timedelta(hours=rng.randint(1, 72)) if decided and status != "CANCELLED" else None
+        updated_at = approved_at or created_at
+
+        conditional = status == "APPROVED_CONDITIONAL"
+        condition_accepted = rng.random() < 0.7 if conditional else None
+        recalled = status == "RECALLED"
+        recall_date = _add_working_days(start, max(1, days // 2)) if recalled else None
+        days_used = Decimal(_working_days(start, recall_date) - 1) if recalled else None
+
+        balance_type = LEDGER_BALANCE.get(code)
+        deducted = approved and balance_type is not None
+        deduction_details = None
+        has_interruptions = False
+        if deducted:
+            amount = hours if code == "ROL" else days_requested
+            if code == "EXFE":
+                amount = days_requested * 8
+            if balance_type == "VACATION_AC" and balances["VACATION_AP"] > 0:
+                from_ap = min(balances["VACATION_AP"], amount)
+                parts = {"VACATION_AP": from_ap, "VACATION_AC": amount - from_ap}
+            else:
+                parts = {balance_type: amount}
+            for part, value in parts.items():
+                if value > 0:
+                    self._ledger(employee.id, start.year, "USAGE", part, value, "LEAVE_REQUEST", leave_id, approved_at, status)
+                    balances[part] -= value
+            deduction_details = json.dumps({part: float(value) for part, value in parts.items() if value > 0})
+
+            # Sickness during vacation: the days are given back
+            if code == "FER" and days >= 3 and end < plan.as_of and status in ("APPROVED", "COMPLETED") and rng.random() < 0.05:
+                has_interruptions = True
+                sick_from = _add_working_days(start, rng.randint(2, days - 1))
+                sick_to = min(end, _add_working_days(sick_from, rng.randint(1, 3)))
+                refunded = Decimal(_working_days(sick_from, sick_to))
+                at = _at(sick_from, rng)
+                refund_id = self._ledger(
+                    employee.id, start.year, "ADJUSTMENT_ADD", "VACATION_AC", refunded, "LEAVE_REQUEST", leave_id, at,
+                    notes="Interruption refund (SICKNESS)",
+                )
+                balances["VACATION_AC"] += refunded
+                self.rows[T_INTERRUPTIONS].append((
+                    _uuid(rng), leave_id, "SICKNESS", sick_from, sick_to, refunded, f"INPS-{rng.randrange(10**9):09d}",
+                    employee.id, "Malattia durante le ferie", refund_id, at,
+                ))
+
+        self.rows[T_LEAVES].append((
+            leave_id, employee.id, plan.leave_types[code], code, start, end, days_requested, hours, status,
+            rng.choice([None, None, "Motivi personali", "Visita medica", "Vacanza"]) if code != "MAL" else None,
+            approver_id if decided and status != "CANCELLED" else None, approved_at,
+            conditional, rng.choice(["RIC", "REP", "PAR", "MOD", "ALT"]) if conditional else None,
+            "Reperibilità telefonica richiesta" if conditional else None, condition_accepted,
+            approved_at + timedelta(hours=4) if condition_accepted else None,
+            _at(recall_date - timedelta(days=1), rng) if recalled else None, "Esigenze di servizio" if recalled else None,
+            days_used, recall_date, deducted, deduction_details,
+            "Periodo di picco lavorativo" if status == "REJECTED" else None, has_interruptions, created_at, updated_at,
+        ))
+        self._leave_history(employee, leave_id, status, approver_id, created_at, approved_at)
+        if status != "DRAFT":
+            self._leave_notifications(employee, leave_id, status, created_at, approved_at)
+        return end
+
+    def _leave_history(self, employee: Employee, leave_id: UUID, status: str, approver_id: UUID,
+                       created_at: datetime, decided_at: Optional[datetime]) -> None:
+        rng = self.rng
+        steps = [(None, "DRAFT", employee.id, created_at)]
+        if status != "DRAFT":
+            submitted_at = created_at + timedelta(minutes=rng.randint(1, 120))
+            steps.append(("DRAFT", "PENDING", employee.id, submitted_at))
+            decided_at = decided_at or submitted_at + timedelta(hours=rng.randint(1, 48))
+            if status in ("COMPLETED", "RECALLED"):
+                steps.append(("PENDING", "APPROVED", approver_id, decided_at))
+                steps.append(("APPROVED", status, approver_id if status == "RECALLED" else employee.id, decided_at + timedelta(days=rng.randint(1, 20))))
+            elif status == "CANCELLED":
+                steps.append(("PENDING", "CANCELLED", employee.id, decided_at))
+            elif status != "PENDING":
+                steps.append(("PENDING", status, approver_id, decided_at))
+        for from_status, to_status, changed_by, at in steps:
+            self.rows[T_LEAVE_HISTORY].append((_uuid(rng), leave_id, from_status, to_status, changed_by, at, None))
+
+    def _notify(self, user_id: UUID, notification_type: str, title: str, message: str, entity_type: str,
+                entity_id: UUID, at: datetime) -> None:
+        rng = self.rng
+        channel = "email" if rng.random() < 0.3 else "in_app"
+        read = channel == "in_app" and at.date() < self.plan.as_of - timedelta(days=2) and rng.random() < 0.8
+        self.rows[T_NOTIFICATIONS].append((
+            _uuid(rng), user_id, self.emails[user_id], notification_type, title, message, channel, "sent",
+            at + timedelta(seconds=rng.randint(1, 30)), at + timedelta(hours=rng.randint(1, 48)) if read else None,
+            entity_type, str(entity_id), at,
+        ))
+
+    def _leave_notifications(self, employee: Employee, leave_id: UUID, status: str,
+                             created_at: datetime, decided_at: Optional[datetime]) -> None:
+        approver_id = employee.manager_id or self.plan.hr_id
+        notification_type, title = NOTIFICATION_TYPES["PENDING"]
+        self._notify(approver_id, notification_type, title, "Una nuova richiesta di assenza attende la tua approvazione.", "leave_request", leave_id, created_at)
+        if status in NOTIFICATION_TYPES and status != "PENDING" and decided_at is not None:
+            notification_type, title = NOTIFICATION_TYPES[status]
+            self._notify(employee.id, notification_type, title, f"{title}.", "leave_request", leave_id, decided_at)
+
+    # ── Trips & expenses ─────────────────────────────────────────────────
+
+    def _trips(self, employee: Employee, first_day: date) -> None:
+        rng, plan = self.rng, self.plan
+        horizon = plan.as_of + timedelta(days=90)
+        for year in range(first_day.year, plan.as_of.year + 1):
+            report_sequence = 0
+            for _ in range(rng.choice([0, 1, 1, 2, 3, 4, 6])):
+                start = _next_working_day(max(first_day, date(year, 1, 1)) + timedelta(days=rng.randrange(350)))
+                if start > horizon:
+                    continue
+                end = start + timedelta(days=rng.choice([0, 1, 1, 2, 3, 4]))
+                destination_type = _weighted(rng, [("NATIONAL", 70), ("EU", 20), ("EXTRA_EU", 10)])[0]
+                destination, currency = rng.choice(DESTINATIONS[destination_type])
+                status = _weighted(rng, PAST_TRIP_STATUSES if end < plan.as_of else FUTURE_TRIP_STATUSES)[0]
+                trip_id = _uuid(rng)
+                created_at = _at(min(start - timedelta(days=rng.randint(5, 40)), plan.as_of), rng)
+                approved = status in ("APPROVED", "COMPLETED")
+                approver_id = employee.manager_id or plan.hr_id
+                self.rows[T_TRIPS].append((
+                    trip_id, employee.id, f"Trasferta {destination}", destination, destination_type, start, end,
+                    rng.choice(["Incontro cliente", "Formazione", "Fiera di settore", "Audit presso sede"]),
+                    f"PRJ-{rng.randrange(1000):03d}", Decimal(rng.randrange(200, 3000)).quantize(Decimal("0.01")),
+                    status, approver_id if approved or status == "REJECTED" else None,
+                    created_at + timedelta(hours=rng.randint(2, 96)) if approved else None, created_at,
+                ))
+                if status in ("APPROVED", "SUBMITTED"):
+                    self._notify(approver_id, "trip_submitted", "Nuova trasferta da approvare", f"Trasferta a {destination}.", "business_trip", trip_id, created_at)
+                if status == "COMPLETED" and report_sequence < REPORTS_PER_EMPLOYEE_YEAR // 2:
+                    report_sequence += 1
+                    self._report(employee, year, report_sequence, trip_id, start, end, currency, f"Nota spese {destination}")
+
+    def _standalone_reports(self, employee: Employee, first_day: date) -> None:
+        rng, plan = self.rng, self.plan
+        for year in range(first_day.year, plan.as_of.year + 1):
+            for n in range(rng.choice([1, 1, 2])):
+                month = rng.randint(1, 12)
+                start = max(first_day, date(year, month, 1))
+                end = min(start + timedelta(days=27), plan.as_of)
+                if end <= start:
+                    continue
+                sequence = REPORTS_PER_EMPLOYEE_YEAR // 2 + n + 1
+                self._report(employee, year, sequence, None, start, end, "EUR", f"Spese {start:%m/%Y}")
+
+    def _report(self, employee: Employee, year: int, sequence: int, trip_id: Optional[UUID],
+                start: date, end: date, currency: str, title: str) -> None:
+        rng, plan = self.rng, self.plan
+        report_id = _uuid(rng)
+        created_at = _at(min(end + timedelta(days=rng.randint(1, 10)), plan.as_of), rng)
+        total = Decimal(0)
+        codes = list(plan.expense_types)
+        for _ in range(rng.randint(2, 8) if trip_id else rng.randint(1, 4)):
+            code = rng.choice(codes)
+            day = start + timedelta(days=rng.randint(0, (end - start).days))
+            km = rate = None
+            if code == "AUTO":
+                km, rate = rng.randint(20, 600), KM_RATE
+                amount, item_currency = (KM_RATE * km).quantize(Decimal("0.01")), "EUR"
+            else:
+                amount, item_currency = Decimal(rng.randint(800, 25000)) / 100, currency
+            exchange_rate = EXCHANGE_RATES[item_currency]
+            amount_eur = (amount * exchange_rate).quantize(Decimal("0.01"))
+            total += amount_eur
+            self.rows[T_ITEMS].append((
+                _uuid(rng), report_id, plan.expense_types[code], code, day, f"{code.title()} {day:%d/%m}",
+                amount, item_currency, exchange_rate, amount_eur, km, rate,
+                rng.choice([None, "Trenitalia", "Hotel Centrale", "Ristorante Da Mario", "Taxi Service"]), created_at,
+            ))
+
+        status = _weighted(rng, REPORT_STATUSES)[0]
+        approved = status in ("APPROVED", "PAID")
+        approved_at = created_at + timedelta(days=rng.randint(1, 10)) if approved or status == "REJECTED" else None
+        paid_at = approved_at + timedelta(days=rng.randint(5, 30)) if status == "PAID" else None
+        number = plan.report_base.get(year, 0) + employee.index * REPORTS_PER_EMPLOYEE_YEAR + sequence
+        self.rows[T_REPORTS].append((
+            report_id, trip_id, trip_id is None, employee.id, format_report_number(year, number), title, start, end,
+            total, total if approved else None, status, employee.manager_id if approved_at else None, approved_at,
+            paid_at, f"BON-{rng.randrange(10**8):08d}" if paid_at else None, created_at,
+        ))
+        if approved_at:
+            notification_type = {"APPROVED": "expense_approved", "PAID": "expense_approved", "REJECTED": "expense_rejected"}[status]
+            self._notify(employee.id, notification_type, "Nota spese aggiornata", f"{title}: {status.lower()}.", "expense_report", report_id, approved_at)
+
+    # ── Calendar ─────────────────────────────────────────────────────────
+
+    def _personal_calendar(self, employee: Employee, first_day: date) -> None:
+        rng = self.rng
+        calendar_id = _uuid(rng)
+        self.rows[T_CALENDARS].append((calendar_id, "PERSONAL", f"{NAME_PREFIX}Personale", "Synthetic dataset", "#8B5CF6", "private", employee.id))
+        day, end = first_day, date(self.plan.as_of.year, 12, 31)
+        while True:
+            day += timedelta(days=rng.randint(5, 25))
+            if day > end:
+                return
+            all_day = rng.random() < 0.4
+            hour = rng.randint(8, 17)
+            self.rows[T_EVENTS].append((
+                _uuid(rng), calendar_id, rng.choice(["Scadenza", "Promemoria", "Appuntamento", "Visita medica"]),
+                day, day, day, None if all_day else dt_time(hour), None if all_day else dt_time(hour + 1), all_day,
+                rng.choice(["generic", "deadline", "reminder"]), "private", None, employee.id, employee.id,
+                _at(day - timedelta(days=rng.randint(1, 30)), rng),
+            ))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Audit logs (worker processes)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def audit_rows(plan: Plan, chunk: int, count: int) -> list[tuple]:
+    rng = _rng(plan.seed, "audit", chunk)
+    users = [(employee.id, employee.email) for employee in plan.employees]
+    # A tenth of the users (managers, HR, heavy users) produce half of the traffic
+    heavy = users[: max(1, len(users) // 10)]
+    addresses = [ipaddress.IPv4Address(f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}") for _ in range(512)]
+    resources = rng.choices(AUDIT_RESOURCES, weights=[r[-1] for r in AUDIT_RESOURCES], k=count)
+    actions = rng.choices(AUDIT_ACTIONS, weights=[a[-1] for a in AUDIT_ACTIONS], k=count)
+    start = datetime.combine(plan.start, dt_time(), tzinfo=timezone.utc)
+    span = int((datetime.combine(plan.as_of, dt_time(23, 59), tzinfo=timezone.utc) - start).total_seconds())
+    getrandbits, random_ = rng.getrandbits, rng.random
+
+    rows = []
+    for n in range(count):
+        user_id, email = heavy[getrandbits(30) % len(heavy)] if random_() < 0.5 else users[getrandbits(30) % len(users)]
+        service_name, resource_type, endpoint, _ = resources[n]
+        action, method, _ = actions[n]
+        resource_id = UUID(int=getrandbits(128), version=4)
+        failed = action == "ERROR"
+        if action in ("CREATE", "DELETE"):
+            path = endpoint if action == "CREATE" else f"{endpoint}/{resource_id}"
+        elif action == "UPDATE":
+            path = f"{endpoint}/{resource_id}"
+        else:
+            path = f"{endpoint}/{resource_id}/{action.lower()}"
+        rows.append((
+            UUID(int=getrandbits(128), version=4), user_id, email, action, resource_type, str(resource_id),
+            f"{action.title()} {resource_type.lower().replace('_', ' ')}",
+            '{"source": "generate_dataset"}' if random_() < 0.1 else None,
+            addresses[getrandbits(9)], USER_AGENTS[getrandbits(30) % len(USER_AGENTS)], path, method,
+            "FAILURE" if failed else "SUCCESS", "Validation error" if failed else None, service_name,
+            start + timedelta(seconds=getrandbits(40) % span),
+        ))
+    return rows
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Loading
+# ═══════════════════════════════════════════════════════════════════════════
+
+_PLAN: Optional[Plan] = None
+_DSN: Optional[str] = None
+
+
+def _dsn() -> str:
+    return make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def _copy_all(dsn: str, rows: dict[CopyTable, list[tuple]], skip_triggers: bool) -> Counter:
+    loaded = Counter()
+    conn = await asyncpg.connect(dsn)
+    try:
+        if skip_triggers:
+            await conn.execute("SET session_replication_role = replica")
+        async with conn.transaction():
+            for table, table_rows in rows.items():
+                loaded[table.name] += await table.copy(conn, table_rows)
+    finally:
+        await conn.close()
+    return loaded
+
+
+def _init_worker(plan: Plan, dsn: str) -> None:
+    global _PLAN, _DSN
+    _PLAN, _DSN = plan, dsn
+
+
+def _load_employees(chunk: int) -> Counter:
+    history = EmployeeHistory(_PLAN, chunk)
+    for employee in _PLAN.employees[chunk * EMPLOYEES_PER_CHUNK:(chunk + 1) * EMPLOYEES_PER_CHUNK]:
+        history.generate(employee)
+    return asyncio.run(_copy_all(_DSN, history.rows, _PLAN.skip_triggers))
+
+
+def _load_audit(chunk: int) -> Counter:
+    count = min(AUDIT_ROWS_PER_CHUNK, _PLAN.audit_rows - chunk * AUDIT_ROWS_PER_CHUNK)
+    return asyncio.run(_copy_all(_DSN, {T_AUDIT: audit_rows(_PLAN, chunk, count)}, _PLAN.skip_triggers))
+
+
+# The timesheet triggers on leave requests and trips mark every day of every
+# row dirty; without the rights to disable triggers the marks are removed after loading
+DIRTY_DAYS_PURGE = "DELETE FROM hr_reporting.timesheet_dirty_days WHERE employee_id IN (SELECT id FROM gen_users)"
+
+RESET_STATEMENTS = [
+    f"DELETE FROM audit.audit_logs WHERE user_email LIKE '%@{EMAIL_DOMAIN}'",
+    f"DELETE FROM notifications.notifications WHERE user_email LIKE '%@{EMAIL_DOMAIN}'",
+    "DELETE FROM expenses.expense_items WHERE report_id IN (SELECT id FROM expenses.expense_reports WHERE user_id IN (SELECT id FROM gen_users))",
+    "DELETE FROM expenses.expense_reports WHERE user_id IN (SELECT id FROM gen_users)",
+    "DELETE FROM expenses.business_trips WHERE user_id IN (SELECT id FROM gen_users)",
+    "DELETE FROM leaves.leave_interruptions WHERE leave_request_id IN (SELECT id FROM leaves.leave_requests WHERE user_id IN (SELECT id FROM gen_users))",
+    "DELETE FROM leaves.leave_request_history WHERE leave_request_id IN (SELECT id FROM leaves.leave_requests WHERE user_id IN (SELECT id FROM gen_users))",
+    "DELETE FROM leaves.leave_requests WHERE user_id IN (SELECT id FROM gen_users)",
+    "DELETE FROM leaves.time_ledger WHERE user_id IN (SELECT id FROM gen_users)",
+    f"DELETE FROM calendar.events WHERE calendar_id IN (SELECT id FROM calendar.calendars WHERE name LIKE '{NAME_PREFIX}%')",
+    f"DELETE FROM calendar.calendars WHERE name LIKE '{NAME_PREFIX}%'",
+    f"DELETE FROM calendar.closures WHERE name LIKE '{NAME_PREFIX}%'",
+    "DELETE FROM auth.employee_contracts WHERE user_id IN (SELECT id FROM gen_users)",
+    "UPDATE auth.users SET manager_id = NULL, department_id = NULL, service_id = NULL WHERE id IN (SELECT id FROM gen_users)",
+    f"DELETE FROM auth.organizational_services WHERE code LIKE '{CODE_PREFIX}%'",
+    f"DELETE FROM auth.departments WHERE code LIKE '{CODE_PREFIX}%' AND parent_id IS NOT NULL",
+    f"DELETE FROM auth.departments WHERE code LIKE '{CODE_PREFIX}%'",
+    "DELETE FROM auth.users WHERE id IN (SELECT id FROM gen_users)",
+    f"DELETE FROM auth.executive_levels WHERE code LIKE '{CODE_PREFIX}%' AND escalates_to_id IS NOT NULL",
+    f"DELETE FROM auth.executive_levels WHERE code LIKE '{CODE_PREFIX}%'",
+    f"DELETE FROM auth.locations WHERE code LIKE '{CODE_PREFIX}%'",
+    f"DELETE FROM auth.work_schedules WHERE code LIKE '{CODE_PREFIX}%'",
+    f"DELETE FROM config.contract_types WHERE code LIKE '{CODE_PREFIX}%'",
+    f"DELETE FROM config.national_contract_versions WHERE national_contract_id IN (SELECT id FROM config.national_contracts WHERE code LIKE '{CODE_PREFIX}%')",
+    f"DELETE FROM config.national_contract_levels WHERE national_contract_id IN (SELECT id FROM config.national_contracts WHERE code LIKE '{CODE_PREFIX}%')",
+    f"DELETE FROM config.national_contracts WHERE code LIKE '{CODE_PREFIX}%'",
+    DIRTY_DAYS_PURGE,
+]
+
+
+async def _can_skip_triggers(conn: asyncpg.Connection) -> bool:
+    """Whether this role may disable triggers (superuser, or granted the setting)."""
+    try:
+        await conn.execute("SET session_replication_role = replica")
+    except asyncpg.InsufficientPrivilegeError:
+        return False
+    await conn.execute("RESET session_replication_role")
+    return True
+
+
+async def _prepare(args: argparse.Namespace, dsn: str) -> Reference:
+    """Check the database, optionally remove an earlier dataset, load the reference data."""
+    conn = await asyncpg.connect(dsn)
+    try:
+        if await conn.fetchval("SELECT to_regclass('auth.users')") is None:
+            raise SystemExit("❌ Database is not initialized (run scripts/init_db.py first)")
+        leave_types = {row["code"]: row["id"] for row in await conn.fetch("SELECT code, id FROM config.leave_types")}
+        if "FER" not in leave_types:
+            raise SystemExit("❌ Leave types missing (run python -m scripts.seed_leave_types first)")
+
+        skip_triggers = await _can_skip_triggers(conn)
+        existing = await conn.fetchval(f"SELECT count(*) FROM auth.users WHERE email LIKE '%@{EMAIL_DOMAIN}'")
+        if existing and not args.reset:
+            raise SystemExit(f"❌ {existing} generated users already exist, use --reset to replace the dataset")
+        if existing:
+            print(f"🧹 Removing the previous dataset ({existing} users)...")
+            async with conn.transaction():
+                if skip_triggers:
+                    await conn.execute("SET LOCAL session_replication_role = replica")
+                await _create_gen_users(conn)
+                for statement in RESET_STATEMENTS:
+                    await conn.execute(statement)
+
+        codes = [code for code, _, _ in EXPENSE_TYPES]
+        expense_types = {row["code"]: row["id"] for row in await conn.fetch(
+            "SELECT code, id FROM config.expense_types WHERE code = ANY($1::text[])", codes
+        )}
+        reference = build_reference(args.seed, args.employees, args.years, args.as_of, leave_types, expense_types)
+        reference.plan.audit_rows = args.audit_rows
+        reference.plan.skip_triggers = skip_triggers
+
+        # Report numbers go above those already used, the counters are reseeded at the end
+        for year in range(reference.plan.first_year, args.as_of.year + 1):
+            reference.plan.report_base[year] = await conn.fetchval(
+                "SELECT coalesce(max(split_part(report_number, '-', 3)::int), 0) FROM expenses.expense_reports "
+                "WHERE report_number ~ $1", f"^NS-{year}-[0-9]+$",
+            )
+    finally:
+        await conn.close()
+    return reference
+
+
+async def _create_gen_users(conn: asyncpg.Connection) -> None:
+    await conn.execute(
+        f"CREATE TEMP TABLE gen_users ON COMMIT DROP AS SELECT id FROM auth.users WHERE email LIKE '%@{EMAIL_DOMAIN}'"
+    )
+
+
+async def _purge_dirty_days(dsn: str) -> None:
+    conn = await asyncpg.connect(dsn)
+    try:
+        async with conn.transaction():
+            await _create_gen_users(conn)
+            await conn.execute(DIRTY_DAYS_PURGE)
+    finally:
+        await conn.close()
+
+
+async def _reseed_report_numbers(years: range) -> None:
+    async with get_db_context() as session:
+        repo = ExpenseReportRepository(session)
+        for year in years:
+            await repo.reseed_report_numbers(year)
+
+
+def _run(executor: ProcessPoolExecutor, label: str, function, chunks: int, loaded: Counter) -> None:
+    started = time.perf_counter()
+    for done, counts in enumerate(executor.map(function, range(chunks)), start=1):
+        loaded.update(counts)
+        if done == chunks or done % max(1, chunks // 10) == 0:
+            print(f"   {label}: {done}/{chunks} slices ({time.perf_counter() - started:.0f}s)")
+
+
+def generate(args: argparse.Namespace) -> None:
+    dsn = _dsn()
+    started = time.perf_counter()
+    print(f"🏗️  Generating {args.employees} employees over {args.years} years, {args.audit_rows} audit rows (seed {args.seed})")
+
+    reference = asyncio.run(_prepare(args, dsn))
+    plan = reference.plan
+    loaded = asyncio.run(_copy_all(dsn, reference.rows, plan.skip_triggers))
+    if not plan.skip_triggers:
+        print("   ℹ️  Cannot disable triggers (not a superuser): timesheet dirty marks are purged after loading")
+    print(f"   ✓ Org tree, users and contracts ({time.perf_counter() - started:.0f}s)")
+
+    employee_chunks = -(-len(plan.employees) // EMPLOYEES_PER_CHUNK)
+    audit_chunks = -(-plan.audit_rows // AUDIT_ROWS_PER_CHUNK)
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker, initargs=(plan, dsn)) as executor:
+        _run(executor, "employee histories", _load_employees, employee_chunks, loaded)
+        _run(executor, "audit logs", _load_audit, audit_chunks, loaded)
+
+    if not plan.skip_triggers:
+        asyncio.run(_purge_dirty_days(dsn))
+    asyncio.run(_reseed_report_numbers(range(plan.first_year, args.as_of.year + 1)))
+
+    print()
+    for table, count in sorted(loaded.items()):
+        print(f"   {table:<28}{count:>12,}")
+    print(f"✅ Loaded {sum(loaded.values()):,} rows in {time.perf_counter() - started:.0f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=1000, help="Employees to generate (default: 1000)")
+    parser.add_argument("--years", type=int, default=3, help="Years of history up to --as-of (default: 3)")
+    parser.add_argument("--audit-rows", type=int, help="Audit log rows (default: 500 per employee)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(), help="'Today' of the dataset, YYYY-MM-DD (default: today)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Loader processes (default: CPU count)")
+    parser.add_argument("--reset", action="store_true", help="Delete a previously generated dataset first")
+    args = parser.parse_args()
+    if args.audit_rows is None:
+        args.audit_rows = args.employees * 500
+    if args.employees < 10 or args.years < 1:
+        parser.error("use at least 10 employees and 1 year")
+    generate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""KRONOS - Expense Report Number Recovery.
+
+Reseeds the per-year report number counters from the highest number already
+stored in expense reports. Run after restoring a backup or importing reports
+that bypassed the allocator. Counters are never moved backwards.
+
+Usage:
+    python scripts/reseed_report_numbers.py            # all years
+    python scripts/reseed_report_numbers.py --year 2026
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.database import get_db_context
+from src.services.expenses.repository import ExpenseReportRepository
+
+
+async def reseed(year: int | None) -> None:
+    async with get_db_context() as session:
+        repo = ExpenseReportRepository(session)
+        years = [year] if year else await repo.get_report_number_years()
+        if not years:
+            print("ℹ️  No expense reports found, nothing to reseed.")
+            return
+        for y in years:
+            last_value = await repo.reseed_report_numbers(y)
+            print(f"   ✓ {y}: next report number is NS-{y}-{last_value + 1:05d}")
+    print("✅ Report number counters reseeded.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--year", type=int, help="Reseed only this year")
+    args = parser.parse_args()
+    asyncio.run(reseed(args.year))
+
+
+if __name__ == "__main__":
+    main()
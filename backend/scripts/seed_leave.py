@@ -30,7 +30,7 @@ async def seed_approved_leave():
         # If not, it uses default session schema which is 'leaves'.
         
         # To be safe, let's explicitly set search path to include auth
-        await session.execute(text("SET search_path TO leaves, auth, public"))
+        await session.execute(text("SET LOCAL search_path TO leaves, auth, public"))
         
         # Get first user
         result = await session.execute(select(User))
@@ -0,0 +1,155 @@
+"""
+KRONOS Backend - Internal Batch Endpoint.
+
+``POST /api/v1/internal/batch`` runs several GET operations of the service
+in one request:
+
+    {"operations": [
+        {"path": "/api/v1/leave-types/…"},
+        {"path": "/api/v1/config/leave.max_days", "headers": {"If-None-Match": "W/\\"…\\""}}
+    ]}
+
+Each operation is dispatched in-process through the app's router, so it
+goes through the normal dependencies (authentication included: the batch
+request's headers are passed on to every operation), but without another
+HTTP round-trip. Operations run one after the other on a single database
+session. The response holds one result per operation, in order:
+
+    {"results": [{"status": 200, "headers": {"etag": "W/\\"…\\""}, "body": {…}}, …]}
+
+JSON results get an ETag and honour ``If-None-Match`` like ``ETagMiddleware``.
+Service clients send these batches via ``src.shared.clients.batching``.
+"""
+import logging
+from typing import Any
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Request, Response
+from pydantic import BaseModel, Field
+from starlette.datastructures import Headers
+
+from src.core.config import settings
+from src.core.database import shared_session
+from src.core.etag import etag_matches, make_etag
+from src.core.serialization import dumps
+from src.shared.clients.batching import BATCH_PATH
+
+logger = logging.getLogger(__name__)
+
+_JSON = Headers({"content-type": "application/json"})
+
+# Headers of the batch request not passed on to its operations
+_HOP_HEADERS = {b"content-length", b"content-type", b"transfer-encoding", b"expect"}
+
+
+class BatchOperation(BaseModel):
+    """A GET to run within a batch."""
+    path: str = Field(..., pattern=r"^/")
+    params: dict[str, Any] = Field(default_factory=dict)
+    headers: dict[str, str] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    """Operations of an internal batch."""
+    operations: list[BatchOperation] = Field(..., min_length=1, max_length=settings.service_batch_max_size)
+
+
+router = APIRouter(tags=["Internal"])
+
+
+@router.post(BATCH_PATH)
+async def run_batch(data: BatchRequest, request: Request) -> Response:
+    """
+    Run read operations of this service in one request.
+
+    No authentication of its own - each operation is authorized by its endpoint.
+    """
+    results = []
+    async with shared_session() as session:
+        for operation in data.operations:
+            status, headers, body = await _dispatch(request, operation)
+            if status >= 500:
+                # Don't let a failed statement poison the session for the next operations
+                await session.rollback()
+            results.append(_encode_result(status, headers, body, operation))
+
+    return Response(
+        content=b'{"results":[' + b",".join(results) + b"]}",
+        media_type="application/json",
+    )
+
+
+async def _dispatch(request: Request, operation: BatchOperation) -> tuple[int, Headers, bytes]:
+    """Run one GET through the app's router and capture its response."""
+    if operation.path.startswith(BATCH_PATH):
+        return 400, _JSON, b'{"detail":"Batches cannot be nested"}'
+
+    path, _, query = operation.path.partition("?")
+    if operation.params:
+        query = "&".join(filter(None, [query, urlencode(operation.params, doseq=True)]))
+
+    overrides = {k.lower().encode("latin-1"): v.encode("latin-1") for k, v in operation.headers.items()}
+    headers = [(k, v) for k, v in request.scope["headers"] if k not in _HOP_HEADERS and k not in overrides]
+    headers.extend(overrides.items())
+
+    scope = {
+        **request.scope,
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+    }
+    # Let the next router pass fill these in for the operation's route
+    for key in ("route", "endpoint", "path_params", "router"):
+        scope.pop(key, None)
+
+    status = 500
+    response_headers: list = []
+    chunks: list[bytes] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal status, response_headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app.router(scope, receive, send)
+    except Exception:
+        logger.exception(f"Batch operation GET {operation.path} failed")
+        return 500, _JSON, b'{"detail":"Internal server error"}'
+    return status, Headers(raw=response_headers), b"".join(chunks)
+
+
+def _encode_result(status: int, headers: Headers, body: bytes, operation: BatchOperation) -> bytes:
+    """One result of the batch response, embedding JSON bodies without re-parsing them."""
+    result_headers = {}
+    is_json = headers.get("content-type", "").startswith("application/json")
+
+    if status == 200 and is_json:
+        etag = headers.get("etag") or make_etag(body)
+        result_headers["etag"] = etag
+        if_none_match = next(
+            (v for k, v in operation.headers.items() if k.lower() == "if-none-match"), None
+        )
+        if etag_matches(if_none_match, etag):
+            status, body = 304, b""
+
+    if not body:
+        encoded_body = b"null"
+    elif is_json:
+        encoded_body = body
+    else:
+        encoded_body = dumps(body.decode("utf-8", errors="replace"))
+
+    return (
+        b'{"status":' + str(status).encode()
+        + b',"headers":' + dumps(result_headers)
+        + b',"body":' + encoded_body + b"}"
+    )
@@ -0,0 +1,347 @@
+"""KRONOS Backend - Per-User Batch Jobs.
+
+Fan-out framework for nightly jobs that do the same work for every user.
+The user population is split into chunks, each chunk is processed by its
+own Celery task (in parallel, on the job's queue) and a chord callback
+aggregates the results::
+
+    start ──► group(run_chunk × N) ──► finish
+
+Progress is checkpointed in Redis per run: the ids of users already
+processed, the ids of users whose last attempt failed and the running
+totals. Starting a run again with the same
+``run_id`` (the default is one run per job per day) only processes the
+users that are still missing, so a run interrupted by a worker restart
+resumes instead of starting over, and a redelivered chunk does not repeat
+work.
+
+Define a job by subclassing ``PerUserJob`` and registering it::
+
+    @register_job
+    class TimesheetRefreshJob(PerUserJob):
+        name = "hr_reporting.update_timesheets"
+
+        async def process_user(self, session, user_id, context):
+            ...
+            return "updated"
+
+    start_job("hr_reporting.update_timesheets")
+"""
+import logging
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from celery import chord, shared_task
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import get_redis_client
+from src.core.config import settings
+from src.core.database import get_db_context
+from src.core.worker_runtime import async_task, run_async
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_PREFIX = "batch_jobs"
+
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+
+
+class PerUserJob(ABC):
+    """A job run once per user, in parallel chunks.
+
+    Subclasses set ``name`` and implement ``process_user``; the other hooks
+    have sensible defaults.
+    """
+
+    name: str = ""
+    queue: str = "reporting"
+    chunk_size: Optional[int] = None
+
+    async def prepare(self, params: dict) -> Optional[dict]:
+        """Build the JSON-serializable context shared by all chunks.
+
+        Runs once per start. Return None to skip the run altogether.
+        """
+        return params
+
+    def run_id(self, context: dict) -> str:
+        """Identifier of the run used for checkpoints (one per day by default)."""
+        return date.today().isoformat()
+
+    async def load_user_ids(self, context: dict) -> list[str]:
+        """Ids of the users to process (all active users by default)."""
+        from src.shared.clients import AuthClient
+
+        users = await AuthClient().get_users()
+        return sorted(
+            str(u["id"]) for u in users
+            if u.get("id") and u.get("is_active", True)
+        )
+
+    @abstractmethod
+    async def process_user(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        context: dict,
+    ) -> Optional[str]:
+        """Do the work for one user; return an outcome to count (or None)."""
+
+    async def process_chunk(
+        self,
+        user_ids: list[str],
+        context: dict,
+    ) -> tuple[dict[str, int], list[str]]:
+        """Process a chunk of users in one session.
+
+        A failing user is rolled back and logged; the rest of the chunk
+        carries on. Returns the outcome counts and the ids of the users
+        that succeeded (failed ones are retried when the run is resumed).
+        """
+        counts: Counter = Counter()
+        done = []
+        async with get_db_context() as session:
+            for user_id in user_ids:
+                try:
+                    outcome = await self.process_user(session, UUID(user_id), context)
+                    await session.commit()
+                    counts[outcome or "processed"] += 1
+                    done.append(user_id)
+                except Exception as e:
+                    await session.rollback()
+                    logger.error(f"{self.name}: failed for user {user_id}: {e}")
+                    counts["failed"] += 1
+        return dict(counts), done
+
+    async def on_complete(self, summary: dict, context: dict) -> None:
+        """Called once with the aggregated summary when all chunks are done."""
+        logger.info(f"{self.name}: run {summary['run_id']} {summary['status']}: {summary['totals']}")
+
+
+_jobs: dict[str, PerUserJob] = {}
+
+
+def register_job(job_class: type[PerUserJob]) -> type[PerUserJob]:
+    """Class decorator registering a job under its ``name``."""
+    if not job_class.name:
+        raise ValueError(f"{job_class.__name__} must define a name")
+    _jobs[job_class.name] = job_class()
+    return job_class
+
+
+def get_job(name: str) -> PerUserJob:
+    try:
+        return _jobs[name]
+    except KeyError:
+        raise ValueError(f"Unknown batch job: {name}") from None
+
+
+def _chunks(items: list[str], size: int) -> list[list[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+# ═══════════════════════════════════════════════════════════
+# Checkpoints
+# ═══════════════════════════════════════════════════════════
+
+class RunCheckpoint:
+    """Redis-backed progress of one run of a job.
+
+    Checkpointing is best effort: if Redis is unavailable the run still
+    completes, it just cannot be resumed.
+    """
+
+    def __init__(self, job_name: str, run_id: str) -> None:
+        base = f"{CHECKPOINT_PREFIX}:{job_name}:{run_id}"
+        self._done_key = f"{base}:done"
+        self._totals_key = f"{base}:totals"
+        self._failed_key = f"{base}:failed"
+        self._status_key = f"{base}:status"
+
+    async def status(self) -> Optional[str]:
+        try:
+            return await get_redis_client().get(self._status_key)
+        except Exception as e:
+            logger.warning(f"Batch job checkpoint unavailable: {e}")
+            return None
+
+    async def set_status(self, status: str) -> None:
+        try:
+            await get_redis_client().set(
+                self._status_key, status, ex=settings.batch_job_checkpoint_ttl
+            )
+        except Exception as e:
+            logger.warning(f"Batch job checkpoint unavailable: {e}")
+
+    async def pending(self, user_ids: list[str]) -> list[str]:
+        """The subset of ``user_ids`` not processed yet in this run."""
+        if not user_ids:
+            return []
+        try:
+            done = await get_redis_client().smismember(self._done_key, user_ids)
+        except Exception as e:
+            logger.warning(f"Batch job checkpoint unavailable: {e}")
+            return list(user_ids)
+        return [user_id for user_id, is_done in zip(user_ids, done) if not is_done]
+
+    async def record(
+        self,
+        user_ids: list[str],
+        counts: dict[str, int],
+        failed_ids: Optional[list[str]] = None,
+    ) -> None:
+        """Mark users as processed or failed and add the chunk's outcomes to the totals.
+
+        Failures are tracked as a set of user ids rather than a counter, so a
+        user that succeeds on a later attempt no longer counts as failed.
+        """
+        if not user_ids and not counts and not failed_ids:
+            return
+        ttl = settings.batch_job_checkpoint_ttl
+        try:
+            pipe = get_redis_client().pipeline(transaction=True)
+            if user_ids:
+                pipe.sadd(self._done_key, *user_ids)
+                pipe.srem(self._failed_key, *user_ids)
+            if failed_ids:
+                pipe.sadd(self._failed_key, *failed_ids)
+            for outcome, count in counts.items():
+                if outcome != "failed":
+                    pipe.hincrby(self._totals_key, outcome, count)
+            pipe.expire(self._done_key, ttl)
+            pipe.expire(self._totals_key, ttl)
+            pipe.expire(self._failed_key, ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Batch job checkpoint unavailable: {e}")
+
+    async def totals(self) -> Optional[dict[str, int]]:
+        """Outcome counts of the run so far; ``failed`` counts users still failing."""
+        try:
+            pipe = get_redis_client().pipeline(transaction=True)
+            pipe.hgetall(self._totals_key)
+            pipe.scard(self._failed_key)
+            totals, failed = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Batch job checkpoint unavailable: {e}")
+            return None
+        totals = {outcome: int(count) for outcome, count in totals.items()}
+        if failed:
+            totals["failed"] = failed
+        return totals
+
+
+# ═══════════════════════════════════════════════════════════
+# Celery tasks
+# ═══════════════════════════════════════════════════════════
+
+async def _plan(
+    job_name: str,
+    params: Optional[dict],
+    run_id: Optional[str],
+) -> tuple[dict, Optional[dict], list[list[str]]]:
+    """Prepare a run: returns (info, context, chunks of pending user ids)."""
+    job = get_job(job_name)
+    context = await job.prepare(dict(params or {}))
+    if context is None:
+        logger.info(f"{job_name}: nothing to do")
+        return {"job": job_name, "status": "skipped"}, None, []
+
+    run_id = run_id or job.run_id(context)
+    checkpoint = RunCheckpoint(job_name, run_id)
+    if await checkpoint.status() == STATUS_COMPLETED:
+        logger.info(f"{job_name}: run {run_id} already completed")
+        return {"job": job_name, "run_id": run_id, "status": STATUS_COMPLETED}, None, []
+
+    user_ids = await job.load_user_ids(context)
+    pending = await checkpoint.pending(user_ids)
+    chunks = _chunks(pending, job.chunk_size or settings.batch_job_chunk_size)
+    await checkpoint.set_status(STATUS_RUNNING)
+
+    logger.info(
+        f"{job_name}: run {run_id}: {len(pending)}/{len(user_ids)} users pending "
+        f"in {len(chunks)} chunks"
+    )
+    info = {
+        "job": job_name,
+        "run_id": run_id,
+        "status": STATUS_RUNNING,
+        "users": len(user_ids),
+        "pending": len(pending),
+        "chunks": len(chunks),
+    }
+    return info, context, chunks
+
+
+def start_job(job_name: str, params: Optional[dict] = None, run_id: Optional[str] = None) -> dict:
+    """Start (or resume) a run of a job and dispatch its chunks.
+
+    Synchronous: call it from a Celery task. Dispatching happens outside
+    the worker loop, so it also works with eager task execution.
+    """
+    info, context, chunks = run_async(_plan(job_name, params, run_id))
+    if context is None:
+        return info
+
+    job = get_job(job_name)
+    if not chunks:
+        run_async(_finish([], job_name, info["run_id"], context))
+    else:
+        chord(
+            run_chunk.s(job_name, info["run_id"], user_chunk, context).set(queue=job.queue)
+            for user_chunk in chunks
+        )(finish.s(job_name, info["run_id"], context).set(queue=job.queue))
+    return info
+
+
+@shared_task(name="batch_jobs.start")
+def start(job_name: str, params: Optional[dict] = None, run_id: Optional[str] = None) -> dict:
+    """Start (or resume) a run of a registered per-user job."""
+    return start_job(job_name, params, run_id)
+
+
+@async_task(name="batch_jobs.run_chunk", acks_late=True)
+async def run_chunk(job_name: str, run_id: str, user_ids: list[str], context: dict) -> dict:
+    """Process one chunk of users, skipping any already done in this run."""
+    job = get_job(job_name)
+    checkpoint = RunCheckpoint(job_name, run_id)
+    pending = await checkpoint.pending(user_ids)
+    if not pending:
+        return {}
+    counts, done = await job.process_chunk(pending, context)
+    succeeded = set(done)
+    await checkpoint.record(done, counts, [u for u in pending if u not in succeeded])
+    return counts
+
+
+async def _finish(results: list[dict], job_name: str, run_id: str, context: dict) -> dict:
+    job = get_job(job_name)
+    checkpoint = RunCheckpoint(job_name, run_id)
+
+    # Redis totals include chunks completed by earlier attempts of the run
+    totals = await checkpoint.totals()
+    if totals is None:
+        totals = dict(sum((Counter(r) for r in results if r), Counter()))
+    # With failures the run stays open: starting it again retries just those users
+    status = STATUS_RUNNING if totals.get("failed") else STATUS_COMPLETED
+    await checkpoint.set_status(status)
+
+    summary = {
+        "job": job_name,
+        "run_id": run_id,
+        "status": status,
+        "chunks": len(results),
+        "totals": totals,
+    }
+    await job.on_complete(summary, context)
+    return summary
+
+
+@async_task(name="batch_jobs.finish")
+async def finish(results: list[dict], job_name: str, run_id: str, context: dict) -> dict:
+    """Chord callback: aggregate chunk results and close the run."""
+    return await _finish(results, job_name, run_id, context)
@@ -4,6 +4,8 @@ from typing import Any, Optional, Union
 
 import redis.asyncio as redis
 from src.core.config import settings
+from src.core.metrics import observe_cache_lookup
+from src.core.serialization import dumps, loads
 
 # Global Redis client
 _redis_client: Optional[redis.Redis] = None
@@ -25,7 +27,7 @@ async def cache_set(key: str, value: Any, expire_seconds: int = 300) -> None:
     """Set a value in Redis with expiration."""
     client = get_redis_client()
     if isinstance(value, (dict, list)):
-        value = json.dumps(value)
+        value = dumps(value)
     await client.set(key, value, ex=expire_seconds)
 
 
@@ -33,9 +35,10 @@ async def cache_get(key: str, as_json: bool = False) -> Optional[Union[str, Any]
     """Get a value from Redis."""
     client = get_redis_client()
     value = await client.get(key)
+    observe_cache_lookup(key, value is not None)
     if value and as_json:
         try:
-            return json.loads(value)
+            return loads(value)
         except json.JSONDecodeError:
             return value
     return value
@@ -45,3 +48,11 @@ async def cache_delete(key: str) -> None:
     """Delete a key from Redis."""
     client = get_redis_client()
     await client.delete(key)
+
+
+async def cache_delete_many(keys: list[str]) -> None:
+    """Delete several keys from Redis in one round-trip."""
+    if not keys:
+        return
+    client = get_redis_client()
+    await client.delete(*keys)
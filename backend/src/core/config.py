@@ -49,6 +49,20 @@ class Settings(BaseSettings):
     database_schema: str = Field(default="public", alias="DATABASE_SCHEMA")
     database_pool_size: int = Field(default=5, alias="DATABASE_POOL_SIZE")
     database_max_overflow: int = Field(default=10, alias="DATABASE_MAX_OVERFLOW")
+    database_statement_cache_size: int = Field(
+        default=100,
+        alias="DATABASE_STATEMENT_CACHE_SIZE",
+        description="Prepared statements cached per connection (0 disables the cache)",
+    )
+    database_pgbouncer: bool = Field(
+        default=False,
+        alias="DATABASE_PGBOUNCER",
+        description=(
+            "Connect through PgBouncer in transaction pooling mode: no statement cache and "
+            "unique prepared statement names. PgBouncer must track search_path "
+            "(track_extra_parameters = search_path)"
+        ),
+    )
 
     # ─────────────────────────────────────────────────────────────
     # Redis
@@ -70,6 +84,22 @@ class Settings(BaseSettings):
     keycloak_client_secret: str = Field(
         default="", alias="KEYCLOAK_CLIENT_SECRET"
     )
+    keycloak_sync_page_size: int = Field(
+        default=200, alias="KEYCLOAK_SYNC_PAGE_SIZE",
+        description="Users fetched and upserted per page during Keycloak sync"
+    )
+    keycloak_sync_concurrency: int = Field(
+        default=8, alias="KEYCLOAK_SYNC_CONCURRENCY",
+        description="Maximum concurrent Keycloak admin calls during sync"
+    )
+    keycloak_sync_rate_limit: float = Field(
+        default=50.0, alias="KEYCLOAK_SYNC_RATE_LIMIT",
+        description="Maximum Keycloak admin calls per second during sync"
+    )
+    keycloak_incremental_sync_lookback: int = Field(
+        default=86400, alias="KEYCLOAK_INCREMENTAL_SYNC_LOOKBACK",
+        description="Seconds of admin events replayed when no high-water mark is stored"
+    )
 
     # ─────────────────────────────────────────────────────────────
     # MinIO
@@ -79,15 +109,90 @@ class Settings(BaseSettings):
     minio_secret_key: str = Field(default="kronos_dev", alias="MINIO_SECRET_KEY")
     minio_bucket: str = Field(default="kronos-attachments", alias="MINIO_BUCKET")
     minio_use_ssl: bool = Field(default=False, alias="MINIO_USE_SSL")
+    storage_backend: Literal["minio", "local"] = Field(
+        default="minio", alias="STORAGE_BACKEND",
+        description="Object storage backend ('local' writes to STORAGE_LOCAL_PATH)"
+    )
+    storage_local_path: str = Field(
+        default="/tmp/kronos-storage", alias="STORAGE_LOCAL_PATH"
+    )
+    storage_io_workers: int = Field(
+        default=8, alias="STORAGE_IO_WORKERS",
+        description="Threads used for blocking storage SDK calls"
+    )
 
     # ─────────────────────────────────────────────────────────────
     # Brevo (Email)
     # ─────────────────────────────────────────────────────────────
     brevo_api_key: str = Field(default="", alias="BREVO_API_KEY")
+    brevo_api_url: str = Field(
+        default="https://api.brevo.com/v3", alias="BREVO_API_URL",
+        description="Brevo API base URL (point at a stand-in for load tests)"
+    )
     brevo_sender_email: str = Field(
         default="noreply@kronos.local", alias="BREVO_SENDER_EMAIL"
     )
     brevo_sender_name: str = Field(default="KRONOS HR", alias="BREVO_SENDER_NAME")
+    email_transport: Literal["brevo", "smtp", "file"] = Field(
+        default="brevo", alias="EMAIL_TRANSPORT",
+        description="Email delivery transport ('smtp'/'file' are local sinks)"
+    )
+    email_smtp_host: str = Field(default="localhost", alias="EMAIL_SMTP_HOST")
+    email_smtp_port: int = Field(default=1025, alias="EMAIL_SMTP_PORT")
+    email_file_sink_path: str = Field(
+        default="/tmp/kronos-mail", alias="EMAIL_FILE_SINK_PATH"
+    )
+    email_batch_size: int = Field(
+        default=100, alias="EMAIL_BATCH_SIZE",
+        description="Max recipients per provider request (Brevo messageVersions)"
+    )
+    email_rate_limit: float = Field(
+        default=10.0, alias="EMAIL_RATE_LIMIT",
+        description="Max provider requests per second (0 = unlimited)"
+    )
+    email_max_connections: int = Field(
+        default=10, alias="EMAIL_MAX_CONNECTIONS",
+        description="Pooled HTTP connections to the email provider"
+    )
+    email_retry_max_attempts: int = Field(
+        default=5, alias="EMAIL_RETRY_MAX_ATTEMPTS",
+        description="Failed attempts before an email is dead-lettered"
+    )
+    email_retry_base_delay: float = Field(
+        default=60.0, alias="EMAIL_RETRY_BASE_DELAY",
+        description="Backoff after the first failure, in seconds (doubles per attempt)"
+    )
+    email_retry_max_delay: float = Field(
+        default=3600.0, alias="EMAIL_RETRY_MAX_DELAY"
+    )
+    email_retry_batch_size: int = Field(
+        default=100, alias="EMAIL_RETRY_BATCH_SIZE",
+        description="Due retries claimed per batch"
+    )
+    email_retry_lease_seconds: int = Field(
+        default=300, alias="EMAIL_RETRY_LEASE_SECONDS",
+        description="How long a claimed retry is hidden from other schedulers while it is sent"
+    )
+
+    # ─────────────────────────────────────────────────────────────
+    # Audit Trail
+    # ─────────────────────────────────────────────────────────────
+    audit_trail_checkpoint_interval: int = Field(
+        default=20, alias="AUDIT_TRAIL_CHECKPOINT_INTERVAL",
+        description="Full snapshot every N versions; versions in between store JSON patches"
+    )
+
+    # ─────────────────────────────────────────────────────────────
+    # Background Jobs (per-user fan-out)
+    # ─────────────────────────────────────────────────────────────
+    batch_job_chunk_size: int = Field(
+        default=50, alias="BATCH_JOB_CHUNK_SIZE",
+        description="Users per chunk task in per-user batch jobs"
+    )
+    batch_job_checkpoint_ttl: int = Field(
+        default=172800, alias="BATCH_JOB_CHECKPOINT_TTL",
+        description="Seconds completed-chunk checkpoints are kept for resuming a run"
+    )
 
     # ─────────────────────────────────────────────────────────────
     # Service URLs (for inter-service communication)
@@ -161,6 +266,70 @@ class Settings(BaseSettings):
         default=20, alias="SERVICE_POOL_KEEPALIVE",
         description="Maximum number of keep-alive connections"
     )
+    service_cache_enabled: bool = Field(
+        default=True, alias="SERVICE_CACHE_ENABLED",
+        description="Cache GET responses of client methods that opt in"
+    )
+    service_cache_max_entries: int = Field(
+        default=2048, alias="SERVICE_CACHE_MAX_ENTRIES",
+        description="Maximum number of cached responses per process (LRU)"
+    )
+    service_single_flight_enabled: bool = Field(
+        default=True, alias="SERVICE_SINGLE_FLIGHT_ENABLED",
+        description="Share one request among identical concurrent GETs"
+    )
+    service_hedging_enabled: bool = Field(
+        default=True, alias="SERVICE_HEDGING_ENABLED",
+        description="Duplicate slow GETs to services whose policy allows hedging"
+    )
+    service_breaker_threshold: int = Field(
+        default=5, alias="SERVICE_BREAKER_THRESHOLD",
+        description="Consecutive failures that open a service's circuit breaker"
+    )
+    service_breaker_reset_seconds: float = Field(
+        default=30.0, alias="SERVICE_BREAKER_RESET_SECONDS",
+        description="Seconds an open circuit fails fast before a probe request"
+    )
+    service_batch_window_ms: float = Field(
+        default=0.0, alias="SERVICE_BATCH_WINDOW_MS",
+        description="Collect GETs to a service issued within this window into one batch request (0: only inside batch_calls())"
+    )
+    service_batch_max_size: int = Field(
+        default=50, alias="SERVICE_BATCH_MAX_SIZE",
+        description="Maximum operations per internal batch request"
+    )
+    service_http2_enabled: bool = Field(
+        default=False, alias="SERVICE_HTTP2_ENABLED",
+        description="Use HTTP/2 between services (needs the http2 extra and an HTTP/2 server)"
+    )
+
+    # ─────────────────────────────────────────────────────────────
+    # Observability
+    # ─────────────────────────────────────────────────────────────
+    server_timing_enabled: bool = Field(
+        default=True, alias="SERVER_TIMING_ENABLED",
+        description="Add Server-Timing headers (db, service calls, cache) to responses"
+    )
+    request_log_enabled: bool = Field(
+        default=True, alias="REQUEST_LOG_ENABLED",
+        description="Log one structured line with the timings of every request"
+    )
+    profiling_enabled: bool = Field(
+        default=False, alias="PROFILING_ENABLED",
+        description="Let admins profile a request by sending the X-Profile header"
+    )
+    profiling_interval_ms: float = Field(
+        default=1.0, alias="PROFILING_INTERVAL_MS",
+        description="Stack sampling interval of the request profiler"
+    )
+    metrics_enabled: bool = Field(
+        default=True, alias="METRICS_ENABLED",
+        description="Record Prometheus metrics (served on /metrics)"
+    )
+    celery_metrics_port: int = Field(
+        default=9808, alias="CELERY_METRICS_PORT",
+        description="Port of the Celery worker's Prometheus endpoint (0 disables it)"
+    )
 
     @computed_field
     @property
@@ -1,8 +1,19 @@
-"""KRONOS Backend - Database Configuration."""
+"""KRONOS Backend - Database Configuration.
+
+The service schema is selected once per connection: ``search_path`` is
+sent as a startup parameter (asyncpg ``server_settings``), so sessions
+start without a ``SET`` round-trip. Code that changes the search path
+must use ``SET LOCAL``, or the change stays on the pooled connection.
+"""
+from collections import Counter
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from contextvars import ContextVar
+from typing import AsyncGenerator, Optional
+from uuid import uuid4
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -18,14 +29,61 @@ class Base(DeclarativeBase):
     pass
 
 
+def _statement_name() -> str:
+    # PgBouncer may hand a transaction a server connection that already has
+    # a statement under a per-connection counter name
+    return f"__asyncpg_{uuid4()}__"
+
+
+def _connect_args() -> dict:
+    """asyncpg connection settings."""
+    connect_args = {
+        "server_settings": {
+            "search_path": f"{settings.database_schema}, public",
+            "application_name": settings.service_name,
+        },
+    }
+    if settings.database_pgbouncer:
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=_statement_name,
+        )
+    else:
+        # asyncpg's own cache (plain execute/fetch) and the dialect's cache of prepared statements
+        connect_args.update(
+            statement_cache_size=settings.database_statement_cache_size,
+            prepared_statement_cache_size=settings.database_statement_cache_size,
+        )
+    return connect_args
+
+
+# Pool events since start, over every engine of the process (see pool_stats)
+_pool_events: Counter = Counter()
+
+
+def _count_pool_event(name: str):
+    def listener(*args) -> None:
+        _pool_events[name] += 1
+    return listener
+
+
+def _create_engine() -> AsyncEngine:
+    new_engine = create_async_engine(
+        settings.database_url,
+        echo=settings.debug,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_pre_ping=True,
+        connect_args=_connect_args(),
+    )
+    for name in ("connect", "checkout", "invalidate", "close"):
+        event.listen(new_engine.sync_engine.pool, name, _count_pool_event(name))
+    return new_engine
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_size=settings.database_pool_size,
-    max_overflow=settings.database_max_overflow,
-    pool_pre_ping=True,
-)
+engine = _create_engine()
 
 # Create session factory
 async_session_factory = async_sessionmaker(
@@ -37,19 +95,40 @@ async_session_factory = async_sessionmaker(
 )
 
 
+def rebind_engine() -> AsyncEngine:
+    """Replace the engine with a fresh one and point the session factory at it.
+
+    asyncpg connections belong to the event loop that opened them. Celery
+    worker processes call this once at startup (after the fork) so their
+    pool is created for the worker's own long-lived loop.
+    """
+    global engine
+    # Connections inherited from the parent process stay with the parent
+    engine.sync_engine.dispose(close=False)
+    engine = _create_engine()
+    async_session_factory.configure(bind=engine)
+    return engine
+
+
+# Session shared by the sub-requests of an internal batch (see src.core.batch)
+_shared_session: ContextVar[Optional[AsyncSession]] = ContextVar("shared_session", default=None)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting database session.
     
-    Sets the search_path to the service's schema.
+    Sessions use the service's schema (see the module docstring). Inside ``shared_session()``
+    the block's session is yielded instead, and left open for the next user.
     
     Yields:
         AsyncSession: Database session with correct schema.
     """
+    shared = _shared_session.get()
+    if shared is not None:
+        yield shared
+        return
+    
     async with async_session_factory() as session:
-        # Set schema for this session
-        await session.execute(
-            text(f"SET search_path TO {settings.database_schema}, public")
-        )
         try:
             yield session
             await session.commit()
@@ -70,9 +149,6 @@ async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
         AsyncSession: Database session with correct schema.
     """
     async with async_session_factory() as session:
-        await session.execute(
-            text(f"SET search_path TO {settings.database_schema}, public")
-        )
         try:
             yield session
             await session.commit()
@@ -83,25 +159,58 @@ async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def shared_session() -> AsyncGenerator[AsyncSession, None]:
+    """Serve every ``get_db()`` dependency resolved inside the block from one session.
+    
+    Yields:
+        AsyncSession: The shared session, committed when the block exits.
+    """
+    async with get_db_context() as session:
+        token = _shared_session.set(session)
+        try:
+            yield session
+        finally:
+            _shared_session.reset(token)
+
+
 async def init_db() -> None:
     """Initialize database connection and create tables.
     
     Called on application startup to verify connection and create tables.
     """
     async with engine.begin() as conn:
-        # Verify connection
-        await conn.execute(text("SELECT 1"))
-        
-        # Set schema for table creation
-        await conn.execute(text(f"SET search_path TO {settings.database_schema}, public"))
-        
-        
-        # Log schema
+        # Verify connection and the schema set at connect time
         result = await conn.execute(text("SHOW search_path"))
         search_path = result.scalar()
         print(f"Database connected. Schema: {settings.database_schema}, search_path: {search_path}")
 
 
+def pool_stats() -> dict[str, int]:
+    """Connection pool state and event counts of this process.
+    
+    ``size``/``checked_in``/``checked_out``/``overflow`` describe the current
+    pool; ``connects``, ``checkouts``, ``invalidations`` and ``closes`` count
+    pool events since start. Connects growing with checkouts means the pool
+    is too small (overflow connections are opened and closed per request).
+    """
+    pool = engine.pool
+    stats = {
+        "connects": _pool_events["connect"],
+        "checkouts": _pool_events["checkout"],
+        "invalidations": _pool_events["invalidate"],
+        "closes": _pool_events["close"],
+    }
+    if hasattr(pool, "checkedout"):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(0, pool.overflow()),
+        )
+    return stats
+
+
 async def close_db() -> None:
     """Close database connection.
     
@@ -0,0 +1,114 @@
+"""
+KRONOS Backend - ETag / Conditional GET Middleware.
+
+Adds a weak ``ETag`` (hash of the body) to successful JSON GET responses
+and answers ``If-None-Match`` with a bodiless ``304 Not Modified`` when it
+matches. Service clients cache these responses and revalidate them with
+the stored ETag (see ``src.shared.clients.response_cache``), so an
+unchanged resource is not sent or parsed again.
+
+Pure ASGI: responses are buffered only for matching GET requests, and only
+up to ``max_body_size``; larger ones are streamed through unchanged.
+"""
+import hashlib
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def make_etag(body: bytes) -> str:
+    return 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+class ETagMiddleware:
+    """Conditional GET support for JSON endpoints.
+
+    Args:
+        app: ASGI application.
+        paths: Path prefixes to handle (all paths if omitted).
+        max_body_size: Responses larger than this are passed through.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Optional[Iterable[str]] = None,
+        max_body_size: int = 1024 * 1024,
+    ) -> None:
+        self.app = app
+        self.paths = tuple(paths) if paths else None
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or (self.paths and not scope["path"].startswith(self.paths))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start: Optional[Message] = None
+        chunks: list[bytes] = []
+        size = 0
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, size, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] != 200
+                    or "etag" in headers
+                    or not headers.get("content-type", "").startswith("application/json")
+                    or "no-store" in headers.get("cache-control", "")
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if size > self.max_body_size:
+                passthrough = True
+                await send(start)
+                await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": message.get("more_body", False)})
+                return
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            etag = make_etag(body)
+            headers = MutableHeaders(raw=start["headers"])
+            headers["etag"] = etag
+            if etag_matches(if_none_match, etag):
+                del headers["content-length"]
+                await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,185 @@
+"""
+KRONOS Backend - Prometheus Metrics.
+
+Metrics shared by all services and the Celery worker:
+
+- ``kronos_http_request_duration_seconds``: request latency by route
+  (recorded by ``RequestContextMiddleware``)
+- ``kronos_db_pool_connections``: database pool usage of ``database.engine``
+- ``kronos_db_pool_events_total``: pool connects, checkouts, invalidations
+  and closes (see ``database.pool_stats``)
+- ``kronos_redis_cache_requests_total``: Redis cache hits/misses by key prefix
+- ``kronos_service_client_*``: ``BaseClient`` latencies, errors, client
+  events and circuit breaker state by target service
+- ``kronos_sse_connections``: open notification streams
+- ``kronos_celery_*``: task durations and broker queue depths
+
+Every service mounts ``router`` for ``GET /metrics``; the Celery worker
+serves the same format on ``CELERY_METRICS_PORT`` (see ``src.worker``).
+With several processes per service (gunicorn, Celery prefork) set
+``PROMETHEUS_MULTIPROC_DIR`` so the metrics of all of them are aggregated.
+"""
+import os
+from typing import Iterable, Optional
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+from prometheus_client.registry import Collector
+
+from src.core.config import settings
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Metrics
+# ═══════════════════════════════════════════════════════════════════════════
+
+HTTP_REQUEST_DURATION = Histogram(
+    "kronos_http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+)
+
+REDIS_CACHE_REQUESTS = Counter(
+    "kronos_redis_cache_requests_total",
+    "Redis cache lookups",
+    ["prefix", "result"],
+)
+
+SERVICE_CLIENT_DURATION = Histogram(
+    "kronos_service_client_duration_seconds",
+    "Latency of requests to other services",
+    ["target"],
+)
+
+SERVICE_CLIENT_ERRORS = Counter(
+    "kronos_service_client_errors_total",
+    "Failed requests to other services",
+    ["target", "kind"],
+)
+
+SSE_CONNECTIONS = Gauge(
+    "kronos_sse_connections",
+    "Open notification streams",
+    multiprocess_mode="livesum",
+)
+
+CELERY_TASK_DURATION = Histogram(
+    "kronos_celery_task_duration_seconds",
+    "Celery task run time",
+    ["task", "state"],
+    buckets=(0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600),
+)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    if settings.metrics_enabled:
+        HTTP_REQUEST_DURATION.labels(method, route, str(status)).observe(seconds)
+
+
+def observe_cache_lookup(key: str, hit: bool) -> None:
+    if settings.metrics_enabled:
+        REDIS_CACHE_REQUESTS.labels(key.split(":", 1)[0], "hit" if hit else "miss").inc()
+
+
+def observe_service_call(target: str, seconds: float, error: Optional[str] = None) -> None:
+    if not settings.metrics_enabled:
+        return
+    SERVICE_CLIENT_DURATION.labels(target).observe(seconds)
+    if error is not None:
+        SERVICE_CLIENT_ERRORS.labels(target, error).inc()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Collectors (read live state at scrape time)
+# ═══════════════════════════════════════════════════════════════════════════
+
+class DatabasePoolCollector(Collector):
+    """Connection pool of the current ``database.engine``."""
+
+    def collect(self) -> Iterable:
+        from src.core.database import pool_stats
+
+        stats = pool_stats()
+        family = GaugeMetricFamily(
+            "kronos_db_pool_connections", "Database pool connections", labels=["state"]
+        )
+        for state in ("size", "checked_out", "checked_in", "overflow"):
+            if state in stats:
+                family.add_metric([state], stats[state])
+        yield family
+
+        events = CounterMetricFamily(
+            "kronos_db_pool_events", "Database pool events", labels=["event"]
+        )
+        for name in ("connects", "checkouts", "invalidations", "closes"):
+            events.add_metric([name], stats[name])
+        yield events
+
+
+class ServiceClientCollector(Collector):
+    """``BaseClient`` event counters and circuit breaker state."""
+
+    def collect(self) -> Iterable:
+        from src.shared.clients.metrics import client_stats
+        from src.shared.clients.resilience import OPEN, health_snapshot
+
+        events = CounterMetricFamily(
+            "kronos_service_client_events", "Service client events", labels=["target", "event"]
+        )
+        for target, counts in client_stats().items():
+            for event, count in counts.items():
+                events.add_metric([target, event], count)
+        yield events
+
+        circuit = GaugeMetricFamily(
+            "kronos_service_circuit_open", "Whether the circuit to a service is open", labels=["target"]
+        )
+        for target, health in health_snapshot().items():
+            circuit.add_metric([target], 1 if health["breaker"] == OPEN else 0)
+        yield circuit
+
+
+_live_collectors: list[Collector] = []
+_exposed_registry: Optional[CollectorRegistry] = None
+
+
+def register_live_collector(collector: Collector) -> None:
+    """Add a collector of live state (register before serving metrics)."""
+    _live_collectors.append(collector)
+    REGISTRY.register(collector)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to expose: aggregated over processes when PROMETHEUS_MULTIPROC_DIR is set."""
+    global _exposed_registry
+    if _exposed_registry is None:
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            _exposed_registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(_exposed_registry)
+            for collector in _live_collectors:
+                _exposed_registry.register(collector)
+        else:
+            _exposed_registry = REGISTRY
+    return _exposed_registry
+
+
+register_live_collector(DatabasePoolCollector())
+register_live_collector(ServiceClientCollector())
+
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    return Response(content=generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
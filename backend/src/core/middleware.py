@@ -1,24 +1,124 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+"""
+KRONOS Backend - Request Context Middleware.
+
+Pure ASGI middleware run on every HTTP request. It:
+
+- sets the request context (method, URL, client IP, user agent) used by
+  the audit client;
+- collects the request's timings (see ``src.core.timing``) and returns them
+  in a ``Server-Timing`` header, then logs one structured line per request
+  and records its latency by route (see ``src.core.metrics``);
+- with ``PROFILING_ENABLED``, profiles a single request for an admin who
+  sends ``X-Profile: 1``. The response body is then replaced by the
+  collapsed-stacks profile (see ``src.core.profiling``), with the original
+  status in ``X-Profile-Status``.
+"""
+import asyncio
+import logging
+import threading
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
 from src.core.context import set_request_context
+from src.core.metrics import observe_request
+from src.core.profiling import SamplingProfiler
+from src.core.timing import install_db_timing, start_request_timing
+
+logger = logging.getLogger(__name__)
+
+
+class RequestContextMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        install_db_timing()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        client = scope.get("client")
+        query = scope.get("query_string", b"").decode("latin-1")
+        path = scope["path"]
+        set_request_context({
+            "method": scope["method"],
+            "url": f"{scope.get('scheme', 'http')}://{headers.get('host', '')}{path}" + (f"?{query}" if query else ""),
+            "client_ip": client[0] if client else None,
+            "user_agent": headers.get("user-agent"),
+            "path": path,
+        })
+
+        timings = start_request_timing()
+        status = 500
+
+        if "x-profile" in headers and settings.profiling_enabled and await self._is_admin(headers):
+            await self._profile(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.server_timing_enabled:
+                    MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            observe_request(scope["method"], getattr(route, "path", "unmatched"), status, timings.elapsed())
+            if settings.request_log_enabled:
+                fields = {"method": scope["method"], "path": path, "status": status, **timings.log_fields()}
+                logger.info(
+                    " ".join(f"{key}={value}" for key, value in fields.items()),
+                    extra={"request_timing": fields},
+                )
+
+    @staticmethod
+    async def _is_admin(headers: Headers) -> bool:
+        from src.core.security import resolve_user
+
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            return (await resolve_user(token)).is_admin
+        except Exception:
+            return False
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve the request under the sampling profiler and answer with the profile."""
+        status = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profiler = SamplingProfiler(
+            interval=settings.profiling_interval_ms / 1000,
+            thread_id=threading.get_ident(),
+        )
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        except Exception:
+            logger.exception(f"Profiled request {scope['method']} {scope['path']} failed")
+        finally:
+            await asyncio.to_thread(profiler.stop)
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Extract relevant info
-        context = {
-            "method": request.method,
-            "url": str(request.url),
-            "client_ip": request.client.host if request.client else None,
-            "user_agent": request.headers.get("user-agent"),
-            "path": request.url.path
-        }
-        
-        # Set context
-        set_request_context(context)
-        
-        # Process request
-        print(f"DEBUG_MIDDLEWARE: Incoming request: {request.method} {request.url}", flush=True)
-        response = await call_next(request)
-        print(f"DEBUG_MIDDLEWARE: Response status: {response.status_code} for {request.url}", flush=True)
-        
-        return response
+        body = profiler.collapsed().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profile-status", str(status).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,26 @@
+"""KRONOS Backend - Client-side rate limiting for outgoing API calls."""
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Spaces out calls so that at most ``rate`` start per second.
+
+    A rate of 0 or less disables the limit. Slots are reserved without
+    awaiting between reading and updating them, so no lock is needed and
+    one limiter can be shared across event loops (e.g. Celery tasks).
+    """
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        """Wait for the next free slot."""
+        if not self._interval:
+            return
+        now = time.monotonic()
+        wait = self._next_slot - now
+        self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,72 @@
+"""
+KRONOS Backend - JSON Serialization.
+
+One orjson-based encoder for API responses, the Redis cache and calls
+between services. ``dumps`` encodes natively what the services return -
+dicts, lists, UUIDs, dates/datetimes, enums, dataclasses - and falls back
+to ``_default`` for Decimals (as numbers, like ``jsonable_encoder``),
+pydantic models and sets.
+
+Every app uses ``DEFAULT_RESPONSE_CLASS``:
+
+- routes with a ``response_model`` (or return annotation) keep FastAPI's
+  direct path, where pydantic validates and dumps the result to JSON bytes
+  in one pass. ``Default(...)`` is what keeps it: an explicit default
+  response class would turn it off.
+- other routes go through ``jsonable_encoder`` and are rendered by
+  ``FastJSONResponse``.
+
+Large untyped results can skip ``jsonable_encoder`` altogether by
+returning ``json_response(content)``; for large typed results prefer
+declaring the ``response_model``.
+"""
+from decimal import Decimal
+from typing import Any, Mapping, Optional
+
+import orjson
+from fastapi.datastructures import Default
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode to UTF-8 JSON bytes (``indent`` for two-space indented output)."""
+    return orjson.dumps(obj, default=_default, option=(_OPTIONS | orjson.OPT_INDENT_2) if indent else _OPTIONS)
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Decode JSON (raises ``json.JSONDecodeError`` on invalid input)."""
+    return orjson.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+DEFAULT_RESPONSE_CLASS = Default(FastJSONResponse)
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> FastJSONResponse:
+    """Response for a large untyped result, without the ``jsonable_encoder`` pass."""
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
@@ -0,0 +1,133 @@
+"""
+KRONOS Backend - Per-Request Timing.
+
+Collects where the current request spends its time - database queries
+(SQLAlchemy cursor events) and calls to other services (``BaseClient``) -
+plus client cache events. ``RequestContextMiddleware`` starts a collector
+per request and reports it as a ``Server-Timing`` header and a log line:
+
+    Server-Timing: app;dur=48.2, db;dur=12.9;desc="7 queries", svc-auth;dur=20.4;desc="1 calls", cache;desc="hits=2 misses=1"
+
+Outside a request (Celery tasks, scripts) nothing is collected.
+"""
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Cache events reported in the ``cache`` Server-Timing entry, by short name
+_CACHE_EVENTS = {
+    "cache_hits": "hits",
+    "cache_stale_hits": "stale",
+    "cache_misses": "misses",
+    "cache_not_modified": "revalidated",
+}
+
+
+@dataclass
+class RequestTimings:
+    """Timings of one request."""
+    started: float = field(default_factory=time.perf_counter)
+    db_time: float = 0.0
+    db_queries: int = 0
+    service_time: dict[str, float] = field(default_factory=dict)
+    service_calls: Counter = field(default_factory=Counter)
+    events: Counter = field(default_factory=Counter)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Value of the Server-Timing header (durations in ms)."""
+        entries = [f"app;dur={self.elapsed() * 1000:.1f}"]
+        if self.db_queries:
+            entries.append(f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries"')
+        for service, seconds in self.service_time.items():
+            entries.append(
+                f'svc-{service};dur={seconds * 1000:.1f};desc="{self.service_calls[service]} calls"'
+            )
+        cache = " ".join(
+            f"{name}={self.events[event_name]}"
+            for event_name, name in _CACHE_EVENTS.items()
+            if self.events[event_name]
+        )
+        if cache:
+            entries.append(f'cache;desc="{cache}"')
+        return ", ".join(entries)
+
+    def log_fields(self) -> dict:
+        """Flat fields for the structured request log."""
+        fields = {
+            "duration_ms": round(self.elapsed() * 1000, 1),
+            "db_ms": round(self.db_time * 1000, 1),
+            "db_queries": self.db_queries,
+        }
+        for service, seconds in self.service_time.items():
+            fields[f"svc_{service}_ms"] = round(seconds * 1000, 1)
+            fields[f"svc_{service}_calls"] = self.service_calls[service]
+        fields.update(self.events)
+        return fields
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timing() -> RequestTimings:
+    """Start collecting timings for the current request."""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def add_service_time(service: str, seconds: float) -> None:
+    """Account a call to another service to the current request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.service_time[service] = timings.service_time.get(service, 0.0) + seconds
+        timings.service_calls[service] += 1
+
+
+def count_event(name: str, count: int = 1) -> None:
+    """Count an event (e.g. a cache hit) for the current request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.events[name] += count
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Database Time (SQLAlchemy cursor events, for every engine)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    timings = _current.get()
+    if timings is not None:
+        timings.db_time += time.perf_counter() - started
+        timings.db_queries += 1
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def install_db_timing() -> None:
+    """Time database queries of all engines (idempotent)."""
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
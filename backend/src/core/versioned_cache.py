@@ -0,0 +1,89 @@
+"""
+KRONOS Backend - Per-process caches versioned through Redis.
+
+For small, rarely changed tables (workflow configs, provider settings)
+that every process keeps in memory. A Redis counter holds the shared
+version: a change bumps it, and each process drops its local entries the
+next time it polls the counter and sees a different value.
+
+Invalidation is commit-aware: ``invalidate`` bumps the version at once
+and again after the session commits, so a process that reloaded the old
+rows between the change and its commit does not keep them.
+"""
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# How often the shared Redis version is polled
+VERSION_CHECK_INTERVAL = 5.0
+
+
+class VersionedLocalCache(ABC):
+    """Base for process-wide caches invalidated through a Redis version counter.
+
+    Subclasses hold the cached entries and implement ``clear_local``.
+    Loaders read ``version`` before a load and only store the result if it
+    is unchanged afterwards.
+    """
+
+    def __init__(self, version_key: str, name: str) -> None:
+        self.version_key = version_key
+        self.name = name
+        self.version: Optional[str] = None
+        self._version_checked_at = 0.0
+        self._pending_key = f"{version_key}:pending"
+        self._background: set = set()
+
+    @abstractmethod
+    def clear_local(self) -> None:
+        """Drop the entries cached by this process."""
+
+    async def sync_version(self) -> None:
+        """Drop local entries if another process bumped the version."""
+        now = time.monotonic()
+        if now - self._version_checked_at < VERSION_CHECK_INTERVAL:
+            return
+        self._version_checked_at = now
+        try:
+            version = await get_redis_client().get(self.version_key)
+        except Exception as e:
+            logger.warning(f"{self.name} version check failed: {e}")
+            return
+        if version != self.version:
+            self.clear_local()
+            self.version = version
+
+    async def bump_version(self) -> None:
+        """Invalidate the cached entries of every process."""
+        self.clear_local()
+        try:
+            self.version = str(await get_redis_client().incr(self.version_key))
+        except Exception as e:
+            logger.warning(f"{self.name} invalidation could not reach Redis: {e}")
+            self.version = None
+        self._version_checked_at = time.monotonic()
+
+    async def invalidate(self, session: AsyncSession) -> None:
+        """Invalidate now and again once the session commits."""
+        await self.bump_version()
+        sync_session = session.sync_session
+        if sync_session.info.get(self._pending_key):
+            return
+        sync_session.info[self._pending_key] = True
+
+        def _after_commit(_session) -> None:
+            _session.info.pop(self._pending_key, None)
+            task = asyncio.get_running_loop().create_task(self.bump_version())
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+        event.listen(sync_session, "after_commit", _after_commit, once=True)
@@ -0,0 +1,91 @@
+"""KRONOS Backend - Async Runtime for Celery Workers.
+
+Celery tasks are synchronous, while services are async. Creating a new event
+loop per task (``asyncio.run``) strands the pooled asyncpg connections, the
+Redis client and HTTP clients on a dead loop, so every task reconnects and
+occasionally fails with "attached to a different loop".
+
+Instead each worker process keeps one long-lived event loop. The database
+engine is recreated for that loop when the process starts, so its pool is
+reused by every task the process runs.
+
+Usage::
+
+    @async_task(name="notifications.process_queue")
+    async def process_queue():
+        async with get_db_context() as session:
+            ...
+"""
+import asyncio
+import functools
+import logging
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from celery import shared_task
+
+from src.core import database
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """The event loop of this worker process (created on first use)."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """Run a coroutine to completion on the worker loop."""
+    return get_worker_loop().run_until_complete(coro)
+
+
+def async_task(*task_args: Any, **task_options: Any) -> Callable:
+    """Register an async function as a Celery task run on the worker loop.
+
+    Accepts the same arguments as ``shared_task``. With ``bind=True`` the
+    task instance is passed as the first argument, as usual.
+    """
+    def decorator(fn: Callable[..., Awaitable[T]]):
+        @functools.wraps(fn)
+        def run(*args: Any, **kwargs: Any) -> T:
+            return run_async(fn(*args, **kwargs))
+
+        return shared_task(*task_args, **task_options)(run)
+
+    return decorator
+
+
+def init_worker_process() -> None:
+    """Create the worker loop and a database engine bound to it.
+
+    Connected to ``worker_process_init``, i.e. runs in each forked child.
+    """
+    get_worker_loop()
+    database.rebind_engine()
+    logger.info("Worker async runtime initialized")
+
+
+def shutdown_worker_process() -> None:
+    """Close pooled connections and the worker loop."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        return
+
+    from src.services.notifications.email_delivery import close_transport
+
+    try:
+        _loop.run_until_complete(close_transport())
+        _loop.run_until_complete(database.engine.dispose())
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+    except Exception as e:
+        logger.warning(f"Error shutting down worker async runtime: {e}")
+    finally:
+        _loop.close()
+        _loop = None
@@ -13,6 +13,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import settings
+from src.core.serialization import DEFAULT_RESPONSE_CLASS
 from src.core.database import init_db, close_db
 
 
@@ -30,6 +31,7 @@ app = FastAPI(
     title="KRONOS Backend - Development Gateway",
     description="Unified backend for local development",
     version="1.0.0",
+    default_response_class=DEFAULT_RESPONSE_CLASS,
     lifespan=lifespan,
     docs_url="/docs",
     redoc_url="/redoc",
@@ -121,6 +123,21 @@ except ImportError as e:
 from src.core.middleware import RequestContextMiddleware
 app.add_middleware(RequestContextMiddleware)
 
+# Conditional GET (ETag / 304) for reference data read by other services
+from src.core.etag import ETagMiddleware
+app.add_middleware(
+    ETagMiddleware,
+    paths=["/api/v1/config", "/api/v1/leave-types", "/api/v1/expense-types", "/api/v1/calendar", "/api/v1/users"],
+)
+
+# Internal batch endpoint (several GETs in one request, see src.core.batch)
+from src.core.batch import router as batch_router
+app.include_router(batch_router)
+
+# Prometheus scrape endpoint
+from src.core.metrics import router as metrics_router
+app.include_router(metrics_router)
+
 # Register Error Handlers
 from src.core.error_handlers import register_error_handlers
 register_error_handlers(app)
@@ -19,6 +19,7 @@ from .models import (
     ApprovalHistory,
     ApprovalReminder,
 )
+from .workflow_cache import workflow_cache
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,7 @@ class WorkflowConfigRepository:
         """Create a new workflow config."""
         self._session.add(config)
         await self._session.flush()
+        await workflow_cache.invalidate(self._session)
         return config
     
     async def get_by_id(self, config_id: UUID) -> Optional[WorkflowConfig]:
@@ -98,6 +100,7 @@ class WorkflowConfigRepository:
     async def update(self, config: WorkflowConfig) -> WorkflowConfig:
         """Update workflow config."""
         await self._session.flush()
+        await workflow_cache.invalidate(self._session)
         return config
     
     async def soft_delete(self, config_id: UUID) -> bool:
@@ -107,6 +110,7 @@ class WorkflowConfigRepository:
             .where(WorkflowConfig.id == config_id)
             .values(is_active=False, updated_at=datetime.utcnow())
         )
+        await workflow_cache.invalidate(self._session)
         return result.rowcount > 0
 
 
@@ -139,6 +143,15 @@ class ApprovalRequestRepository:
         result = await self._session.execute(query)
         return result.scalar_one_or_none()
     
+    async def get_by_ids(self, request_ids: List[UUID]) -> List[ApprovalRequest]:
+        """Get approval requests by ID in one query (without relationships)."""
+        if not request_ids:
+            return []
+        result = await self._session.execute(
+            select(ApprovalRequest).where(ApprovalRequest.id.in_(request_ids))
+        )
+        return list(result.scalars().all())
+    
     async def get_by_entity(
         self,
         entity_type: str,
@@ -479,6 +492,17 @@ class ApprovalReminderRepository:
         )
         return result.rowcount > 0
     
+    async def mark_sent_bulk(self, reminder_ids: List[UUID]) -> int:
+        """Mark reminders as sent in one statement."""
+        if not reminder_ids:
+            return 0
+        result = await self._session.execute(
+            update(ApprovalReminder)
+            .where(ApprovalReminder.id.in_(reminder_ids))
+            .values(is_sent=True, sent_at=datetime.utcnow())
+        )
+        return result.rowcount
+    
     async def delete_for_request(self, request_id: UUID) -> int:
         """Delete all reminders for a request."""
         result = await self._session.execute(
@@ -4,25 +4,25 @@ KRONOS Approval Service - Celery Tasks.
 Background tasks for expiration handling and reminders.
 """
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
-
-from celery import shared_task
+from uuid import UUID
 
 from src.core.database import async_session_factory
+from src.core.worker_runtime import async_task
 from src.shared.clients import NotificationClient
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(name="approvals.check_expirations")
-def check_expirations():
+@async_task(name="approvals.check_expirations")
+async def check_expirations():
     """
     Check for expired approval requests and apply expiration actions.
     
     Runs every 15 minutes.
     """
-    import asyncio
-    asyncio.run(_check_expirations_async())
+    await _check_expirations_async()
 
 
 async def _check_expirations_async():
@@ -74,27 +74,30 @@ async def _check_expirations_async():
             await session.rollback()
 
 
-@shared_task(name="approvals.send_reminders")
-def send_reminders():
+@async_task(name="approvals.send_reminders")
+async def send_reminders():
     """
     Send reminder notifications for pending approvals.
     
     Runs every 30 minutes.
     """
-    import asyncio
-    asyncio.run(_send_reminders_async())
+    await _send_reminders_async()
 
 
 async def _send_reminders_async():
-    """Async implementation of reminder sending."""
-    from .models import ApprovalReminder, ApprovalRequest
+    """
+    Async implementation of reminder sending.
+    
+    Due reminders are grouped by approver: each approver gets one digest of
+    their pending requests, all digests go out in one batch call and the
+    reminders are marked sent with one UPDATE.
+    """
     from .repository import ApprovalReminderRepository, ApprovalRequestRepository
     
     async with async_session_factory() as session:
         try:
             reminder_repo = ApprovalReminderRepository(session)
             request_repo = ApprovalRequestRepository(session)
-            notification_client = NotificationClient()
             
             # Get due reminders
             now = datetime.utcnow()
@@ -104,45 +107,45 @@ async def _send_reminders_async():
                 logger.debug("No reminders due")
                 return
             
-            logger.info(f"Sending {len(reminders)} approval reminders")
+            requests = {
+                r.id: r for r in await request_repo.get_by_ids(
+                    list({reminder.approval_request_id for reminder in reminders})
+                )
+            }
             
+            # Reminders of resolved requests are just closed
+            resolved_ids = []
+            by_approver = defaultdict(list)
             for reminder in reminders:
-                try:
-                    # Get request details
-                    request = await request_repo.get_by_id(reminder.approval_request_id)
-                    if not request or request.status != "PENDING":
-                        # Request was resolved, skip
-                        await reminder_repo.mark_sent(reminder.id)
-                        continue
-                    
-                    # Determine message based on reminder type
-                    if reminder.reminder_type == "FINAL":
-                        title = "⚠️ Approvazione in Scadenza!"
-                        message = f"La richiesta '{request.title}' scade tra poco. Agisci subito."
-                    else:
-                        title = "Promemoria Approvazione"
-                        message = f"Hai una richiesta in attesa: {request.title}"
-                    
-                    # Send notification
-                    await notification_client.send_notification(
-                        user_id=reminder.approver_id,
-                        title=title,
-                        message=message,
-                        notification_type="APPROVAL_REMINDER",
-                        data={
-                            "approval_request_id": str(request.id),
-                            "entity_type": request.entity_type,
-                            "reminder_type": reminder.reminder_type,
-                        },
-                    )
-                    
-                    # Mark as sent
-                    await reminder_repo.mark_sent(reminder.id)
-                    logger.debug(f"Sent reminder {reminder.id} to {reminder.approver_id}")
-                    
-                except Exception as e:
-                    logger.error(f"Error sending reminder {reminder.id}: {e}")
+                request = requests.get(reminder.approval_request_id)
+                if not request or request.status != "PENDING":
+                    resolved_ids.append(reminder.id)
+                else:
+                    by_approver[reminder.approver_id].append((reminder, request))
+            
+            logger.info(
+                f"Sending {len(reminders) - len(resolved_ids)} approval reminders "
+                f"to {len(by_approver)} approvers"
+            )
             
+            failed_approvers = set()
+            if by_approver:
+                result = await NotificationClient().send_batch([
+                    _build_reminder_digest(approver_id, items)
+                    for approver_id, items in by_approver.items()
+                ])
+                failed_approvers = {UUID(str(a)) for a in result.get("failed_user_ids", [])}
+                for error in result.get("errors", []):
+                    logger.error(f"Error sending approval reminders: {error}")
+            
+            # Reminders of approvers that could not be notified stay due
+            sent_ids = resolved_ids + [
+                reminder.id
+                for approver_id, items in by_approver.items()
+                if approver_id not in failed_approvers
+                for reminder, _ in items
+            ]
+            await reminder_repo.mark_sent_bulk(sent_ids)
             await session.commit()
             
         except Exception as e:
@@ -150,15 +153,59 @@ async def _send_reminders_async():
             await session.rollback()
 
 
-@shared_task(name="approvals.cleanup_old_requests")
-def cleanup_old_requests():
+def _build_reminder_digest(approver_id: UUID, items: list) -> dict:
+    """One notification listing all the pending requests of an approver."""
+    # An approver may have several due reminders for the same request
+    requests = {}
+    urgent = set()
+    for reminder, request in items:
+        requests[request.id] = request
+        if reminder.reminder_type == "FINAL":
+            urgent.add(request.id)
+    
+    if len(requests) == 1:
+        request = next(iter(requests.values()))
+        if urgent:
+            title = "⚠️ Approvazione in Scadenza!"
+            message = f"La richiesta '{request.title}' scade tra poco. Agisci subito."
+        else:
+            title = "Promemoria Approvazione"
+            message = f"Hai una richiesta in attesa: {request.title}"
+        action_url = f"/approvals/{request.id}"
+    else:
+        title = "⚠️ Approvazioni in Scadenza!" if urgent else "Promemoria Approvazioni"
+        lines = [f"Hai {len(requests)} richieste in attesa:"]
+        for request in sorted(requests.values(), key=lambda r: (r.id not in urgent, r.created_at or datetime.min)):
+            line = f"- {request.title}"
+            if request.id in urgent:
+                line += " (in scadenza)"
+            lines.append(line)
+        message = "\n".join(lines)
+        action_url = "/approvals/pending"
+    
+    return {
+        "user_id": approver_id,
+        "notification_type": "approval_reminder",
+        "title": title,
+        "message": message,
+        "channels": ["in_app", "email"],
+        "priority": "high" if urgent else "normal",
+        "action_url": action_url,
+        "payload": {
+            "approval_request_ids": [str(request_id) for request_id in requests],
+            "urgent_request_ids": [str(request_id) for request_id in urgent],
+        },
+    }
+
+
+@async_task(name="approvals.cleanup_old_requests")
+async def cleanup_old_requests():
     """
     Clean up old resolved approval requests.
     
     Runs weekly. Archives requests older than configured retention period.
     """
-    import asyncio
-    asyncio.run(_cleanup_old_requests_async())
+    await _cleanup_old_requests_async()
 
 
 async def _cleanup_old_requests_async():
@@ -0,0 +1,180 @@
+"""
+KRONOS Approval Service - Compiled Workflow Table.
+
+In-memory, per-process table of active workflows used by
+``WorkflowEngine.select_workflow``. Conditions are parsed once into
+predicate objects, workflows are kept sorted by priority and the default
+workflow is resolved up front, so selecting a workflow is a pure in-memory
+match.
+
+Tables are versioned across processes through a Redis counter (see
+``src.core.versioned_cache``): any create/update/soft delete bumps the
+version and every process reloads its tables the next time it notices the
+change.
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect
+
+from src.core.versioned_cache import VersionedLocalCache
+from .models import WorkflowConfig
+
+VERSION_KEY = "approvals:workflow_configs:version"
+
+# Upper bound on table age, in case a version bump was lost (e.g. Redis down)
+MAX_TABLE_AGE = 300.0
+
+
+# ═══════════════════════════════════════════════════════════
+# Predicates
+# ═══════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class RangePredicate:
+    """Numeric bound on an entity attribute (missing values count as 0)."""
+
+    field: str
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    def __call__(self, entity_data: Dict[str, Any]) -> bool:
+        value = entity_data.get(self.field, 0)
+        if self.minimum is not None and value < self.minimum:
+            return False
+        if self.maximum is not None and value > self.maximum:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class MembershipPredicate:
+    """Entity attribute must be one of the allowed values, when present."""
+
+    fields: Tuple[str, ...]
+    allowed: frozenset
+
+    def __call__(self, entity_data: Dict[str, Any]) -> bool:
+        value = None
+        for field in self.fields:
+            value = entity_data.get(field)
+            if value:
+                break
+        return not value or value in self.allowed
+
+
+def compile_conditions(conditions: Optional[Dict[str, Any]]) -> Tuple:
+    """Parse a workflow ``conditions`` document into predicates."""
+    if not conditions:
+        return ()
+
+    predicates: List = []
+    for field, low_key, high_key in (
+        ("amount", "min_amount", "max_amount"),
+        ("days", "min_days", "max_days"),
+    ):
+        if low_key in conditions or high_key in conditions:
+            predicates.append(
+                RangePredicate(field, conditions.get(low_key), conditions.get(high_key))
+            )
+
+    if "entity_subtypes" in conditions:
+        predicates.append(
+            MembershipPredicate(("subtype", "leave_type"), frozenset(conditions["entity_subtypes"]))
+        )
+    if "departments" in conditions:
+        predicates.append(
+            MembershipPredicate(("department",), frozenset(conditions["departments"]))
+        )
+    return tuple(predicates)
+
+
+# ═══════════════════════════════════════════════════════════
+# Compiled table
+# ═══════════════════════════════════════════════════════════
+
+_CONFIG_COLUMNS = tuple(attr.key for attr in inspect(WorkflowConfig).column_attrs)
+
+
+class WorkflowSnapshot:
+    """Read-only, session-independent copy of a ``WorkflowConfig`` row."""
+
+    __slots__ = _CONFIG_COLUMNS
+
+    def __init__(self, config: WorkflowConfig) -> None:
+        for column in _CONFIG_COLUMNS:
+            object.__setattr__(self, column, getattr(config, column))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("WorkflowSnapshot is read-only")
+
+    def __repr__(self) -> str:
+        return f"WorkflowSnapshot(name={self.name!r}, entity_type={self.entity_type!r})"
+
+
+@dataclass(frozen=True)
+class CompiledWorkflowTable:
+    """Active workflows of one entity type, ready for matching."""
+
+    entity_type: str
+    entries: Tuple[Tuple[Tuple, WorkflowSnapshot], ...]
+    default: Optional[WorkflowSnapshot]
+    version: Optional[str]
+    loaded_at: float
+
+    @classmethod
+    def build(
+        cls,
+        entity_type: str,
+        configs: List[WorkflowConfig],
+        default: Optional[WorkflowConfig],
+        version: Optional[str],
+    ) -> "CompiledWorkflowTable":
+        ordered = sorted(configs, key=lambda c: c.priority)
+        return cls(
+            entity_type=entity_type,
+            entries=tuple(
+                (compile_conditions(c.conditions), WorkflowSnapshot(c)) for c in ordered
+            ),
+            default=WorkflowSnapshot(default) if default else None,
+            version=version,
+            loaded_at=time.monotonic(),
+        )
+
+    def match(self, entity_data: Dict[str, Any]) -> Tuple[Optional[WorkflowSnapshot], bool]:
+        """Return the first matching workflow and whether it is the default fallback."""
+        for predicates, workflow in self.entries:
+            if all(predicate(entity_data) for predicate in predicates):
+                return workflow, False
+        return self.default, self.default is not None
+
+
+class WorkflowSelectionCache(VersionedLocalCache):
+    """Process-wide store of compiled workflow tables."""
+
+    def __init__(self) -> None:
+        super().__init__(VERSION_KEY, "Workflow cache")
+        self._tables: Dict[str, CompiledWorkflowTable] = {}
+
+    async def get_table(self, entity_type: str, config_repo) -> CompiledWorkflowTable:
+        """Get the compiled table for an entity type, loading it on a miss."""
+        await self.sync_version()
+        table = self._tables.get(entity_type)
+        if table and time.monotonic() - table.loaded_at < MAX_TABLE_AGE:
+            return table
+
+        version = self.version
+        configs = await config_repo.get_active_by_entity_type(entity_type)
+        default = next((c for c in configs if c.is_default), None)
+        table = CompiledWorkflowTable.build(entity_type, configs, default, version)
+        # Only keep it if no invalidation happened while loading
+        if version == self.version:
+            self._tables[entity_type] = table
+        return table
+
+    def clear_local(self) -> None:
+        self._tables.clear()
+
+
+workflow_cache = WorkflowSelectionCache()
@@ -20,6 +20,7 @@ from .models import (
     DecisionType,
     HistoryAction,
 )
+from .workflow_cache import WorkflowSnapshot, workflow_cache
 from .repository import (
     WorkflowConfigRepository,
     ApprovalRequestRepository,
@@ -65,72 +66,24 @@ class WorkflowEngine:
         self,
         entity_type: str,
         entity_data: Dict[str, Any],
-    ) -> Optional[WorkflowConfig]:
+    ) -> Optional[WorkflowSnapshot]:
         """
         Select the best matching workflow for an entity.
         
         Evaluates conditions and returns the highest priority match.
+        Matching runs against the compiled in-memory workflow table, so it
+        only touches the database when the table has to be (re)loaded.
         """
-        configs = await self._config_repo.get_active_by_entity_type(entity_type)
+        table = await workflow_cache.get_table(entity_type, self._config_repo)
+        config, is_default = table.match(entity_data)
         
-        for config in configs:
-            if await self._evaluate_conditions(config.conditions, entity_data):
-                logger.info(f"Selected workflow '{config.name}' for {entity_type}")
-                return config
-        
-        # Fallback to default
-        default = await self._config_repo.get_default_for_entity_type(entity_type)
-        if default:
-            logger.info(f"Using default workflow '{default.name}' for {entity_type}")
-            return default
-        
-        logger.warning(f"No workflow found for entity type: {entity_type}")
-        return None
-    
-    async def _evaluate_conditions(
-        self,
-        conditions: Optional[Dict[str, Any]],
-        entity_data: Dict[str, Any],
-    ) -> bool:
-        """Evaluate workflow conditions against entity data."""
-        if not conditions:
-            return True
-        
-        # Check amount conditions
-        if "min_amount" in conditions:
-            amount = entity_data.get("amount", 0)
-            if amount < conditions["min_amount"]:
-                return False
-        
-        if "max_amount" in conditions:
-            amount = entity_data.get("amount", 0)
-            if amount > conditions["max_amount"]:
-                return False
-        
-        # Check days conditions
-        if "min_days" in conditions:
-            days = entity_data.get("days", 0)
-            if days < conditions["min_days"]:
-                return False
-        
-        if "max_days" in conditions:
-            days = entity_data.get("days", 0)
-            if days > conditions["max_days"]:
-                return False
-        
-        # Check entity subtypes
-        if "entity_subtypes" in conditions:
-            subtype = entity_data.get("subtype") or entity_data.get("leave_type")
-            if subtype and subtype not in conditions["entity_subtypes"]:
-                return False
-        
-        # Check departments
-        if "departments" in conditions:
-            dept = entity_data.get("department")
-            if dept and dept not in conditions["departments"]:
-                return False
-        
-        return True
+        if config is None:
+            logger.warning(f"No workflow found for entity type: {entity_type}")
+        elif is_default:
+            logger.info(f"Using default workflow '{config.name}' for {entity_type}")
+        else:
+            logger.info(f"Selected workflow '{config.name}' for {entity_type}")
+        return config
     
     # ═══════════════════════════════════════════════════════════
     # Approver Assignment
@@ -0,0 +1,110 @@
+"""
+KRONOS Audit Service - Delta Encoding for the Audit Trail.
+
+Trail entries store an RFC 6902 JSON patch from the previous version's state
+instead of full snapshots. Every ``AUDIT_TRAIL_CHECKPOINT_INTERVAL`` versions
+(and on INSERT) a checkpoint entry stores the full ``before_data`` /
+``after_data`` as before, so any version is rebuilt by replaying at most one
+interval of patches from the nearest checkpoint.
+
+Only the operations produced by ``make_patch`` (add, remove, replace) are
+supported by ``apply_patch``. Lists are replaced as a whole.
+"""
+import copy
+from typing import Any, Iterable, Iterator, Optional
+
+from src.core.exceptions import KronosException
+
+
+class MissingCheckpointError(KronosException):
+    """A trail to replay does not start with a checkpoint (its base was lost)."""
+
+    def __init__(self, entity_type: str, entity_id: str, version: int) -> None:
+        super().__init__(
+            message=(
+                f"Audit trail of {entity_type}:{entity_id} cannot be rebuilt: "
+                f"version {version} is a delta with no checkpoint before it"
+            ),
+            code="AUDIT_TRAIL_INCOMPLETE",
+            details={"entity_type": entity_type, "entity_id": entity_id, "version": version},
+        )
+
+
+def _escape(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(before: Any, after: Any, path: str = "") -> list[dict]:
+    """JSON patch turning ``before`` into ``after``."""
+    if before == after:
+        return []
+    if not isinstance(before, dict) or not isinstance(after, dict):
+        return [{"op": "replace", "path": path, "value": after}]
+
+    ops: list[dict] = []
+    for key in before.keys() - after.keys():
+        ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+    for key, value in after.items():
+        child = f"{path}/{_escape(key)}"
+        if key not in before:
+            ops.append({"op": "add", "path": child, "value": value})
+        else:
+            ops.extend(make_patch(before[key], value, child))
+    return ops
+
+
+def apply_patch(document: Any, patch: Iterable[dict]) -> Any:
+    """Apply a patch produced by ``make_patch`` to a copy of ``document``."""
+    document = copy.deepcopy(document)
+    for op in patch:
+        if op["path"] == "":
+            document = copy.deepcopy(op.get("value"))
+            continue
+        *parents, leaf = [_unescape(t) for t in op["path"].split("/")[1:]]
+        target = document
+        for token in parents:
+            target = target[token]
+        if op["op"] == "remove":
+            target.pop(leaf, None)
+        else:
+            target[leaf] = copy.deepcopy(op["value"])
+    return document
+
+
+def touched_fields(patch: Iterable[dict]) -> set[str]:
+    """Top-level fields changed by a patch (all of them for a root replace)."""
+    fields = set()
+    for op in patch:
+        if op["path"] == "":
+            return {"*"}
+        fields.add(_unescape(op["path"].split("/")[1]))
+    return fields
+
+
+def entry_state(operation: str, before: Optional[dict], after: Optional[dict]) -> Optional[dict]:
+    """The entity state a trail entry stands for (last known state on DELETE)."""
+    return before if operation == "DELETE" else after
+
+
+def replay(entries: Iterable) -> Iterator[tuple[Any, Optional[dict], Optional[dict]]]:
+    """Rebuild ``(entry, before_data, after_data)`` for trail entries in version order.
+
+    The first entry must be a checkpoint, else ``MissingCheckpointError`` is raised.
+    """
+    state = None
+    for index, entry in enumerate(entries):
+        if index == 0 and not entry.is_checkpoint:
+            raise MissingCheckpointError(entry.entity_type, entry.entity_id, entry.version)
+        if entry.is_checkpoint:
+            before = entry.before_data
+            current = entry_state(entry.operation, entry.before_data, entry.after_data)
+        else:
+            # On DELETE the patch leads to the deleted state itself
+            current = apply_patch(state, entry.patch or [])
+            before = current if entry.operation == "DELETE" else state
+        yield entry, before, None if entry.operation == "DELETE" else current
+        state = current
@@ -4,11 +4,14 @@ from typing import Optional
 from uuid import UUID, uuid4
 
 from sqlalchemy import (
+    Boolean,
     DateTime,
     Integer,
     String,
     Text,
+    UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB, INET
 from sqlalchemy.orm import Mapped, mapped_column
@@ -68,11 +71,16 @@ class AuditLog(Base):
 class AuditTrail(Base):
     """Audit trail for entity versioning.
     
-    Maintains complete history of entity changes with snapshots.
+    Maintains complete history of entity changes. Checkpoint entries hold
+    full snapshots; the others only a JSON patch from the previous version
+    (see ``src.services.audit.delta``).
     """
     
     __tablename__ = "audit_trail"
-    __table_args__ = {"schema": "audit"}
+    __table_args__ = (
+        UniqueConstraint("entity_type", "entity_id", "version", name="uq_audit_trail_entity_version"),
+        {"schema": "audit"},
+    )
     
     id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -90,9 +98,13 @@ class AuditTrail(Base):
     # Change type
     operation: Mapped[str] = mapped_column(String(10), nullable=False)  # INSERT, UPDATE, DELETE
     
-    # Snapshot
+    # Snapshot (checkpoints only)
+    is_checkpoint: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("true"))
     before_data: Mapped[Optional[dict]] = mapped_column(JSONB)  # State before change
     after_data: Mapped[Optional[dict]] = mapped_column(JSONB)   # State after change
+    
+    # Delta (non-checkpoints): JSON patch from the previous version's state
+    patch: Mapped[Optional[list]] = mapped_column(JSONB)
     changed_fields: Mapped[Optional[list]] = mapped_column(JSONB)  # List of changed fields
     
     # Who and when
@@ -107,3 +119,25 @@ class AuditTrail(Base):
     change_reason: Mapped[Optional[str]] = mapped_column(Text)
     service_name: Mapped[str] = mapped_column(String(50), nullable=False)
     request_id: Mapped[Optional[str]] = mapped_column(String(100))  # Correlation ID
+
+
+class AuditTrailHead(Base):
+    """Latest version and state of each audited entity.
+
+    Versions are allocated by a single ``UPDATE ... RETURNING`` on this row,
+    which also yields the previous state the next delta is computed from.
+    """
+    
+    __tablename__ = "audit_trail_heads"
+    __table_args__ = {"schema": "audit"}
+    
+    entity_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    entity_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    checkpoint_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    state: Mapped[Optional[dict]] = mapped_column(JSONB)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
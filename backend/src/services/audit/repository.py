@@ -3,11 +3,14 @@ from datetime import datetime
 from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import select, func, and_, desc, text as sa_text
+from sqlalchemy import select, update, case, or_, func, and_, desc, text as sa_text
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.services.audit.models import AuditLog, AuditTrail
+from src.core.config import settings
+from src.services.audit.delta import entry_state, make_patch, touched_fields
+from src.services.audit.models import AuditLog, AuditTrail, AuditTrailHead
 from src.services.auth.models import User
 from src.services.audit.schemas import AuditLogFilter
 from src.shared.schemas import DataTableRequest
@@ -373,11 +376,10 @@ class AuditTrailRepository:
     ) -> int:
         """Get the latest version number for an entity."""
         result = await self._session.execute(
-            select(func.max(AuditTrail.version))
-            .where(
+            select(AuditTrailHead.version).where(
                 and_(
-                    AuditTrail.entity_type == entity_type,
-                    AuditTrail.entity_id == entity_id,
+                    AuditTrailHead.entity_type == entity_type,
+                    AuditTrailHead.entity_id == entity_id,
                 )
             )
         )
@@ -390,7 +392,7 @@ class AuditTrailRepository:
         entity_id: str,
         version: int,
     ) -> Optional[AuditTrail]:
-        """Get a specific version of an entity."""
+        """Get a specific version of an entity (stored form, may be a delta)."""
         result = await self._session.execute(
             select(AuditTrail)
             .where(
@@ -403,16 +405,155 @@ class AuditTrailRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_replay_chain(
+        self,
+        entity_type: str,
+        entity_id: str,
+        up_to: int,
+        from_version: Optional[int] = None,
+    ) -> list[AuditTrail]:
+        """Entries needed to rebuild versions ``from_version``..``up_to``.
+
+        Starts at the nearest checkpoint at or before ``from_version``
+        (defaults to ``up_to``), in ascending version order. Without such a
+        checkpoint the chain starts at the oldest entry, so that ``replay``
+        reports the incomplete trail instead of the versions looking absent.
+        """
+        entity = and_(
+            AuditTrail.entity_type == entity_type,
+            AuditTrail.entity_id == entity_id,
+        )
+        checkpoint = func.coalesce(
+            select(func.max(AuditTrail.version))
+            .where(
+                entity,
+                AuditTrail.is_checkpoint.is_(True),
+                AuditTrail.version <= (from_version or up_to),
+            )
+            .scalar_subquery(),
+            select(func.min(AuditTrail.version)).where(entity).scalar_subquery(),
+        )
+        result = await self._session.execute(
+            select(AuditTrail)
+            .where(
+                entity,
+                AuditTrail.version >= checkpoint,
+                AuditTrail.version <= up_to,
+            )
+            .order_by(AuditTrail.version)
+        )
+        return list(result.scalars().all())
+
+    async def _advance_head(
+        self,
+        entity_type: str,
+        entity_id: str,
+        state: Optional[dict],
+        force_checkpoint: bool,
+    ) -> tuple[int, bool, Optional[dict]]:
+        """Allocate the next version of an entity.
+
+        Returns (version, is_checkpoint, previous_state). One statement in
+        the common case; the row lock serializes concurrent writers of the
+        same entity only.
+        """
+        interval = settings.audit_trail_checkpoint_interval
+        key = and_(
+            AuditTrailHead.entity_type == entity_type,
+            AuditTrailHead.entity_id == entity_id,
+        )
+        old = (
+            select(AuditTrailHead.entity_type, AuditTrailHead.entity_id, AuditTrailHead.state)
+            .where(key)
+            .with_for_update()
+            .subquery("old")
+        )
+        next_version = AuditTrailHead.version + 1
+        advance = (
+            update(AuditTrailHead)
+            .where(
+                key,
+                AuditTrailHead.entity_type == old.c.entity_type,
+                AuditTrailHead.entity_id == old.c.entity_id,
+            )
+            .values(
+                version=next_version,
+                checkpoint_version=case(
+                    (
+                        or_(
+                            sa.literal(force_checkpoint),
+                            next_version - AuditTrailHead.checkpoint_version >= interval,
+                        ),
+                        next_version,
+                    ),
+                    else_=AuditTrailHead.checkpoint_version,
+                ),
+                state=func.coalesce(sa.cast(state, JSONB), old.c.state),
+                updated_at=func.now(),
+            )
+            .returning(AuditTrailHead.version, AuditTrailHead.checkpoint_version, old.c.state)
+            .execution_options(synchronize_session=False)
+        )
+
+        for _ in range(2):
+            row = (await self._session.execute(advance)).first()
+            if row:
+                version, checkpoint_version, previous_state = row
+                return version, checkpoint_version == version, previous_state
+
+            # First change of this entity
+            created = await self._session.execute(
+                pg_insert(AuditTrailHead)
+                .values(
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                    version=1,
+                    checkpoint_version=1,
+                    state=state,
+                )
+                .on_conflict_do_nothing(index_elements=["entity_type", "entity_id"])
+                .returning(AuditTrailHead.version)
+            )
+            if created.first():
+                return 1, True, None
+            # Lost a race with another first writer: advance its head instead
+
+        raise RuntimeError(f"Could not allocate audit version for {entity_type}:{entity_id}")
+
     async def create(self, **kwargs: Any) -> AuditTrail:
-        """Create audit trail entry."""
-        # Get next version
-        version = await self.get_latest_version(
-            kwargs.get("entity_type", ""),
-            kwargs.get("entity_id", ""),
+        """Create audit trail entry.
+
+        The version comes from the entity head, and the entry stores either
+        a full checkpoint or a JSON patch from the previous version.
+        """
+        kwargs.pop("version", None)
+        operation = kwargs["operation"]
+        before_data = kwargs.pop("before_data", None)
+        after_data = kwargs.pop("after_data", None)
+        state = entry_state(operation, before_data, after_data)
+
+        version, is_checkpoint, previous_state = await self._advance_head(
+            kwargs["entity_type"],
+            kwargs["entity_id"],
+            state,
+            force_checkpoint=operation == "INSERT",
         )
-        kwargs["version"] = version + 1
-        
-        trail = AuditTrail(**kwargs)
+
+        patch = make_patch(previous_state, state if state is not None else previous_state)
+        if kwargs.get("changed_fields") is None and operation == "UPDATE":
+            kwargs["changed_fields"] = sorted(touched_fields(patch) - {"*"}) or None
+
+        if is_checkpoint:
+            trail = AuditTrail(
+                version=version,
+                is_checkpoint=True,
+                before_data=before_data if before_data is not None else previous_state,
+                after_data=after_data,
+                **kwargs,
+            )
+        else:
+            trail = AuditTrail(version=version, is_checkpoint=False, patch=patch, **kwargs)
+
         self._session.add(trail)
         await self._session.flush()
         return trail
@@ -112,7 +112,7 @@ async def get_log(
         raise HTTPException(status_code=404, detail=str(e))
 
 
-@router.get("/audit/logs/resource/{resource_type}/{resource_id}")
+@router.get("/audit/logs/resource/{resource_type}/{resource_id}", response_model=list[AuditLogListItem])
 async def get_resource_logs(
     resource_type: str,
     resource_id: str,
@@ -246,7 +246,7 @@ async def export_audit_logs(
     from fastapi.responses import StreamingResponse
     import csv
     import io
-    import json
+    from src.core.serialization import dumps
     
     # Parse dates
     start = datetime.fromisoformat(start_date) if start_date else None
@@ -309,7 +309,7 @@ async def export_audit_logs(
         ]
         
         output = io.BytesIO()
-        output.write(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+        output.write(dumps(data, indent=True))
         output.seek(0)
         
         return StreamingResponse(
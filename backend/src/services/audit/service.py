@@ -5,6 +5,7 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import NotFoundError
+from src.services.audit.delta import entry_state, replay, touched_fields
 from src.services.audit.repository import AuditLogRepository, AuditTrailRepository
 from src.services.audit.schemas import (
     AuditLogCreate,
@@ -71,7 +72,20 @@ class AuditService:
 
     async def record_change(self, data: AuditTrailCreate):
         """Record an entity change to audit trail."""
-        return await self._trail_repo.create(**data.model_dump())
+        trail = await self._trail_repo.create(**data.model_dump())
+        return self._materialize(trail, data.before_data, data.after_data)
+
+    @staticmethod
+    def _materialize(
+        trail,
+        before_data: Optional[dict],
+        after_data: Optional[dict],
+    ) -> AuditTrailResponse:
+        """Response for a trail entry with its reconstructed snapshots."""
+        response = AuditTrailResponse.model_validate(trail)
+        response.before_data = before_data
+        response.after_data = after_data
+        return response
 
     async def get_entity_history(
         self,
@@ -84,11 +98,16 @@ class AuditService:
         if not history:
             raise NotFoundError(f"No history found for {entity_type}:{entity_id}")
         
+        versions = [
+            self._materialize(entry, before, after)
+            for entry, before, after in replay(reversed(history))
+        ]
+        versions.reverse()
         return EntityHistoryResponse(
             entity_type=entity_type,
             entity_id=entity_id,
             current_version=history[0].version if history else 0,
-            history=[AuditTrailResponse.model_validate(h) for h in history],
+            history=versions,
         )
 
     async def get_entity_version(
@@ -96,12 +115,15 @@ class AuditService:
         entity_type: str,
         entity_id: str,
         version: int,
-    ):
+    ) -> AuditTrailResponse:
         """Get a specific version of an entity."""
-        trail = await self._trail_repo.get_version(entity_type, entity_id, version)
-        if not trail:
+        chain = await self._trail_repo.get_replay_chain(entity_type, entity_id, version)
+        if not chain or chain[-1].version != version:
             raise NotFoundError(f"Version {version} not found for {entity_type}:{entity_id}")
-        return trail
+        
+        # The chain is not empty (checked above): its last entry is the requested version
+        *_, (entry, before, after) = replay(chain)
+        return self._materialize(entry, before, after)
 
     async def compare_versions(
         self,
@@ -111,23 +133,36 @@ class AuditService:
         version2: int,
     ) -> dict:
         """Compare two versions of an entity."""
-        v1 = await self._trail_repo.get_version(entity_type, entity_id, version1)
-        v2 = await self._trail_repo.get_version(entity_type, entity_id, version2)
+        low, high = sorted((version1, version2))
+        chain = await self._trail_repo.get_replay_chain(
+            entity_type, entity_id, up_to=high, from_version=low
+        )
+        states = {}
+        # Only fields touched between the two versions can differ
+        touched: Optional[set] = set()
+        for entry, before, after in replay(chain):
+            states[entry.version] = entry_state(entry.operation, before, after)
+            if low < entry.version <= high and touched is not None:
+                if entry.is_checkpoint:
+                    touched = None
+                else:
+                    touched |= touched_fields(entry.patch or [])
+                    if "*" in touched:
+                        touched = None
         
-        if not v1 or not v2:
+        if low not in states or high not in states:
             raise NotFoundError("One or both versions not found")
         
-        # Get data from appropriate field
-        data1 = v1.after_data if v1.operation != "DELETE" else v1.before_data
-        data2 = v2.after_data if v2.operation != "DELETE" else v2.before_data
+        data1 = states[version1] or {}
+        data2 = states[version2] or {}
         
         # Find differences
         differences = {}
-        all_keys = set((data1 or {}).keys()) | set((data2 or {}).keys())
+        all_keys = touched if touched is not None else set(data1.keys()) | set(data2.keys())
         
         for key in all_keys:
-            val1 = (data1 or {}).get(key)
-            val2 = (data2 or {}).get(key)
+            val1 = data1.get(key)
+            val2 = data2.get(key)
             
             if val1 != val2:
                 differences[key] = {
@@ -172,21 +207,13 @@ class AuditService:
         
         Called by other services via HTTP or message queue.
         """
-        # Calculate changed fields
-        changed_fields = None
-        if before_data and after_data and operation == "UPDATE":
-            changed_fields = [
-                key for key in set(before_data.keys()) | set(after_data.keys())
-                if before_data.get(key) != after_data.get(key)
-            ]
-        
+        # Changed fields are derived from the stored patch by the repository
         return await self._trail_repo.create(
             entity_type=entity_type,
             entity_id=entity_id,
             operation=operation,
             before_data=before_data,
             after_data=after_data,
-            changed_fields=changed_fields,
             changed_by=changed_by,
             changed_by_email=changed_by_email,
             change_reason=change_reason,
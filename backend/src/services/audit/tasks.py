@@ -2,25 +2,15 @@
 
 Scheduled tasks for audit log maintenance and statistics.
 """
-import asyncio
 import logging
 from celery import shared_task
 
 from src.core.database import get_db_context
+from src.core.worker_runtime import run_async
 
 logger = logging.getLogger(__name__)
 
 
-def run_async(coro):
-    """Helper to run async code in Celery tasks."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
 @shared_task(name="audit.archive_old_logs", bind=True, max_retries=3)
 def archive_old_logs(self, retention_days: int = 90):
     """
@@ -2,7 +2,8 @@
 from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import select, func, or_, text
+from sqlalchemy import String, all_, bindparam, select, func, or_, text, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -212,3 +213,73 @@ class UserRepository:
         user.is_active = False
         await self._session.flush()
         return True
+
+    # ═══════════════════════════════════════════════════════════
+    # Bulk Keycloak Sync
+    # ═══════════════════════════════════════════════════════════
+
+    # Columns refreshed from Keycloak on every sync
+    KEYCLOAK_SYNC_COLUMNS = (
+        "email", "username", "first_name", "last_name",
+        "is_admin", "is_manager", "is_approver", "is_hr", "is_employee",
+        "is_active", "mfa_enabled", "last_sync_at",
+    )
+
+    async def get_sync_state(self, keycloak_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Get identity fields of existing users keyed by Keycloak ID."""
+        if not keycloak_ids:
+            return {}
+        result = await self._session.execute(
+            select(
+                User.keycloak_id,
+                User.id,
+                User.email,
+                User.username,
+                User.first_name,
+                User.last_name,
+            ).where(User.keycloak_id.in_(keycloak_ids))
+        )
+        return {row.keycloak_id: row._asdict() for row in result}
+
+    async def upsert_from_keycloak(self, rows: list[dict[str, Any]]) -> None:
+        """Insert or update a page of Keycloak users with one statement."""
+        if not rows:
+            return
+        stmt = pg_insert(User).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.keycloak_id],
+            set_={
+                **{col: stmt.excluded[col] for col in self.KEYCLOAK_SYNC_COLUMNS},
+                "updated_at": func.now(),
+            },
+        )
+        await self._session.execute(stmt)
+
+    async def deactivate_missing_keycloak_ids(self, keycloak_ids: list[str]) -> list[str]:
+        """Deactivate active users whose Keycloak ID is not in the given set.
+        
+        Returns the Keycloak IDs of the deactivated users.
+        """
+        stmt = (
+            update(User)
+            .where(User.is_active == True)
+            .where(User.keycloak_id != all_(bindparam("seen_ids", type_=ARRAY(String))))
+            .values(is_active=False)
+            .returning(User.keycloak_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(stmt, {"seen_ids": keycloak_ids})
+        return list(result.scalars().all())
+
+    async def deactivate_by_keycloak_ids(self, keycloak_ids: list[str]) -> int:
+        """Deactivate the users with the given Keycloak IDs."""
+        if not keycloak_ids:
+            return 0
+        result = await self._session.execute(
+            update(User)
+            .where(User.keycloak_id.in_(keycloak_ids))
+            .where(User.is_active == True)
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -257,6 +257,10 @@ class UserService:
         """Sync all users from Keycloak. Delegates to KeycloakSyncService."""
         return await self._keycloak_service.sync_from_keycloak(request)
 
+    async def sync_incremental_from_keycloak(self) -> KeycloakSyncResponse:
+        """Sync users changed since the last run. Delegates to KeycloakSyncService."""
+        return await self._keycloak_service.sync_incremental()
+
     # ═══════════════════════════════════════════════════════════
     # MFA Operations (Delegates to MfaService)
     # ═══════════════════════════════════════════════════════════
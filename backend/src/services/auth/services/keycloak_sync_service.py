@@ -3,18 +3,36 @@ KRONOS Auth - Keycloak Sync Service
 
 Handles synchronization of users between Keycloak and local database.
 """
-from datetime import datetime
+import asyncio
+import re
+import time
+from datetime import datetime, timezone
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from keycloak import KeycloakAdmin, KeycloakOpenIDConnection
+from keycloak.exceptions import KeycloakGetError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import cache_delete_many, get_redis_client
 from src.core.config import settings
+from src.core.rate_limit import RateLimiter
 from src.services.auth.repository import UserRepository
 from src.services.auth.schemas import KeycloakSyncRequest, KeycloakSyncResponse
 from src.shared.audit_client import get_audit_logger
 
+# Realm roles mirrored into the local is_* flags
+SYNCED_ROLES = ("admin", "manager", "approver", "hr", "employee")
+
+# Incremental sync: newest admin event time (epoch ms) already applied
+INCREMENTAL_SYNC_HWM_KEY = "keycloak_sync:admin_events_hwm"
+
+# Admin event resource types that can change a synced user
+USER_EVENT_RESOURCE_TYPES = ["USER", "REALM_ROLE_MAPPING", "CREDENTIAL", "GROUP_MEMBERSHIP"]
+
+_USER_RESOURCE_PATH = re.compile(r"^users/([0-9a-fA-F-]{36})")
+
 
 class KeycloakSyncService:
     """Service for Keycloak synchronization operations."""
@@ -23,6 +41,8 @@ class KeycloakSyncService:
         self._session = session
         self._user_repo = user_repo
         self._audit = get_audit_logger("auth-service")
+        self._semaphore = asyncio.Semaphore(settings.keycloak_sync_concurrency)
+        self._rate_limiter = RateLimiter(settings.keycloak_sync_rate_limit)
 
     def _get_keycloak_admin(self) -> KeycloakAdmin:
         """Get authenticated Keycloak Admin client."""
@@ -35,115 +55,305 @@ class KeycloakSyncService:
         )
         return KeycloakAdmin(connection=connection)
 
+    async def _call_keycloak(self, func, *args, **kwargs):
+        """Run a blocking Keycloak admin call in a worker thread.
+        
+        Calls are bounded by the sync concurrency limit and the admin API
+        rate limit, so a large realm cannot overload Keycloak.
+        """
+        async with self._semaphore:
+            await self._rate_limiter.acquire()
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def _fetch_role_members(self, keycloak_admin: KeycloakAdmin) -> dict[str, set[str]]:
+        """Fetch the members of every synced realm role (one paged call per role).
+        
+        Much cheaper than one role-mapping lookup per user.
+        """
+        async def fetch(role_name: str) -> set[str]:
+            try:
+                members = await self._call_keycloak(
+                    keycloak_admin.get_realm_role_members, role_name
+                )
+            except KeycloakGetError:
+                # Role not defined in this realm
+                return set()
+            return {m["id"] for m in members if m.get("id")}
+
+        results = await asyncio.gather(*(fetch(r) for r in SYNCED_ROLES))
+        return dict(zip(SYNCED_ROLES, results))
+
+    async def _has_otp(self, keycloak_admin: KeycloakAdmin, kc_user: dict) -> bool:
+        """Check whether the user has an OTP credential configured."""
+        # Full user representations already carry the flag
+        if "totp" in kc_user:
+            return bool(kc_user["totp"])
+        try:
+            creds = await self._call_keycloak(keycloak_admin.get_user_credentials, kc_user["id"])
+        except Exception:
+            return False
+        return any(c.get("type") == "otp" for c in creds)
+
+    def _build_user_row(
+        self,
+        kc_user: dict,
+        role_members: dict[str, set[str]],
+        has_otp: bool,
+        existing: Optional[dict],
+        synced_at: datetime,
+    ) -> dict:
+        """Map a Keycloak user to a users row for the bulk upsert."""
+        kc_id = kc_user["id"]
+        if existing:
+            # Keep local values for attributes Keycloak does not provide
+            identity = {
+                "id": existing["id"],
+                "email": kc_user.get("email", existing["email"]),
+                "username": kc_user.get("username", existing["username"]),
+                "first_name": kc_user.get("firstName", existing["first_name"]),
+                "last_name": kc_user.get("lastName", existing["last_name"]),
+            }
+        else:
+            identity = {
+                "id": uuid4(),
+                "email": kc_user.get("email", f"{kc_id}@unknown"),
+                "username": kc_user.get("username") or kc_user.get("email", f"{kc_id}@unknown"),
+                "first_name": kc_user.get("firstName", ""),
+                "last_name": kc_user.get("lastName", ""),
+            }
+        return {
+            "keycloak_id": kc_id,
+            **identity,
+            "is_admin": kc_id in role_members["admin"],
+            "is_manager": kc_id in role_members["manager"],
+            "is_approver": kc_id in role_members["approver"],
+            "is_hr": kc_id in role_members["hr"],
+            "is_employee": kc_id in role_members["employee"],
+            "is_active": kc_user.get("enabled", True),
+            "mfa_enabled": has_otp,
+            "last_sync_at": synced_at,
+        }
+
+    async def _upsert_rows(self, rows: list[dict], errors: list[str]) -> set[str]:
+        """Upsert a page of users, isolating failing rows.
+        
+        The whole page is written with one INSERT ... ON CONFLICT. If it
+        violates a constraint (e.g. an email already used by another
+        account), rows are retried one by one in savepoints so a single bad
+        user does not fail the page.
+        
+        Returns the Keycloak IDs of the rows that could not be written.
+        """
+        try:
+            async with self._session.begin_nested():
+                await self._user_repo.upsert_from_keycloak(rows)
+            return set()
+        except IntegrityError:
+            pass
+
+        failed = set()
+        for row in rows:
+            try:
+                async with self._session.begin_nested():
+                    await self._user_repo.upsert_from_keycloak([row])
+            except IntegrityError as e:
+                failed.add(row["keycloak_id"])
+                errors.append(f"Error syncing user {row['email']}: {e.orig}")
+        return failed
+
     async def sync_from_keycloak(self, request: KeycloakSyncRequest) -> KeycloakSyncResponse:
         """Sync all users from Keycloak.
         
         This is an admin operation that fetches all users from
         Keycloak and syncs them to the local database.
+        
+        Users are paged from Keycloak; role flags come from one role-members
+        lookup per synced role, OTP checks run concurrently under a rate
+        limit, and each page is upserted with a single statement.
+        Deactivations are computed in SQL from the set of IDs seen.
         """
         try:
-            keycloak_connection = KeycloakOpenIDConnection(
-                server_url=settings.keycloak_url,
-                realm_name=settings.keycloak_realm,
-                client_id=settings.keycloak_client_id,
-                client_secret_key=settings.keycloak_client_secret,
-            )
-            keycloak_admin = KeycloakAdmin(connection=keycloak_connection)
-            
-            kc_users = keycloak_admin.get_users({})
-            
-            synced = 0
-            created = 0
-            updated = 0
-            deactivated = 0
-            errors = []
-            
-            keycloak_ids_seen = set()
-            
-            for kc_user in kc_users:
-                try:
-                    kc_id = kc_user.get("id")
-                    if not kc_id:
-                        continue
-                    
-                    keycloak_ids_seen.add(kc_id)
-                    
-                    kc_roles = keycloak_admin.get_realm_roles_of_user(kc_id)
-                    role_names = [r.get("name") for r in kc_roles]
-                    
-                    has_otp = False
-                    try:
-                        creds = keycloak_admin.get_user_credentials(kc_id)
-                        has_otp = any(c.get("type") == "otp" for c in creds)
-                    except Exception:
-                        pass
-                    
-                    local_user = await self._user_repo.get_by_keycloak_id(kc_id)
-                    
-                    if local_user:
-                        await self._user_repo.update(
-                            local_user.id,
-                            email=kc_user.get("email", local_user.email),
-                            username=kc_user.get("username", local_user.username),
-                            first_name=kc_user.get("firstName", local_user.first_name),
-                            last_name=kc_user.get("lastName", local_user.last_name),
-                            is_admin="admin" in role_names,
-                            is_manager="manager" in role_names,
-                            is_approver="approver" in role_names,
-                            is_hr="hr" in role_names,
-                            is_employee="employee" in role_names,
-                            is_active=kc_user.get("enabled", True),
-                            mfa_enabled=has_otp,
-                            last_sync_at=datetime.utcnow(),
-                        )
-                        updated += 1
-                    else:
-                        new_user = await self._user_repo.create(
-                            keycloak_id=kc_id,
-                            email=kc_user.get("email", f"{kc_id}@unknown"),
-                            username=kc_user.get("username") or kc_user.get("email", f"{kc_id}@unknown"),
-                            first_name=kc_user.get("firstName", ""),
-                            last_name=kc_user.get("lastName", ""),
-                            is_admin="admin" in role_names,
-                            is_manager="manager" in role_names,
-                            is_approver="approver" in role_names,
-                            is_hr="hr" in role_names,
-                            is_employee="employee" in role_names,
-                            is_active=kc_user.get("enabled", True),
-                            mfa_enabled=has_otp,
-                            last_sync_at=datetime.utcnow(),
-                        )
-                        created += 1
-                        
-                        await self._audit.log_action(
-                            action="CREATE",
-                            resource_type="USER",
-                            resource_id=str(new_user.id),
-                            description=f"User synced from Keycloak: {new_user.email}",
-                            request_data={"keycloak_id": kc_id, "roles": role_names},
-                        )
-                    
-                    synced += 1
-                    
-                except Exception as e:
-                    errors.append(f"Error syncing user {kc_user.get('email', 'unknown')}: {str(e)}")
-            
-            if request.force_full_sync:
-                all_local = await self._user_repo.get_all(active_only=False, limit=10000, offset=0)
-                for local_user in all_local:
-                    if local_user.keycloak_id not in keycloak_ids_seen:
-                        if local_user.is_active:
-                            await self._user_repo.deactivate(local_user.id)
-                            deactivated += 1
-            
+            keycloak_admin = self._get_keycloak_admin()
+            role_members = await self._fetch_role_members(keycloak_admin)
+        except Exception as e:
             return KeycloakSyncResponse(
-                synced=synced,
-                created=created,
-                updated=updated,
-                deactivated=deactivated,
-                errors=errors,
+                synced=0,
+                created=0,
+                updated=0,
+                deactivated=0,
+                errors=[f"Keycloak connection error: {str(e)}"],
+            )
+
+        page_size = settings.keycloak_sync_page_size
+        synced_at = datetime.utcnow()
+        synced = 0
+        created = 0
+        updated = 0
+        deactivated = 0
+        errors: list[str] = []
+        created_ids: list[str] = []
+        keycloak_ids_seen: set[str] = set()
+        listing_complete = True
+        first = 0
+
+        while True:
+            try:
+                kc_users = await self._call_keycloak(
+                    keycloak_admin.get_users, {"first": first, "max": page_size}
+                )
+            except Exception as e:
+                errors.append(f"Keycloak connection error: {str(e)}")
+                # An incomplete listing must never drive deactivations
+                listing_complete = False
+                break
+
+            page_len = len(kc_users)
+            kc_users = [u for u in kc_users if u.get("id")]
+            if kc_users:
+                kc_ids = [u["id"] for u in kc_users]
+                keycloak_ids_seen.update(kc_ids)
+
+                existing = await self._user_repo.get_sync_state(kc_ids)
+                otp_flags = await asyncio.gather(
+                    *(self._has_otp(keycloak_admin, u) for u in kc_users)
+                )
+                rows = [
+                    self._build_user_row(u, role_members, has_otp, existing.get(u["id"]), synced_at)
+                    for u, has_otp in zip(kc_users, otp_flags)
+                ]
+
+                failed = await self._upsert_rows(rows, errors)
+                page_created = [
+                    r["keycloak_id"] for r in rows
+                    if r["keycloak_id"] not in existing and r["keycloak_id"] not in failed
+                ]
+                page_synced = len(rows) - len(failed)
+                synced += page_synced
+                created += len(page_created)
+                updated += page_synced - len(page_created)
+                created_ids.extend(page_created)
+
+            if page_len < page_size:
+                break
+            first += page_size
+
+        if request.force_full_sync and listing_complete and keycloak_ids_seen:
+            deactivated_ids = await self._user_repo.deactivate_missing_keycloak_ids(
+                list(keycloak_ids_seen)
+            )
+            deactivated = len(deactivated_ids)
+
+        if created or deactivated:
+            await self._audit.log_action(
+                action="SYNC",
+                resource_type="USER",
+                description=(
+                    f"Keycloak sync: {created} users created, {updated} updated, "
+                    f"{deactivated} deactivated"
+                ),
+                request_data={"created_keycloak_ids": created_ids[:1000]},
+            )
+
+        return KeycloakSyncResponse(
+            synced=synced,
+            created=created,
+            updated=updated,
+            deactivated=deactivated,
+            errors=errors,
+        )
+
+    async def _get_high_water_mark(self) -> int:
+        """Newest admin event time already applied (epoch ms)."""
+        value = await get_redis_client().get(INCREMENTAL_SYNC_HWM_KEY)
+        if value:
+            return int(value)
+        lookback_ms = settings.keycloak_incremental_sync_lookback * 1000
+        return int(time.time() * 1000) - lookback_ms
+
+    async def _fetch_changed_user_ids(
+        self, keycloak_admin: KeycloakAdmin, since_ms: int
+    ) -> tuple[dict[str, int], int]:
+        """Collect users touched by admin events newer than ``since_ms``.
+        
+        Returns the affected Keycloak IDs with the time of their earliest
+        event, and the new high-water mark.
+        """
+        page_size = settings.keycloak_sync_page_size
+        # dateFrom only has day granularity: filter on the event time locally
+        date_from = datetime.fromtimestamp(since_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+        user_ids: dict[str, int] = {}
+        high_water_mark = since_ms
+        first = 0
+
+        while True:
+            events = await self._call_keycloak(
+                keycloak_admin.get_admin_events,
+                {
+                    "dateFrom": date_from,
+                    "resourceTypes": USER_EVENT_RESOURCE_TYPES,
+                    "first": first,
+                    "max": page_size,
+                },
+            )
+            for event in events:
+                event_time = event.get("time", 0)
+                if event_time <= since_ms:
+                    continue
+                high_water_mark = max(high_water_mark, event_time)
+                match = _USER_RESOURCE_PATH.match(event.get("resourcePath", ""))
+                if match:
+                    kc_id = match.group(1)
+                    user_ids[kc_id] = min(user_ids.get(kc_id, event_time), event_time)
+
+            # Events are returned newest first
+            if len(events) < page_size or events[-1].get("time", 0) <= since_ms:
+                break
+            first += page_size
+
+        return user_ids, high_water_mark
+
+    async def _get_user_or_none(self, keycloak_admin: KeycloakAdmin, kc_id: str) -> Optional[dict]:
+        try:
+            return await self._call_keycloak(keycloak_admin.get_user, kc_id)
+        except KeycloakGetError as e:
+            if e.response_code == 404:
+                return None
+            raise
+
+    async def _get_user_role_names(self, keycloak_admin: KeycloakAdmin, kc_id: str) -> set[str]:
+        roles = await self._call_keycloak(keycloak_admin.get_realm_roles_of_user, kc_id)
+        return {r.get("name") for r in roles}
+
+    async def sync_incremental(self) -> KeycloakSyncResponse:
+        """Apply Keycloak changes made since the last incremental run.
+        
+        Reads admin events newer than the stored high-water mark, refreshes
+        only the users they touch (in batches, with the same bulk upsert as
+        the full sync), deactivates deleted users and drops their cached
+        identities so role and enabled-flag changes apply immediately.
+        
+        Reports an error if admin events are disabled in the realm.
+        """
+        try:
+            keycloak_admin = self._get_keycloak_admin()
+            realm = await self._call_keycloak(keycloak_admin.get_realm, settings.keycloak_realm)
+            if not realm.get("adminEventsEnabled"):
+                # Nothing to read: an empty result would look like "no changes"
+                return KeycloakSyncResponse(
+                    synced=0,
+                    created=0,
+                    updated=0,
+                    deactivated=0,
+                    errors=[
+                        f"Admin events are disabled in realm '{settings.keycloak_realm}': "
+                        "enable adminEventsEnabled and adminEventsDetailsEnabled, "
+                        "until then changes are only picked up by the full sync"
+                    ],
+                )
+            since_ms = await self._get_high_water_mark()
+            changed_ids, high_water_mark = await self._fetch_changed_user_ids(
+                keycloak_admin, since_ms
             )
-            
         except Exception as e:
             return KeycloakSyncResponse(
                 synced=0,
@@ -153,6 +363,71 @@ class KeycloakSyncService:
                 errors=[f"Keycloak connection error: {str(e)}"],
             )
 
+        synced = 0
+        created = 0
+        updated = 0
+        deactivated = 0
+        errors: list[str] = []
+        synced_at = datetime.utcnow()
+        changed = sorted(changed_ids)
+        batch_size = settings.keycloak_sync_page_size
+        # Users whose changes were not applied: the mark stays before their events
+        unsynced: set[str] = set()
+
+        for i in range(0, len(changed), batch_size):
+            batch = changed[i:i + batch_size]
+            try:
+                kc_users = await asyncio.gather(
+                    *(self._get_user_or_none(keycloak_admin, kc_id) for kc_id in batch)
+                )
+                present = [u for u in kc_users if u]
+                user_roles, otp_flags = await asyncio.gather(
+                    asyncio.gather(*(self._get_user_role_names(keycloak_admin, u["id"]) for u in present)),
+                    asyncio.gather(*(self._has_otp(keycloak_admin, u) for u in present)),
+                )
+            except Exception as e:
+                errors.append(f"Keycloak error: {str(e)}")
+                unsynced.update(changed[i:])
+                break
+            deleted = [kc_id for kc_id, u in zip(batch, kc_users) if u is None]
+            role_members = {
+                role: {u["id"] for u, names in zip(present, user_roles) if role in names}
+                for role in SYNCED_ROLES
+            }
+
+            existing = await self._user_repo.get_sync_state([u["id"] for u in present])
+            rows = [
+                self._build_user_row(u, role_members, has_otp, existing.get(u["id"]), synced_at)
+                for u, has_otp in zip(present, otp_flags)
+            ]
+            failed = await self._upsert_rows(rows, errors)
+            unsynced.update(failed)
+            batch_created = sum(
+                1 for r in rows
+                if r["keycloak_id"] not in existing and r["keycloak_id"] not in failed
+            )
+            batch_synced = len(rows) - len(failed)
+            synced += batch_synced
+            created += batch_created
+            updated += batch_synced - batch_created
+            deactivated += await self._user_repo.deactivate_by_keycloak_ids(deleted)
+
+        # Changes must be visible before dropping the cached identities
+        await self._session.commit()
+        await cache_delete_many([f"user_identity:{kc_id}" for kc_id in changed])
+        if unsynced:
+            # Events up to the mark are skipped: retry from just before the first missed one
+            high_water_mark = min(changed_ids[kc_id] for kc_id in unsynced) - 1
+        await get_redis_client().set(INCREMENTAL_SYNC_HWM_KEY, high_water_mark)
+
+        return KeycloakSyncResponse(
+            synced=synced,
+            created=created,
+            updated=updated,
+            deactivated=deactivated,
+            errors=errors,
+        )
+
     async def get_or_create_from_token(
         self,
         keycloak_id: str,
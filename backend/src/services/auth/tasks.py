@@ -0,0 +1,38 @@
+"""KRONOS Auth Service - Celery Tasks.
+
+Scheduled tasks for Keycloak user synchronization.
+"""
+import logging
+from celery import shared_task
+
+from src.core.database import get_db_context
+from src.core.worker_runtime import run_async
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="auth.incremental_keycloak_sync")
+def incremental_keycloak_sync():
+    """
+    Apply Keycloak user, role and enabled-flag changes made since the last run.
+    
+    Runs every minute, driven by Keycloak admin events, so a full sync is
+    only needed for bootstrapping and reconciliation.
+    """
+    async def _sync():
+        from src.services.auth.repository import UserRepository
+        from src.services.auth.services import KeycloakSyncService
+        
+        async with get_db_context() as session:
+            service = KeycloakSyncService(session, UserRepository(session))
+            return await service.sync_incremental()
+    
+    result = run_async(_sync())
+    if result.errors:
+        logger.warning(f"Incremental Keycloak sync completed with errors: {result.errors[:5]}")
+    elif result.synced or result.deactivated:
+        logger.info(
+            f"Incremental Keycloak sync: {result.synced} synced "
+            f"({result.created} created), {result.deactivated} deactivated"
+        )
+    return result.model_dump()
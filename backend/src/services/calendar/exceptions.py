@@ -4,13 +4,15 @@ KRONOS - Calendar Service Exceptions
 Domain-specific exceptions for the calendar microservice.
 Inherits from shared enterprise exceptions to ensure consistent error handling.
 """
+from datetime import date
 from typing import Optional
 from uuid import UUID
 
 from src.shared.exceptions import (
     NotFoundError,
     ForbiddenError,
-    BusinessRuleError
+    BusinessRuleError,
+    ValidationError,
 )
 
 
@@ -88,3 +90,22 @@ class ClosureNotFound(NotFoundError):
             resource_type="CalendarClosure",
             resource_id=closure_id
         )
+
+
+class InvalidRecurrenceRule(ValidationError):
+    """Raised when an event recurrence rule is not a valid RRULE."""
+    def __init__(self, rule: str, reason: Optional[str] = None):
+        super().__init__(
+            message=f"Invalid recurrence rule: {reason}" if reason else "Invalid recurrence rule",
+            field="recurrence_rule",
+            value=rule,
+        )
+
+
+class InvalidEventDates(ValidationError):
+    """Raised when an event would end before it starts."""
+    def __init__(self, start_date: date, end_date: date):
+        super().__init__(
+            message=f"Event end date {end_date} is before its start date {start_date}",
+            fields=["start_date", "end_date"],
+        )
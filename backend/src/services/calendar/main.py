@@ -3,12 +3,14 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import settings
+from src.core.serialization import DEFAULT_RESPONSE_CLASS
 from .routers import api_router
 
 app = FastAPI(
     title="KRONOS Calendar Service",
     description="Microservice for managing calendars, holidays, closures, events, and working day calculations.",
     version="1.0.0",
+    default_response_class=DEFAULT_RESPONSE_CLASS,
     docs_url="/api/docs",
     openapi_url="/api/openapi.json",
 )
@@ -32,6 +34,18 @@ app.include_router(setup_router, prefix="/api/v1/calendar")
 from src.core.middleware import RequestContextMiddleware
 app.add_middleware(RequestContextMiddleware)
 
+# Conditional GET (ETag / 304) for reference data read by other services
+from src.core.etag import ETagMiddleware
+app.add_middleware(ETagMiddleware, paths=["/api/v1/calendar"])
+
+# Internal batch endpoint (several GETs in one request, see src.core.batch)
+from src.core.batch import router as batch_router
+app.include_router(batch_router)
+
+# Prometheus scrape endpoint
+from src.core.metrics import router as metrics_router
+app.include_router(metrics_router)
+
 # Register Error Handlers
 from src.core.error_handlers import register_error_handlers
 register_error_handlers(app)
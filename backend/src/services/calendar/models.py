@@ -10,6 +10,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -18,7 +19,9 @@ from sqlalchemy import (
     func,
     Enum as SQLEnum,
     CheckConstraint,
-    Numeric
+    Numeric,
+    case,
+    literal_column,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -301,13 +304,31 @@ class CalendarHoliday(Base):
     profile: Mapped[Optional["HolidayProfile"]] = relationship(back_populates="holidays")
 
 
+def event_span(start_date, series_end_date):
+    """Date range covered by an event or event series (open-ended if NULL).
+
+    The upper bound is clamped to ``start_date``: daterange() raises on a
+    reversed range, and rows written before the date validation may have one.
+    """
+    upper = case((series_end_date < start_date, start_date), else_=series_end_date)
+    return func.daterange(start_date, upper, literal_column("'[]'"))
+
+
 class CalendarEvent(Base):
     """
     Generic calendar event.
     Refactored to use unified Calendar.
     """
     __tablename__ = "events"
-    __table_args__ = {"schema": "calendar"}
+    __table_args__ = (
+        # Interval index for range queries (overlap with &&)
+        Index(
+            "ix_calendar_events_span",
+            event_span(literal_column("start_date"), literal_column("series_end_date")),
+            postgresql_using="gist",
+        ),
+        {"schema": "calendar"},
+    )
     
     id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
     
@@ -348,6 +369,8 @@ class CalendarEvent(Base):
         PG_UUID(as_uuid=True),
         ForeignKey("calendar.events.id", ondelete="CASCADE"),
     )
+    # Last day covered by the event or series (NULL: recurs forever)
+    series_end_date: Mapped[Optional[date]] = mapped_column(Date)
     
     created_by: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,192 @@
+"""
+KRONOS Calendar Service - Recurring Event Expansion.
+
+A recurring ``CalendarEvent`` is stored once, as the series master: its
+``start_date``/``end_date`` describe the first occurrence and
+``recurrence_rule`` holds an iCalendar RRULE (optionally with EXDATE lines).
+Occurrences are expanded lazily, only for the window being viewed, and the
+result is cached per (event revision, window).
+
+``series_end_date`` on the master is the last day covered by the series
+(NULL when the rule has no UNTIL/COUNT), so range queries can match masters
+with a single interval overlap test.
+"""
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Optional
+from uuid import UUID
+
+from dateutil.rrule import rrulestr
+
+from src.services.calendar.exceptions import InvalidRecurrenceRule
+
+MAX_CACHED_EXPANSIONS = 4096
+# Safety cap for a single window (e.g. a daily rule over several years)
+MAX_OCCURRENCES_PER_WINDOW = 2000
+
+
+def _normalize(rule: str) -> str:
+    rule = rule.strip()
+    if "\n" not in rule and not rule.upper().startswith(("RRULE:", "DTSTART")):
+        rule = f"RRULE:{rule}"
+    return rule
+
+
+@lru_cache(maxsize=1024)
+def parse_rule(rule: str, dtstart: date):
+    """Parse an RRULE string anchored at ``dtstart`` into a dateutil rruleset."""
+    try:
+        return rrulestr(
+            _normalize(rule),
+            dtstart=datetime.combine(dtstart, datetime.min.time()),
+            forceset=True,
+            ignoretz=True,
+        )
+    except (ValueError, TypeError) as e:
+        raise InvalidRecurrenceRule(rule, str(e)) from e
+
+
+def validate_rule(rule: str, dtstart: date) -> None:
+    """Raise ``InvalidRecurrenceRule`` if the rule cannot be parsed."""
+    parse_rule(rule, dtstart)
+
+
+def _rrule_values(rule: str) -> list[str]:
+    """Values of the RRULE lines of a rule, e.g. ``FREQ=WEEKLY;COUNT=4``."""
+    values = []
+    for line in _normalize(rule).splitlines():
+        name, _, value = line.strip().partition(":")
+        if name.split(";")[0].upper() == "RRULE":
+            values.append(value)
+    return values
+
+
+def _is_finite(rule: str) -> bool:
+    """Whether every RRULE of the rule is bounded by COUNT or UNTIL."""
+    values = _rrule_values(rule)
+    return bool(values) and all(
+        {part.split("=")[0].strip().upper() for part in value.split(";")} & {"COUNT", "UNTIL"}
+        for value in values
+    )
+
+
+def _last(items: Iterable) -> Optional[Any]:
+    """Last item of a finite iterable, or None if it is empty."""
+    tail = deque(items, maxlen=1)
+    return tail[0] if tail else None
+
+
+def series_end(start_date: date, end_date: date, rule: Optional[str]) -> Optional[date]:
+    """Last day covered by an event series, or None if it never ends."""
+    if not rule:
+        return end_date
+    rule_set = parse_rule(rule, start_date)
+    if not _is_finite(rule):
+        return None
+    last = _last(rule_set)
+    if last is None:
+        return end_date
+    return last.date() + (end_date - start_date)
+
+
+def occurrence_spans(
+    start_date: date,
+    end_date: date,
+    rule: str,
+    window_start: date,
+    window_end: date,
+) -> tuple[tuple[date, date], ...]:
+    """(start, end) of every occurrence overlapping the window."""
+    duration = end_date - start_date
+    rule_set = parse_rule(rule, start_date)
+    # An occurrence starting up to ``duration`` days before the window still overlaps it
+    after = datetime.combine(window_start - duration, datetime.min.time())
+    before = datetime.combine(window_end, datetime.min.time())
+    spans = []
+    for occurrence in rule_set.xafter(after, inc=True):
+        if occurrence > before or len(spans) >= MAX_OCCURRENCES_PER_WINDOW:
+            break
+        day = occurrence.date()
+        spans.append((day, day + duration))
+    return tuple(spans)
+
+
+class EventOccurrence:
+    """One occurrence of a recurring event.
+
+    Reads through to the series master, except for the occurrence dates.
+    """
+
+    def __init__(self, master, start_date: date, end_date: date) -> None:
+        self._master = master
+        self.start_date = start_date
+        self.end_date = end_date
+        self.occurrence_date = start_date
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._master, name)
+
+    def __repr__(self) -> str:
+        return f"EventOccurrence(id={self._master.id}, start_date={self.start_date})"
+
+
+class OccurrenceCache:
+    """Bounded LRU of expanded occurrence spans per (event revision, window)."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_EXPANSIONS) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[tuple[date, date], ...]] = OrderedDict()
+
+    def spans(self, event, window_start: date, window_end: date) -> tuple[tuple[date, date], ...]:
+        key = (
+            event.id,
+            event.updated_at,
+            event.recurrence_rule,
+            event.start_date,
+            event.end_date,
+            window_start,
+            window_end,
+        )
+        spans = self._entries.get(key)
+        if spans is not None:
+            self._entries.move_to_end(key)
+            return spans
+
+        spans = occurrence_spans(
+            event.start_date, event.end_date, event.recurrence_rule, window_start, window_end
+        )
+        self._entries[key] = spans
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return spans
+
+    def invalidate(self, event_id: UUID) -> None:
+        for key in [k for k in self._entries if k[0] == event_id]:
+            del self._entries[key]
+
+
+occurrence_cache = OccurrenceCache()
+
+
+def expand_events(events, window_start: date, window_end: date) -> list:
+    """Replace recurring masters with their occurrences inside the window.
+
+    A materialized child (``parent_event_id`` set) starting on the same day
+    as a generated occurrence overrides that occurrence.
+    """
+    overrides = {
+        (e.parent_event_id, e.start_date) for e in events if e.parent_event_id is not None
+    }
+    expanded = []
+    for event in events:
+        if not (event.is_recurring and event.recurrence_rule):
+            expanded.append(event)
+            continue
+        for start, end in occurrence_cache.spans(event, window_start, window_end):
+            if (event.id, start) in overrides:
+                continue
+            expanded.append(EventOccurrence(event, start, end))
+    expanded.sort(key=lambda e: (e.start_date, e.start_time or datetime.min.time()))
+    return expanded
@@ -2,7 +2,7 @@ from datetime import date
 from typing import List, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, or_, and_, delete, func
+from sqlalchemy import select, or_, and_, delete, false, func, literal_column
 from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,8 +19,10 @@ from .models import (
     WorkingDayException,
     CalendarPermission,
     LocationSubscription,
+    event_span,
 )
 from src.core.exceptions import NotFoundError
+from .recurrence import series_end
 
 
 class BaseRepository:
@@ -159,10 +161,9 @@ class CalendarEventRepository(BaseRepository):
 
         stmt = select(CalendarEvent).where(CalendarEvent.calendar_id.in_(calendar_ids))
 
-        if start_date:
-            stmt = stmt.where(CalendarEvent.end_date >= start_date)
-        if end_date:
-            stmt = stmt.where(CalendarEvent.start_date <= end_date)
+        if start_date or end_date:
+            # Matches single events and any recurring series active in the range
+            stmt = stmt.where(_overlaps(start_date, end_date))
         if event_type:
             stmt = stmt.where(CalendarEvent.event_type == event_type)
 
@@ -181,18 +182,19 @@ class CalendarEventRepository(BaseRepository):
         stmt = select(CalendarEvent).where(
             CalendarEvent.calendar_id.in_(calendar_ids),
             CalendarEvent.event_type == 'closure', 
-            CalendarEvent.start_date <= end_date,
-            CalendarEvent.end_date >= start_date
+            _overlaps(start_date, end_date),
         )
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
     async def create(self, event: CalendarEvent) -> CalendarEvent:
+        _set_series_end(event)
         self.session.add(event)
         await self.session.flush()
         return event
 
     async def update(self, event: CalendarEvent) -> CalendarEvent:
+        _set_series_end(event)
         self.session.add(event)
         await self.session.flush()
         return event
@@ -202,6 +204,21 @@ class CalendarEventRepository(BaseRepository):
         await self.session.flush()
 
 
+def _overlaps(start_date: Optional[date], end_date: Optional[date]):
+    """Span of the event/series overlaps [start_date, end_date] (served by the GiST index)."""
+    if start_date and end_date and end_date < start_date:
+        # Empty window; daterange() would raise on the reversed bounds
+        return false()
+    return event_span(CalendarEvent.start_date, CalendarEvent.series_end_date).op("&&")(
+        func.daterange(start_date, end_date, literal_column("'[]'"))
+    )
+
+
+def _set_series_end(event: CalendarEvent) -> None:
+    rule = event.recurrence_rule if event.is_recurring else None
+    event.series_end_date = series_end(event.start_date, event.end_date, rule)
+
+
 class WorkWeekProfileRepository(BaseRepository):
     async def get_all(self) -> Sequence[WorkWeekProfile]:
         result = await self.session.execute(select(WorkWeekProfile))
@@ -5,7 +5,7 @@ from typing import Optional, List, Dict, Any, Union
 from uuid import UUID
 from enum import Enum
 from decimal import Decimal
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
 
 
 # ═══════════════════════════════════════════════════════════
@@ -244,6 +244,12 @@ class EventBase(BaseModel):
 class EventCreate(EventBase):
     participant_ids: Optional[List[UUID]] = None
 
+    @model_validator(mode="after")
+    def end_after_start(self) -> "EventCreate":
+        if self.end_date < self.start_date:
+            raise ValueError("end_date must be >= start_date")
+        return self
+
 
 class EventUpdate(BaseModel):
     title: Optional[str] = None
@@ -254,8 +260,16 @@ class EventUpdate(BaseModel):
     end_time: Optional[time] = None
     is_all_day: Optional[bool] = None
     calendar_id: Optional[UUID] = None
+    is_recurring: Optional[bool] = None
+    recurrence_rule: Optional[str] = None
     participant_ids: Optional[List[UUID]] = None
 
+    @model_validator(mode="after")
+    def end_after_start(self) -> "EventUpdate":
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValueError("end_date must be >= start_date")
+        return self
+
 class EventResponse(EventBase):
     model_config = ConfigDict(from_attributes=True)
     id: UUID
@@ -263,6 +277,8 @@ class EventResponse(EventBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     participants: List[ParticipantResponse] = []
+    # Set on expanded occurrences of a recurring event (id is the series)
+    occurrence_date: Optional[date] = None
     
     # Computed fields for view convenience
     color: Optional[str] = None 
@@ -37,11 +37,25 @@ from src.services.calendar.services.calendars import CalendarManagementService
 from src.services.calendar.services.events import CalendarEventService
 from src.services.calendar.services.profiles import CalendarProfileService
 
+from src.services.calendar.recurrence import EventOccurrence
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _index_by_day(items, start_date: date, end_date: date, span) -> Dict[date, list]:
+    """Map each day of [start_date, end_date] to the items covering it."""
+    by_day: Dict[date, list] = {}
+    for item in items:
+        item_start, item_end = span(item)
+        day = max(item_start, start_date)
+        last = min(item_end, end_date)
+        while day <= last:
+            by_day.setdefault(day, []).append(item)
+            day += timedelta(days=1)
+    return by_day
+
+
 class CalendarService(BaseCalendarService):
     """
     Unified Calendar Service façade.
@@ -377,8 +391,24 @@ class CalendarService(BaseCalendarService):
         config = await self._get_location_config(location_id)
         work_days_mask = self._get_working_days_mask(config)
         
-        # We need a set of holiday dates for rapid lookup during the loop
-        holiday_dates = {date.fromisoformat(h["date"]) for h in raw_holidays}
+        # Index every item by the days it covers (clipped to the range), so
+        # the day loop below is a dict lookup instead of a scan of all items.
+        holidays_by_day = {}
+        for h in raw_holidays:
+            holidays_by_day.setdefault(date.fromisoformat(h["date"]), h)
+
+        closures_by_day = _index_by_day(
+            raw_closures,
+            start_date,
+            end_date,
+            lambda c: (date.fromisoformat(c["start_date"]), date.fromisoformat(c["end_date"])),
+        )
+        events_by_day = _index_by_day(
+            events, start_date, end_date, lambda e: (e.start_date, e.end_date)
+        )
+        leaves_by_day = _index_by_day(
+            leaves, start_date, end_date, lambda lv: (lv["start_date"], lv["end_date"])
+        )
 
         # 3. Iterate Day by Day
         days_views = []
@@ -389,8 +419,8 @@ class CalendarService(BaseCalendarService):
             day_items = []
             
             # -- Check Holiday --
-            is_holiday_today = current in holiday_dates
-            holiday_today = next((h for h in raw_holidays if date.fromisoformat(h["date"]) == current), None)
+            holiday_today = holidays_by_day.get(current)
+            is_holiday_today = holiday_today is not None
             
             if holiday_today:
                 day_items.append(schemas.CalendarDayItem(
@@ -411,59 +441,57 @@ class CalendarService(BaseCalendarService):
                 working_days_count += 1
                 
             # -- Check Closures --
-            for c in raw_closures:
-                c_start = date.fromisoformat(c["start_date"])
-                c_end = date.fromisoformat(c["end_date"])
-                if c_start <= current <= c_end:
-                    day_items.append(schemas.CalendarDayItem(
-                        id=UUID(c["id"]) if c.get("id") else None,
-                        title=c["name"],
-                        item_type="closure",
-                        date=current,
-                        is_all_day=True,
-                        metadata={
-                            "closure_id": c["id"],
-                            "location_id": c.get("location_id")
-                        }
-                    ))
+            for c in closures_by_day.get(current, ()):
+                day_items.append(schemas.CalendarDayItem(
+                    id=UUID(c["id"]) if c.get("id") else None,
+                    title=c["name"],
+                    item_type="closure",
+                    date=current,
+                    is_all_day=True,
+                    metadata={
+                        "closure_id": c["id"],
+                        "location_id": c.get("location_id")
+                    }
+                ))
             
             # -- Check Events --
-            for e in events:
-                if e.start_date <= current <= e.end_date:
-                    day_items.append(schemas.CalendarDayItem(
-                        id=e.id,
-                        title=e.title,
-                        item_type=e.event_type or "event",
-                        date=current,
-                        start_date=e.start_date,
-                        start_time=e.start_time,
-                        end_time=e.end_time,
-                        is_all_day=e.is_all_day,
-                        color=e.color, 
-                        metadata={
-                            "calendar_id": str(e.calendar_id) if e.calendar_id else None,
-                            "location": e.location,
-                            "visibility": e.visibility,
-                            "status": e.status,
-                            "is_virtual": e.is_virtual,
-                            "meeting_url": e.meeting_url
-                        }
-                    ))
+            for e in events_by_day.get(current, ()):
+                metadata = {
+                    "calendar_id": str(e.calendar_id) if e.calendar_id else None,
+                    "location": e.location,
+                    "visibility": e.visibility,
+                    "status": e.status,
+                    "is_virtual": e.is_virtual,
+                    "meeting_url": e.meeting_url
+                }
+                if isinstance(e, EventOccurrence):
+                    metadata["occurrence_date"] = e.occurrence_date.isoformat()
+                day_items.append(schemas.CalendarDayItem(
+                    id=e.id,
+                    title=e.title,
+                    item_type=e.event_type or "event",
+                    date=current,
+                    start_date=e.start_date,
+                    start_time=e.start_time,
+                    end_time=e.end_time,
+                    is_all_day=e.is_all_day,
+                    color=e.color, 
+                    metadata=metadata
+                ))
                     
             # -- Check Leaves --
-            for lv in leaves:
-                if lv["start_date"] <= current <= lv["end_date"]:
-                     day_items.append(schemas.CalendarDayItem(
-                        id=UUID(lv["id"]) if "id" in lv else None,
-                        title=lv.get("leave_type_code", "Ferie"),
-                        item_type="leave",
-                        date=current,
-                        is_all_day=True,
-                        metadata={
-                            "leave_type_code": lv.get("leave_type_code"),
-                            "status": lv.get("status")
-                        }
-                    ))
+            for lv in leaves_by_day.get(current, ()):
+                day_items.append(schemas.CalendarDayItem(
+                    id=UUID(lv["id"]) if "id" in lv else None,
+                    title=lv.get("leave_type_code", "Ferie"),
+                    item_type="leave",
+                    date=current,
+                    is_all_day=True,
+                    metadata={
+                        "leave_type_code": lv.get("leave_type_code"),
+                        "status": lv.get("status")
+                    }
+                ))
 
             days_views.append(schemas.CalendarDayView(
                 date=current,
@@ -19,7 +19,10 @@ from src.services.calendar.models import (
 )
 from src.services.calendar import schemas
 from src.services.calendar.services.base import BaseCalendarService
-from src.services.calendar.exceptions import EventNotFound, EventAccessDenied, CalendarAccessDenied
+from src.services.calendar.recurrence import expand_events, occurrence_cache, validate_rule
+from src.services.calendar.exceptions import (
+    EventNotFound, EventAccessDenied, CalendarAccessDenied, InvalidEventDates
+)
 
 
 class CalendarEventService(BaseCalendarService):
@@ -57,12 +60,17 @@ class CalendarEventService(BaseCalendarService):
             return []
         
         # Build query via repo
-        return await self._event_repo.get_visible_events(
+        events = await self._event_repo.get_visible_events(
             calendar_ids=all_calendar_ids,
             start_date=start_date,
             end_date=end_date,
             event_type=event_type
         )
+        
+        # Recurring series can only be expanded over a bounded window
+        if start_date and end_date:
+            return expand_events(events, start_date, end_date)
+        return list(events)
     
     async def get_event(self, event_id: UUID) -> Optional[CalendarEvent]:
         """Get event by ID."""
@@ -83,6 +91,9 @@ class CalendarEventService(BaseCalendarService):
             logger.warning(f"User {user_id} denied write access to calendar {calendar_id}")
             raise CalendarAccessDenied(calendar_id, user_id, "write")
         
+        if data.is_recurring and data.recurrence_rule:
+            validate_rule(data.recurrence_rule, data.start_date)
+        
         # Create event
         event_dict = data.model_dump(exclude={"calendar_id", "participant_ids"})
         event = CalendarEvent(
@@ -148,6 +159,13 @@ class CalendarEventService(BaseCalendarService):
         for key, value in update_dict.items():
             setattr(event, key, value)
         
+        # A partial update can move one bound past the stored other one
+        if event.end_date < event.start_date:
+            raise InvalidEventDates(event.start_date, event.end_date)
+        
+        if event.is_recurring and event.recurrence_rule:
+            validate_rule(event.recurrence_rule, event.start_date)
+        
         # Handle participants update if provided
         if data.participant_ids is not None:
             # Clear existing participants
@@ -164,6 +182,7 @@ class CalendarEventService(BaseCalendarService):
 
         await self._event_repo.update(event)
         await self.db.commit()
+        occurrence_cache.invalidate(event_id)
 
         # Reload event properly to load relationships
         loaded_event = await self.get_event(event.id)
@@ -195,6 +214,7 @@ class CalendarEventService(BaseCalendarService):
         event_title = event.title
         await self._event_repo.delete(event)
         await self.db.commit()
+        occurrence_cache.invalidate(event_id)
         
         await self._audit.log_action(
             user_id=user_id,
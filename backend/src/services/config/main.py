@@ -5,6 +5,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import settings
+from src.core.serialization import DEFAULT_RESPONSE_CLASS
 from src.core.database import init_db, close_db
 from src.services.config.router import router
 # Import models to register them with SQLAlchemy metadata
@@ -25,6 +26,7 @@ app = FastAPI(
     title="KRONOS Config Service",
     description="Dynamic configuration service for KRONOS HRMS",
     version="1.0.0",
+    default_response_class=DEFAULT_RESPONSE_CLASS,
     lifespan=lifespan,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
@@ -50,6 +52,18 @@ app.include_router(setup_router, prefix="/api/v1/config")
 from src.core.middleware import RequestContextMiddleware
 app.add_middleware(RequestContextMiddleware)
 
+# Conditional GET (ETag / 304) for reference data read by other services
+from src.core.etag import ETagMiddleware
+app.add_middleware(ETagMiddleware, paths=["/api/v1/config", "/api/v1/leave-types", "/api/v1/expense-types"])
+
+# Internal batch endpoint (several GETs in one request, see src.core.batch)
+from src.core.batch import router as batch_router
+app.include_router(batch_router)
+
+# Prometheus scrape endpoint
+from src.core.metrics import router as metrics_router
+app.include_router(metrics_router)
+
 # Register Error Handlers
 from src.core.error_handlers import register_error_handlers
 register_error_handlers(app)
@@ -321,6 +321,7 @@ class TripAttachment(Base):
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     content_type: Mapped[str] = mapped_column(String(100), nullable=False)
     size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    checksum_sha256: Mapped[Optional[str]] = mapped_column(String(64))
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -352,6 +353,7 @@ class ReportAttachment(Base):
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     content_type: Mapped[str] = mapped_column(String(100), nullable=False)
     size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    checksum_sha256: Mapped[Optional[str]] = mapped_column(String(64))
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -360,3 +362,23 @@ class ReportAttachment(Base):
     
     # Relationship
     report: Mapped["ExpenseReport"] = relationship(back_populates="attachments")
+
+
+class ReportNumberCounter(Base):
+    """Per-year counter for expense report numbers (NS-{year}-{n}).
+    
+    Numbers are handed out with a single row-locked UPSERT, so allocation is
+    O(1) and concurrent creates never receive the same number.
+    """
+    
+    __tablename__ = "report_number_counters"
+    __table_args__ = {"schema": "expenses"}
+    
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    last_value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
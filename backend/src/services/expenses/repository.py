@@ -4,7 +4,8 @@ from decimal import Decimal
 from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import select, func, and_, desc
+from sqlalchemy import Integer, select, func, and_, desc
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -15,9 +16,17 @@ from src.services.expenses.models import (
     ExpenseReport,
     ExpenseReportStatus,
     ExpenseItem,
+    ReportNumberCounter,
 )
 from src.shared.schemas import DataTableRequest
 
+REPORT_NUMBER_PREFIX = "NS"
+
+
+def format_report_number(year: int, value: int) -> str:
+    """Format an expense report number, e.g. NS-2026-00042."""
+    return f"{REPORT_NUMBER_PREFIX}-{year}-{value:05d}"
+
 
 class BusinessTripRepository:
     """Repository for business trips."""
@@ -304,13 +313,76 @@ class ExpenseReportRepository:
 
     async def generate_report_number(self, year: int) -> str:
         """Generate unique report number."""
-        # Get count of reports for this year
+        return (await self.allocate_report_numbers(year, 1))[0]
+
+    async def allocate_report_numbers(self, year: int, count: int) -> list[str]:
+        """Reserve a block of consecutive report numbers for a year.
+        
+        The counter row stays locked until the surrounding transaction ends,
+        so numbers are unique and gapless even under concurrent creates.
+        Bulk imports should reserve their whole block with one call.
+        """
+        if count < 1:
+            raise ValueError("count must be positive")
+        
+        stmt = (
+            pg_insert(ReportNumberCounter)
+            .values(year=year, last_value=count)
+            .on_conflict_do_update(
+                index_elements=[ReportNumberCounter.year],
+                set_={
+                    "last_value": ReportNumberCounter.last_value + count,
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(ReportNumberCounter.last_value)
+        )
+        last_value = (await self._session.execute(stmt)).scalar_one()
+        first_value = last_value - count + 1
+        return [
+            format_report_number(year, n) for n in range(first_value, last_value + 1)
+        ]
+
+    async def get_max_report_sequence(self, year: int) -> int:
+        """Highest sequence already used in report numbers of a year."""
         result = await self._session.execute(
-            select(func.count(ExpenseReport.id))
-            .where(func.extract("year", ExpenseReport.created_at) == year)
+            select(
+                func.max(
+                    func.cast(func.split_part(ExpenseReport.report_number, "-", 3), Integer)
+                )
+            ).where(ExpenseReport.report_number.regexp_match(f"^{REPORT_NUMBER_PREFIX}-{year}-[0-9]+$"))
+        )
+        return result.scalar() or 0
+
+    async def reseed_report_numbers(self, year: int) -> int:
+        """Reset a year's counter to the highest number already in use.
+        
+        Recovery path after restores or manual imports that bypassed the
+        allocator. Never moves the counter backwards.
+        """
+        max_value = await self.get_max_report_sequence(year)
+        stmt = (
+            pg_insert(ReportNumberCounter)
+            .values(year=year, last_value=max_value)
+            .on_conflict_do_update(
+                index_elements=[ReportNumberCounter.year],
+                set_={
+                    "last_value": func.greatest(ReportNumberCounter.last_value, max_value),
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(ReportNumberCounter.last_value)
         )
-        count = (result.scalar() or 0) + 1
-        return f"NS-{year}-{count:05d}"
+        return (await self._session.execute(stmt)).scalar_one()
+
+    async def get_report_number_years(self) -> list[int]:
+        """Years that have reports or a counter row."""
+        report_years = select(
+            func.cast(func.split_part(ExpenseReport.report_number, "-", 2), Integer)
+        ).where(ExpenseReport.report_number.regexp_match(f"^{REPORT_NUMBER_PREFIX}-[0-9]{{4}}-[0-9]+$"))
+        counter_years = select(ReportNumberCounter.year)
+        result = await self._session.execute(report_years.union(counter_years))
+        return sorted(result.scalars().all())
 
     async def create(self, **kwargs: Any) -> ExpenseReport:
         """Create report."""
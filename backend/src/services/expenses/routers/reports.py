@@ -17,7 +17,11 @@ from src.services.expenses.schemas import (
     ApproveReportRequest,
     RejectReportRequest,
     MarkPaidRequest,
-    ExpenseAdminDataTableResponse
+    ExpenseAdminDataTableResponse,
+    AttachmentUploadRequest,
+    AttachmentUploadResponse,
+    AttachmentUploadComplete,
+    AttachmentDownloadResponse,
 )
 
 router = APIRouter()
@@ -189,9 +193,40 @@ async def upload_report_attachment(
     service: ExpenseService = Depends(get_expense_service),
 ):
     """Upload PDF attachment for an expense report."""
-    user_id = token.user_id
-    content = await file.read()
-    
-    return await service.update_report_attachment(
-        id, user_id, content, file.filename, file.content_type
+    return await service.update_report_attachment(id, token.user_id, file)
+
+
+@router.post("/expenses/{id}/attachment/upload-url", response_model=AttachmentUploadResponse)
+async def create_report_attachment_upload(
+    id: UUID,
+    data: AttachmentUploadRequest,
+    token: TokenPayload = Depends(get_current_user),
+    service: ExpenseService = Depends(get_expense_service),
+):
+    """Get a presigned URL to upload an expense report attachment directly to storage."""
+    return await service.create_report_attachment_upload(
+        id, token.user_id, data.filename, data.content_type
     )
+
+
+@router.post("/expenses/{id}/attachment/complete", response_model=ExpenseReportResponse)
+async def complete_report_attachment_upload(
+    id: UUID,
+    data: AttachmentUploadComplete,
+    token: TokenPayload = Depends(get_current_user),
+    service: ExpenseService = Depends(get_expense_service),
+):
+    """Register an attachment uploaded through a presigned URL."""
+    return await service.complete_report_attachment_upload(
+        id, token.user_id, data.file_path, data.filename
+    )
+
+
+@router.get("/expenses/{id}/attachment/download-url", response_model=AttachmentDownloadResponse)
+async def get_report_attachment_download(
+    id: UUID,
+    token: TokenPayload = Depends(get_current_user),
+    service: ExpenseService = Depends(get_expense_service),
+):
+    """Get a temporary URL to download the expense report attachment."""
+    return await service.get_report_attachment_download(id)
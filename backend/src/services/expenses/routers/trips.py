@@ -19,7 +19,11 @@ from src.services.expenses.schemas import (
     ApproveTripRequest,
     RejectTripRequest,
     DailyAllowanceResponse,
-    DailyAllowanceUpdate
+    DailyAllowanceUpdate,
+    AttachmentUploadRequest,
+    AttachmentUploadResponse,
+    AttachmentUploadComplete,
+    AttachmentDownloadResponse,
 )
 from src.services.expenses.models import TripStatus
 
@@ -205,14 +209,45 @@ async def upload_trip_attachment(
     service: ExpenseService = Depends(get_expense_service),
 ):
     """Upload PDF attachment for a trip."""
-    user_id = token.user_id
-    content = await file.read()
-    
-    return await service.update_trip_attachment(
-        id, user_id, content, file.filename, file.content_type
+    return await service.update_trip_attachment(id, token.user_id, file)
+
+
+@router.post("/trips/{id}/attachment/upload-url", response_model=AttachmentUploadResponse)
+async def create_trip_attachment_upload(
+    id: UUID,
+    data: AttachmentUploadRequest,
+    token: TokenPayload = Depends(get_current_user),
+    service: ExpenseService = Depends(get_expense_service),
+):
+    """Get a presigned URL to upload a trip attachment directly to storage."""
+    return await service.create_trip_attachment_upload(
+        id, token.user_id, data.filename, data.content_type
+    )
+
+
+@router.post("/trips/{id}/attachment/complete", response_model=BusinessTripResponse)
+async def complete_trip_attachment_upload(
+    id: UUID,
+    data: AttachmentUploadComplete,
+    token: TokenPayload = Depends(get_current_user),
+    service: ExpenseService = Depends(get_expense_service),
+):
+    """Register an attachment uploaded through a presigned URL."""
+    return await service.complete_trip_attachment_upload(
+        id, token.user_id, data.file_path, data.filename
     )
 
 
+@router.get("/trips/{id}/attachment/download-url", response_model=AttachmentDownloadResponse)
+async def get_trip_attachment_download(
+    id: UUID,
+    token: TokenPayload = Depends(get_current_user),
+    service: ExpenseService = Depends(get_expense_service),
+):
+    """Get a temporary URL to download the trip attachment."""
+    return await service.get_trip_attachment_download(id)
+
+
 # ═══════════════════════════════════════════════════════════
 # Daily Allowance Endpoints
 # ═══════════════════════════════════════════════════════════
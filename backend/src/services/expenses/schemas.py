@@ -21,9 +21,39 @@ class AttachmentResponse(IDMixin, BaseSchema):
     file_path: str
     content_type: str
     size_bytes: int
+    checksum_sha256: Optional[str] = None
     created_at: datetime
 
 
+class AttachmentUploadRequest(BaseModel):
+    """Request a presigned URL for a direct browser upload."""
+    
+    filename: str = Field(..., max_length=255)
+    content_type: str = Field(..., max_length=100)
+
+
+class AttachmentUploadResponse(BaseModel):
+    """Presigned upload target returned to the browser."""
+    
+    upload_url: str
+    file_path: str
+    expires_in: int
+
+
+class AttachmentUploadComplete(BaseModel):
+    """Confirm a direct upload once the browser has PUT the file."""
+    
+    file_path: str = Field(..., max_length=500)
+    filename: str = Field(..., max_length=255)
+
+
+class AttachmentDownloadResponse(BaseModel):
+    """Presigned download URL of a stored attachment."""
+    
+    download_url: str
+    expires_in: int
+
+
 class BusinessTripBase(BaseModel):
     """Base business trip schema."""
     
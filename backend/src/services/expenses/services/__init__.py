@@ -17,6 +17,7 @@ from typing import Optional, List
 from uuid import UUID
 from datetime import date
 
+from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.services.expenses.models import TripStatus, ExpenseReportStatus, DestinationType
@@ -109,8 +110,17 @@ class ExpenseService(BaseExpenseService):
     async def cancel_trip(self, id: UUID, user_id: UUID, reason: str):
         return await self._trips.cancel_trip(id, user_id, reason)
 
-    async def update_trip_attachment(self, id: UUID, user_id: UUID, content: bytes, filename: str, content_type: str):
-        return await self._trips.update_trip_attachment(id, user_id, content, filename, content_type)
+    async def update_trip_attachment(self, id: UUID, user_id: UUID, file: UploadFile):
+        return await self._trips.update_trip_attachment(id, user_id, file)
+
+    async def create_trip_attachment_upload(self, id: UUID, user_id: UUID, filename: str, content_type: str):
+        return await self._trips.create_trip_attachment_upload(id, user_id, filename, content_type)
+
+    async def complete_trip_attachment_upload(self, id: UUID, user_id: UUID, file_path: str, filename: str):
+        return await self._trips.complete_trip_attachment_upload(id, user_id, file_path, filename)
+
+    async def get_trip_attachment_download(self, id: UUID):
+        return await self._trips.get_trip_attachment_download(id)
 
     async def handle_approval_callback(self, data: ApprovalCallback):
         """Handle approval callback routing."""
@@ -219,8 +229,17 @@ class ExpenseService(BaseExpenseService):
     async def cancel_report(self, id: UUID, user_id: UUID, reason: str):
         return await self._reports.cancel_report(id, user_id, reason)
 
-    async def update_report_attachment(self, id: UUID, user_id: UUID, content: bytes, filename: str, content_type: str):
-        return await self._reports.update_report_attachment(id, user_id, content, filename, content_type)
+    async def update_report_attachment(self, id: UUID, user_id: UUID, file: UploadFile):
+        return await self._reports.update_report_attachment(id, user_id, file)
+
+    async def create_report_attachment_upload(self, id: UUID, user_id: UUID, filename: str, content_type: str):
+        return await self._reports.create_report_attachment_upload(id, user_id, filename, content_type)
+
+    async def complete_report_attachment_upload(self, id: UUID, user_id: UUID, file_path: str, filename: str):
+        return await self._reports.complete_report_attachment_upload(id, user_id, file_path, filename)
+
+    async def get_report_attachment_download(self, id: UUID):
+        return await self._reports.get_report_attachment_download(id)
 
     # ═══════════════════════════════════════════════════════════════════════
     # Expense Items (delegated to ExpenseItemService)
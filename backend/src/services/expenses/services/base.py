@@ -4,12 +4,16 @@ KRONOS - Expenses Service Base
 Shared dependencies and utilities for Expenses sub-services.
 """
 import logging
+from datetime import datetime
 from typing import Optional, Any
 from uuid import UUID
 
+from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.exceptions import BusinessRuleError, NotFoundError, ValidationError
 from src.shared.audit_client import get_audit_logger
+from src.shared.storage import StoredObject, get_storage
 from src.shared.clients import (
     AuthClient, 
     ConfigClient, 
@@ -26,6 +30,10 @@ from src.services.expenses.repository import (
 
 logger = logging.getLogger(__name__)
 
+ATTACHMENT_CONTENT_TYPE = "application/pdf"
+ATTACHMENT_UPLOAD_URL_TTL = 900
+ATTACHMENT_DOWNLOAD_URL_TTL = 3600
+
 
 class BaseExpenseService:
     """Base class for expense-related services with common dependencies."""
@@ -98,3 +106,68 @@ class BaseExpenseService:
             "DIV": "OTHER"
         }
         return mapping.get(code, "OTHER")
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Attachments
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def _attachment_key(self, prefix: str, id: UUID, filename: str) -> str:
+        """Build a unique storage key, e.g. ``trip_<id>_<ts>.pdf``."""
+        ext = filename.split(".")[-1]
+        return f"{prefix}_{id}_{datetime.utcnow().timestamp()}.{ext}"
+
+    def _validate_attachment(self, content_type: str, size: Optional[int], max_size: int) -> None:
+        if content_type != ATTACHMENT_CONTENT_TYPE:
+            raise ValidationError("Only PDF files are allowed", field="attachment")
+        if size is not None and size > max_size:
+            raise ValidationError(
+                f"File size exceeds {max_size // (1024 * 1024)}MB limit", field="attachment"
+            )
+
+    async def _upload_attachment(self, file: UploadFile, key: str, max_size: int) -> StoredObject:
+        """Validate and stream an uploaded attachment to storage."""
+        # UploadFile.size is known up front for multipart bodies: reject early
+        self._validate_attachment(file.content_type, file.size, max_size)
+        try:
+            return await get_storage().upload(file, key, file.content_type, max_size=max_size)
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error(f"File upload failed: {str(e)}")
+            raise BusinessRuleError("Failed to upload file to storage")
+
+    async def _presign_attachment_upload(
+        self, key: str, content_type: str, max_size: int
+    ) -> dict:
+        """Get a presigned PUT URL for a direct browser upload."""
+        self._validate_attachment(content_type, None, max_size)
+        try:
+            url = await get_storage().get_presigned_put_url(key, ATTACHMENT_UPLOAD_URL_TTL)
+        except Exception as e:
+            logger.error(f"Failed to generate presigned upload URL: {str(e)}")
+            raise BusinessRuleError("Failed to prepare file upload")
+        return {"upload_url": url, "file_path": key, "expires_in": ATTACHMENT_UPLOAD_URL_TTL}
+
+    async def _verify_direct_upload(self, key: str, prefix: str, id: UUID, max_size: int) -> StoredObject:
+        """Check that a browser upload landed in storage and respects the limits."""
+        if not key.startswith(f"{prefix}_{id}_"):
+            raise ValidationError("Invalid attachment path", field="file_path")
+        stored = await get_storage().stat(key)
+        if stored is None:
+            raise ValidationError("Uploaded file not found in storage", field="file_path")
+        # The presigned PUT does not bind type or size: drop a non-conforming upload
+        try:
+            self._validate_attachment(stored.content_type, stored.size, max_size)
+        except ValidationError:
+            await get_storage().delete(key)
+            raise
+        return stored
+
+    async def _presign_attachment_download(self, key: Optional[str]) -> dict:
+        """Get a (cached) presigned GET URL for a stored attachment."""
+        if not key:
+            raise NotFoundError("Attachment not found")
+        url = await get_storage().get_presigned_url(key, ATTACHMENT_DOWNLOAD_URL_TTL)
+        if url is None:
+            raise BusinessRuleError("Failed to prepare file download")
+        return {"download_url": url, "expires_in": ATTACHMENT_DOWNLOAD_URL_TTL}
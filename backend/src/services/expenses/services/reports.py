@@ -9,7 +9,9 @@ from decimal import Decimal
 from typing import Optional
 from uuid import UUID, uuid4
 
-from src.core.exceptions import NotFoundError, BusinessRuleError, ValidationError
+from fastapi import UploadFile
+
+from src.core.exceptions import NotFoundError, BusinessRuleError
 from src.services.expenses.models import ExpenseReportStatus, ReportAttachment
 from src.services.expenses.schemas import (
     ExpenseReportCreate,
@@ -19,11 +21,13 @@ from src.services.expenses.schemas import (
     ExpenseAdminDataTableItem,
 )
 from src.shared.schemas import DataTableRequest
-from src.shared.storage import storage_manager
-from src.services.expenses.services.base import BaseExpenseService
+from src.shared.storage import StoredObject
+from src.services.expenses.services.base import BaseExpenseService, ATTACHMENT_CONTENT_TYPE
 
 logger = logging.getLogger(__name__)
 
+REPORT_ATTACHMENT_MAX_SIZE = 5 * 1024 * 1024
+
 
 class ExpenseReportService(BaseExpenseService):
     """
@@ -138,12 +142,24 @@ class ExpenseReportService(BaseExpenseService):
             if trip.user_id != user_id:
                 raise BusinessRuleError("Cannot create report for another user's trip")
         
-        # Generate report number
+        report_id = uuid4()
+        await self._audit.log_action(
+            user_id=user_id,
+            action="CREATE",
+            resource_type="EXPENSE_REPORT",
+            resource_id=str(report_id),
+            description=f"Created {'standalone ' if is_standalone else ''}report {data.title}",
+            request_data=data.model_dump(mode="json"),
+        )
+        
+        # Last before the commit: allocating locks the year's counter row
+        # until the transaction ends
         report_number = await self._report_repo.generate_report_number(
             date.today().year
         )
         
-        report = await self._report_repo.create(
+        return await self._report_repo.create(
+            id=report_id,
             trip_id=data.trip_id,
             is_standalone=is_standalone,
             user_id=user_id,
@@ -154,19 +170,10 @@ class ExpenseReportService(BaseExpenseService):
             employee_notes=data.employee_notes,
             status=ExpenseReportStatus.DRAFT,
             total_amount=Decimal(0),
+            # A new report has none: no refresh needed to serialize them
+            items=[],
+            attachments=[],
         )
-        
-        await self._audit.log_action(
-            user_id=user_id,
-            action="CREATE",
-            resource_type="EXPENSE_REPORT",
-            resource_id=str(report.id),
-            description=f"Created {'standalone ' if is_standalone else ''}report {data.title}",
-            request_data=data.model_dump(mode="json"),
-        )
-        
-        await self.db.refresh(report, ["items", "attachments"])
-        return report
 
     async def submit_report(self, id: UUID, user_id: UUID):
         """Submit report for approval."""
@@ -364,35 +371,56 @@ class ExpenseReportService(BaseExpenseService):
         
         return await self.get_report(id)
 
-    async def update_report_attachment(
-        self, id: UUID, user_id: UUID, content: bytes, filename: str, content_type: str
-    ):
+    async def update_report_attachment(self, id: UUID, user_id: UUID, file: UploadFile):
         """Upload and update report attachment."""
         report = await self.get_report(id)
         if report.user_id != user_id:
             raise BusinessRuleError("Cannot update another user's report")
         
-        # Validation
-        if content_type != "application/pdf":
-            raise ValidationError("Only PDF files are allowed", field="attachment")
-        if len(content) > 5 * 1024 * 1024:
-            raise ValidationError("File size exceeds 5MB limit", field="attachment")
+        storage_filename = self._attachment_key("report", id, file.filename)
+        stored = await self._upload_attachment(file, storage_filename, REPORT_ATTACHMENT_MAX_SIZE)
         
-        # Unique filename
-        ext = filename.split(".")[-1]
-        storage_filename = f"report_{id}_{datetime.utcnow().timestamp()}.{ext}"
+        return await self._add_report_attachment(report, user_id, stored, file.filename)
+
+    async def create_report_attachment_upload(
+        self, id: UUID, user_id: UUID, filename: str, content_type: str
+    ) -> dict:
+        """Get a presigned URL so the browser can upload the attachment directly."""
+        report = await self.get_report(id)
+        if report.user_id != user_id:
+            raise BusinessRuleError("Cannot update another user's report")
         
-        path = storage_manager.upload_file(content, storage_filename, content_type)
-        if not path:
-            raise BusinessRuleError("Failed to upload file to storage")
-            
-        # Create attachment record
+        storage_filename = self._attachment_key("report", id, filename)
+        return await self._presign_attachment_upload(
+            storage_filename, content_type, REPORT_ATTACHMENT_MAX_SIZE
+        )
+
+    async def complete_report_attachment_upload(
+        self, id: UUID, user_id: UUID, file_path: str, filename: str
+    ):
+        """Register an attachment uploaded directly through a presigned URL."""
+        report = await self.get_report(id)
+        if report.user_id != user_id:
+            raise BusinessRuleError("Cannot update another user's report")
+        
+        stored = await self._verify_direct_upload(file_path, "report", id, REPORT_ATTACHMENT_MAX_SIZE)
+        
+        return await self._add_report_attachment(report, user_id, stored, filename)
+
+    async def get_report_attachment_download(self, id: UUID) -> dict:
+        """Get a temporary download URL for the report's attachment."""
+        report = await self.get_report(id)
+        return await self._presign_attachment_download(report.attachment_path)
+
+    async def _add_report_attachment(self, report, user_id: UUID, stored: StoredObject, filename: str):
+        """Create the attachment record for a stored file."""
         attachment = ReportAttachment(
-            report_id=id,
-            file_path=path,
+            report_id=report.id,
+            file_path=stored.key,
             filename=filename,
-            content_type=content_type,
-            size_bytes=len(content),
+            content_type=ATTACHMENT_CONTENT_TYPE,
+            size_bytes=stored.size,
+            checksum_sha256=stored.checksum,
         )
         self.db.add(attachment)
         
@@ -402,8 +430,8 @@ class ExpenseReportService(BaseExpenseService):
             user_id=user_id,
             action="UPLOAD_ATTACHMENT",
             resource_type="EXPENSE_REPORT",
-            resource_id=str(id),
-            description=f"Uploaded attachment {filename} for report {id}",
+            resource_id=str(report.id),
+            description=f"Uploaded attachment {filename} for report {report.id}",
         )
         
-        return await self.get_report(id)
+        return await self.get_report(report.id)
@@ -9,7 +9,9 @@ from decimal import Decimal
 from typing import Optional
 from uuid import UUID, uuid4
 
-from src.core.exceptions import NotFoundError, BusinessRuleError, ValidationError
+from fastapi import UploadFile
+
+from src.core.exceptions import NotFoundError, BusinessRuleError
 from src.services.expenses.models import TripStatus, TripAttachment
 from src.services.expenses.schemas import (
     BusinessTripCreate,
@@ -21,11 +23,13 @@ from src.services.expenses.schemas import (
     ApprovalCallback,
 )
 from src.shared.schemas import DataTableRequest
-from src.shared.storage import storage_manager
-from src.services.expenses.services.base import BaseExpenseService
+from src.shared.storage import StoredObject
+from src.services.expenses.services.base import BaseExpenseService, ATTACHMENT_CONTENT_TYPE
 
 logger = logging.getLogger(__name__)
 
+TRIP_ATTACHMENT_MAX_SIZE = 2 * 1024 * 1024
+
 
 class ExpenseTripService(BaseExpenseService):
     """
@@ -330,40 +334,61 @@ class ExpenseTripService(BaseExpenseService):
         
         return await self.get_trip(id)
 
-    async def update_trip_attachment(
-        self, id: UUID, user_id: UUID, content: bytes, filename: str, content_type: str
-    ):
+    async def update_trip_attachment(self, id: UUID, user_id: UUID, file: UploadFile):
         """Upload and update trip attachment."""
         trip = await self.get_trip(id)
         if trip.user_id != user_id:
             raise BusinessRuleError("Cannot update another user's trip")
         
-        # Validation
-        if content_type != "application/pdf":
-            raise ValidationError("Only PDF files are allowed", field="attachment")
-        if len(content) > 2 * 1024 * 1024:
-            raise ValidationError("File size exceeds 2MB limit", field="attachment")
+        storage_filename = self._attachment_key("trip", id, file.filename)
+        stored = await self._upload_attachment(file, storage_filename, TRIP_ATTACHMENT_MAX_SIZE)
         
-        # Unique filename
-        ext = filename.split(".")[-1]
-        storage_filename = f"trip_{id}_{datetime.utcnow().timestamp()}.{ext}"
+        return await self._add_trip_attachment(trip, user_id, stored, file.filename)
+
+    async def create_trip_attachment_upload(
+        self, id: UUID, user_id: UUID, filename: str, content_type: str
+    ) -> dict:
+        """Get a presigned URL so the browser can upload the attachment directly."""
+        trip = await self.get_trip(id)
+        if trip.user_id != user_id:
+            raise BusinessRuleError("Cannot update another user's trip")
         
-        path = storage_manager.upload_file(content, storage_filename, content_type)
-        if not path:
-            raise BusinessRuleError("Failed to upload file to storage")
-            
-        # Create attachment record
+        storage_filename = self._attachment_key("trip", id, filename)
+        return await self._presign_attachment_upload(
+            storage_filename, content_type, TRIP_ATTACHMENT_MAX_SIZE
+        )
+
+    async def complete_trip_attachment_upload(
+        self, id: UUID, user_id: UUID, file_path: str, filename: str
+    ):
+        """Register an attachment uploaded directly through a presigned URL."""
+        trip = await self.get_trip(id)
+        if trip.user_id != user_id:
+            raise BusinessRuleError("Cannot update another user's trip")
+        
+        stored = await self._verify_direct_upload(file_path, "trip", id, TRIP_ATTACHMENT_MAX_SIZE)
+        
+        return await self._add_trip_attachment(trip, user_id, stored, filename)
+
+    async def get_trip_attachment_download(self, id: UUID) -> dict:
+        """Get a temporary download URL for the trip's attachment."""
+        trip = await self.get_trip(id)
+        return await self._presign_attachment_download(trip.attachment_path)
+
+    async def _add_trip_attachment(self, trip, user_id: UUID, stored: StoredObject, filename: str):
+        """Create the attachment record for a stored file."""
         attachment = TripAttachment(
-            trip_id=id,
-            file_path=path,
+            trip_id=trip.id,
+            file_path=stored.key,
             filename=filename,
-            content_type=content_type,
-            size_bytes=len(content),
+            content_type=ATTACHMENT_CONTENT_TYPE,
+            size_bytes=stored.size,
+            checksum_sha256=stored.checksum,
         )
         self.db.add(attachment)
         
         # Update legacy path for compatibility
-        trip.attachment_path = path
+        trip.attachment_path = stored.key
         
         await self.db.commit()
         
@@ -372,11 +397,11 @@ class ExpenseTripService(BaseExpenseService):
             user_id=user_id,
             action="UPLOAD_ATTACHMENT",
             resource_type="BUSINESS_TRIP",
-            resource_id=str(id),
-            description=f"Uploaded attachment {filename} for trip {id}",
+            resource_id=str(trip.id),
+            description=f"Uploaded attachment {filename} for trip {trip.id}",
         )
         
-        return await self.get_trip(id)
+        return await self.get_trip(trip.id)
 
     async def handle_approval_callback(self, data: ApprovalCallback, approve_callback=None, reject_callback=None):
         """
@@ -256,10 +256,13 @@ class AttendanceAggregator(BaseAggregator):
             # Get holidays for the period
             holidays = []
             try:
+                # Uncached: timesheets store the result, and the dirty-day job
+                # runs right after a holiday changes
                 holidays = await self._calendar_client.get_holidays(
                     year=start_date.year,
                     start_date=start_date,
-                    end_date=end_date
+                    end_date=end_date,
+                    cache=None,
                 )
             except Exception as e:
                 logger.warning(f"Could not fetch holidays: {e}")
@@ -0,0 +1,246 @@
+"""
+KRONOS HR Reporting Service - Compact Day Grid for Monthly Timesheets.
+
+A timesheet month is stored as a packed grid instead of a JSON list of
+per-day dicts: one status-code byte per day followed by the worked minutes
+per day (little-endian uint16). Leave types and notes are rare and kept
+apart in a sparse ``{day_of_month: {...}}`` dict.
+
+Expected hours and weekday are derived, and display labels come from
+``DayStatus``: the per-day dicts (``to_items``) are built only when a
+timesheet is returned by the API.
+
+Summaries count status codes with ``bytes.count`` / ``bytes.translate``
+instead of matching label substrings day by day.
+"""
+import calendar
+import enum
+import sys
+from array import array
+from datetime import date, timedelta
+from typing import Any, Iterable, Optional
+
+MINUTES_PER_HOUR = 60
+STANDARD_DAY_MINUTES = 8 * MINUTES_PER_HOUR
+
+
+class DayStatus(enum.IntEnum):
+    """Status code of a timesheet day (one byte in the grid)."""
+    BLANK = 0        # Future working day, nothing planned yet
+    PRESENT = 1
+    TRIP = 2
+    SICKNESS = 3
+    VACATION = 4
+    ROL = 5
+    PERMIT = 6
+    ABSENT = 7       # Other leave types, labelled with the leave type code
+    WEEKEND = 8
+    HOLIDAY = 9
+
+    @property
+    def label(self) -> str:
+        return STATUS_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label: Optional[str]) -> "DayStatus":
+        """Code of a display label (as produced by the attendance aggregator)."""
+        label = label or ""
+        for status, status_label in STATUS_LABELS.items():
+            if label == status_label:
+                return status
+        if label.startswith(STATUS_LABELS[cls.ABSENT]):
+            return cls.ABSENT
+        raise ValueError(f"Unknown timesheet day status: {label!r}")
+
+
+STATUS_LABELS = {
+    DayStatus.BLANK: "",
+    DayStatus.PRESENT: "Presente",
+    DayStatus.TRIP: "Trasferta",
+    DayStatus.SICKNESS: "Malattia",
+    DayStatus.VACATION: "Ferie",
+    DayStatus.ROL: "ROL",
+    DayStatus.PERMIT: "Permesso",
+    DayStatus.ABSENT: "Assente",
+    DayStatus.WEEKEND: "Weekend",
+    DayStatus.HOLIDAY: "Festività",
+}
+
+NON_WORKING = frozenset({DayStatus.WEEKEND, DayStatus.HOLIDAY})
+
+
+def _mask(codes: Iterable[DayStatus]) -> bytes:
+    """``bytes.translate`` table mapping the given codes to 1, others to 0."""
+    table = bytearray(256)
+    for code in codes:
+        table[code] = 1
+    return bytes(table)
+
+
+_WORKED_MASK = _mask({DayStatus.PRESENT, DayStatus.TRIP})
+
+
+class DayGrid:
+    """Status codes, worked minutes and sparse notes of the days of one month."""
+
+    __slots__ = ("year", "month", "status", "minutes", "notes")
+
+    def __init__(
+        self,
+        year: int,
+        month: int,
+        status: Optional[bytearray] = None,
+        minutes: Optional[array] = None,
+        notes: Optional[dict[int, dict]] = None,
+    ) -> None:
+        size = calendar.monthrange(year, month)[1]
+        self.year = year
+        self.month = month
+        self.status = status if status is not None else bytearray(size)
+        self.minutes = minutes if minutes is not None else array("H", bytes(2 * size))
+        self.notes = notes if notes is not None else {}
+        if len(self.status) != size or len(self.minutes) != size:
+            raise ValueError(f"Day grid for {year}/{month} must have {size} days")
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    # ─── Storage ──────────────────────────────────────────
+
+    @classmethod
+    def from_storage(
+        cls,
+        year: int,
+        month: int,
+        packed: Optional[bytes],
+        notes: Optional[dict] = None,
+    ) -> "DayGrid":
+        """Decode the ``day_grid`` / ``day_notes`` columns."""
+        if not packed:
+            return cls(year, month)
+        size = len(packed) // 3
+        minutes = array("H")
+        minutes.frombytes(packed[size:])
+        if sys.byteorder != "little":
+            minutes.byteswap()
+        return cls(
+            year,
+            month,
+            bytearray(packed[:size]),
+            minutes,
+            {int(day): dict(note) for day, note in (notes or {}).items()},
+        )
+
+    def to_storage(self) -> tuple[bytes, Optional[dict]]:
+        """Encode as the ``day_grid`` / ``day_notes`` column values."""
+        minutes = array("H", self.minutes)
+        if sys.byteorder != "little":
+            minutes.byteswap()
+        notes = {str(day): note for day, note in sorted(self.notes.items())}
+        return bytes(self.status) + minutes.tobytes(), notes or None
+
+    # ─── Per-day items (aggregator input / API output) ────
+
+    @classmethod
+    def from_items(cls, year: int, month: int, items: Iterable[dict]) -> "DayGrid":
+        """Build a grid from per-day dicts; days not covered stay blank."""
+        grid = cls(year, month)
+        for item in items:
+            grid.set_item(item)
+        return grid
+
+    def set_item(self, item: dict) -> None:
+        """Store one per-day dict (as returned by the attendance aggregator)."""
+        day = item["date"]
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        if (day.year, day.month) != (self.year, self.month):
+            raise ValueError(f"{day} is not in {self.year}/{self.month}")
+
+        index = day.day - 1
+        self.status[index] = DayStatus.from_label(item.get("status"))
+        self.minutes[index] = round((item.get("hours_worked") or 0) * MINUTES_PER_HOUR)
+        note = {
+            key: item[key] for key in ("leave_type", "notes")
+            if item.get(key) is not None
+        }
+        if note:
+            self.notes[day.day] = note
+        else:
+            self.notes.pop(day.day, None)
+
+    def copy_days(self, other: "DayGrid", days: Iterable[date]) -> None:
+        """Overwrite the given days with those of another grid of the same month."""
+        for day in days:
+            index = day.day - 1
+            self.status[index] = other.status[index]
+            self.minutes[index] = other.minutes[index]
+            if day.day in other.notes:
+                self.notes[day.day] = dict(other.notes[day.day])
+            else:
+                self.notes.pop(day.day, None)
+
+    def to_items(self) -> list[dict[str, Any]]:
+        """Per-day dicts for the API (``TimesheetDay``)."""
+        items = []
+        first = date(self.year, self.month, 1)
+        for index, code in enumerate(self.status):
+            status = DayStatus(code)
+            current = first + timedelta(days=index)
+            note = self.notes.get(index + 1, {})
+            label = status.label
+            if status == DayStatus.ABSENT:
+                label = f"{label} ({note.get('leave_type') or ''})"
+            items.append({
+                "date": current,
+                "status": label,
+                "hours_worked": self.minutes[index] / MINUTES_PER_HOUR,
+                "hours_expected": 0.0 if status in NON_WORKING else STANDARD_DAY_MINUTES / MINUTES_PER_HOUR,
+                "leave_type": note.get("leave_type"),
+                "notes": note.get("notes"),
+                "weekday": current.weekday(),
+            })
+        return items
+
+    # ─── Computations ─────────────────────────────────────
+
+    def roll_elapsed(self, today: date) -> int:
+        """Mark blank weekdays up to ``today`` as present (8h); returns how many changed."""
+        if (self.year, self.month) > (today.year, today.month):
+            return 0
+        end = len(self) if (self.year, self.month) < (today.year, today.month) else today.day
+        first_weekday = calendar.weekday(self.year, self.month, 1)
+        rolled = 0
+        index = self.status.find(DayStatus.BLANK, 0, end)
+        while index != -1:
+            if (first_weekday + index) % 7 < 5:
+                self.status[index] = DayStatus.PRESENT
+                self.minutes[index] = STANDARD_DAY_MINUTES
+                rolled += 1
+            index = self.status.find(DayStatus.BLANK, index + 1, end)
+        return rolled
+
+    def summary(self) -> dict:
+        """Monthly totals (``TimesheetSummary``)."""
+        codes = bytes(self.status)
+        sickness = codes.count(DayStatus.SICKNESS)
+        vacation = codes.count(DayStatus.VACATION)
+        other = codes.count(DayStatus.ABSENT) + codes.count(DayStatus.ROL)
+        days_absent = sickness + vacation + other
+
+        # A day counts as worked with hours logged or a present/trip status:
+        # OR the two 0/1 byte masks as integers and count the set bits
+        worked_by_status = int.from_bytes(codes.translate(_WORKED_MASK), "little")
+        worked_by_hours = int.from_bytes(bytes(map(bool, self.minutes)), "little")
+        worked = (worked_by_status | worked_by_hours).bit_count()
+
+        return {
+            "total_days": len(codes),
+            "days_worked": float(worked),
+            "days_absent": float(days_absent),
+            "hours_worked": sum(self.minutes) / MINUTES_PER_HOUR,
+            "hours_absence": float(days_absent * 8.0),  # Approx
+            "sickness_days": float(sickness),
+            "vacation_days": float(vacation),
+            "other_days": float(other),
+        }
@@ -7,6 +7,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import settings
+from src.core.serialization import DEFAULT_RESPONSE_CLASS
 from .routers import (
     dashboard_router,
     reports_router,
@@ -20,6 +21,7 @@ app = FastAPI(
     title="KRONOS HR Reporting Service",
     description="Enterprise HR Analytics, Dashboards, and Compliance Reporting",
     version="1.0.0",
+    default_response_class=DEFAULT_RESPONSE_CLASS,
     docs_url="/docs",
     redoc_url="/redoc",
 )
@@ -48,6 +50,14 @@ app.include_router(timesheets_router, prefix="/api/v1/hr")
 from src.core.middleware import RequestContextMiddleware
 app.add_middleware(RequestContextMiddleware)
 
+# Internal batch endpoint (several GETs in one request, see src.core.batch)
+from src.core.batch import router as batch_router
+app.include_router(batch_router)
+
+# Prometheus scrape endpoint
+from src.core.metrics import router as metrics_router
+app.include_router(metrics_router)
+
 # Register Error Handlers
 from src.core.error_handlers import register_error_handlers
 register_error_handlers(app)
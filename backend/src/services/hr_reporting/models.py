@@ -14,6 +14,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Integer,
+    LargeBinary,
     Numeric,
     String,
     Text,
@@ -25,6 +26,8 @@ import enum
 
 from src.core.database import Base
 
+from .day_grid import DayGrid
+
 
 class ReportType(str, enum.Enum):
     """Types of reports."""
@@ -513,8 +516,9 @@ class MonthlyTimesheet(Base):
     # Status flow
     status: Mapped[str] = mapped_column(String(20), default="draft", index=True)
     
-    # Detailed data (Daily list)
-    days: Mapped[Optional[list[dict]]] = mapped_column(JSONB)
+    # Detailed data: packed day grid (see ``day_grid``) + sparse per-day notes
+    day_grid: Mapped[Optional[bytes]] = mapped_column(LargeBinary)
+    day_notes: Mapped[Optional[dict]] = mapped_column(JSONB)
     
     # Summary data (Totals)
     summary: Mapped[Optional[dict]] = mapped_column(JSONB)
@@ -541,6 +545,39 @@ class MonthlyTimesheet(Base):
         onupdate=func.now(),
     )
 
+    @property
+    def grid(self) -> DayGrid:
+        """Decoded day grid. Assign a grid back to store changes."""
+        return DayGrid.from_storage(self.year, self.month, self.day_grid, self.day_notes)
+
+    @grid.setter
+    def grid(self, grid: DayGrid) -> None:
+        self.day_grid, self.day_notes = grid.to_storage()
+
+
+# Employee id of dirty days that concern every employee (closures, holidays)
+ALL_EMPLOYEES = UUID(int=0)
+
+
+class TimesheetDirtyDay(Base):
+    """
+    A day whose timesheet entry is stale.
+    
+    Filled by database triggers on leave requests, business trips, closures
+    and holidays; drained by the timesheet refresh job, which recomputes
+    only these days. ``employee_id`` is ``ALL_EMPLOYEES`` for company-wide
+    changes.
+    """
+    __tablename__ = "timesheet_dirty_days"
+    __table_args__ = {"schema": "hr_reporting"}
+    
+    employee_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    marked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+    )
+
 
 class HRReportingSettings(Base):
     """
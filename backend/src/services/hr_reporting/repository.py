@@ -2,14 +2,19 @@ from datetime import date
 from typing import List, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, and_, desc, delete, extract
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .models import (
+    ALL_EMPLOYEES,
     GeneratedReport,
     DailySnapshot,
     HRAlert,
     EmployeeMonthlyStats,
+    MonthlyTimesheet,
+    TimesheetDirtyDay,
+    TimesheetStatus,
     TrainingRecord,
     MedicalRecord,
     SafetyCompliance,
@@ -116,6 +121,66 @@ class EmployeeMonthlyStatsRepository(BaseRepository):
         return stats
 
 
+class TimesheetDirtyDayRepository(BaseRepository):
+    """Set of (employee, day) timesheet entries waiting to be recomputed."""
+
+    async def mark(self, employee_id: UUID, days: Sequence[date]) -> None:
+        if not days:
+            return
+        await self.session.execute(
+            pg_insert(TimesheetDirtyDay)
+            .values([{"employee_id": employee_id, "day": day} for day in days])
+            .on_conflict_do_nothing()
+        )
+
+    async def expand_company_wide(self) -> None:
+        """Replace company-wide marks with marks for every open timesheet they touch."""
+        claimed = (
+            delete(TimesheetDirtyDay)
+            .where(TimesheetDirtyDay.employee_id == ALL_EMPLOYEES)
+            .returning(TimesheetDirtyDay.day)
+            .cte("claimed")
+        )
+        open_timesheets = (
+            select(MonthlyTimesheet.employee_id, claimed.c.day)
+            .join(
+                MonthlyTimesheet,
+                and_(
+                    MonthlyTimesheet.year == extract("year", claimed.c.day),
+                    MonthlyTimesheet.month == extract("month", claimed.c.day),
+                ),
+            )
+            .where(
+                MonthlyTimesheet.status.in_(
+                    [TimesheetStatus.DRAFT.value, TimesheetStatus.PENDING_CONFIRMATION.value]
+                )
+            )
+        )
+        await self.session.execute(
+            pg_insert(TimesheetDirtyDay)
+            .from_select(["employee_id", "day"], open_timesheets)
+            .on_conflict_do_nothing()
+        )
+
+    async def get_dirty_employee_ids(self) -> list[str]:
+        result = await self.session.execute(
+            select(TimesheetDirtyDay.employee_id)
+            .where(TimesheetDirtyDay.employee_id != ALL_EMPLOYEES)
+            .distinct()
+            .order_by(TimesheetDirtyDay.employee_id)
+        )
+        return [str(employee_id) for employee_id in result.scalars().all()]
+
+    async def claim(self, employee_id: UUID) -> list[date]:
+        """Remove and return an employee's dirty days (restored on rollback)."""
+        result = await self.session.execute(
+            delete(TimesheetDirtyDay)
+            .where(TimesheetDirtyDay.employee_id == employee_id)
+            .returning(TimesheetDirtyDay.day)
+        )
+        return sorted(result.scalars().all())
+
+
 class TrainingRecordRepository(BaseRepository):
     async def get_by_employee(self, employee_id: UUID) -> Sequence[TrainingRecord]:
         stmt = select(TrainingRecord).where(TrainingRecord.employee_id == employee_id).order_by(desc(TrainingRecord.training_date))
@@ -8,7 +8,9 @@ from decimal import Decimal
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field, field_validator
+
+from .day_grid import DayGrid
 
 
 # ═══════════════════════════════════════════════════════════
@@ -618,7 +620,8 @@ class MonthlyTimesheetResponse(BaseModel):
     year: int
     month: int
     status: str
-    days: List[TimesheetDay] = []
+    # Read from the model's packed ``grid``, expanded to per-day entries here
+    days: List[TimesheetDay] = Field(default=[], validation_alias=AliasChoices("days", "grid"))
     summary: Optional[TimesheetSummary] = None
     confirmed_at: Optional[datetime] = None
     employee_notes: Optional[str] = None
@@ -633,6 +636,13 @@ class MonthlyTimesheetResponse(BaseModel):
     class Config:
         from_attributes = True
 
+    @field_validator("days", mode="before")
+    @classmethod
+    def expand_grid(cls, v):
+        if isinstance(v, DayGrid):
+            return v.to_items()
+        return v
+
 
 class TimesheetConfirmation(BaseModel):
     """Request to confirm timesheet."""
@@ -4,15 +4,18 @@ Timesheet Service.
 Handles generation, retrieval, and confirmation of Monthly Timesheets.
 """
 import logging
+from collections import defaultdict
 from datetime import date, datetime, timedelta
 from uuid import UUID
-from typing import Optional, List, Any, Tuple
+from typing import Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
+from ..day_grid import DayGrid
 from ..models import MonthlyTimesheet, TimesheetStatus
+from ..repository import TimesheetDirtyDayRepository
 from ..schemas import TimesheetConfirmation, MonthlyTimesheetResponse
 from .settings import HRSettingsService
 from ..aggregator import HRDataAggregator
@@ -28,6 +31,7 @@ class TimesheetService:
         self.settings_service = HRSettingsService(session)
         self.aggregator = HRDataAggregator()
         self.audit_logger = get_audit_logger("hr-reporting-service")
+        self.dirty_days = TimesheetDirtyDayRepository(session)
 
     async def get_or_create_timesheet(
         self, 
@@ -38,13 +42,7 @@ class TimesheetService:
         """
         Get existing timesheet or generate a new draft.
         """
-        stmt = select(MonthlyTimesheet).where(
-            MonthlyTimesheet.employee_id == employee_id,
-            MonthlyTimesheet.year == year,
-            MonthlyTimesheet.month == month
-        )
-        result = await self.session.execute(stmt)
-        timesheet = result.scalar_one_or_none()
+        timesheet = await self._get_timesheet(employee_id, year, month)
         
         if timesheet:
             # Optionally refresh data if in draft?
@@ -136,29 +134,9 @@ class TimesheetService:
             logger.info(f"Skipping update for confirmed/approved timesheet {timesheet.id}")
             return timesheet
             
-        start_date = date(year, month, 1)
-        if month == 12:
-            next_month = date(year + 1, 1, 1)
-        else:
-            next_month = date(year, month + 1, 1)
-        end_date = next_month - timedelta(days=1)
-        
-        # Get fresh daily data
-        daily_items = await self.aggregator.get_employee_daily_attendance_range(
-            employee_id, start_date, end_date
-        )
-        
-        # Serialize
-        serialized_days = []
-        for item in daily_items:
-            item_copy = item.copy()
-            if isinstance(item_copy.get("date"), date):
-                item_copy["date"] = item_copy["date"].isoformat()
-            serialized_days.append(item_copy)
-            
-        # Update model
-        timesheet.days = serialized_days
-        timesheet.summary = self._calculate_summary(daily_items)
+        grid = await self._attendance_grid(employee_id, year, month)
+        timesheet.grid = grid
+        timesheet.summary = grid.summary()
         timesheet.updated_at = datetime.utcnow()
         
         await self.session.commit()
@@ -171,76 +149,126 @@ class TimesheetService:
         month: int
     ) -> MonthlyTimesheet:
         """Call aggregator and build model."""
-        start_date = date(year, month, 1)
-        # End date calculation
-        if month == 12:
-            next_month = date(year + 1, 1, 1)
-        else:
-            next_month = date(year, month + 1, 1)
-        end_date = next_month - timedelta(days=1)
-        
-        # Get daily data
-        daily_items = await self.aggregator.get_employee_daily_attendance_range(
-            employee_id, start_date, end_date
-        )
-        
-        # Serialize dates for JSONB
-        serialized_days = []
-        for item in daily_items:
-            item_copy = item.copy()
-            if isinstance(item_copy.get("date"), date):
-                item_copy["date"] = item_copy["date"].isoformat()
-            serialized_days.append(item_copy)
-        
-        # Calculate summary
-        summary = self._calculate_summary(daily_items)
+        grid = await self._attendance_grid(employee_id, year, month)
         
         return MonthlyTimesheet(
             employee_id=employee_id,
             year=year,
             month=month,
             status=TimesheetStatus.DRAFT,
-            days=serialized_days,
-            summary=summary
+            grid=grid,
+            summary=grid.summary()
         )
 
-    def _calculate_summary(self, days: List[dict]) -> dict:
-        total = len(days)
-        worked = 0
-        hours_worked = 0.0
-        sickness = 0.0
-        vacation = 0.0
-        other = 0.0
-        days_absent = 0.0
+    async def _attendance_grid(self, employee_id: UUID, year: int, month: int) -> DayGrid:
+        """
+        Day grid of a whole month from the attendance aggregator.
         
-        for d in days:
-            status = d.get("status", "")
-            h = d.get("hours_worked", 0)
+        The aggregator returns an empty list when it fails: a grid built
+        from it would be all blank days, which ``roll_elapsed_days`` later
+        turns into worked days, so nothing is built.
+        """
+        start_date, end_date = self._month_bounds(year, month)
+        daily_items = await self.aggregator.get_employee_daily_attendance_range(
+            employee_id, start_date, end_date
+        )
+        if not daily_items:
+            raise RuntimeError(
+                f"No attendance data for {employee_id} between {start_date} and {end_date}"
+            )
+        return DayGrid.from_items(year, month, daily_items)
+
+    async def refresh_dirty_days(self, employee_id: UUID) -> int:
+        """
+        Recompute only the days marked dirty for an employee.
+        
+        Days are claimed from the dirty set in the current transaction, so
+        they are marked again if the refresh fails. Months without a
+        timesheet (generated in full on first access) and confirmed or
+        approved timesheets are skipped. Returns the number of days updated.
+        """
+        by_month = defaultdict(list)
+        for day in await self.dirty_days.claim(employee_id):
+            by_month[(day.year, day.month)].append(day)
+        
+        refreshed = 0
+        for (year, month), days in sorted(by_month.items()):
+            timesheet = await self._get_timesheet(employee_id, year, month)
+            if not timesheet or timesheet.status in (TimesheetStatus.CONFIRMED, TimesheetStatus.APPROVED):
+                continue
             
-            hours_worked += h
-            if h > 0 or status in ("Presente", "Trasferta"):
-                worked += 1
+            daily_items = await self.aggregator.get_employee_daily_attendance_range(
+                employee_id, days[0], days[-1]
+            )
+            if not daily_items:
+                raise RuntimeError(
+                    f"No attendance data for {employee_id} between {days[0]} and {days[-1]}"
+                )
             
-            if "Malattia" in status:
-                sickness += 1
-                days_absent += 1
-            elif "Ferie" in status:
-                vacation += 1
-                days_absent += 1
-            elif "Assente" in status or "ROL" in status:
-                other += 1
-                days_absent += 1
+            grid = timesheet.grid
+            grid.copy_days(DayGrid.from_items(year, month, daily_items), days)
+            timesheet.grid = grid
+            timesheet.summary = grid.summary()
+            timesheet.updated_at = datetime.utcnow()
+            refreshed += len(days)
+        
+        await self.session.flush()
+        return refreshed
+
+    async def roll_elapsed_days(self, today: Optional[date] = None, lookback_days: int = 7) -> int:
+        """
+        Turn days that are no longer in the future into regular working days.
+        
+        A day without leave, trip, weekend or holiday is generated blank
+        while in the future and as "Presente" (8h) once it has started,
+        so this is the only change the passing of time makes to a
+        timesheet. Done locally, without calling other services. Returns
+        the number of timesheets updated.
+        """
+        today = today or date.today()
+        since = today - timedelta(days=lookback_days)
+        months = {(since.year, since.month), (today.year, today.month)}
         
-        return {
-            "total_days": total,
-            "days_worked": float(worked),
-            "days_absent": float(days_absent),
-            "hours_worked": float(hours_worked),
-            "hours_absence": float(days_absent * 8.0), # Approx
-            "sickness_days": float(sickness),
-            "vacation_days": float(vacation),
-            "other_days": float(other)
-        }
+        result = await self.session.execute(
+            select(MonthlyTimesheet).where(
+                or_(*[
+                    and_(MonthlyTimesheet.year == year, MonthlyTimesheet.month == month)
+                    for year, month in months
+                ]),
+                MonthlyTimesheet.status.in_([TimesheetStatus.DRAFT, TimesheetStatus.PENDING_CONFIRMATION]),
+            )
+        )
+        
+        updated = 0
+        for timesheet in result.scalars():
+            grid = timesheet.grid
+            if not grid.roll_elapsed(today):
+                continue
+            timesheet.grid = grid
+            timesheet.summary = grid.summary()
+            updated += 1
+        
+        await self.session.flush()
+        return updated
+
+    async def _get_timesheet(self, employee_id: UUID, year: int, month: int) -> Optional[MonthlyTimesheet]:
+        result = await self.session.execute(
+            select(MonthlyTimesheet).where(
+                MonthlyTimesheet.employee_id == employee_id,
+                MonthlyTimesheet.year == year,
+                MonthlyTimesheet.month == month
+            )
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def _month_bounds(year: int, month: int) -> Tuple[date, date]:
+        start_date = date(year, month, 1)
+        if month == 12:
+            next_month = date(year + 1, 1, 1)
+        else:
+            next_month = date(year, month + 1, 1)
+        return start_date, next_month - timedelta(days=1)
 
     async def check_confirmation_window(self, year: int, month: int) -> Tuple[bool, date]:
         """Check if confirmation is allowed for the given period."""
@@ -6,30 +6,24 @@ Scheduled tasks for:
 - Compliance checks
 - Monthly stats calculation
 """
-import asyncio
 import logging
 from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
 
 from celery import shared_task
 
+from src.core.batch_jobs import PerUserJob, register_job, start_job
 from src.core.database import async_session_factory, get_db_context
-from src.shared.clients import AuthClient, NotificationClient
+from src.core.worker_runtime import run_async
+from src.shared.clients import NotificationClient
+from .repository import TimesheetDirtyDayRepository
 from .service import HRReportingService
 from .services.timesheet import TimesheetService
 
 logger = logging.getLogger(__name__)
 
 
-def run_async(coro):
-    """Run async coroutine in sync context."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
 @shared_task(name="hr_reporting.create_daily_snapshot")
 def create_daily_snapshot():
     """
@@ -204,46 +198,127 @@ def generate_report_async(report_type: str, year: int, month: int = None, depart
     return run_async(_generate())
 
 
-@shared_task(name="hr_reporting.update_timesheets")
-def update_daily_timesheets():
-    """
-    Daily task to update all employee timesheets.
+@register_job
+class TimesheetRefreshJob(PerUserJob):
+    """Recompute the stale days of employee timesheets (see ``TimesheetDirtyDay``)."""
 
-    Runs daily (e.g., 02:00) to keep timesheets up-to-date.
-    """
-    async def _update_all_timesheets():
+    name = "hr_reporting.refresh_dirty_timesheets"
+
+    async def prepare(self, params: dict) -> Optional[dict]:
+        async with get_db_context() as session:
+            await TimesheetDirtyDayRepository(session).expand_company_wide()
+        return params
+
+    def run_id(self, context: dict) -> str:
+        # The dirty set is the checkpoint: every run drains whatever is in it
+        return datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+
+    async def load_user_ids(self, context: dict) -> list[str]:
+        async with get_db_context() as session:
+            return await TimesheetDirtyDayRepository(session).get_dirty_employee_ids()
+
+    async def process_user(self, session, user_id: UUID, context: dict) -> str:
+        refreshed = await TimesheetService(session).refresh_dirty_days(user_id)
+        return "updated" if refreshed else "skipped"
+
+
+@register_job
+class TimesheetDeadlineReminderJob(PerUserJob):
+    """Remind employees with an unconfirmed timesheet of the confirmation deadline."""
+
+    name = "hr_reporting.check_timesheet_deadlines"
+
+    async def prepare(self, params: dict) -> Optional[dict]:
         today = date.today()
-        logger.info(f"Starting daily timesheet update for {today}")
+        logger.info(f"Checking timesheet deadlines for {today}")
         
-        auth_client = AuthClient()
+        # We check the deadline of the previous month's timesheet:
+        # if today is Jan 24, the Dec timesheet deadline (e.g. Jan 27)
+        if today.month == 1:
+            chk_year = today.year - 1
+            chk_month = 12
+        else:
+            chk_year = today.year
+            chk_month = today.month - 1
         
-        try:
-            # 1. Get all active users
-            users = await auth_client.get_users()
-            active_users = [u for u in users if u.get("is_active", True)]
-            logger.info(f"Found {len(active_users)} active users")
-            
-            async with get_db_context() as session:
-                service = TimesheetService(session)
-                
-                for user in active_users:
-                    try:
-                        user_id = UUID(user["id"])
-                        # Update current month
-                        await service.update_timesheet_data(
-                            user_id, 
-                            today.year, 
-                            today.month
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to update timesheet for user {user.get('id')}: {e}")
-                        
-            logger.info("Daily timesheet update completed")
+        async with get_db_context() as session:
+            can_confirm, deadline = await TimesheetService(session).check_confirmation_window(
+                chk_year, chk_month
+            )
+        
+        if not can_confirm and today > deadline:
+            logger.info("Confirmation window already closed. Skipping reminders.")
+            return None
+
+        days_until = (deadline - today).days
+        
+        # Remind on: 5 days before, 2 days before, 0 days (Deadline)
+        if days_until not in [5, 2, 0]:
+            return None
+
+        logger.info(f"Deadline approaching in {days_until} days ({deadline}). Sending reminders.")
+        return {
+            "year": chk_year,
+            "month": chk_month,
+            "deadline": deadline.isoformat(),
+            "days_until": days_until,
+        }
+
+    async def process_user(self, session, user_id: UUID, context: dict) -> Optional[str]:
+        ts = await TimesheetService(session).get_or_create_timesheet(
+            user_id, context["year"], context["month"]
+        )
+        if ts.status not in ["DRAFT", "PENDING"]:  # Uses string/enum value
+            return "confirmed"
+
+        chk_year, chk_month = context["year"], context["month"]
+        deadline = date.fromisoformat(context["deadline"])
+        days_until = context["days_until"]
+        title = "⚠️ Scadenza Timesheet"
+        msg = f"Il timesheet di {chk_month}/{chk_year} scade il {deadline.strftime('%d/%m/%Y')}. Conferalo ora."
+        if days_until == 0:
+            title = "🚨 ULTIMO GIORNO: Timesheet"
+            msg = f"Oggi scade la conferma del timesheet di {chk_month}/{chk_year}. Conferalo urgentemente."
             
-        except Exception as e:
-            logger.error(f"Critical error in daily timesheet update: {e}")
+        await NotificationClient().send_notification(
+            user_id=user_id,
+            notification_type="TIMESHEET_REMINDER",
+            title=title,
+            message=msg,
+            action_url="/timesheet",
+            priority="high" if days_until == 0 else "normal"
+        )
+        return "reminded"
+
 
-    return run_async(_update_all_timesheets())
+@shared_task(name="hr_reporting.update_timesheets")
+def update_daily_timesheets():
+    """
+    Daily task to keep employee timesheets up-to-date.
+
+    Runs daily (e.g., 02:00). Elapsed days are rolled forward locally, then
+    the days marked dirty by leave, trip, closure and holiday changes are
+    recomputed (see ``process_dirty_timesheets``).
+    """
+    async def _roll_elapsed_days():
+        async with get_db_context() as session:
+            return await TimesheetService(session).roll_elapsed_days()
+
+    rolled = run_async(_roll_elapsed_days())
+    logger.info(f"Rolled elapsed days forward in {rolled} timesheets")
+    return {"rolled": rolled, **start_job(TimesheetRefreshJob.name)}
+
+
+@shared_task(name="hr_reporting.process_dirty_timesheets")
+def process_dirty_timesheets():
+    """
+    Recompute timesheet days marked dirty since the last run.
+    
+    Runs every few minutes, so approved leaves and trips show up in
+    timesheets shortly after the change. Employees are processed in
+    parallel chunks on the reporting queue (see ``src.core.batch_jobs``).
+    """
+    return start_job(TimesheetRefreshJob.name)
 
 
 @shared_task(name="hr_reporting.check_timesheet_deadlines")
@@ -251,74 +326,6 @@ def check_timesheet_deadlines():
     """
     Check for approaching timesheet deadlines and send reminders.
     
-    Runs daily (e.g., 08:00).
+    Runs daily (e.g., 08:00). Reminders are sent in parallel chunks.
     """
-    async def _check_deadlines():
-        today = date.today()
-        logger.info(f"Checking timesheet deadlines for {today}")
-        
-        async with get_db_context() as session:
-            service = TimesheetService(session)
-            notification = NotificationClient()
-            
-            # Check deadline for previous month
-            # Logic: If today is close to deadline, find unconfirmed timesheets
-            # We need to know the deadline for the "Timesheet Month"
-            # If today is Jan 24, we are checking Dec timesheet deadline (e.g. Jan 27)
-            
-            # Find relevant year/month. 
-            # We assume we are checking the "previous valid month" for confirmation.
-            # E.g. If today is Jan, we check Dec.
-            if today.month == 1:
-                chk_year = today.year - 1
-                chk_month = 12
-            else:
-                chk_year = today.year
-                chk_month = today.month - 1
-                
-            can_confirm, deadline = await service.check_confirmation_window(chk_year, chk_month)
-            
-            if not can_confirm and today > deadline:
-                logger.info("Confirmation window already closed. Skipping reminders.")
-                return
-
-            days_until = (deadline - today).days
-            
-            # Remind on: 5 days before, 2 days before, 0 days (Deadline)
-            if days_until not in [5, 2, 0]:
-                return
-
-            logger.info(f"Deadline approaching in {days_until} days ({deadline}). Sending reminders.")
-            
-            # Get all active users
-            auth = AuthClient()
-            users = await auth.get_users()
-            
-            for user in users:
-                if not user.get("is_active", True):
-                    continue
-                    
-                user_id = UUID(user["id"])
-                ts = await service.get_or_create_timesheet(user_id, chk_year, chk_month)
-                
-                if ts.status in ["DRAFT", "PENDING"]:  # Uses string/enum value
-                    # SEND REMINDER
-                    try:
-                        title = "⚠️ Scadenza Timesheet"
-                        msg = f"Il timesheet di {chk_month}/{chk_year} scade il {deadline.strftime('%d/%m/%Y')}. Conferalo ora."
-                        if days_until == 0:
-                            title = "🚨 ULTIMO GIORNO: Timesheet"
-                            msg = f"Oggi scade la conferma del timesheet di {chk_month}/{chk_year}. Conferalo urgentemente."
-                            
-                        await notification.send_notification(
-                            user_id=user_id,
-                            notification_type="TIMESHEET_REMINDER",
-                            title=title,
-                            message=msg,
-                            action_url="/timesheet",
-                            priority="high" if days_until == 0 else "normal"
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to send reminder to {user_id}: {e}")
-
-    return run_async(_check_deadlines())
+    return start_job(TimesheetDeadlineReminderJob.name)
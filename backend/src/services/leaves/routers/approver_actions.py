@@ -14,6 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.database import get_db
 from src.core.security import get_current_user, require_approver as require_manager, TokenPayload
 from src.core.exceptions import NotFoundError, BusinessRuleError, ValidationError
+from src.core.serialization import json_response
 from src.services.leaves.services import LeaveService
 from src.services.leaves.schemas import (
     LeaveRequestResponse,
@@ -397,4 +398,4 @@ async def get_team_calendar(
     """
     # This would call a method that aggregates team data
     # Implementation depends on how teams are structured in auth service
-    return await service.get_team_calendar(token.sub, start_date, end_date)
+    return json_response(await service.get_team_calendar(token.sub, start_date, end_date))
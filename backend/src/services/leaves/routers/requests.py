@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional
 from uuid import UUID
 from datetime import date
@@ -6,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from src.core.security import get_current_user, require_approver, require_permission, TokenPayload
 from src.core.exceptions import NotFoundError, BusinessRuleError, ValidationError
+from src.shared.clients.batching import batch_calls
 from src.shared.schemas import DataTableRequest
 from src.services.leaves.services import LeaveService
 from src.services.leaves.models import LeaveRequestStatus
@@ -27,6 +29,30 @@ from src.services.leaves.deps import get_leave_service
 
 router = APIRouter()
 
+
+async def _with_user_names(service: LeaveService, requests) -> list[LeaveRequestListItem]:
+    """List items with the requesters' names, fetched from auth in one batch."""
+    user_ids = list({r.user_id for r in requests})
+    async with batch_calls():
+        infos = await asyncio.gather(
+            *(service._get_user_info(user_id) for user_id in user_ids),
+            return_exceptions=True,
+        )
+    names = {
+        user_id: f"{info.get('first_name', '')} {info.get('last_name', '')}".strip()
+        for user_id, info in zip(user_ids, infos)
+        if isinstance(info, dict)
+    }
+    
+    items = []
+    for r in requests:
+        item = LeaveRequestListItem.model_validate(r)
+        if r.user_id in names:
+            item.user_name = names[r.user_id]
+        items.append(item)
+    return items
+
+
 # ═══════════════════════════════════════════════════════════
 # Leave Request Endpoints
 # ═══════════════════════════════════════════════════════════
@@ -101,17 +127,7 @@ async def leaves_admin_datatable(
     )
     
     # Enrich with user names
-    data = []
-    for r in requests:
-        item = LeaveRequestListItem.model_validate(r)
-        # Fetch user info for display
-        try:
-            user_info = await service._get_user_info(r.user_id)
-            if user_info:
-                item.user_name = f"{user_info.get('first_name', '')} {user_info.get('last_name', '')}".strip()
-        except Exception:
-            pass
-        data.append(item)
+    data = await _with_user_names(service, requests)
     
     return LeaveRequestDataTableResponse(
         draw=request.draw,
@@ -130,17 +146,7 @@ async def get_pending_approval(
     requests = await service.get_pending_approval()
     
     # Enrich with user names
-    result = []
-    for r in requests:
-        item = LeaveRequestListItem.model_validate(r)
-        # Fetch user name from auth service
-        try:
-            user_info = await service._get_user_info(r.user_id)
-            if user_info:
-                item.user_name = f"{user_info.get('first_name', '')} {user_info.get('last_name', '')}".strip()
-        except Exception:
-            pass
-        result.append(item)
+    result = await _with_user_names(service, requests)
     
     return result
 
@@ -167,13 +173,7 @@ async def get_approval_history(
     requests = await service.get_all_requests(status=status_filter, year=year, limit=limit)
     
     # Enrich with user names
-    result = []
-    for r in requests:
-        item = LeaveRequestListItem.model_validate(r)
-        user_info = await service._get_user_info(r.user_id)
-        if user_info:
-            item.user_name = f"{user_info.get('first_name', '')} {user_info.get('last_name', '')}".strip()
-        result.append(item)
+    result = await _with_user_names(service, requests)
     
     return result
 
@@ -480,16 +480,7 @@ async def get_requests_internal(
     )
     
     # Enrich with user names
-    data = []
-    for r in requests:
-        item = LeaveRequestListItem.model_validate(r)
-        try:
-            user_info = await service._get_user_info(r.user_id)
-            if user_info:
-                item.user_name = f"{user_info.get('first_name', '')} {user_info.get('last_name', '')}".strip()
-        except Exception:
-            pass
-        data.append(item)
+    data = await _with_user_names(service, requests)
     
     return data
 
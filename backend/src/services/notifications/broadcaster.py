@@ -4,6 +4,8 @@ import logging
 from uuid import UUID
 from typing import Dict, AsyncGenerator
 
+from src.core.metrics import SSE_CONNECTIONS
+
 logger = logging.getLogger(__name__)
 
 class NotificationBroadcaster:
@@ -34,6 +36,7 @@ class NotificationBroadcaster:
         if user_id not in self.connections:
             self.connections[user_id] = set()
         self.connections[user_id].add(queue)
+        SSE_CONNECTIONS.inc()
         
         logger.debug(f"User {user_id} connected to notification stream. Active connections: {len(self.connections.get(user_id, []))}")
 
@@ -52,8 +55,9 @@ class NotificationBroadcaster:
 
     def disconnect(self, user_id: UUID, queue: asyncio.Queue):
         """Remove a connection."""
-        if user_id in self.connections:
+        if user_id in self.connections and queue in self.connections[user_id]:
             self.connections[user_id].discard(queue)
+            SSE_CONNECTIONS.dec()
             if not self.connections[user_id]:
                 del self.connections[user_id]
 
@@ -0,0 +1,423 @@
+"""
+KRONOS Notification Service - Email Delivery Engine.
+
+Sends rendered emails through a pluggable transport:
+- ``BrevoTransport``: Brevo transactional API over a long-lived, pooled HTTP
+  client. Messages of the same template are grouped into a single request
+  using ``messageVersions`` (one version per recipient).
+- ``SmtpTransport``: plain SMTP, e.g. a local MailHog/Mailpit sink.
+- ``FileTransport``: writes each message as an ``.eml`` file (tests).
+
+Provider settings are cached per process and versioned across processes
+through a Redis counter (see ``src.core.versioned_cache``): changing the
+email provider settings bumps the version and every process reloads them.
+"""
+import asyncio
+import logging
+import smtplib
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+from pathlib import Path
+from typing import Any, Optional
+from uuid import UUID
+
+import httpx
+
+from src.core.config import settings
+from src.core.rate_limit import RateLimiter
+from src.core.versioned_cache import VersionedLocalCache
+from src.services.notifications.exceptions import ProviderConfigurationError
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "notifications:email_provider:version"
+
+# Upper bound on cached settings age, in case a version bump was lost
+MAX_CONFIG_AGE = 300.0
+
+
+# ═══════════════════════════════════════════════════════════
+# Messages
+# ═══════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """Session-independent copy of the active ``EmailProviderSettings``."""
+
+    provider: str
+    api_key: str
+    sender_email: str
+    sender_name: str
+    reply_to_email: Optional[str] = None
+    reply_to_name: Optional[str] = None
+    id: Optional[UUID] = None
+
+    @classmethod
+    def from_settings(cls, row) -> "ProviderConfig":
+        return cls(
+            id=row.id,
+            provider=row.provider,
+            api_key=row.api_key,
+            sender_email=row.sender_email,
+            sender_name=row.sender_name,
+            reply_to_email=row.reply_to_email,
+            reply_to_name=row.reply_to_name,
+        )
+
+    @classmethod
+    def from_environment(cls) -> "ProviderConfig":
+        """Fallback used by local sinks when no provider row is configured."""
+        return cls(
+            provider="local",
+            api_key=settings.brevo_api_key,
+            sender_email=settings.brevo_sender_email,
+            sender_name=settings.brevo_sender_name,
+        )
+
+
+@dataclass(frozen=True)
+class EmailRecipient:
+    """One recipient of a templated send, with its own variables."""
+
+    to_email: str
+    variables: dict[str, Any]
+    to_name: Optional[str] = None
+    user_id: Optional[UUID] = None
+    notification_id: Optional[UUID] = None
+
+
+@dataclass
+class OutgoingEmail:
+    """A single rendered message, ready for a transport."""
+
+    to_email: str
+    subject: str
+    html_content: str
+    to_name: Optional[str] = None
+    # Brevo-side template: the provider renders it from ``params``
+    brevo_template_id: Optional[int] = None
+    params: dict[str, Any] = field(default_factory=dict)
+    # Messages with the same key may share a provider request
+    batch_key: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DeliveryResult:
+    """Per-recipient outcome of a send."""
+
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# ═══════════════════════════════════════════════════════════
+# Transports
+# ═══════════════════════════════════════════════════════════
+
+class EmailTransport(ABC):
+    """Interface shared by all transports."""
+
+    # Whether an active EmailProviderSettings row is needed to send
+    requires_provider_settings = True
+
+    def __init__(self, batch_size: int = 1) -> None:
+        self.batch_size = max(1, batch_size)
+
+    async def send(self, config: ProviderConfig, messages: list[OutgoingEmail]) -> list[DeliveryResult]:
+        """Send messages, returning one result per message in the same order."""
+        results: list[Optional[DeliveryResult]] = [None] * len(messages)
+        groups: dict[Any, list[int]] = {}
+        for index, message in enumerate(messages):
+            # Messages without a batch key always go alone
+            key = message.batch_key if message.batch_key is not None else ("single", index)
+            groups.setdefault(key, []).append(index)
+
+        batches = []
+        for indexes in groups.values():
+            for start in range(0, len(indexes), self.batch_size):
+                batches.append(indexes[start:start + self.batch_size])
+
+        async def _run(indexes: list[int]) -> None:
+            batch = [messages[i] for i in indexes]
+            try:
+                batch_results = await self.send_batch(config, batch)
+            except Exception as e:
+                logger.error(f"Email batch of {len(batch)} failed: {e}")
+                batch_results = [DeliveryResult(error=str(e))] * len(batch)
+            for i, result in zip(indexes, batch_results):
+                results[i] = result
+
+        await asyncio.gather(*(_run(indexes) for indexes in batches))
+        return results
+
+    @abstractmethod
+    async def send_batch(self, config: ProviderConfig, messages: list[OutgoingEmail]) -> list[DeliveryResult]:
+        """Send messages that may share one provider request, one result per message."""
+
+    async def aclose(self) -> None:  # noqa: B027 - optional hook
+        """Release the transport's resources (nothing to do by default)."""
+
+
+class BrevoTransport(EmailTransport):
+    """Brevo transactional email API.
+
+    One pooled ``httpx.AsyncClient`` is kept per event loop (Celery tasks
+    run each job on a fresh loop), so connections are reused across sends.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        batch_size: int = 100,
+        rate_limit: float = 10.0,
+        max_connections: int = 10,
+        timeout: float = 10.0,
+    ) -> None:
+        super().__init__(batch_size)
+        self.base_url = base_url or settings.brevo_api_url
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._timeout = timeout
+        self._rate_limiter = RateLimiter(rate_limit)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self._limits,
+                timeout=self._timeout,
+                headers={"content-type": "application/json", "accept": "application/json"},
+            )
+            self._client_loop = loop
+            self._semaphore = asyncio.Semaphore(self._limits.max_connections)
+        return self._client
+
+    async def request(self, config: ProviderConfig, method: str, path: str, **kwargs) -> httpx.Response:
+        """Rate-limited call to the Brevo API with the provider's key."""
+        client = self._get_client()
+        async with self._semaphore:
+            await self._rate_limiter.acquire()
+            return await client.request(method, path, headers={"api-key": config.api_key}, **kwargs)
+
+    def _base_payload(self, config: ProviderConfig, first: OutgoingEmail) -> dict:
+        payload: dict[str, Any] = {
+            "sender": {"email": config.sender_email, "name": config.sender_name},
+        }
+        if config.reply_to_email:
+            payload["replyTo"] = {"email": config.reply_to_email, "name": config.reply_to_name or config.sender_name}
+        if first.brevo_template_id:
+            payload["templateId"] = first.brevo_template_id
+        else:
+            payload["subject"] = first.subject
+            payload["htmlContent"] = first.html_content
+        return payload
+
+    @staticmethod
+    def _recipient(message: OutgoingEmail) -> dict:
+        if message.to_name:
+            return {"email": message.to_email, "name": message.to_name}
+        return {"email": message.to_email}
+
+    async def send_batch(self, config: ProviderConfig, messages: list[OutgoingEmail]) -> list[DeliveryResult]:
+        if not config.api_key or not config.sender_email:
+            raise ProviderConfigurationError("Invalid provider configuration")
+
+        payload = self._base_payload(config, messages[0])
+        if len(messages) == 1:
+            message = messages[0]
+            payload["to"] = [self._recipient(message)]
+            if message.brevo_template_id:
+                payload["params"] = message.params
+        else:
+            versions = []
+            for message in messages:
+                version: dict[str, Any] = {"to": [self._recipient(message)]}
+                if message.brevo_template_id:
+                    version["params"] = message.params
+                else:
+                    version["subject"] = message.subject
+                    version["htmlContent"] = message.html_content
+                versions.append(version)
+            payload["messageVersions"] = versions
+
+        response = await self.request(config, "POST", "/smtp/email", json=payload)
+
+        if response.status_code in (200, 201):
+            body = response.json()
+            if len(messages) == 1:
+                return [DeliveryResult(message_id=body.get("messageId"))]
+            message_ids = body.get("messageIds") or []
+            if len(message_ids) != len(messages):
+                message_ids = [None] * len(messages)
+            return [DeliveryResult(message_id=message_id) for message_id in message_ids]
+
+        if response.status_code == 400 and len(messages) > 1:
+            # One bad recipient rejects the whole request: resend one by one
+            # so that only the offending messages are marked failed.
+            logger.warning(f"Brevo rejected a batch of {len(messages)}, retrying individually")
+            results = await asyncio.gather(
+                *(self.send_batch(config, [message]) for message in messages),
+                return_exceptions=True,
+            )
+            return [
+                DeliveryResult(error=str(result)) if isinstance(result, Exception) else result[0]
+                for result in results
+            ]
+
+        error = f"Provider error ({response.status_code}): {response.text}"
+        return [DeliveryResult(error=error)] * len(messages)
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+
+def _build_mime(config: ProviderConfig, message: OutgoingEmail) -> EmailMessage:
+    mime = EmailMessage()
+    mime["Message-ID"] = make_msgid(domain=config.sender_email.rpartition("@")[2] or None)
+    mime["From"] = formataddr((config.sender_name, config.sender_email))
+    mime["To"] = formataddr((message.to_name or "", message.to_email))
+    if config.reply_to_email:
+        mime["Reply-To"] = formataddr((config.reply_to_name or "", config.reply_to_email))
+    mime["Subject"] = message.subject
+    mime.set_content(message.html_content, subtype="html")
+    return mime
+
+
+class SmtpTransport(EmailTransport):
+    """Plain SMTP delivery, one connection per batch (local sinks, relays)."""
+
+    requires_provider_settings = False
+
+    def __init__(self, host: str, port: int, batch_size: int = 100) -> None:
+        super().__init__(batch_size)
+        self.host = host
+        self.port = port
+
+    def _send_blocking(self, config: ProviderConfig, messages: list[OutgoingEmail]) -> list[DeliveryResult]:
+        results = []
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            for message in messages:
+                mime = _build_mime(config, message)
+                try:
+                    smtp.send_message(mime)
+                    results.append(DeliveryResult(message_id=mime["Message-ID"]))
+                except smtplib.SMTPException as e:
+                    results.append(DeliveryResult(error=str(e)))
+        return results
+
+    async def send_batch(self, config: ProviderConfig, messages: list[OutgoingEmail]) -> list[DeliveryResult]:
+        return await asyncio.to_thread(self._send_blocking, config, messages)
+
+
+class FileTransport(EmailTransport):
+    """Writes every message to ``directory`` as an ``.eml`` file."""
+
+    requires_provider_settings = False
+
+    def __init__(self, directory: str, batch_size: int = 100) -> None:
+        super().__init__(batch_size)
+        self.directory = Path(directory)
+
+    def _write_blocking(self, config: ProviderConfig, messages: list[OutgoingEmail]) -> list[DeliveryResult]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        results = []
+        for message in messages:
+            mime = _build_mime(config, message)
+            message_id = mime["Message-ID"]
+            path = self.directory / f"{message_id.strip('<>').replace('@', '_')}.eml"
+            path.write_bytes(bytes(mime))
+            results.append(DeliveryResult(message_id=message_id))
+        return results
+
+    async def send_batch(self, config: ProviderConfig, messages: list[OutgoingEmail]) -> list[DeliveryResult]:
+        return await asyncio.to_thread(self._write_blocking, config, messages)
+
+
+_transport: Optional[EmailTransport] = None
+
+
+def get_transport() -> EmailTransport:
+    """Get the configured email transport (created lazily)."""
+    global _transport
+    if _transport is None:
+        if settings.email_transport == "smtp":
+            _transport = SmtpTransport(
+                settings.email_smtp_host,
+                settings.email_smtp_port,
+                batch_size=settings.email_batch_size,
+            )
+        elif settings.email_transport == "file":
+            _transport = FileTransport(settings.email_file_sink_path, batch_size=settings.email_batch_size)
+        else:
+            _transport = BrevoTransport(
+                batch_size=settings.email_batch_size,
+                rate_limit=settings.email_rate_limit,
+                max_connections=settings.email_max_connections,
+            )
+    return _transport
+
+
+def set_transport(transport: Optional[EmailTransport]) -> None:
+    """Override the email transport (used by tests)."""
+    global _transport
+    _transport = transport
+
+
+async def close_transport() -> None:
+    if _transport is not None:
+        await _transport.aclose()
+
+
+# ═══════════════════════════════════════════════════════════
+# Provider settings cache
+# ═══════════════════════════════════════════════════════════
+
+class ProviderSettingsCache(VersionedLocalCache):
+    """Process-wide cache of the active email provider settings."""
+
+    def __init__(self) -> None:
+        super().__init__(VERSION_KEY, "Email provider cache")
+        self._configs: dict[str, tuple[float, Optional[ProviderConfig]]] = {}
+
+    def clear_local(self) -> None:
+        self._configs.clear()
+
+    async def get(self, provider_repo, provider: str = "brevo") -> Optional[ProviderConfig]:
+        """Get the active settings for a provider, loading them on a miss."""
+        await self.sync_version()
+        entry = self._configs.get(provider)
+        if entry and time.monotonic() - entry[0] < MAX_CONFIG_AGE:
+            return entry[1]
+
+        version = self.version
+        row = await provider_repo.get_active(provider)
+        config = ProviderConfig.from_settings(row) if row else None
+        if version == self.version:
+            self._configs[provider] = (time.monotonic(), config)
+        return config
+
+    async def require(self, provider_repo, transport: EmailTransport) -> ProviderConfig:
+        """Settings to send with, raising if the transport needs them and none exist."""
+        config = await self.get(provider_repo)
+        if config:
+            return config
+        if transport.requires_provider_settings:
+            raise ProviderConfigurationError("No active email provider configured")
+        return ProviderConfig.from_environment()
+
+
+provider_settings_cache = ProviderSettingsCache()
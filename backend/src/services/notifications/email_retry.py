@@ -0,0 +1,33 @@
+"""
+KRONOS Notification Service - Email Retry Policy.
+
+Failed emails are rescheduled on ``EmailLog.next_retry_at`` with exponential
+backoff and jitter. Once ``EMAIL_RETRY_MAX_ATTEMPTS`` attempts have failed
+the log is dead-lettered and no longer picked up by the retry scheduler.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+from src.core.config import settings
+
+
+def retry_delay(attempt: int) -> float:
+    """Seconds to wait before retrying after the ``attempt``-th failure.
+
+    Exponential in the attempt number, capped, with "equal jitter": half the
+    delay is fixed and half is random, so retries of a failed batch spread
+    out instead of hitting the provider together again.
+    """
+    delay = min(
+        settings.email_retry_max_delay,
+        settings.email_retry_base_delay * (2 ** max(0, attempt - 1)),
+    )
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def next_attempt_at(attempt: int, now: Optional[datetime] = None) -> Optional[datetime]:
+    """When to retry after ``attempt`` failures, or None to dead-letter."""
+    if attempt >= settings.email_retry_max_attempts:
+        return None
+    return (now or datetime.utcnow()) + timedelta(seconds=retry_delay(attempt))
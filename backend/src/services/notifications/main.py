@@ -5,8 +5,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import settings
+from src.core.serialization import DEFAULT_RESPONSE_CLASS
 from src.core.database import init_db, close_db
 from src.services.notifications.router import router
+from src.services.notifications.email_delivery import close_transport
 # Import models to register them with SQLAlchemy metadata
 from src.services.notifications import models  # noqa: F401
 
@@ -16,6 +18,7 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     await init_db()
     yield
+    await close_transport()
     await close_db()
 
 
@@ -23,6 +26,7 @@ app = FastAPI(
     title="KRONOS Notification Service",
     description="Notification and email service with Brevo integration",
     version="1.0.0",
+    default_response_class=DEFAULT_RESPONSE_CLASS,
     lifespan=lifespan,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
@@ -42,6 +46,14 @@ app.include_router(router, prefix="/api/v1")
 from src.core.middleware import RequestContextMiddleware
 app.add_middleware(RequestContextMiddleware)
 
+# Internal batch endpoint (several GETs in one request, see src.core.batch)
+from src.core.batch import router as batch_router
+app.include_router(batch_router)
+
+# Prometheus scrape endpoint
+from src.core.metrics import router as metrics_router
+app.include_router(metrics_router)
+
 # Register Error Handlers
 from src.core.error_handlers import register_error_handlers
 register_error_handlers(app)
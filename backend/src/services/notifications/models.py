@@ -8,10 +8,12 @@ from sqlalchemy import (
     DateTime,
     Enum as SQLEnum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -66,6 +68,8 @@ class NotificationType(str, enum.Enum):
     EXPENSE_REJECTED = "expense_rejected"
     EXPENSE_PAID = "expense_paid"
     
+    APPROVAL_REMINDER = "approval_reminder"
+    
     CALENDAR_SYSTEM_DEADLINE = "calendar_system_deadline"
     CALENDAR_PERSONAL_DEADLINE = "calendar_personal_deadline"
     CALENDAR_SHARED_DEADLINE = "calendar_shared_deadline"
@@ -267,6 +271,7 @@ class EmailLogStatus(str, enum.Enum):
     CLICKED = "clicked"
     BOUNCED = "bounced"
     FAILED = "failed"
+    DEAD_LETTER = "dead_letter"  # Retries exhausted
 
 
 class EmailLog(Base):
@@ -277,7 +282,15 @@ class EmailLog(Base):
     """
     
     __tablename__ = "email_logs"
-    __table_args__ = {"schema": "notifications"}
+    __table_args__ = (
+        # Retry scheduler: due failed emails, in next_retry_at order
+        Index(
+            "ix_notifications_email_logs_retry_due",
+            "next_retry_at",
+            postgresql_where=text("status = 'failed'"),
+        ),
+        {"schema": "notifications"},
+    )
     
     id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
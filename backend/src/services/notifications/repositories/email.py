@@ -1,10 +1,11 @@
 from datetime import datetime, timedelta
 from typing import Optional, Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy import select, func, and_, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.services.notifications.email_retry import next_attempt_at
 from src.services.notifications.models import (
     EmailLog,
     EmailTemplate,
@@ -58,6 +59,41 @@ class EmailLogRepository:
         await self._session.refresh(log)
         return log
 
+    async def create_pending_many(self, entries: list[dict]) -> list[EmailLog]:
+        """Create pending log entries for a batch in a single flush."""
+        logs = [
+            EmailLog(id=uuid4(), status=EmailLogStatus.PENDING.value, **entry)
+            for entry in entries
+        ]
+        self._session.add_all(logs)
+        await self._session.flush()
+        return logs
+
+    async def record_delivery_results(self, results: list[tuple[EmailLog, Optional[str], Optional[str]]]) -> None:
+        """Apply per-recipient (log, message_id, error) outcomes of a batch send."""
+        now = datetime.utcnow()
+        for log, message_id, error in results:
+            if error is None:
+                log.status = EmailLogStatus.SENT.value
+                log.sent_at = now
+                if message_id:
+                    log.message_id = message_id
+            else:
+                log.error_message = error
+                self._apply_failure(log, now)
+        await self._session.flush()
+
+    @staticmethod
+    def _apply_failure(log: EmailLog, now: datetime) -> None:
+        """Count a failed attempt and schedule the retry (or dead-letter)."""
+        log.failed_at = now
+        log.retry_count = (log.retry_count or 0) + 1
+        log.next_retry_at = next_attempt_at(log.retry_count, now)
+        if log.next_retry_at is None:
+            log.status = EmailLogStatus.DEAD_LETTER.value
+        else:
+            log.status = EmailLogStatus.FAILED.value
+
     async def mark_sent(self, id: UUID, message_id: str) -> None:
         """Mark log as sent."""
         await self.update_status(id, status=EmailLogStatus.SENT.value, message_id=message_id)
@@ -100,8 +136,7 @@ class EmailLogRepository:
         elif status == EmailLogStatus.BOUNCED.value:
             log.bounced_at = now
         elif status == EmailLogStatus.FAILED.value:
-            log.failed_at = now
-            log.retry_count = (log.retry_count or 0) + 1
+            self._apply_failure(log, now)
 
         await self._session.flush()
         return log
@@ -157,28 +192,83 @@ class EmailLogRepository:
 
         return stats
 
-    async def get_pending_retries(self, limit: int = 50) -> list[EmailLog]:
-        """Get failed emails eligible for retry."""
+    async def claim_due_retries(self, limit: int = 100, lease_seconds: int = 300) -> list[EmailLog]:
+        """Lease and return failed emails whose retry is due, oldest first.
+
+        ``next_retry_at`` is pushed ``lease_seconds`` ahead, so once the
+        caller commits, other schedulers skip the rows without a lock being
+        held while they are sent. If the sender dies, they come due again
+        when the lease expires.
+        """
         result = await self._session.execute(
             select(EmailLog)
             .where(
                 and_(
                     EmailLog.status == EmailLogStatus.FAILED.value,
-                    EmailLog.retry_count < 3,  # Max 3 retries
+                    EmailLog.next_retry_at <= func.now(),
                 )
             )
-            .order_by(EmailLog.created_at)
+            .order_by(EmailLog.next_retry_at)
             .limit(limit)
+            .with_for_update(skip_locked=True)
         )
-        return list(result.scalars().all())
+        logs = list(result.scalars().all())
+        lease_until = datetime.utcnow() + timedelta(seconds=lease_seconds)
+        for log in logs:
+            log.next_retry_at = lease_until
+        await self._session.flush()
+        return logs
 
     async def schedule_retry(self, id: UUID) -> None:
-        """Schedule email for retry (just updates status back to pending)."""
+        """Make a failed or dead-lettered email due for retry now."""
         log = await self.get(id)
         if log:
-            log.status = EmailLogStatus.PENDING.value
+            log.status = EmailLogStatus.FAILED.value
+            log.next_retry_at = datetime.utcnow()
             await self._session.flush()
 
+    async def get_retry_queue_stats(self) -> dict:
+        """Depth and age of the retry queue."""
+        now = func.now()
+        result = await self._session.execute(
+            select(
+                func.count(EmailLog.id).filter(EmailLog.status == EmailLogStatus.FAILED.value),
+                func.count(EmailLog.id).filter(
+                    and_(
+                        EmailLog.status == EmailLogStatus.FAILED.value,
+                        EmailLog.next_retry_at <= now,
+                    )
+                ),
+                func.min(EmailLog.next_retry_at).filter(
+                    EmailLog.status == EmailLogStatus.FAILED.value
+                ),
+                func.extract(
+                    "epoch",
+                    now - func.min(EmailLog.next_retry_at).filter(
+                        and_(
+                            EmailLog.status == EmailLogStatus.FAILED.value,
+                            EmailLog.next_retry_at <= now,
+                        )
+                    ),
+                ),
+                func.count(EmailLog.id).filter(
+                    EmailLog.status == EmailLogStatus.DEAD_LETTER.value
+                ),
+            ).where(
+                EmailLog.status.in_(
+                    [EmailLogStatus.FAILED.value, EmailLogStatus.DEAD_LETTER.value]
+                )
+            )
+        )
+        scheduled, due, next_retry_at, oldest_due_age, dead_letter = result.one()
+        return {
+            "scheduled": scheduled or 0,
+            "due": due or 0,
+            "next_retry_at": next_retry_at,
+            "oldest_due_age_seconds": round(float(oldest_due_age), 1) if oldest_due_age else 0.0,
+            "dead_letter": dead_letter or 0,
+        }
+
 
 class EmailTemplateRepository:
     """Repository for email templates."""
@@ -209,6 +209,15 @@ async def get_email_stats(
     return await service.get_email_stats(days=days)
 
 
+@router.get("/notifications/email-logs/retry-queue", response_model=dict)
+async def get_email_retry_queue(
+    current_user: TokenPayload = Depends(require_permission("notifications:view")),
+    service: NotificationService = Depends(get_notification_service),
+):
+    """Get email retry queue depth and age. Admin only."""
+    return await service.get_email_retry_stats()
+
+
 @router.post("/notifications/email-logs/{id}/retry", response_model=MessageResponse)
 async def retry_email(
     id: UUID,
@@ -5,6 +5,8 @@ from src.services.notifications.deps import get_notification_service
 from src.services.notifications.schemas import (
     NotificationResponse,
     NotificationCreate,
+    NotificationBatchRequest,
+    NotificationBatchResponse,
     SendEmailRequest,
     SendEmailResponse
 )
@@ -29,3 +31,12 @@ async def create_notification(
     if not notification:
         raise HTTPException(status_code=400, detail="Notification not created")
     return notification
+
+
+@router.post("/notifications/batch", response_model=NotificationBatchResponse)
+async def create_notifications_batch(
+    data: NotificationBatchRequest,
+    service: NotificationService = Depends(get_notification_service),
+):
+    """Create many individual notifications in one call. Called by other services."""
+    return await service.send_batch(data)
@@ -204,6 +204,34 @@ class BulkNotificationResponse(BaseModel):
     errors: list[str] = []
 
 
+class NotificationBatchItem(BaseModel):
+    """One notification of a batch, with its own recipient and content."""
+    
+    user_id: UUID
+    user_email: Optional[str] = Field(None, max_length=255)  # Looked up if omitted
+    notification_type: NotificationType
+    title: str = Field(..., max_length=200)
+    message: str
+    channels: list[NotificationChannel] = [NotificationChannel.IN_APP]
+    priority: NotificationPriority = NotificationPriority.NORMAL
+    entity_type: Optional[str] = None
+    entity_id: Optional[str] = None
+    action_url: Optional[str] = None
+    payload: Optional[dict] = None
+
+
+class NotificationBatchRequest(BaseModel):
+    """Request to create many individual notifications at once."""
+    
+    notifications: list[NotificationBatchItem]
+
+
+class NotificationBatchResponse(BulkNotificationResponse):
+    """Response from a notification batch."""
+    
+    failed_user_ids: list[UUID] = []
+
+
 # ═══════════════════════════════════════════════════════════
 # Push Subscription Schemas
 # ═══════════════════════════════════════════════════════════
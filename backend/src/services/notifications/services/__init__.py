@@ -23,6 +23,7 @@ from src.services.notifications.models import Notification
 from src.services.notifications.schemas import (
     NotificationCreate,
     BulkNotificationRequest,
+    NotificationBatchRequest,
     SendEmailRequest,
     EmailTemplateCreate,
     EmailTemplateUpdate,
@@ -62,7 +63,8 @@ class NotificationService(BaseNotificationService):
         self._core = NotificationCoreService(
             session,
             email_sender=self._email.send_email_notification,
-            push_sender=self._push.send_push_notification
+            push_sender=self._push.send_push_notification,
+            email_batch_sender=self._email.send_email_notifications,
         )
         
         self._templates = NotificationTemplateService(session)
@@ -99,6 +101,9 @@ class NotificationService(BaseNotificationService):
 
     async def send_bulk(self, data: BulkNotificationRequest):
         return await self._core.send_bulk(data)
+
+    async def send_batch(self, data: NotificationBatchRequest):
+        return await self._core.send_batch(data)
     
     async def process_queue(self, batch_size: int = 100):
         return await self._core.process_queue(batch_size)
@@ -125,6 +130,12 @@ class NotificationService(BaseNotificationService):
     async def retry_email(self, log_id: UUID):
         return await self._email.retry_email(log_id)
 
+    async def process_due_email_retries(self, batch_size: int = 100):
+        return await self._email.process_due_retries(batch_size)
+
+    async def get_email_retry_stats(self):
+        return await self._email.get_email_retry_stats()
+
     async def get_email_events(self, log_id: UUID, permissive: bool = False):
         return await self._email.get_email_events(log_id, permissive)
 
@@ -15,6 +15,8 @@ from src.services.notifications.schemas import (
     NotificationCreate,
     BulkNotificationRequest,
     BulkNotificationResponse,
+    NotificationBatchRequest,
+    NotificationBatchResponse,
 )
 from src.services.notifications.services.base import BaseNotificationService
 
@@ -26,10 +28,17 @@ class NotificationCoreService(BaseNotificationService):
     Core service for Notification management.
     """
     
-    def __init__(self, session, email_sender: Callable = None, push_sender: Callable = None):
+    def __init__(
+        self,
+        session,
+        email_sender: Callable = None,
+        push_sender: Callable = None,
+        email_batch_sender: Callable = None,
+    ):
         super().__init__(session)
         self.email_sender = email_sender
         self.push_sender = push_sender
+        self.email_batch_sender = email_batch_sender
 
     def set_senders(self, email_sender: Callable, push_sender: Callable):
         self.email_sender = email_sender
@@ -163,19 +172,12 @@ class NotificationCoreService(BaseNotificationService):
 
     async def send_bulk(self, data: BulkNotificationRequest):
         """Send bulk notifications."""
-        from sqlalchemy import text
-        
         # 1. Fetch user emails
         if not data.user_ids:
             return BulkNotificationResponse(total=0, sent=0, failed=0, errors=[])
             
         try:
-             # Use raw SQL to fetch emails without importing auth models to avoid circular deps
-             # Need to cast UUIDs to string or pass list properly
-             # SQLAlchemy execute with list param handling
-             q = text("SELECT id, email FROM auth.users WHERE id = ANY(:ids)")
-             result = await self._session.execute(q, {"ids": data.user_ids})
-             user_map = {row.id: row.email for row in result.fetchall()}
+             user_map = await self._get_user_emails(data.user_ids)
         except Exception as e:
              logger.error(f"Failed to fetch users for bulk: {e}")
              return BulkNotificationResponse(
@@ -241,6 +243,80 @@ class NotificationCoreService(BaseNotificationService):
             errors=errors
         )
 
+    async def send_batch(self, data: NotificationBatchRequest):
+        """Create many individual notifications (each with its own content).
+        
+        Lets other services notify N users with one call instead of N.
+        Missing recipient emails are looked up in a single query.
+        """
+        items = data.notifications
+        if not items:
+            return NotificationBatchResponse(total=0, sent=0, failed=0, errors=[])
+        
+        missing = list({item.user_id for item in items if not item.user_email})
+        user_map = {}
+        if missing:
+            try:
+                user_map = await self._get_user_emails(missing)
+            except Exception as e:
+                logger.error(f"Failed to fetch users for batch: {e}")
+        
+        success_count = 0
+        errors = []
+        failed_user_ids = []
+        
+        for item in items:
+            email = item.user_email or user_map.get(item.user_id)
+            if not email:
+                errors.append(f"User {item.user_id} not found")
+                failed_user_ids.append(item.user_id)
+                continue
+            
+            try:
+                for channel in item.channels:
+                    await self.create_notification(NotificationCreate(
+                        user_id=item.user_id,
+                        user_email=email,
+                        notification_type=item.notification_type,
+                        title=item.title,
+                        message=item.message,
+                        channel=channel,
+                        priority=item.priority,
+                        entity_type=item.entity_type,
+                        entity_id=item.entity_id,
+                        action_url=item.action_url,
+                        payload=item.payload,
+                    ))
+                success_count += 1
+            except Exception as e:
+                error_msg = f"Failed to send batch notification to {item.user_id}: {str(e)}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+                failed_user_ids.append(item.user_id)
+        
+        # Trigger immediate processing
+        try:
+            await self.process_queue()
+        except Exception as e:
+            logger.error(f"Failed to trigger process_queue after batch: {e}")
+        
+        return NotificationBatchResponse(
+            total=len(items),
+            sent=success_count,
+            failed=len(failed_user_ids),
+            errors=errors,
+            failed_user_ids=failed_user_ids,
+        )
+
+    async def _get_user_emails(self, user_ids: list[UUID]) -> dict[UUID, str]:
+        """Emails of the given users, in one query."""
+        from sqlalchemy import text
+        
+        # Use raw SQL to fetch emails without importing auth models to avoid circular deps
+        q = text("SELECT id, email FROM auth.users WHERE id = ANY(:ids)")
+        result = await self._session.execute(q, {"ids": list(user_ids)})
+        return {row.id: row.email for row in result.fetchall()}
+
     async def process_queue(self, batch_size: int = 100):
         """Process pending notifications concurrently."""
         notifications = await self._notification_repo.get_queued(batch_size)
@@ -269,8 +345,25 @@ class NotificationCoreService(BaseNotificationService):
                     logger.error(f"Failed to process notification {n.id}: {e}")
                     return False, str(e)
 
+        # Emails go out in batches; the delivery engine applies the
+        # provider rate limit and connection pool.
+        email_results = {}
+        if self.email_batch_sender:
+            emails = [n for n in notifications if n.channel == NotificationChannel.EMAIL]
+            if emails:
+                try:
+                    email_results = await self.email_batch_sender(emails)
+                except Exception as e:
+                    logger.error(f"Failed to send email batch: {e}")
+                    email_results = {n.id: (False, str(e)) for n in emails}
+
+        async def _send(n):
+            if n.id in email_results:
+                return email_results[n.id]
+            return await _do_send_only(n)
+
         # Run I/O in parallel
-        io_tasks = [_do_send_only(n) for n in notifications]
+        io_tasks = [_send(n) for n in notifications]
         io_results = await asyncio.gather(*io_tasks)
         
         # Process DB updates sequentially (Session is not thread-safe)
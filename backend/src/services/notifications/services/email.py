@@ -4,21 +4,29 @@ KRONOS - Notification Service - Email Module
 Handles Email delivery, templating, and provider integration.
 """
 import logging
-import httpx
-import re
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, Any
 
+from src.core.config import settings
 from src.services.notifications.exceptions import (
     NotificationNotFound,
     TemplateNotFound,
     ProviderConfigurationError,
     DailyEmailLimitExceeded
 )
-from src.services.notifications.models import Notification
+from src.services.notifications.models import EmailLog, EmailLogStatus, Notification
 from src.services.notifications.schemas import SendEmailRequest, SendEmailResponse
 from src.services.notifications.services.base import BaseNotificationService
+from src.services.notifications.template_engine import template_cache
+from src.services.notifications.email_delivery import (
+    BrevoTransport,
+    DeliveryResult,
+    EmailRecipient,
+    OutgoingEmail,
+    get_transport,
+    provider_settings_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -73,22 +81,60 @@ class NotificationEmailService(BaseNotificationService):
         if not log:
             raise NotificationNotFound("Email log not found")
             
-        # Re-send
-        # We need to reconstruct template object or just pass None/Raw check
-        # For simplicity, if template_code is present in log, fetch it.
         template = None
         if log.template_code:
             template = await self._template_repo.get_by_code(log.template_code)
-        
-        success = await self._send_email_with_log(
-            to_email=log.recipient,
-            template=template,
-            variables=log.variables, # Assume it's stored as JSON
-            to_name=None, # Not stored in log usually
-            notification_id=log.notification_id
+
+        # Re-send on the same log, outside the retry schedule
+        results = await self._dispatch([(log, template)])
+        return results[0].ok
+
+    async def process_due_retries(self, batch_size: int = 100) -> dict:
+        """Retry one batch of failed emails whose ``next_retry_at`` is due.
+
+        Commits twice: once to lease the claimed rows, before any provider
+        call, and once to record the delivery results. No row lock is held
+        while the emails are sent.
+        """
+        logs = await self._email_log_repo.claim_due_retries(
+            limit=batch_size, lease_seconds=settings.email_retry_lease_seconds
         )
-        
-        return success
+        stats = {"claimed": len(logs), "sent": 0, "failed": 0, "dead_letter": 0}
+        if not logs:
+            await self._session.commit()
+            return stats
+
+        templates = {}
+        for code in {log.template_code for log in logs if log.template_code}:
+            templates[code] = await self._template_repo.get_by_code(code)
+        await self._session.commit()
+
+        items, missing = [], []
+        for log in logs:
+            if log.template_code and not templates[log.template_code]:
+                missing.append(log)
+            else:
+                items.append((log, templates.get(log.template_code)))
+
+        await self._dispatch(items)
+        if missing:
+            await self._email_log_repo.record_delivery_results(
+                [(log, None, f"Template {log.template_code} not found during retry") for log in missing]
+            )
+        await self._session.commit()
+
+        for log in logs:
+            if log.status == EmailLogStatus.SENT.value:
+                stats["sent"] += 1
+            elif log.status == EmailLogStatus.DEAD_LETTER.value:
+                stats["dead_letter"] += 1
+            else:
+                stats["failed"] += 1
+        return stats
+
+    async def get_email_retry_stats(self) -> dict:
+        """Retry queue depth and age."""
+        return await self._email_log_repo.get_retry_queue_stats()
 
     async def get_email_events(self, log_id: UUID, permissive: bool = False):
         """Fetch email events from Provider."""
@@ -100,34 +146,24 @@ class NotificationEmailService(BaseNotificationService):
         if not log.message_id:
              return []
              
-        # Call Provider API (Brevo)
-        # This duplicates logic in _send_brevo_email regarding provider settings fetching
-        # Ideally we should have a ProviderManager.
-        # For now, implementing inline as per original service.
-        settings = await self._provider_repo.get_active()
-        if not settings:
+        # Delivery events only exist on the Brevo side
+        transport = get_transport()
+        if not isinstance(transport, BrevoTransport):
             return []
-            
-        provider_config = settings.get_config_dict()
-        api_key = provider_config.get("api_key")
-        
-        if not api_key:
+
+        config = await provider_settings_cache.get(self._provider_repo)
+        if not config or not config.api_key:
             return []
-            
-        url = f"https://api.brevo.com/v3/smtp/statistics/events?messageId={log.message_id}"
-        
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers={
-                        "api-key": api_key,
-                        "accept": "application/json"
-                    },
-                    timeout=10.0
-                )
-                if response.status_code == 200:
-                   return response.json().get("events", [])
+            response = await transport.request(
+                config,
+                "GET",
+                "/smtp/statistics/events",
+                params={"messageId": log.message_id},
+            )
+            if response.status_code == 200:
+                return response.json().get("events", [])
         except Exception:
             pass
             
@@ -135,37 +171,47 @@ class NotificationEmailService(BaseNotificationService):
 
     async def send_email_notification(self, notification: Notification):
         """Send email for a notification object."""
-        # Get user email
-        to_email = await self._get_user_email(notification.user_id)
-        if not to_email:
-            logger.error(f"No email found for user {notification.user_id}")
-            return False
-            
-        # Get template if any
-        template = None
-        # Logic to determine template code from notification type?
-        # Or construct generic content.
-        # Original code likely had a mapping.
-        # For this refactor, we assume notification has enough info or use generic.
-        
-        template_code = f"NOTIFICATION_{notification.notification_type.upper()}"
-        template = await self._template_repo.get_by_code(template_code)
-        
-        variables = notification.metadata or {}
-        variables.update({
-            "title": notification.title,
-            "message": notification.message,
-            "entity_id": str(notification.entity_id) if notification.entity_id else "",
-            "entity_type": notification.entity_type or "",
-        })
-        
-        return await self._send_email_with_log(
-            to_email=to_email,
-            template=template,
-            variables=variables,
-            notification_id=notification.id,
-            user_id=notification.user_id
-        )
+        results = await self.send_email_notifications([notification])
+        sent, _ = results[notification.id]
+        return sent
+
+    async def send_email_notifications(self, notifications: list[Notification]) -> dict:
+        """Send emails for several notifications, batching same-template sends.
+
+        Returns ``{notification_id: (sent, error)}``.
+        """
+        results: dict = {}
+        groups: dict[str, list] = {}
+        for notification in notifications:
+            to_email = notification.user_email or await self._get_user_email(notification.user_id)
+            if not to_email:
+                logger.error(f"No email found for user {notification.user_id}")
+                results[notification.id] = (False, "Recipient email not found")
+                continue
+
+            variables = dict(notification.payload or {})
+            variables.update({
+                "title": notification.title,
+                "message": notification.message,
+                "entity_id": str(notification.entity_id) if notification.entity_id else "",
+                "entity_type": notification.entity_type or "",
+            })
+            template_code = f"NOTIFICATION_{notification.notification_type.upper()}"
+            groups.setdefault(template_code, []).append(
+                EmailRecipient(
+                    to_email=to_email,
+                    variables=variables,
+                    user_id=notification.user_id,
+                    notification_id=notification.id,
+                )
+            )
+
+        for template_code, recipients in groups.items():
+            template = await self._template_repo.get_by_code(template_code)
+            deliveries = await self._deliver(template, recipients)
+            for recipient, delivery in zip(recipients, deliveries):
+                results[recipient.notification_id] = (delivery.ok, delivery.error)
+        return results
 
     async def _send_email_with_log(
         self,
@@ -177,113 +223,106 @@ class NotificationEmailService(BaseNotificationService):
         user_id: Optional[UUID] = None
     ):
         """Shared method to send email with full logging."""
-        
-        # 1. Render content
-        subject = variables.get("title", "Notification")
-        content = variables.get("message", "")
-        
-        if template:
-            subject = self._render_template(template.subject, variables)
-            content = self._render_template(template.html_content, variables)
-        
-        # 2. Create Log (Pending)
-        log = await self._email_log_repo.create_pending(
-            user_id=user_id,
-            notification_id=notification_id,
-            to_email=to_email,
-            subject=subject,
-            template_code=template.code if template else None,
-            variables=variables
+        results = await self._deliver(
+            template,
+            [
+                EmailRecipient(
+                    to_email=to_email,
+                    variables=variables,
+                    to_name=to_name,
+                    user_id=user_id,
+                    notification_id=notification_id,
+                )
+            ],
         )
-        
-        # 3. Send via Provider
-        try:
-            message_id = await self._send_brevo_email(
-                to_email=to_email,
-                template=template,
-                variables=variables,
-                to_name=to_name
-            )
-            
-            # 4. Update Log (Sent)
-            await self._email_log_repo.mark_sent(log.id, message_id)
-            return True
-            
-        except Exception as e:
-            logger.error(f"Email send failed: {e}")
-            await self._email_log_repo.mark_failed(log.id, str(e))
-            return False
+        return results[0].ok
 
-    async def _send_brevo_email(
+    async def _deliver(self, template, recipients: list[EmailRecipient]) -> list[DeliveryResult]:
+        """Render, log and send one template to many recipients.
+
+        Every recipient gets its own ``EmailLog``; the transport groups the
+        messages into as few provider requests as it can and the
+        per-recipient outcome is written back to each log.
+        """
+        if not recipients:
+            return []
+
+        # 1. Render content (compiled template, once per recipient)
+        rendered = [self._render_email(template, r.variables) for r in recipients]
+
+        # 2. Create logs (pending), one flush for the whole batch
+        logs = await self._email_log_repo.create_pending_many([
+            {
+                "to_email": r.to_email,
+                "to_name": r.to_name,
+                "user_id": r.user_id,
+                "notification_id": r.notification_id,
+                "subject": subject,
+                "template_code": template.code if template else None,
+                "variables": r.variables,
+            }
+            for r, (subject, _) in zip(recipients, rendered)
+        ])
+
+        # 3. Send and record the outcome on each log
+        return await self._dispatch(
+            [(log, template) for log in logs],
+            rendered=rendered,
+        )
+
+    async def _dispatch(
         self,
-        to_email: str,
-        template,
-        variables: dict,
-        to_name: Optional[str] = None,
-    ):
-        """Send email via Brevo API."""
-        settings = await self._provider_repo.get_active()
-        if not settings:
-            raise ProviderConfigurationError("No active email provider configured")
-            
-        config = settings.get_config_dict()
-        api_key = config.get("api_key")
-        sender_email = config.get("sender_email")
-        sender_name = config.get("sender_name")
-        
-        if not api_key or not sender_email:
-            raise ProviderConfigurationError("Invalid provider configuration")
-            
-        # Prepare payload
-        payload = {
-            "sender": {"email": sender_email, "name": sender_name},
-            "to": [{"email": to_email, "name": to_name} if to_name else {"email": to_email}],
-        }
-        
-        if template and template.brevo_template_id:
-            # Use Brevo Template
-            payload["templateId"] = int(template.brevo_template_id)
-            payload["params"] = variables
+        items: list[tuple[EmailLog, Any]],
+        rendered: Optional[list[tuple[str, str]]] = None,
+    ) -> list[DeliveryResult]:
+        """Send existing email logs and record each outcome on its log.
+
+        ``items`` are (log, template) pairs; ``rendered`` holds the
+        (subject, html) of each item when the caller already rendered them.
+        """
+        if not items:
+            return []
+        if rendered is None:
+            rendered = [self._render_email(template, log.variables or {}) for log, template in items]
+
+        transport = get_transport()
+        try:
+            config = await provider_settings_cache.require(self._provider_repo, transport)
+        except ProviderConfigurationError as e:
+            results = [DeliveryResult(error=str(e))] * len(items)
         else:
-            # Use raw content
-            subject = variables.get("title", "Notification")
-            html_content = variables.get("message", "")
-            
-            if template:
-                subject = self._render_template(template.subject, variables)
-                html_content = self._render_template(template.html_content, variables)
-                
-            payload["subject"] = subject
-            payload["htmlContent"] = html_content
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.brevo.com/v3/smtp/email",
-                headers={
-                    "api-key": api_key,
-                    "content-type": "application/json",
-                    "accept": "application/json"
-                },
-                json=payload,
-                timeout=10.0
-            )
-            
-            if response.status_code in [201, 200]:
-                return response.json().get("messageId")
-            else:
-                raise Exception(f"Provider error: {response.text}")
-
-    def _render_template(self, content: str, variables: dict) -> str:
-        """Simple template rendering."""
-        if not content: return ""
-        result = content
-        for k, v in variables.items():
-            if v is not None:
-                # Handle double braces
-                result = result.replace(f"{{{{{k}}}}}", str(v))
-                # Handle single braces (legacy)
-                result = result.replace(f"{{{k}}}", str(v))
-        return result
+            messages = [
+                OutgoingEmail(
+                    to_email=log.to_email,
+                    to_name=log.to_name,
+                    subject=subject,
+                    html_content=content,
+                    brevo_template_id=(
+                        int(template.brevo_template_id)
+                        if template and template.brevo_template_id
+                        else None
+                    ),
+                    params=log.variables or {},
+                    batch_key=template.code if template else None,
+                )
+                for (log, template), (subject, content) in zip(items, rendered)
+            ]
+            results = await transport.send(config, messages)
+
+        for result in results:
+            if not result.ok:
+                logger.error(f"Email send failed: {result.error}")
+        await self._email_log_repo.record_delivery_results(
+            [(log, result.message_id, result.error) for (log, _), result in zip(items, results)]
+        )
+        return results
+
+    def _render_email(self, template, variables: dict) -> tuple[str, str]:
+        """Render subject and HTML body from the compiled template cache."""
+        if not template:
+            return variables.get("title", "Notification"), variables.get("message", "")
+        compiled = template_cache.get(template)
+        return compiled.render_subject(variables), compiled.render_html(variables)
 
     def _convert_to_brevo_syntax(self, content: str) -> str:
         """Convert standard syntax to Brevo syntax if needed."""
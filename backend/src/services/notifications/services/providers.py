@@ -4,12 +4,17 @@ KRONOS - Notification Service - Providers Module
 Handles Email Provider Settings (SMTP/API configs).
 """
 import logging
-import httpx
+from dataclasses import replace
 from uuid import UUID
 from typing import Optional
 
 from src.core.exceptions import BusinessRuleError
 from src.services.notifications.exceptions import ProviderConfigurationError
+from src.services.notifications.email_delivery import (
+    OutgoingEmail,
+    get_transport,
+    provider_settings_cache,
+)
 from src.services.notifications.schemas import (
     EmailProviderSettingsCreate,
     EmailProviderSettingsUpdate,
@@ -41,7 +46,9 @@ class NotificationProviderService(BaseNotificationService):
             if active:
                  await self._provider_repo.update(active.id, is_active=False)
                  
-        return await self._provider_repo.create(**data.model_dump())
+        settings = await self._provider_repo.create(**data.model_dump())
+        await provider_settings_cache.invalidate(self._session)
+        return settings
 
     async def update_settings(self, id: UUID, data: EmailProviderSettingsUpdate):
         """Update provider settings."""
@@ -54,7 +61,9 @@ class NotificationProviderService(BaseNotificationService):
              if active and active.id != id:
                   await self._provider_repo.update(active.id, is_active=False)
 
-        return await self._provider_repo.update(id, **data.model_dump(exclude_unset=True))
+        updated = await self._provider_repo.update(id, **data.model_dump(exclude_unset=True))
+        await provider_settings_cache.invalidate(self._session)
+        return updated
 
     async def test_settings(self, data: TestEmailRequest):
         """Test settings by sending an email."""
@@ -66,38 +75,19 @@ class NotificationProviderService(BaseNotificationService):
         # un-saved settings we'd need to mock the repo response.
         
         # Let's assume we test the ACTIVE settings.
-        settings = await self.get_active_settings()
-        if not settings:
-             raise ProviderConfigurationError("No active settings to test")
-             
-        config = settings.get_config_dict()
-        api_key = config.get("api_key")
-        sender_email = config.get("sender_email")
-        
-        if not api_key:
+        transport = get_transport()
+        config = await provider_settings_cache.require(self._provider_repo, transport)
+        if transport.requires_provider_settings and not config.api_key:
              raise ProviderConfigurationError("Missing API key in settings")
-             
-        # Simple send via httpx (duplicating `_send_brevo_email` logic but isolated)
-        payload = {
-            "sender": {"email": sender_email, "name": "KRONOS Test"},
-            "to": [{"email": data.to_email}],
-            "subject": "Test Configuration KRONOS",
-            "htmlContent": "<p>This is a test email to verify your configuration.</p>"
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.brevo.com/v3/smtp/email",
-                headers={
-                    "api-key": api_key,
-                    "content-type": "application/json",
-                    "accept": "application/json"
-                },
-                json=payload,
-                timeout=10.0
-            )
-            
-            if response.status_code in [201, 200]:
-                return True
-            else:
-                raise BusinessRuleError(f"Test failed: {response.text}")
+
+        message = OutgoingEmail(
+            to_email=data.to_email,
+            subject="Test Configuration KRONOS",
+            html_content="<p>This is a test email to verify your configuration.</p>",
+        )
+        test_config = replace(config, sender_name="KRONOS Test")
+        result = (await transport.send(test_config, [message]))[0]
+
+        if result.ok:
+            return True
+        raise BusinessRuleError(f"Test failed: {result.error}")
@@ -14,6 +14,7 @@ from src.services.notifications.schemas import (
     EmailTemplateUpdate,
 )
 from src.services.notifications.services.base import BaseNotificationService
+from src.services.notifications.template_engine import template_cache
 
 import httpx
 from src.core.config import settings
@@ -52,6 +53,7 @@ class NotificationTemplateService(BaseNotificationService):
         template = await self.get_template(id)
         
         updated = await self._template_repo.update(id, **data.model_dump(exclude_unset=True))
+        template_cache.invalidate(template.code)
         
         # Audit (user_id needed to log who updated)
         # Using placeholder since original service didn't pass user_id clearly in all paths
@@ -93,7 +95,7 @@ class NotificationTemplateService(BaseNotificationService):
             "isActive": True
         }
         
-        url = "https://api.brevo.com/v3/smtp/templates"
+        url = f"{settings.brevo_api_url}/smtp/templates"
         method = "POST"
         
         if is_update:
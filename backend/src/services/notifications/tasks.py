@@ -7,22 +7,20 @@ from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID
 
-from celery import shared_task
+from src.core.database import async_session_factory
+from src.core.worker_runtime import async_task
 from src.services.notifications.models import (
     NotificationType,
     NotificationChannel,
 )
 from src.services.notifications.repositories import CalendarExternalRepository
 from src.services.notifications.schemas import NotificationCreate
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.config import settings
 
 async def _get_async_session() -> AsyncSession:
-    """Create async database session for task."""
-    engine = create_async_engine(settings.database_url)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    return async_session()
+    """Create async database session for task (pooled by the worker runtime)."""
+    return async_session_factory()
 
 
 async def _send_notification(
@@ -59,14 +57,13 @@ async def _send_notification(
             print(f"[Scheduler] Error sending {channel} notification: {e}")
 
 
-@shared_task(name="notifications.check_system_deadlines")
-def check_system_deadlines():
+@async_task(name="notifications.check_system_deadlines")
+async def check_system_deadlines():
     """Check for upcoming system deadlines (holidays, closures).
     
     Run this task hourly via Celery beat.
     """
-    import asyncio
-    asyncio.run(_check_system_deadlines_async())
+    await _check_system_deadlines_async()
 
 
 async def _check_system_deadlines_async():
@@ -162,14 +159,13 @@ async def _notify_all_users_about_holiday(session: AsyncSession, holiday) -> Non
         print(f"[Scheduler] Error notifying users about holiday: {e}")
 
 
-@shared_task(name="notifications.check_personal_deadlines")
-def check_personal_deadlines():
+@async_task(name="notifications.check_personal_deadlines")
+async def check_personal_deadlines():
     """Check for upcoming personal calendar events.
     
     Run this task hourly via Celery beat.
     """
-    import asyncio
-    asyncio.run(_check_personal_deadlines_async())
+    await _check_personal_deadlines_async()
 
 
 async def _check_personal_deadlines_async():
@@ -226,14 +222,13 @@ async def _notify_about_personal_event(session: AsyncSession, event) -> None:
         print(f"[Scheduler] Error notifying about personal event: {e}")
 
 
-@shared_task(name="notifications.check_shared_deadlines")
-def check_shared_deadlines():
+@async_task(name="notifications.check_shared_deadlines")
+async def check_shared_deadlines():
     """Check for upcoming shared calendar events.
     
     Run this task hourly via Celery beat.
     """
-    import asyncio
-    asyncio.run(_check_shared_deadlines_async())
+    await _check_shared_deadlines_async()
 
 
 async def _check_shared_deadlines_async():
@@ -298,87 +293,45 @@ async def _notify_shared_calendar_users(session: AsyncSession, event) -> None:
             print(f"[Scheduler] Error notifying shared calendar user: {e}")
 
 
-@shared_task(name="notifications.process_email_retries")
-def process_email_retries():
-    """Process retry queue for failed emails.
+# Upper bound on batches per run, so one run cannot hog the worker
+MAX_RETRY_BATCHES_PER_RUN = 20
+
+
+@async_task(name="notifications.process_email_retries")
+async def process_email_retries():
+    """Retry failed emails whose next_retry_at is due.
     
-    Run this task every 5 minutes via Celery beat.
+    Run this task every 30 seconds via Celery beat. Only due rows are read
+    (partial index on next_retry_at), so idle runs are cheap.
     """
-    import asyncio
-    asyncio.run(_process_email_retries_async())
+    await _process_email_retries_async()
 
 
 async def _process_email_retries_async():
     """Async implementation of email retry processor."""
-    from src.services.notifications.models import EmailLogStatus
-    from src.services.notifications.repositories import EmailLogRepository, EmailTemplateRepository
     from src.services.notifications.services import NotificationService
     
     session = await _get_async_session()
-    email_repo = EmailLogRepository(session)
-    template_repo = EmailTemplateRepository(session)
     service = NotificationService(session)
+    batch_size = settings.email_retry_batch_size
+    totals = {"claimed": 0, "sent": 0, "failed": 0, "dead_letter": 0}
     
     try:
-        # Get pending retries
-        pending_logs = await email_repo.get_pending_retries(limit=50)
-        
-        if not pending_logs:
-            return
-            
-        print(f"[Scheduler] Processing {len(pending_logs)} email retries...")
+        for _ in range(MAX_RETRY_BATCHES_PER_RUN):
+            # Each batch leases its rows and records the results in its own transactions
+            stats = await service.process_due_email_retries(batch_size)
+            for key in totals:
+                totals[key] += stats[key]
+            if stats["claimed"] < batch_size:
+                break
         
-        for log in pending_logs:
-            try:
-                # Update status to processing
-                log.status = EmailLogStatus.QUEUED.value
-                await session.flush()
-                
-                # Get template
-                template = await template_repo.get_by_code(log.template_code)
-                if not template:
-                    await email_repo.update_status(
-                        log.id, 
-                        EmailLogStatus.FAILED.value, 
-                        error_message=f"Template {log.template_code} not found during retry"
-                    )
-                    await session.commit()
-                    continue
-                
-                # Attempt resend (using internal method to avoid creating new log)
-                try:
-                    result = await service._send_brevo_email(
-                        to_email=log.to_email,
-                        to_name=log.to_name,
-                        template=template,
-                        variables=log.variables or {},
-                    )
-                    
-                    # Update success
-                    await email_repo.update_status(
-                        log.id,
-                        status=EmailLogStatus.SENT.value,
-                        message_id=result.get("messageId"),
-                        provider_response=result,
-                    )
-                    
-                except Exception as e:
-                    # Schedule next retry or fail permanently
-                    error_msg = str(e)
-                    await email_repo.update_status(
-                        log.id,
-                        status=EmailLogStatus.FAILED.value,
-                        error_message=error_msg,
-                        provider_response={"error": error_msg}
-                    )
-                    
-                    if (log.retry_count or 0) < 3:
-                        await email_repo.schedule_retry(log.id)
-            
-            except Exception as e:
-                print(f"[Scheduler] Error processing retry for log {log.id}: {e}")
-                
-        await session.commit()
+        if totals["claimed"]:
+            queue = await service.get_email_retry_stats()
+            print(
+                f"[Scheduler] Email retries: {totals['sent']} sent, {totals['failed']} rescheduled, "
+                f"{totals['dead_letter']} dead-lettered; queue depth {queue['scheduled']} "
+                f"({queue['due']} due, oldest {queue['oldest_due_age_seconds']}s)"
+            )
         
     except Exception as e:
         print(f"[Scheduler] Error in retry processor: {e}")
@@ -386,14 +339,13 @@ async def _process_email_retries_async():
     finally:
         await session.close()
 
-@shared_task(name="notifications.process_queue")
-def process_notifications_queue():
+@async_task(name="notifications.process_queue")
+async def process_notifications_queue():
     """Process pending notifications queue.
     
     Run this task frequently via Celery beat.
     """
-    import asyncio
-    asyncio.run(_process_notifications_queue_async())
+    await _process_notifications_queue_async()
 
 
 async def _process_notifications_queue_async():
@@ -0,0 +1,138 @@
+"""
+KRONOS Notification Service - Email Template Engine.
+
+Templates are compiled once into a list of segments (literal chunks and
+placeholders) and cached per template code and ``updated_at``, so rendering
+an email is a single join instead of repeated ``str.replace`` passes over the
+whole HTML.
+
+Placeholder syntax:
+- ``{{name}}``: value inserted HTML-escaped in HTML bodies.
+- ``{{{name}}}``: value inserted as-is (trusted HTML).
+- ``{name}``: legacy single-brace form, same as ``{{name}}``.
+
+Placeholders without a value are left in the output unchanged.
+"""
+import html
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, Union
+
+_PLACEHOLDER = re.compile(r"\{\{\{(\w+)\}\}\}|\{\{(\w+)\}\}|\{(\w+)\}")
+
+MAX_CACHED_TEMPLATES = 512
+
+
+@dataclass(frozen=True)
+class Placeholder:
+    """Variable slot in a compiled template."""
+
+    name: str
+    source: str  # Original text, emitted when the variable is missing
+    raw: bool
+
+
+Segment = Union[str, Placeholder]
+
+
+@dataclass(frozen=True)
+class CompiledText:
+    """A template string split into literal chunks and placeholders."""
+
+    segments: tuple[Segment, ...]
+
+    @classmethod
+    def compile(cls, content: Optional[str]) -> "CompiledText":
+        if not content:
+            return cls(())
+        segments: list[Segment] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(content):
+            if match.start() > position:
+                segments.append(content[position:match.start()])
+            raw_name, name, legacy_name = match.groups()
+            segments.append(
+                Placeholder(
+                    name=raw_name or name or legacy_name,
+                    source=match.group(0),
+                    raw=raw_name is not None,
+                )
+            )
+            position = match.end()
+        if position < len(content):
+            segments.append(content[position:])
+        return cls(tuple(segments))
+
+    def render(self, variables: dict[str, Any], escape: bool) -> str:
+        parts = []
+        for segment in self.segments:
+            if segment.__class__ is str:
+                parts.append(segment)
+                continue
+            value = variables.get(segment.name)
+            if value is None:
+                parts.append(segment.source)
+            elif escape and not segment.raw:
+                parts.append(html.escape(str(value)))
+            else:
+                parts.append(str(value))
+        return "".join(parts)
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Compiled subject and bodies of an ``EmailTemplate``."""
+
+    subject: CompiledText
+    html_content: CompiledText
+    text_content: CompiledText
+
+    @classmethod
+    def from_template(cls, template) -> "CompiledTemplate":
+        return cls(
+            subject=CompiledText.compile(template.subject),
+            html_content=CompiledText.compile(template.html_content),
+            text_content=CompiledText.compile(template.text_content),
+        )
+
+    def render_subject(self, variables: dict[str, Any]) -> str:
+        return self.subject.render(variables, escape=False)
+
+    def render_html(self, variables: dict[str, Any]) -> str:
+        return self.html_content.render(variables, escape=True)
+
+    def render_text(self, variables: dict[str, Any]) -> str:
+        return self.text_content.render(variables, escape=False)
+
+
+class TemplateCache:
+    """Bounded LRU of compiled templates keyed by (code, updated_at)."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_TEMPLATES) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, Optional[datetime]], CompiledTemplate] = OrderedDict()
+
+    def get(self, template) -> CompiledTemplate:
+        """Get the compiled form of a template, compiling it on a miss."""
+        key = (template.code, template.updated_at)
+        compiled = self._entries.get(key)
+        if compiled is not None:
+            self._entries.move_to_end(key)
+            return compiled
+
+        compiled = CompiledTemplate.from_template(template)
+        # A newer revision replaces any older one of the same code
+        self.invalidate(template.code)
+        self._entries[key] = compiled
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return compiled
+
+    def invalidate(self, code: str) -> None:
+        for key in [k for k in self._entries if k[0] == code]:
+            del self._entries[key]
+
+
+template_cache = TemplateCache()
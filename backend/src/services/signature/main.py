@@ -10,6 +10,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import settings
+from src.core.serialization import DEFAULT_RESPONSE_CLASS
 from src.core.database import init_db, close_db
 from src.services.signature.router import router
 
@@ -35,6 +36,7 @@ app = FastAPI(
     All signature transactions are immutable and include forensic metadata.
     """,
     version="1.0.0",
+    default_response_class=DEFAULT_RESPONSE_CLASS,
     docs_url="/api/v1/signature/docs",
     redoc_url="/api/v1/signature/redoc",
     openapi_url="/api/v1/signature/openapi.json",
@@ -57,6 +59,14 @@ app.include_router(router, prefix="/api/v1")
 from src.core.middleware import RequestContextMiddleware
 app.add_middleware(RequestContextMiddleware)
 
+# Internal batch endpoint (several GETs in one request, see src.core.batch)
+from src.core.batch import router as batch_router
+app.include_router(batch_router)
+
+# Prometheus scrape endpoint
+from src.core.metrics import router as metrics_router
+app.include_router(metrics_router)
+
 from src.core.error_handlers import register_error_handlers
 register_error_handlers(app)
 
@@ -4,6 +4,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import settings
+from src.core.serialization import DEFAULT_RESPONSE_CLASS
 from src.core.database import init_db, close_db
 from src.services.smart_working.router import router
 
@@ -21,6 +22,7 @@ app = FastAPI(
     title="KRONOS - Smart Working Service",
     description="Microservice for Remote Work (Lavoro Agile) management",
     version="1.0.0",
+    default_response_class=DEFAULT_RESPONSE_CLASS,
     docs_url="/api/v1/smart-working/docs",
     openapi_url="/api/v1/smart-working/openapi.json",
     lifespan=lifespan
@@ -42,6 +44,14 @@ app.include_router(router, prefix="/api/v1")
 from src.core.middleware import RequestContextMiddleware
 app.add_middleware(RequestContextMiddleware)
 
+# Internal batch endpoint (several GETs in one request, see src.core.batch)
+from src.core.batch import router as batch_router
+app.include_router(batch_router)
+
+# Prometheus scrape endpoint
+from src.core.metrics import router as metrics_router
+app.include_router(metrics_router)
+
 # Register Error Handlers
 from src.core.error_handlers import register_error_handlers
 register_error_handlers(app)
@@ -9,6 +9,8 @@ from uuid import UUID
 
 from src.core.config import settings
 from src.shared.clients.base import BaseClient
+from src.shared.clients.resilience import LOOKUP_POLICY
+from src.shared.clients.response_cache import USER_INFO
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,8 @@ logger = logging.getLogger(__name__)
 class AuthClient(BaseClient):
     """Client for Auth Service interactions."""
     
+    resilience = LOOKUP_POLICY
+    
     def __init__(self):
         super().__init__(
             base_url=settings.auth_service_url,
@@ -28,7 +32,7 @@ class AuthClient(BaseClient):
     
     async def get_user_info(self, user_id: UUID) -> Optional[dict]:
         """Get user details from auth service."""
-        return await self.get_safe(f"/api/v1/users/{user_id}")
+        return await self.get_safe(f"/api/v1/users/{user_id}", cache=USER_INFO)
     
     async def get_user(self, user_id: UUID) -> Optional[dict]:
         """Alias for get_user_info for aggregator compatibility."""
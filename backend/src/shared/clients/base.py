@@ -6,10 +6,13 @@ for all inter-service communication.
 
 Features:
 - Singleton HTTP client with connection pooling (Keep-Alive)
-- Automatic retry with exponential backoff
+- Bounded retry of idempotent requests with jittered exponential backoff
+- Per-service circuit breaker, adaptive timeouts and hedged GETs (see resilience)
 - Typed exception handling
 - Request/Response logging
-- Configurable timeouts
+- Opt-in GET response cache with ETag revalidation (see response_cache)
+- Single-flight: identical concurrent GETs share one request
+- Batching: GETs to a service can share one internal batch request (see batching)
 
 Usage:
     class AuthClient(BaseClient):
@@ -22,14 +25,30 @@ Usage:
         async def get_user(self, user_id: UUID) -> Optional[dict]:
             return await self.get(f"/api/v1/users/{user_id}")
 """
+import asyncio
 import logging
+import time
 from typing import Optional, Any, ClassVar
 from contextlib import asynccontextmanager
 
 import httpx
 
 from src.core.config import settings
+from src.core.metrics import observe_service_call
+from src.core.serialization import dumps, loads
+from src.core.timing import add_service_time
+from src.shared.clients.batching import BATCH_PATH, RequestBatcher, batch_window
+from src.shared.clients.metrics import record
+from src.shared.clients.resilience import (
+    DEFAULT_POLICY,
+    ResiliencePolicy,
+    ServiceHealth,
+    retry_delay,
+    service_health,
+)
+from src.shared.clients.response_cache import CachePolicy, response_cache
 from src.shared.exceptions import (
+    CircuitOpenError,
     ServiceUnavailableError,
     ServiceResponseError,
     ServiceTimeoutError,
@@ -37,6 +56,16 @@ from src.shared.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+IDEMPOTENT_METHODS = frozenset({"GET", "PUT", "DELETE"})
+RETRYABLE_STATUS = frozenset({502, 503, 504})
+
+
+def _freeze(mapping: Optional[dict]) -> tuple:
+    """Hashable, order-independent form of params/headers for request keys."""
+    if not mapping:
+        return ()
+    return tuple(sorted((str(k).lower(), str(v)) for k, v in mapping.items()))
+
 
 class BaseClient:
     """
@@ -46,13 +75,27 @@ class BaseClient:
     - Shared connection pool (reduced latency, better resource usage)
     - Consistent error handling
     - Automatic retry for transient failures
+    - Failing fast while a service is unhealthy
     - Request logging for debugging
+    
+    Subclasses tune the resilience behaviour by overriding ``resilience``.
     """
     
+    resilience: ClassVar[ResiliencePolicy] = DEFAULT_POLICY
+    
     # Class-level shared client for connection pooling
     _shared_client: ClassVar[Optional[httpx.AsyncClient]] = None
     _client_initialized: ClassVar[bool] = False
     
+    # Background revalidations in flight, by cache key
+    _revalidating: ClassVar[dict[tuple, asyncio.Task]] = {}
+    
+    # GET requests in flight, shared by identical concurrent calls
+    _in_flight: ClassVar[dict[tuple, asyncio.Task]] = {}
+    
+    # Batch queues, by (service, base_url)
+    _batchers: ClassVar[dict[tuple, RequestBatcher]] = {}
+    
     def __init__(self, base_url: str, service_name: str):
         """
         Initialize the client.
@@ -82,8 +125,8 @@ class BaseClient:
                     max_connections=settings.service_pool_connections,
                     max_keepalive_connections=settings.service_pool_keepalive,
                 ),
-                # Enable HTTP/2 for better performance
-                http2=False,  # Set to True if all services support HTTP/2
+                # HTTP/2 multiplexes concurrent calls over one connection per service
+                http2=settings.service_http2_enabled,
             )
             cls._client_initialized = True
             logger.info(
@@ -110,6 +153,7 @@ class BaseClient:
         json: Optional[dict] = None,
         headers: Optional[dict] = None,
         timeout: Optional[float] = None,
+        cache: Optional[CachePolicy] = None,
     ) -> Optional[Any]:
         """
         Make HTTP request with enterprise error handling.
@@ -121,6 +165,7 @@ class BaseClient:
             json: JSON body for POST/PUT
             headers: Additional headers
             timeout: Override default timeout
+            cache: Cache the response of a GET (see ``response_cache``)
         
         Returns:
             Parsed JSON response or None for empty responses
@@ -130,6 +175,134 @@ class BaseClient:
             ServiceTimeoutError: When request times out
             ServiceResponseError: When service returns 5xx error
         """
+        if cache is not None and method == "GET" and settings.service_cache_enabled:
+            return await self._cached_get(path, cache, params=params, headers=headers, timeout=timeout)
+        
+        if method == "GET" and settings.service_single_flight_enabled:
+            response = await self._send_coalesced(path, params=params, headers=headers, timeout=timeout)
+        else:
+            response = await self._send(method, path, params=params, json=json, headers=headers, timeout=timeout)
+        return self._parse(response, method, path)
+    
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        """
+        Send a request under the client's resilience policy.
+        
+        Fails fast with CircuitOpenError while the service's breaker is open.
+        Idempotent requests are retried on transport errors, timeouts and
+        502/503/504; GETs may be hedged. Without an explicit ``timeout`` each
+        idempotent attempt uses the service's adaptive timeout; other methods
+        keep ``SERVICE_TIMEOUT``, since a write that times out may still be
+        applied. GETs are queued for a batch request while batching is active.
+        """
+        if method == "GET":
+            window = batch_window()
+            if window is not None:
+                return await self._send_batched(path, params, headers, window)
+        
+        policy = self.resilience
+        health = service_health(self.service_name)
+        idempotent = method in IDEMPOTENT_METHODS
+        retries = policy.max_retries if idempotent else 0
+        attempt = 0
+        
+        while True:
+            if not health.breaker.allow(policy):
+                record(self.service_name, "short_circuited")
+                raise CircuitOpenError(self.service_name, health.breaker.retry_after(policy))
+            
+            attempt_timeout = timeout or (
+                health.timeout(policy) if idempotent else settings.service_timeout
+            )
+            try:
+                if method == "GET":
+                    response = await self._send_hedged(
+                        path, params, headers, attempt_timeout, policy, health
+                    )
+                else:
+                    response = await self._attempt(
+                        method, path, params, json, headers, attempt_timeout, health
+                    )
+            except (ServiceUnavailableError, ServiceResponseError) as e:
+                if health.breaker.record_failure(policy):
+                    record(self.service_name, "circuit_opened")
+                    logger.warning(
+                        f"[{self.service_name}] Circuit opened after "
+                        f"{health.breaker.failures} consecutive failures"
+                    )
+                retryable = isinstance(e, ServiceUnavailableError) or e.status_code in RETRYABLE_STATUS
+                if attempt >= retries or not retryable:
+                    raise
+                record(self.service_name, "retries")
+                await asyncio.sleep(retry_delay(policy, attempt))
+                attempt += 1
+            except BaseException:
+                health.breaker.release()
+                raise
+            else:
+                health.breaker.record_success()
+                return response
+    
+    async def _send_hedged(
+        self,
+        path: str,
+        params: Optional[dict],
+        headers: Optional[dict],
+        timeout: float,
+        policy: ResiliencePolicy,
+        health: ServiceHealth,
+    ) -> httpx.Response:
+        """GET with a duplicate request if the first one is slower than the service's p95."""
+        health.count_request()
+        delay = health.hedge_delay(policy)
+        if delay is None:
+            return await self._attempt("GET", path, params, None, headers, timeout, health)
+        
+        loop = asyncio.get_running_loop()
+        primary = loop.create_task(self._attempt("GET", path, params, None, headers, timeout, health))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+            
+            health.hedges += 1
+            record(self.service_name, "hedged")
+            hedge = loop.create_task(self._attempt("GET", path, params, None, headers, timeout, health))
+            pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            record(self.service_name, "hedge_wins")
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _attempt(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict],
+        json: Optional[dict],
+        headers: Optional[dict],
+        timeout: float,
+        health: ServiceHealth,
+    ) -> httpx.Response:
+        """One request/response exchange, mapping transport errors and 5xx to service exceptions."""
         url = f"{self.base_url}{path}"
         client = await self.get_shared_client()
         
@@ -137,59 +310,244 @@ class BaseClient:
         request_kwargs = {
             "method": method,
             "url": url,
+            "timeout": timeout,
         }
         if params:
             request_kwargs["params"] = params
         if json:
-            request_kwargs["json"] = json
+            request_kwargs["content"] = dumps(json)
+            headers = {"content-type": "application/json", **(headers or {})}
         if headers:
             request_kwargs["headers"] = headers
-        if timeout:
-            request_kwargs["timeout"] = timeout
         
+        started = time.monotonic()
+        error = None
         try:
             logger.debug(f"[{self.service_name}] {method} {path}")
             response = await client.request(**request_kwargs)
             
-            # Handle server errors (5xx)
-            if response.status_code >= 500:
-                logger.error(
-                    f"[{self.service_name}] Server error: "
-                    f"{response.status_code} {response.text[:200]}"
-                )
-                raise ServiceResponseError(
-                    self.service_name,
-                    response.status_code,
-                    response.text[:500],
-                )
-            
-            # Handle client errors (4xx) - log but don't raise
-            if response.status_code >= 400:
-                logger.warning(
-                    f"[{self.service_name}] Client error: "
-                    f"{response.status_code} on {method} {path}"
-                )
-                return None
-            
-            # Parse response
-            if response.content:
-                return response.json()
-            return None
-            
         except httpx.ConnectError as e:
+            error = "connect"
             logger.error(f"[{self.service_name}] Connection error: {e}")
             raise ServiceUnavailableError(self.service_name, str(e))
         
         except httpx.TimeoutException as e:
+            error = "timeout"
             logger.error(f"[{self.service_name}] Timeout: {e}")
-            raise ServiceTimeoutError(
-                self.service_name,
-                timeout or settings.service_timeout,
-            )
+            raise ServiceTimeoutError(self.service_name, timeout)
         
         except httpx.HTTPError as e:
+            error = "http"
             logger.error(f"[{self.service_name}] HTTP error: {e}")
             raise ServiceUnavailableError(self.service_name, str(e))
+        
+        finally:
+            elapsed = time.monotonic() - started
+            add_service_time(self.service_name, elapsed)
+            if error is not None:
+                observe_service_call(self.service_name, elapsed, error)
+        
+        if response.status_code >= 500:
+            error = f"{response.status_code}"
+        observe_service_call(self.service_name, elapsed, error)
+        
+        # Handle server errors (5xx)
+        if response.status_code >= 500:
+            logger.error(
+                f"[{self.service_name}] Server error: "
+                f"{response.status_code} {response.text[:200]}"
+            )
+            raise ServiceResponseError(
+                self.service_name,
+                response.status_code,
+                response.text[:500],
+            )
+        # Only idempotent calls use the adaptive timeout: keep writes out of its samples
+        if method in IDEMPOTENT_METHODS:
+            health.latency.add(elapsed)
+        return response
+    
+    async def _send_coalesced(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        """
+        Send a GET, sharing it with identical GETs already in flight (single-flight).
+        
+        Concurrent callers asking for the same (service, path, params, headers)
+        await one request. They share the response (or exception), but each
+        parses its own copy of the body. A caller being cancelled does not
+        cancel the request for the others.
+        """
+        key = (
+            self.service_name,
+            self.base_url,
+            path,
+            _freeze(params),
+            _freeze(headers),
+        )
+        loop = asyncio.get_running_loop()
+        flight = BaseClient._in_flight.get(key)
+        if flight is not None and flight.get_loop() is loop:
+            record(self.service_name, "coalesced")
+            return await asyncio.shield(flight)
+        
+        flight = loop.create_task(self._send("GET", path, params=params, headers=headers, timeout=timeout))
+        BaseClient._in_flight[key] = flight
+        
+        def done(task: asyncio.Task) -> None:
+            if BaseClient._in_flight.get(key) is task:
+                del BaseClient._in_flight[key]
+            # Retrieve the exception so it is not reported when every caller went away
+            if not task.cancelled():
+                task.exception()
+        
+        flight.add_done_callback(done)
+        record(self.service_name, "requests")
+        return await asyncio.shield(flight)
+    
+    # ═══════════════════════════════════════════════════════════════════════
+    # Batching
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    async def _send_batched(
+        self,
+        path: str,
+        params: Optional[dict],
+        headers: Optional[dict],
+        window: float,
+    ) -> httpx.Response:
+        """Queue a GET for the service's next batch request and wait for its response."""
+        key = (self.service_name, self.base_url)
+        batcher = BaseClient._batchers.get(key)
+        if batcher is None or batcher.loop is not asyncio.get_running_loop():
+            batcher = BaseClient._batchers[key] = RequestBatcher(
+                self._send_batch, max_size=settings.service_batch_max_size
+            )
+        
+        if params:
+            path = f"{path}?{httpx.QueryParams(params)}"
+        response = await batcher.submit({"path": path, "headers": headers or {}}, window)
+        if isinstance(response, Exception):
+            raise response
+        if response.status_code >= 500:
+            raise ServiceResponseError(self.service_name, response.status_code, response.text[:500])
+        return response
+    
+    async def _send_batch(self, operations: list[dict]) -> list:
+        """Send queued GETs, as one batch request if there are several."""
+        if len(operations) == 1:
+            return [await self._send("GET", operations[0]["path"], headers=operations[0]["headers"] or None)]
+        
+        response = await self._send("POST", BATCH_PATH, json={"operations": operations})
+        if response.status_code in (404, 405):
+            # Service without a batch endpoint: fall back to separate requests
+            logger.warning(f"[{self.service_name}] No batch endpoint, sending {len(operations)} GETs")
+            return await asyncio.gather(
+                *(self._send("GET", op["path"], headers=op["headers"] or None) for op in operations),
+                return_exceptions=True,
+            )
+        if response.status_code >= 400:
+            raise ServiceResponseError(self.service_name, response.status_code, response.text[:500])
+        
+        record(self.service_name, "batches")
+        record(self.service_name, "batched", len(operations))
+        return [
+            httpx.Response(
+                result["status"],
+                headers={"content-type": "application/json", **result["headers"]},
+                content=b"" if result["body"] is None else dumps(result["body"]),
+                request=httpx.Request("GET", f"{self.base_url}{op['path']}"),
+            )
+            for op, result in zip(operations, loads(response.content)["results"])
+        ]
+    
+    def _parse(self, response: httpx.Response, method: str, path: str) -> Optional[Any]:
+        """Parse a response body; client errors (4xx) are logged and give None."""
+        if response.status_code >= 400:
+            logger.warning(
+                f"[{self.service_name}] Client error: "
+                f"{response.status_code} on {method} {path}"
+            )
+            return None
+        
+        if response.content:
+            return loads(response.content)
+        return None
+    
+    # ═══════════════════════════════════════════════════════════════════════
+    # Response Cache
+    # ═══════════════════════════════════════════════════════════════════════
+    
+    async def _cached_get(
+        self,
+        path: str,
+        policy: CachePolicy,
+        params: Optional[dict] = None,
+        **kwargs,
+    ) -> Optional[Any]:
+        """GET through the response cache (fresh hit, stale-while-revalidate, or fetch)."""
+        key = response_cache.make_key(self.service_name, path, params)
+        entry = response_cache.get(key)
+        now = time.monotonic()
+        
+        if entry is not None and entry.is_fresh(now):
+            record(self.service_name, "cache_hits")
+            return entry.value()
+        
+        if entry is not None and entry.is_servable(now):
+            record(self.service_name, "cache_stale_hits")
+            self._revalidate_in_background(key, path, policy, params, **kwargs)
+            return entry.value()
+        
+        record(self.service_name, "cache_misses")
+        return await self._revalidate(key, path, policy, params, **kwargs)
+    
+    async def _revalidate(
+        self,
+        key: tuple,
+        path: str,
+        policy: CachePolicy,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        **kwargs,
+    ) -> Optional[Any]:
+        """Fetch a cached resource, conditionally on the stored ETag."""
+        entry = response_cache.get(key)
+        if entry is not None and entry.etag:
+            headers = {**(headers or {}), "If-None-Match": entry.etag}
+        
+        if settings.service_single_flight_enabled:
+            response = await self._send_coalesced(path, params=params, headers=headers, **kwargs)
+        else:
+            response = await self._send("GET", path, params=params, headers=headers, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            record(self.service_name, "cache_not_modified")
+            response_cache.renew(entry, policy)
+            return entry.value()
+        
+        result = self._parse(response, "GET", path)
+        # Errors and empty bodies are not cached, so they are retried next call
+        if response.status_code == 200 and result is not None:
+            response_cache.store(key, response.content, response.headers.get("etag"), policy)
+        return result
+    
+    def _revalidate_in_background(self, key: tuple, path: str, policy: CachePolicy, params, **kwargs) -> None:
+        if key in BaseClient._revalidating:
+            return
+        
+        async def revalidate():
+            try:
+                await self._revalidate(key, path, policy, params, **kwargs)
+            except Exception as e:
+                logger.warning(f"[{self.service_name}] Background revalidation of {path} failed: {e}")
+            finally:
+                BaseClient._revalidating.pop(key, None)
+        
+        BaseClient._revalidating[key] = asyncio.get_running_loop().create_task(revalidate())
     
     async def _request_safe(
         self,
@@ -0,0 +1,116 @@
+"""
+KRONOS - Request Batching for Service Clients
+
+GETs to the same service can be sent together as one request to its
+internal batch endpoint (``src.core.batch``). Batching applies to calls
+issued inside ``batch_calls()``, or to all calls when
+``SERVICE_BATCH_WINDOW_MS`` is set:
+
+    async with batch_calls():
+        user, leave_type, max_days = await asyncio.gather(
+            auth_client.get_user_info(user_id),
+            config_client.get_leave_type(leave_type_id),
+            config_client.get_sys_config("leave.max_days"),
+        )
+
+Calls made within the window are queued per service and flushed together;
+a queue holding a single call is sent as a plain GET. Each caller gets back
+its own response, so caching, ETags and error handling work unchanged.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BATCH_PATH = "/api/v1/internal/batch"
+
+# Batch window of the current context: None follows the setting, < 0 disables
+_batch_window: ContextVar[Optional[float]] = ContextVar("batch_window", default=None)
+
+NO_BATCHING = -1.0
+
+
+@asynccontextmanager
+async def batch_calls(window: float = 0.0) -> AsyncIterator[None]:
+    """Batch GETs issued in the block, e.g. by ``asyncio.gather``.
+
+    Args:
+        window: Seconds to wait for more calls before flushing (by default
+            only the calls started in the same event loop iteration).
+    """
+    token = _batch_window.set(window)
+    try:
+        yield
+    finally:
+        _batch_window.reset(token)
+
+
+def batch_window() -> Optional[float]:
+    """Batch window for a call made now, or None if it isn't batched."""
+    window = _batch_window.get()
+    if window is None:
+        if settings.service_batch_window_ms <= 0:
+            return None
+        window = settings.service_batch_window_ms / 1000
+    return window if window >= 0 else None
+
+
+def disable_batching() -> None:
+    """Disable batching for the rest of the current task."""
+    _batch_window.set(NO_BATCHING)
+
+
+class RequestBatcher:
+    """Queue of operations to one service, flushed as one batch."""
+
+    def __init__(
+        self,
+        send: Callable[[list[dict]], Awaitable[list]],
+        max_size: int,
+    ) -> None:
+        self._send = send
+        self.max_size = max_size
+        self.loop = asyncio.get_running_loop()
+        self._queue: list[tuple[dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Handle] = None
+        self._flushes: set[asyncio.Task] = set()
+
+    def submit(self, operation: dict, window: float) -> asyncio.Future:
+        """Queue an operation; the future resolves to its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((operation, future))
+        if len(self._queue) >= self.max_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(window, self.flush) if window else loop.call_soon(self.flush)
+        return future
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        queue, self._queue = self._queue, []
+        if not queue:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(queue))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _run(self, queue: list[tuple[dict, asyncio.Future]]) -> None:
+        disable_batching()
+        try:
+            results = await self._send([operation for operation, _ in queue])
+        except Exception as e:
+            for _, future in queue:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(queue, results):
+            if not future.done():
+                future.set_result(result)
@@ -10,6 +10,8 @@ from uuid import UUID
 
 from src.core.config import settings
 from src.shared.clients.base import BaseClient
+from src.shared.clients.resilience import LOOKUP_POLICY
+from src.shared.clients.response_cache import CALENDAR_DATA, CachePolicy
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,8 @@ logger = logging.getLogger(__name__)
 class CalendarClient(BaseClient):
     """Client for Calendar Service interactions."""
     
+    resilience = LOOKUP_POLICY
+    
     def __init__(self):
         super().__init__(
             base_url=settings.calendar_service_url,
@@ -32,8 +36,13 @@ class CalendarClient(BaseClient):
         year: int,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        cache: Optional[CachePolicy] = CALENDAR_DATA,
     ) -> list[dict]:
-        """Get holidays from calendar service."""
+        """Get holidays from calendar service.
+        
+        The default policy may serve a list up to an hour old; callers that
+        persist what they compute from it pass ``cache=None``.
+        """
         params = {"year": year}
         if start_date:
             params["start_date"] = start_date.isoformat()
@@ -44,14 +53,16 @@ class CalendarClient(BaseClient):
             "/api/v1/calendar/holidays-list",
             default=[],
             params=params,
+            cache=cache,
         )
     
     async def get_closures(
         self,
         year: int,
         location_id: Optional[UUID] = None,
+        cache: Optional[CachePolicy] = CALENDAR_DATA,
     ) -> list[dict]:
-        """Get company closures from calendar service."""
+        """Get company closures from calendar service (see ``get_holidays`` for ``cache``)."""
         params = {"year": year}
         if location_id:
             params["location_id"] = str(location_id)
@@ -60,6 +71,7 @@ class CalendarClient(BaseClient):
             "/api/v1/calendar/closures-list",
             default=[],
             params=params,
+            cache=cache,
         )
     
     # ═══════════════════════════════════════════════════════════════════════
@@ -10,6 +10,8 @@ from uuid import UUID
 
 from src.core.config import settings
 from src.shared.clients.base import BaseClient
+from src.shared.clients.resilience import LOOKUP_POLICY
+from src.shared.clients.response_cache import REFERENCE_DATA
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,8 @@ logger = logging.getLogger(__name__)
 class ConfigClient(BaseClient):
     """Client for Config Service interactions."""
     
+    resilience = LOOKUP_POLICY
+    
     def __init__(self):
         super().__init__(
             base_url=settings.config_service_url,
@@ -73,15 +77,15 @@ class ConfigClient(BaseClient):
     
     async def get_expense_types(self) -> list[dict]:
         """Get all expense types."""
-        return await self.get_safe("/api/v1/expense-types", default=[])
+        return await self.get_safe("/api/v1/expense-types", default=[], cache=REFERENCE_DATA)
     
     async def get_sys_config(self, key: str, default: Any = None) -> Any:
         """Get system config value by key."""
-        data = await self.get_safe(f"/api/v1/config/{key}")
+        data = await self.get_safe(f"/api/v1/config/{key}", cache=REFERENCE_DATA)
         if data and isinstance(data, dict):
             return data.get("value", default)
         return default
     
     async def get_leave_type(self, leave_type_id: UUID) -> Optional[dict]:
         """Get leave type details."""
-        return await self.get_safe(f"/api/v1/leave-types/{leave_type_id}")
+        return await self.get_safe(f"/api/v1/leave-types/{leave_type_id}", cache=REFERENCE_DATA)
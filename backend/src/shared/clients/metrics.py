@@ -0,0 +1,30 @@
+"""
+KRONOS - Service Client Counters
+
+Per-service event counters of the inter-service clients (cache hits and
+misses, coalesced requests, ...), kept in process memory. Events are also
+counted on the current request's timings (see ``src.core.timing``).
+
+    from src.shared.clients.metrics import client_stats
+    client_stats()  # {"config": {"hits": 120, "misses": 4, ...}, ...}
+"""
+from collections import Counter
+
+from src.core.timing import count_event
+
+_counters: dict[str, Counter] = {}
+
+
+def record(service: str, event: str, count: int = 1) -> None:
+    """Count an event of a service client (also for the current request's timings)."""
+    _counters.setdefault(service, Counter())[event] += count
+    count_event(event, count)
+
+
+def client_stats() -> dict[str, dict[str, int]]:
+    """Snapshot of the counters, per service."""
+    return {service: dict(counts) for service, counts in _counters.items()}
+
+
+def reset_client_stats() -> None:
+    _counters.clear()
@@ -125,6 +125,51 @@ class NotificationClient(BaseClient):
         
         return result
     
+    async def send_batch(self, notifications: list[dict]) -> dict:
+        """
+        Send many individual notifications in one request.
+
+        Args:
+            notifications: Items with user_id, notification_type, title, message
+                and optionally channels, priority, entity_type, entity_id,
+                action_url, payload. Recipient emails are resolved by the
+                notification service.
+
+        Returns:
+            dict with 'total', 'sent', 'failed', 'errors', 'failed_user_ids'.
+            If the request itself fails, every recipient is reported as failed.
+        """
+        items = []
+        for item in notifications:
+            item = {key: value for key, value in item.items() if value is not None}
+            item["user_id"] = str(item["user_id"])
+            if item.get("entity_id"):
+                item["entity_id"] = str(item["entity_id"])
+            action_url = item.get("action_url")
+            if action_url and action_url.startswith("/"):
+                item["action_url"] = f"{settings.frontend_url}{action_url}"
+            items.append(item)
+
+        if not items:
+            return {"total": 0, "sent": 0, "failed": 0, "errors": [], "failed_user_ids": []}
+
+        try:
+            response = await self.post("/api/v1/notifications/batch", json={"notifications": items})
+            if response:
+                return response
+            error = "empty response"
+        except Exception as e:
+            logger.error(f"NotificationClient batch error: {e}")
+            error = str(e)
+
+        return {
+            "total": len(items),
+            "sent": 0,
+            "failed": len(items),
+            "errors": [error],
+            "failed_user_ids": [item["user_id"] for item in items],
+        }
+
     async def send_with_email(
         self,
         user_id: UUID,
@@ -0,0 +1,194 @@
+"""
+KRONOS - Resilience Policies for Service Clients
+
+Keeps one slow or failing service from dragging down its callers:
+
+- **Adaptive timeouts**: each idempotent attempt times out at a multiple
+  of the service's observed p99 latency (clamped between a floor and
+  ``SERVICE_TIMEOUT``) instead of always waiting the global timeout.
+  Writes keep the global timeout.
+- **Hedged requests**: for policies that allow it, a GET still running
+  after the service's p95 latency is duplicated, and the first response
+  wins. Hedges are capped to a fraction of the requests so they cannot
+  double the load.
+- **Bounded retries** with exponential backoff and full jitter, for
+  idempotent requests on transport errors, timeouts and 502/503/504.
+- **Circuit breaker**: after consecutive failures calls fail fast with
+  ``CircuitOpenError`` (so ``get_safe`` returns its default at once) until
+  a probe request succeeds.
+
+Policies are per client class (``BaseClient.resilience``); the live state
+(latencies, breaker) is per service and process.
+"""
+import random
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from src.core.config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class ResiliencePolicy:
+    """Resilience settings of a service client."""
+    max_retries: int = settings.service_max_retries
+    retry_base_delay: float = 0.1
+    retry_max_delay: float = 2.0
+
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_delay: float = 0.05
+    hedge_budget: float = 0.1           # Max hedges per request
+
+    timeout_quantile: float = 0.99
+    timeout_multiplier: float = 3.0
+    timeout_floor: float = 1.0          # Never adapt below this
+    min_samples: int = 20               # Use SERVICE_TIMEOUT until this many samples
+
+    breaker_failure_threshold: int = settings.service_breaker_threshold
+    breaker_reset_timeout: float = settings.service_breaker_reset_seconds
+
+
+# Common policies
+DEFAULT_POLICY = ResiliencePolicy()
+LOOKUP_POLICY = ResiliencePolicy(hedge=True, timeout_floor=0.5)   # Cheap, hot reads (calendar, auth, config)
+
+
+class LatencyWindow:
+    """Quantiles over the latest successful idempotent response times of a service."""
+
+    def __init__(self, size: int = 256) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self._sorted: list[float] = []
+
+    def add(self, seconds: float) -> None:
+        if len(self._samples) == self._samples.maxlen:
+            del self._sorted[bisect_left(self._sorted, self._samples[0])]
+        self._samples.append(seconds)
+        insort(self._sorted, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._sorted:
+            return None
+        return self._sorted[min(len(self._sorted) - 1, int(q * len(self._sorted)))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self, policy: ResiliencePolicy) -> bool:
+        """Whether a request may be sent now."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= policy.breaker_reset_timeout:
+            self.state = HALF_OPEN
+            self._probing = False
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def retry_after(self, policy: ResiliencePolicy) -> float:
+        return max(0.0, policy.breaker_reset_timeout - (time.monotonic() - self.opened_at))
+
+    def release(self) -> None:
+        """End a probe that neither succeeded nor failed (e.g. cancelled)."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self, policy: ResiliencePolicy) -> bool:
+        """Count a failure; returns True if this opened the circuit."""
+        self.failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.failures >= policy.breaker_failure_threshold
+        ):
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+
+class ServiceHealth:
+    """Live latency and breaker state of one service."""
+
+    def __init__(self) -> None:
+        self.latency = LatencyWindow()
+        self.breaker = CircuitBreaker()
+        self.requests = 0
+        self.hedges = 0
+
+    def count_request(self) -> None:
+        self.requests += 1
+        # Halve both counts from time to time so the hedge budget tracks recent traffic
+        if self.requests >= 1000:
+            self.requests //= 2
+            self.hedges //= 2
+
+    def timeout(self, policy: ResiliencePolicy) -> float:
+        """Per-attempt timeout derived from observed latency."""
+        if len(self.latency) < policy.min_samples:
+            return settings.service_timeout
+        observed = self.latency.quantile(policy.timeout_quantile) * policy.timeout_multiplier
+        return min(settings.service_timeout, max(policy.timeout_floor, observed))
+
+    def hedge_delay(self, policy: ResiliencePolicy) -> Optional[float]:
+        """Delay after which to hedge a GET, or None to not hedge it."""
+        if (
+            not policy.hedge
+            or not settings.service_hedging_enabled
+            or len(self.latency) < policy.min_samples
+        ):
+            return None
+        if self.hedges >= policy.hedge_budget * self.requests:
+            return None
+        return max(policy.hedge_min_delay, self.latency.quantile(policy.hedge_quantile))
+
+
+def retry_delay(policy: ResiliencePolicy, attempt: int) -> float:
+    """Exponential backoff with full jitter for retry number ``attempt`` (0-based)."""
+    return random.uniform(0, min(policy.retry_max_delay, policy.retry_base_delay * 2 ** attempt))
+
+
+_health: dict[str, ServiceHealth] = {}
+
+
+def service_health(service: str) -> ServiceHealth:
+    health = _health.get(service)
+    if health is None:
+        health = _health[service] = ServiceHealth()
+    return health
+
+
+def health_snapshot() -> dict[str, dict]:
+    """Breaker state and latency quantiles per service."""
+    return {
+        service: {
+            "breaker": health.breaker.state,
+            "consecutive_failures": health.breaker.failures,
+            "samples": len(health.latency),
+            "p50": health.latency.quantile(0.5),
+            "p95": health.latency.quantile(0.95),
+            "p99": health.latency.quantile(0.99),
+        }
+        for service, health in _health.items()
+    }
@@ -0,0 +1,119 @@
+"""
+KRONOS - Response Cache for Inter-Service Clients
+
+Process-local cache of GET responses for slow-changing reference data
+(configuration, leave/expense types, holidays, user info). Caching is
+opt-in per client method through a ``CachePolicy``:
+
+    REFERENCE_DATA = CachePolicy(ttl=300, stale_ttl=600)
+
+    async def get_expense_types(self):
+        return await self.get_safe("/api/v1/expense-types", default=[], cache=REFERENCE_DATA)
+
+Within ``ttl`` a cached response is returned without any request. Until
+``ttl + stale_ttl`` it is still returned immediately while a background
+request revalidates it (stale-while-revalidate). After that the next call
+waits for the revalidation. Revalidations send ``If-None-Match`` with the
+stored ETag, so an unchanged resource costs a bodiless 304.
+
+Entries are kept in a bounded LRU shared by all clients of the process;
+hit/miss counters are kept per service (see ``metrics``).
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+from src.core.config import settings
+from src.core.serialization import loads
+from src.shared.clients.metrics import record
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long a cached response is fresh, then servable while revalidating."""
+    ttl: float
+    stale_ttl: float = 0.0
+
+
+# Common policies
+REFERENCE_DATA = CachePolicy(ttl=60, stale_ttl=300)     # Config keys, leave/expense types
+CALENDAR_DATA = CachePolicy(ttl=300, stale_ttl=3600)    # Holidays, closures
+USER_INFO = CachePolicy(ttl=30, stale_ttl=120)
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    etag: Optional[str]
+    fresh_until: float
+    stale_until: float
+
+    def value(self) -> Any:
+        # Parsed per hit, so callers can't mutate the cached copy
+        return loads(self.body) if self.body else None
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def is_servable(self, now: float) -> bool:
+        return now < self.stale_until
+
+
+class ResponseCache:
+    """Bounded LRU of GET responses."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+
+    @staticmethod
+    def make_key(service: str, path: str, params: Optional[dict]) -> tuple:
+        return (service, path, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(
+        self,
+        key: Hashable,
+        body: bytes,
+        etag: Optional[str],
+        policy: CachePolicy,
+    ) -> CacheEntry:
+        now = time.monotonic()
+        entry = CacheEntry(
+            body=body,
+            etag=etag,
+            fresh_until=now + policy.ttl,
+            stale_until=now + policy.ttl + policy.stale_ttl,
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            record(evicted[0], "cache_evictions")
+        return entry
+
+    def renew(self, entry: CacheEntry, policy: CachePolicy) -> None:
+        """Extend an entry confirmed unchanged by the server (304)."""
+        now = time.monotonic()
+        entry.fresh_until = now + policy.ttl
+        entry.stale_until = now + policy.ttl + policy.stale_ttl
+
+    def invalidate(self, service: Optional[str] = None) -> None:
+        """Drop all entries, or those of one service."""
+        if service is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == service]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+response_cache = ResponseCache(max_entries=settings.service_cache_max_entries)
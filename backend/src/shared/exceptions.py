@@ -129,6 +129,19 @@ class ServiceTimeoutError(ServiceUnavailableError):
         self.timeout_seconds = timeout_seconds
 
 
+class CircuitOpenError(ServiceUnavailableError):
+    """Raised without calling a service whose circuit breaker is open."""
+
+    code = "CIRCUIT_OPEN"
+
+    def __init__(self, service_name: str, retry_after: float):
+        super().__init__(
+            service_name=service_name,
+            original_error=f"Circuit open, retry in {retry_after:.0f}s",
+        )
+        self.retry_after = retry_after
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Resource Exceptions
 # ═══════════════════════════════════════════════════════════════════════════
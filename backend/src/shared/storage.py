@@ -1,76 +1,366 @@
-"""KRONOS Storage Manager - Minio integration."""
-import io
+"""KRONOS Storage Manager - async object storage layer.
+
+Uploads are streamed from the incoming ``UploadFile`` to the object store in
+fixed-size chunks, so memory per upload is bounded by the part size rather than
+by the file size. All blocking SDK calls run in a dedicated thread pool and
+never on the event loop.
+
+Backends:
+- ``MinioStorageBackend``: MinIO/S3 multipart upload (production).
+- ``LocalStorageBackend``: plain directory on disk (tests, local dev).
+"""
+import asyncio
+import hashlib
 import logging
-from typing import Optional
+import mimetypes
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import BinaryIO, Optional
+from urllib.parse import quote
+
+from fastapi import UploadFile
 from minio import Minio
+from minio.error import S3Error
+
 from src.core.config import settings
+from src.core.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
 
-class StorageManager:
-    """Manager for file storage using MinIO."""
-    
+# MinIO requires multipart parts of at least 5 MiB
+DEFAULT_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.storage_io_workers,
+    thread_name_prefix="storage-io",
+)
+
+
+async def _run_blocking(func, *args, **kwargs):
+    """Run a blocking storage call in the storage thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, lambda: func(*args, **kwargs))
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    """Result of a completed upload."""
+
+    key: str
+    size: int
+    checksum: Optional[str]  # sha256 hex digest, None when unknown
+    content_type: str
+
+
+class _HashingReader:
+    """File-like wrapper computing size and sha256 while the SDK reads it.
+
+    Raises ``ValidationError`` as soon as ``max_size`` is exceeded, so an
+    oversized upload is aborted without reading the remainder.
+    """
+
+    def __init__(self, source: BinaryIO, max_size: Optional[int] = None) -> None:
+        self._source = source
+        self._max_size = max_size
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._source.read(size)
+        if chunk:
+            self.size += len(chunk)
+            if self._max_size is not None and self.size > self._max_size:
+                raise ValidationError(
+                    f"File size exceeds {self._max_size // (1024 * 1024)}MB limit",
+                    field="attachment",
+                )
+            self._hash.update(chunk)
+        return chunk
+
+    @property
+    def checksum(self) -> str:
+        return self._hash.hexdigest()
+
+
+class _PresignedUrlCache:
+    """Bounded in-memory cache of presigned GET URLs, valid for their TTL."""
+
+    # Drop entries a bit before the URL actually expires
+    SAFETY_MARGIN_SECONDS = 30
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self._max_entries = max_entries
+        self._entries: dict[tuple[str, int], tuple[float, str]] = {}
+
+    def get(self, key: str, expires_in: int) -> Optional[str]:
+        entry = self._entries.get((key, expires_in))
+        if entry is None:
+            return None
+        valid_until, url = entry
+        if time.monotonic() >= valid_until:
+            self._entries.pop((key, expires_in), None)
+            return None
+        return url
+
+    def set(self, key: str, expires_in: int, url: str) -> None:
+        ttl = expires_in - self.SAFETY_MARGIN_SECONDS
+        if ttl <= 0:
+            return
+        if len(self._entries) >= self._max_entries:
+            # Dicts keep insertion order: evict the oldest entry
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[(key, expires_in)] = (time.monotonic() + ttl, url)
+
+    def invalidate(self, key: str) -> None:
+        for cache_key in [k for k in self._entries if k[0] == key]:
+            self._entries.pop(cache_key, None)
+
+
+class StorageBackend(ABC):
+    """Async storage interface shared by all backends."""
+
     def __init__(self) -> None:
+        self._url_cache = _PresignedUrlCache()
+
+    @abstractmethod
+    async def upload(
+        self,
+        file: UploadFile,
+        key: str,
+        content_type: str,
+        max_size: Optional[int] = None,
+    ) -> StoredObject:
+        """Stream an uploaded file to storage under ``key``."""
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        """Return metadata for a stored object, or None if it does not exist."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        """Delete an object from storage."""
+
+    @abstractmethod
+    async def get_presigned_put_url(self, key: str, expires_in: int = 900) -> str:
+        """Get a temporary URL the browser can PUT the file to directly."""
+
+    async def get_presigned_url(self, key: str, expires_in: int = 3600) -> Optional[str]:
+        """Get a temporary download URL, cached for the URL lifetime."""
+        if not key:
+            return None
+        url = self._url_cache.get(key, expires_in)
+        if url is None:
+            url = await self._presign_get(key, expires_in)
+            if url:
+                self._url_cache.set(key, expires_in, url)
+        return url
+
+    @abstractmethod
+    async def _presign_get(self, key: str, expires_in: int) -> Optional[str]:
+        """Sign a download URL for ``key``, or None if it cannot be signed."""
+
+
+class MinioStorageBackend(StorageBackend):
+    """MinIO/S3 backend using streamed multipart uploads."""
+
+    def __init__(self, part_size: int = DEFAULT_PART_SIZE) -> None:
+        super().__init__()
+        self.client = Minio(
+            settings.minio_endpoint,
+            access_key=settings.minio_access_key,
+            secret_key=settings.minio_secret_key,
+            secure=settings.minio_use_ssl,
+        )
+        self.bucket = settings.minio_bucket
+        self.part_size = part_size
+        self._bucket_ready = False
+
+    def _ensure_bucket(self) -> None:
+        if self._bucket_ready:
+            return
+        if not self.client.bucket_exists(self.bucket):
+            self.client.make_bucket(self.bucket)
+            logger.info(f"Created storage bucket: {self.bucket}")
+        self._bucket_ready = True
+
+    def _put_stream(
+        self, source: BinaryIO, key: str, content_type: str, max_size: Optional[int]
+    ) -> StoredObject:
+        self._ensure_bucket()
+        reader = _HashingReader(source, max_size)
+        # length=-1 makes the SDK upload in part_size chunks (multipart)
+        self.client.put_object(
+            self.bucket,
+            key,
+            reader,
+            length=-1,
+            part_size=self.part_size,
+            content_type=content_type,
+        )
+        return StoredObject(key=key, size=reader.size, checksum=reader.checksum, content_type=content_type)
+
+    async def upload(
+        self,
+        file: UploadFile,
+        key: str,
+        content_type: str,
+        max_size: Optional[int] = None,
+    ) -> StoredObject:
+        await file.seek(0)
+        return await _run_blocking(self._put_stream, file.file, key, content_type, max_size)
+
+    def _stat(self, key: str) -> Optional[StoredObject]:
         try:
-            self.client = Minio(
-                settings.minio_endpoint,
-                access_key=settings.minio_access_key,
-                secret_key=settings.minio_secret_key,
-                secure=settings.minio_use_ssl,
-            )
-            self.bucket = settings.minio_bucket
-            
-            # Ensure bucket exists
-            if not self.client.bucket_exists(self.bucket):
-                self.client.make_bucket(self.bucket)
-                logger.info(f"Created storage bucket: {self.bucket}")
-                
+            info = self.client.stat_object(self.bucket, key)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return None
+            raise
+        return StoredObject(
+            key=key,
+            size=info.size,
+            checksum=None,
+            content_type=info.content_type,
+        )
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        return await _run_blocking(self._stat, key)
+
+    async def delete(self, key: str) -> bool:
+        if not key:
+            return False
+        try:
+            await _run_blocking(self.client.remove_object, self.bucket, key)
         except Exception as e:
-            logger.error(f"Failed to initialize storage manager: {str(e)}")
-            # Fail silently for now, but log the error
-            self.client = None
+            logger.error(f"Failed to delete file: {str(e)}")
+            return False
+        self._url_cache.invalidate(key)
+        return True
 
-    def upload_file(self, content: bytes, filename: str, content_type: str) -> Optional[str]:
-        """Upload a file to storage and return the path/key."""
-        if not self.client:
-            return None
-            
+    async def get_presigned_put_url(self, key: str, expires_in: int = 900) -> str:
+        await _run_blocking(self._ensure_bucket)
+        return await _run_blocking(
+            self.client.presigned_put_object,
+            self.bucket,
+            key,
+            expires=timedelta(seconds=expires_in),
+        )
+
+    async def _presign_get(self, key: str, expires_in: int) -> Optional[str]:
         try:
-            data = io.BytesIO(content)
-            self.client.put_object(
+            return await _run_blocking(
+                self.client.presigned_get_object,
                 self.bucket,
-                filename,
-                data,
-                len(content),
-                content_type=content_type,
+                key,
+                expires=timedelta(seconds=expires_in),
             )
-            return filename
         except Exception as e:
-            logger.error(f"File upload failed: {str(e)}")
+            logger.error(f"Failed to generate presigned URL: {str(e)}")
             return None
 
-    def get_presigned_url(self, filename: str, expires_in: int = 3600) -> Optional[str]:
-        """Get a temporary URL for file access."""
-        if not self.client or not filename:
-            return None
-            
+
+class LocalStorageBackend(StorageBackend):
+    """Filesystem backend for tests and local development.
+
+    Presigned URLs point at ``base_url`` (the directory itself by default)
+    and are not actually signed.
+    """
+
+    def __init__(self, root: str, base_url: Optional[str] = None) -> None:
+        super().__init__()
+        self.root = Path(root)
+        self.base_url = (base_url or self.root.resolve().as_uri()).rstrip("/")
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValidationError("Invalid storage key", field="attachment")
+        return path
+
+    def _write_stream(
+        self, source: BinaryIO, key: str, content_type: str, max_size: Optional[int]
+    ) -> StoredObject:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        reader = _HashingReader(source, max_size)
+        tmp_path = path.with_name(path.name + ".part")
         try:
-            return self.client.presigned_get_object(self.bucket, filename, expires=expires_in)
-        except Exception as e:
-            logger.error(f"Failed to generate presigned URL: {str(e)}")
+            with open(tmp_path, "wb") as out:
+                while chunk := reader.read(DEFAULT_CHUNK_SIZE):
+                    out.write(chunk)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return StoredObject(key=key, size=reader.size, checksum=reader.checksum, content_type=content_type)
+
+    async def upload(
+        self,
+        file: UploadFile,
+        key: str,
+        content_type: str,
+        max_size: Optional[int] = None,
+    ) -> StoredObject:
+        await file.seek(0)
+        return await _run_blocking(self._write_stream, file.file, key, content_type, max_size)
+
+    def _stat(self, key: str) -> Optional[StoredObject]:
+        path = self._path(key)
+        if not path.is_file():
             return None
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(DEFAULT_CHUNK_SIZE):
+                digest.update(chunk)
+        # No metadata on disk: derive the content type from the key's extension
+        content_type, _ = mimetypes.guess_type(key)
+        return StoredObject(
+            key=key,
+            size=path.stat().st_size,
+            checksum=digest.hexdigest(),
+            content_type=content_type or "application/octet-stream",
+        )
 
-    def delete_file(self, filename: str) -> bool:
-        """Delete a file from storage."""
-        if not self.client or not filename:
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        return await _run_blocking(self._stat, key)
+
+    async def delete(self, key: str) -> bool:
+        if not key:
             return False
-            
-        try:
-            self.client.remove_object(self.bucket, filename)
-            return True
-        except Exception as e:
-            logger.error(f"Failed to delete file: {str(e)}")
+        path = self._path(key)
+        if not path.exists():
             return False
+        await _run_blocking(path.unlink)
+        self._url_cache.invalidate(key)
+        return True
+
+    async def get_presigned_put_url(self, key: str, expires_in: int = 900) -> str:
+        return f"{self.base_url}/{quote(key)}"
+
+    async def _presign_get(self, key: str, expires_in: int) -> Optional[str]:
+        return f"{self.base_url}/{quote(key)}"
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """Get the configured storage backend (created lazily)."""
+    global _storage
+    if _storage is None:
+        if settings.storage_backend == "local":
+            _storage = LocalStorageBackend(settings.storage_local_path)
+        else:
+            _storage = MinioStorageBackend()
+    return _storage
+
 
-# Global instance
-storage_manager = StorageManager()
+def set_storage(backend: Optional[StorageBackend]) -> None:
+    """Override the storage backend (used by tests)."""
+    global _storage
+    _storage = backend
@@ -2,8 +2,24 @@
 
 This module defines the Celery application instance shared across services.
 """
+import os
+import time
+
 from celery import Celery
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from prometheus_client import start_http_server
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
 from src.core.config import settings
+from src.core.metrics import CELERY_TASK_DURATION, metrics_registry, register_live_collector
+from src.core.worker_runtime import init_worker_process, shutdown_worker_process
 
 # Initialize Celery app
 celery_app = Celery(
@@ -24,6 +40,8 @@ celery_app.conf.update(
         "src.services.notifications.tasks",
         "src.services.audit.tasks",
         "src.services.hr_reporting.tasks",
+        "src.core.batch_jobs",
+        "src.services.auth.tasks",
         "background_jobs.tasks.reconciliation",
         # Add other service tasks here as needed
     ],
@@ -43,13 +61,18 @@ celery_app.conf.update(
         },
         "process-email-retries": {
             "task": "notifications.process_email_retries",
-            "schedule": 300.0,   # Every 5 minutes
+            "schedule": 30.0,   # Every 30 seconds (due retries only)
         },
         # Process Notification Queue - runs every minute
         "notifications-process-queue": {
             "task": "notifications.process_queue",
             "schedule": 60.0,  # Every minute
         },
+        # Incremental Keycloak sync - runs every minute
+        "auth-incremental-keycloak-sync": {
+            "task": "auth.incremental_keycloak_sync",
+            "schedule": 60.0,  # Every minute
+        },
         # Audit Data Retention - runs daily at 3 AM
         "audit-archive-old-logs": {
             "task": "audit.archive_old_logs",
@@ -88,6 +111,12 @@ celery_app.conf.update(
             "schedule": 86400.0,  # Daily
             "options": {"queue": "reporting"},
         },
+        # Dirty timesheet days (leave/trip/closure changes) - every 5 minutes
+        "hr-dirty-timesheets": {
+            "task": "hr_reporting.process_dirty_timesheets",
+            "schedule": 300.0,  # Every 5 minutes
+            "options": {"queue": "reporting"},
+        },
         # Timesheet Deadline Check - runs daily at 09:00 AM
         "hr-timesheet-deadline-check": {
             "task": "hr_reporting.check_timesheet_deadlines",
@@ -106,3 +135,73 @@ celery_app.conf.update(
     },
 )
 
+
+# One event loop and database pool per worker process (see src.core.worker_runtime)
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    init_worker_process()
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(pid=None, **kwargs):
+    shutdown_worker_process()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+# ─────────────────────────────────────────────────────────────
+# Prometheus metrics (task durations, queue depths)
+# ─────────────────────────────────────────────────────────────
+_task_started: dict[str, float] = {}
+
+
+@task_prerun.connect
+def _task_prerun(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None and settings.metrics_enabled:
+        CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+class QueueDepthCollector(Collector):
+    """Messages waiting in the broker's queues (Redis lists)."""
+
+    def __init__(self, queues: set[str]) -> None:
+        self.queues = sorted(queues)
+
+    def collect(self):
+        import redis
+
+        family = GaugeMetricFamily("kronos_celery_queue_depth", "Messages waiting in a Celery queue", labels=["queue"])
+        client = redis.Redis.from_url(settings.redis_url)
+        try:
+            for queue, depth in zip(self.queues, self._depths(client)):
+                family.add_metric([queue], depth)
+        finally:
+            client.close()
+        yield family
+
+    def _depths(self, client) -> list[int]:
+        pipe = client.pipeline(transaction=False)
+        for queue in self.queues:
+            pipe.llen(queue)
+        return pipe.execute()
+
+
+@worker_init.connect
+def _start_metrics_server(**kwargs):
+    """Serve the worker's metrics from the main worker process."""
+    if not settings.metrics_enabled or not settings.celery_metrics_port:
+        return
+    queues = {celery_app.conf.task_default_queue} | {
+        entry["options"]["queue"]
+        for entry in celery_app.conf.beat_schedule.values()
+        if "queue" in entry.get("options", {})
+    }
+    register_live_collector(QueueDepthCollector(queues))
+    start_http_server(settings.celery_metrics_port, registry=metrics_registry())
@@ -0,0 +1,180 @@
+"""
+Benchmark users and the data they need, in the benchmark database.
+
+The database must have been prepared the usual way first (schemas,
+migrations, RBAC roles, leave types):
+
+    python scripts/init_db.py
+    python scripts/bootstrap_system.py
+    python -m scripts.seed_leave_types
+
+``prepare`` then upserts a manager, an admin and ``employees`` employees
+reporting to the manager (all with ``bench-`` Keycloak IDs), credits
+them vacation for this year and the next two, removes the leave and
+approval requests of earlier runs and makes sure an email provider is
+configured. Only rows of benchmark users are touched.
+"""
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Iterator
+from uuid import UUID
+
+from sqlalchemy import select, text
+
+from src.core.database import async_session_factory
+from src.services.auth.models import User
+from src.services.leaves.ledger.models import (
+    TimeLedgerBalanceType,
+    TimeLedgerEntry,
+    TimeLedgerEntryType,
+    TimeLedgerReferenceType,
+)
+from src.services.notifications.models import EmailProviderSettings
+from tests.benchmarks.stubs import FakeKeycloak, FakeUser
+
+BENCH_EMAIL_DOMAIN = "bench.kronos.local"
+# Reference of the vacation credited to benchmark users
+BENCH_CREDIT_REFERENCE = uuid.uuid5(uuid.NAMESPACE_URL, "kronos-benchmark-credit")
+BENCH_CREDIT_DAYS = 500
+LEAVE_TYPE_CODE = "FER"
+
+
+@dataclass
+class BenchUser:
+    id: UUID
+    identity: FakeUser
+    token: str = ""
+    _days: Iterator[date] = field(default=None, repr=False)
+
+    def next_leave_day(self) -> date:
+        """A new working day for a one-day leave request, from next year on."""
+        if self._days is None:
+            self._days = _working_days(date(date.today().year + 1, 1, 7))
+        return next(self._days)
+
+
+@dataclass
+class BenchData:
+    manager: BenchUser
+    admin: BenchUser
+    employees: list[BenchUser]
+    leave_type_id: UUID
+
+    @property
+    def users(self) -> list[BenchUser]:
+        return [self.manager, self.admin, *self.employees]
+
+
+def _working_days(start: date) -> Iterator[date]:
+    day = start
+    while True:
+        if day.weekday() < 5:
+            yield day
+        day += timedelta(days=1)
+
+
+async def prepare(keycloak: FakeKeycloak, employees: int) -> BenchData:
+    async with async_session_factory() as session:
+        if (await session.execute(text("SELECT to_regclass('auth.users')"))).scalar() is None:
+            raise RuntimeError("Benchmark database is not initialized (run scripts/init_db.py first)")
+
+        leave_type_id = (await session.execute(
+            text("SELECT id FROM config.leave_types WHERE code = :code"), {"code": LEAVE_TYPE_CODE}
+        )).scalar()
+        if leave_type_id is None:
+            raise RuntimeError(f"Leave type {LEAVE_TYPE_CODE} missing (run scripts/seed_leave_types.py)")
+
+        manager = await _upsert_user(session, "manager", ["manager", "employee"], is_manager=True, is_approver=True)
+        admin = await _upsert_user(session, "admin", ["admin"], is_admin=True, is_hr=True)
+        staff = [
+            await _upsert_user(session, f"employee-{n:04d}", ["employee"], manager_id=manager.id)
+            for n in range(employees)
+        ]
+        users = [manager, admin, *staff]
+        user_ids = [user.id for user in users]
+
+        # Start from a clean slate: requests of earlier runs would overlap the new ones
+        await session.execute(
+            text("DELETE FROM approvals.approval_requests WHERE requester_id = ANY(:ids)"), {"ids": user_ids}
+        )
+        await session.execute(
+            text("DELETE FROM leaves.leave_requests WHERE user_id = ANY(:ids)"), {"ids": user_ids}
+        )
+        await session.execute(
+            text("DELETE FROM leaves.time_ledger WHERE user_id = ANY(:ids) AND reference_type = :ref"),
+            {"ids": user_ids, "ref": TimeLedgerReferenceType.LEAVE_REQUEST},
+        )
+        await _credit_vacation(session, user_ids)
+        await _ensure_email_provider(session)
+        await session.commit()
+
+    for user in users:
+        keycloak.add_user(user.identity)
+        user.token = keycloak.issue_token(user.identity, lifetime=24 * 3600)
+    return BenchData(manager=manager, admin=admin, employees=staff, leave_type_id=leave_type_id)
+
+
+async def _upsert_user(session, name: str, roles: list[str], **flags) -> BenchUser:
+    keycloak_id = f"bench-{name}"
+    identity = FakeUser(
+        sub=keycloak_id,
+        username=keycloak_id,
+        email=f"{name}@{BENCH_EMAIL_DOMAIN}",
+        name=f"Bench {name.title()}",
+        roles=roles,
+    )
+    user = (await session.execute(select(User).where(User.keycloak_id == keycloak_id))).scalar_one_or_none()
+    if user is None:
+        user = User(
+            keycloak_id=keycloak_id,
+            username=keycloak_id,
+            email=identity.email,
+            first_name="Bench",
+            last_name=name.title(),
+            hire_date=date(date.today().year - 3, 1, 1),
+        )
+        session.add(user)
+    for flag, value in flags.items():
+        setattr(user, flag, value)
+    user.is_active = True
+    await session.flush()
+    return BenchUser(id=user.id, identity=identity)
+
+
+async def _credit_vacation(session, user_ids: list[UUID]) -> None:
+    years = range(date.today().year, date.today().year + 3)
+    credited = set((await session.execute(
+        select(TimeLedgerEntry.user_id, TimeLedgerEntry.year).where(
+            TimeLedgerEntry.user_id.in_(user_ids),
+            TimeLedgerEntry.reference_id == BENCH_CREDIT_REFERENCE,
+        )
+    )).all())
+    for user_id in user_ids:
+        for year in years:
+            if (user_id, year) in credited:
+                continue
+            session.add(TimeLedgerEntry(
+                user_id=user_id,
+                year=year,
+                entry_type=TimeLedgerEntryType.ADJUSTMENT_ADD,
+                balance_type=TimeLedgerBalanceType.VACATION_AC,
+                amount=BENCH_CREDIT_DAYS,
+                reference_type=TimeLedgerReferenceType.MANUAL_ADJUSTMENT,
+                reference_id=BENCH_CREDIT_REFERENCE,
+                reference_status="APPROVED",
+                notes="Benchmark credit",
+            ))
+
+
+async def _ensure_email_provider(session) -> None:
+    active = (await session.execute(
+        select(EmailProviderSettings.id).where(EmailProviderSettings.is_active.is_(True)).limit(1)
+    )).scalar()
+    if active is None:
+        session.add(EmailProviderSettings(
+            provider="brevo",
+            api_key="bench",
+            sender_email=f"noreply@{BENCH_EMAIL_DOMAIN}",
+            sender_name="KRONOS Bench",
+        ))
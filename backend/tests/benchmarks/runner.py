@@ -0,0 +1,156 @@
+"""
+Load runner, latency statistics and baseline comparison.
+
+A scenario iteration is run in a loop by ``concurrency`` workers for a
+fixed time. Each measured operation (``Recorder.record``) keeps its own
+latencies, so one scenario can report several endpoints.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class Recorder:
+    """Latencies and errors per operation."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, Counter] = defaultdict(Counter)
+        self.items: Counter = Counter()
+        self.enabled = True
+
+    def record(self, operation: str, seconds: float, error: Optional[str] = None, items: int = 1) -> None:
+        if not self.enabled:
+            return
+        self.latencies[operation].append(seconds)
+        self.items[operation] += items
+        if error is not None:
+            self.errors[operation][error] += 1
+
+
+@dataclass
+class OperationSummary:
+    operation: str
+    count: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput: float  # items per second
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict[str, OperationSummary]:
+    summaries = {}
+    for operation, latencies in recorder.latencies.items():
+        ordered = sorted(latencies)
+        summaries[operation] = OperationSummary(
+            operation=operation,
+            count=len(ordered),
+            errors=sum(recorder.errors[operation].values()),
+            p50_ms=round(percentile(ordered, 50) * 1000, 2),
+            p95_ms=round(percentile(ordered, 95) * 1000, 2),
+            p99_ms=round(percentile(ordered, 99) * 1000, 2),
+            throughput=round(recorder.items[operation] / elapsed, 2) if elapsed else 0.0,
+        )
+    return summaries
+
+
+async def run_load(
+    iteration: Callable[[int], Awaitable[None]],
+    recorder: Recorder,
+    concurrency: int,
+    duration: float,
+    warmup: float = 0.0,
+) -> float:
+    """Run ``iteration(worker)`` in ``concurrency`` loops; returns the measured time."""
+    measuring = warmup <= 0
+    recorder.enabled = measuring
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def worker(number: int) -> None:
+        while time.perf_counter() < deadline:
+            await iteration(number)
+
+    async def start_measuring() -> None:
+        nonlocal measure_from
+        await asyncio.sleep(warmup)
+        measure_from = time.perf_counter()
+        recorder.enabled = True
+
+    tasks = [asyncio.create_task(worker(n)) for n in range(concurrency)]
+    if not measuring:
+        tasks.append(asyncio.create_task(start_measuring()))
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - measure_from
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Reporting & Baseline
+# ═══════════════════════════════════════════════════════════════════════════
+
+def format_table(results: dict[str, OperationSummary], baseline: Optional[dict] = None) -> str:
+    header = f"{'operation':<34}{'count':>8}{'err%':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'per s':>10}"
+    lines = [header, "-" * len(header)]
+    for name in sorted(results):
+        s = results[name]
+        line = (
+            f"{name:<34}{s.count:>8}{s.error_rate * 100:>7.1f}"
+            f"{s.p50_ms:>10.1f}{s.p95_ms:>10.1f}{s.p99_ms:>10.1f}{s.throughput:>10.1f}"
+        )
+        reference = (baseline or {}).get(name)
+        if reference and reference.get("p95_ms"):
+            line += f"   p95 {(s.p95_ms / reference['p95_ms'] - 1) * 100:+.0f}% vs baseline"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["operations"]
+
+
+def save_baseline(path: Path, results: dict[str, OperationSummary], meta: dict) -> None:
+    """Merge ``results`` into the baseline file (other operations are kept)."""
+    operations = load_baseline(path)
+    operations.update({name: asdict(summary) for name, summary in results.items()})
+    path.write_text(json.dumps({"meta": meta, "operations": dict(sorted(operations.items()))}, indent=2) + "\n")
+
+
+def find_regressions(
+    results: dict[str, OperationSummary],
+    baseline: dict,
+    tolerance: float,
+) -> list[str]:
+    """Operations slower (p95), less productive or more error-prone than the baseline."""
+    regressions = []
+    for name, s in sorted(results.items()):
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        if reference["p95_ms"] and s.p95_ms > reference["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {s.p95_ms:.1f}ms > baseline {reference['p95_ms']:.1f}ms")
+        if reference["throughput"] and s.throughput < reference["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: {s.throughput:.1f}/s < baseline {reference['throughput']:.1f}/s")
+        reference_rate = reference["errors"] / reference["count"] if reference["count"] else 0.0
+        if s.error_rate > reference_rate + 0.01:
+            regressions.append(f"{name}: error rate {s.error_rate:.1%} > baseline {reference_rate:.1%}")
+    return regressions
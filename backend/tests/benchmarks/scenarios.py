@@ -0,0 +1,215 @@
+"""
+Benchmark scenarios: scripted traffic on the hot endpoints.
+
+A scenario is one iteration of user behaviour, run in a loop by each
+worker; ``ctx.call`` times every request under an operation name. Add a
+scenario with the ``@scenario`` decorator.
+"""
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+import httpx
+
+from tests.benchmarks.runner import Recorder
+
+if TYPE_CHECKING:
+    # fixtures imports src, which must only happen once the environment is set
+    from tests.benchmarks.fixtures import BenchData, BenchUser
+
+
+@dataclass
+class BenchContext:
+    client: httpx.AsyncClient
+    urls: dict[str, str]
+    data: "BenchData"
+    recorder: Recorder
+
+    def employee(self, worker: int) -> "BenchUser":
+        """The employee a worker acts as (workers don't share users)."""
+        return self.data.employees[worker % len(self.data.employees)]
+
+    async def call(
+        self,
+        operation: str,
+        service: str,
+        method: str,
+        path: str,
+        user: "BenchUser",
+        **kwargs,
+    ) -> Optional[httpx.Response]:
+        """Timed request; returns the response, or None if it failed."""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(
+                method,
+                f"{self.urls[service]}{path}",
+                headers={"Authorization": f"Bearer {user.token}"},
+                **kwargs,
+            )
+        except httpx.HTTPError as e:
+            self.recorder.record(operation, time.perf_counter() - started, error=type(e).__name__)
+            return None
+        error = str(response.status_code) if response.status_code >= 400 else None
+        self.recorder.record(operation, time.perf_counter() - started, error=error)
+        return None if error else response
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    run: Callable[[BenchContext, int], Awaitable[None]]
+    concurrency: int
+    setup: Optional[Callable[[BenchContext], Awaitable[None]]] = None
+
+    @property
+    def description(self) -> str:
+        return (self.run.__doc__ or "").strip().splitlines()[0]
+
+
+SCENARIOS: dict[str, Scenario] = {}
+
+
+def scenario(name: str, concurrency: int = 10, setup: Optional[Callable] = None):
+    def register(run):
+        SCENARIOS[name] = Scenario(name=name, run=run, concurrency=concurrency, setup=setup)
+        return run
+    return register
+
+
+def _datatable(length: int = 25) -> dict:
+    return {
+        "draw": 1,
+        "start": 0,
+        "length": length,
+        "search": {"value": "", "regex": False},
+        "order": [{"column": 0, "dir": "desc"}],
+        "columns": [{"data": "start_date", "name": "start_date", "searchable": True, "orderable": True}],
+    }
+
+
+async def _create_and_submit(ctx: BenchContext, employee: "BenchUser") -> Optional[str]:
+    day = employee.next_leave_day().isoformat()
+    created = await ctx.call("leaves.create", "leaves", "POST", "/api/v1/leaves", employee, json={
+        "leave_type_id": str(ctx.data.leave_type_id),
+        "start_date": day,
+        "end_date": day,
+        "employee_notes": "benchmark",
+    })
+    if created is None:
+        return None
+    request_id = created.json()["id"]
+    submitted = await ctx.call("leaves.submit", "leaves", "POST", f"/api/v1/leaves/{request_id}/submit", employee)
+    return request_id if submitted is not None else None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Scenarios
+# ═══════════════════════════════════════════════════════════════════════════
+
+@scenario("leave_lifecycle", concurrency=8)
+async def leave_lifecycle(ctx: BenchContext, worker: int) -> None:
+    """Employee creates and submits a one-day leave request, the manager approves it."""
+    request_id = await _create_and_submit(ctx, ctx.employee(worker))
+    if request_id is not None:
+        await ctx.call(
+            "leaves.approve", "leaves", "POST", f"/api/v1/leaves/{request_id}/approve", ctx.data.manager,
+            json={"notes": "ok"},
+        )
+
+
+@scenario("balance_summary", concurrency=20)
+async def balance_summary(ctx: BenchContext, worker: int) -> None:
+    """Employee opens the balance summary."""
+    await ctx.call("leaves.balance_summary", "leaves", "GET", "/api/v1/balances/me/summary", ctx.employee(worker))
+
+
+@scenario("calendar_range", concurrency=20)
+async def calendar_range(ctx: BenchContext, worker: int) -> None:
+    """Employee loads the calendar for the whole year."""
+    year = date.today().year
+    await ctx.call(
+        "calendar.range", "calendar", "GET", "/api/v1/calendar/range", ctx.employee(worker),
+        params={"start_date": f"{year}-01-01", "end_date": f"{year}-12-31"},
+    )
+
+
+async def _pending_requests(ctx: BenchContext) -> None:
+    """Leave a couple of submitted requests per employee waiting for the manager."""
+    ctx.recorder.enabled = False
+    for employee in ctx.data.employees:
+        for _ in range(2):
+            await _create_and_submit(ctx, employee)
+
+
+@scenario("pending_approvals", concurrency=10, setup=_pending_requests)
+async def pending_approvals(ctx: BenchContext, worker: int) -> None:
+    """Manager checks pending approvals (approval service and leave inbox)."""
+    await ctx.call("approvals.pending", "approvals", "GET", "/api/v1/approvals/decisions/pending", ctx.data.manager)
+    await ctx.call("leaves.approver_pending", "leaves", "GET", "/api/v1/leaves/approver/pending", ctx.data.manager)
+
+
+@scenario("datatables", concurrency=10, setup=_pending_requests)
+async def datatables(ctx: BenchContext, worker: int) -> None:
+    """Employee pages their requests, the manager pages the pending ones."""
+    await ctx.call(
+        "leaves.datatable", "leaves", "POST", "/api/v1/leaves/datatable", ctx.employee(worker), json=_datatable(),
+    )
+    await ctx.call(
+        "leaves.approver_datatable", "leaves", "POST", "/api/v1/leaves/approver/pending/datatable",
+        ctx.data.manager, json=_datatable(),
+    )
+
+
+@scenario("hr_monthly_report", concurrency=4)
+async def hr_monthly_report(ctx: BenchContext, worker: int) -> None:
+    """HR generates the monthly absence report of the previous month."""
+    today = date.today()
+    year, month = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+    await ctx.call(
+        "hr.monthly_report", "hr_reporting", "GET", "/api/v1/hr/reports/monthly", ctx.data.admin,
+        params={"year": year, "month": month},
+    )
+
+
+NOTIFICATION_BATCH = 100
+
+
+@scenario("notification_queue", concurrency=1)
+async def notification_queue(ctx: BenchContext, worker: int) -> None:
+    """The queue processor sends a batch of queued emails (through the Brevo stand-in).
+
+    Runs in the benchmark process, like the Celery task; throughput is in
+    notifications per second.
+    """
+    from src.core.database import async_session_factory
+    from src.services.notifications.models import Notification, NotificationChannel, NotificationType
+    from src.services.notifications.services import NotificationService
+
+    async with async_session_factory() as session:
+        for n in range(NOTIFICATION_BATCH):
+            employee = ctx.data.employees[n % len(ctx.data.employees)]
+            session.add(Notification(
+                user_id=employee.id,
+                user_email=employee.identity.email,
+                notification_type=NotificationType.LEAVE_REQUEST_APPROVED.value,
+                title="Richiesta approvata",
+                message="La tua richiesta di ferie è stata approvata.",
+                channel=NotificationChannel.EMAIL.value,
+                status="queued",
+            ))
+        await session.commit()
+
+        started = time.perf_counter()
+        try:
+            result = await NotificationService(session).process_queue(batch_size=NOTIFICATION_BATCH)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            ctx.recorder.record("notifications.process_queue", time.perf_counter() - started, error=type(e).__name__)
+            return
+        error = "failed" if result["failed"] else None
+        ctx.recorder.record(
+            "notifications.process_queue", time.perf_counter() - started, error=error, items=result["processed"],
+        )
@@ -0,0 +1,108 @@
+"""
+Starts the KRONOS services as uvicorn processes on free local ports.
+
+Every service gets the same environment, with all ``*_SERVICE_URL``
+settings pointing at the other local processes, so calls between
+services go over real HTTP like in a deployment.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from tests.benchmarks.stubs import free_port
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Service name -> (ASGI app, setting with its URL)
+SERVICES = {
+    "auth": ("src.services.auth.main:app", "AUTH_SERVICE_URL"),
+    "config": ("src.services.config.main:app", "CONFIG_SERVICE_URL"),
+    "notifications": ("src.services.notifications.main:app", "NOTIFICATION_SERVICE_URL"),
+    "audit": ("src.services.audit.main:app", "AUDIT_SERVICE_URL"),
+    "calendar": ("src.services.calendar.main:app", "CALENDAR_SERVICE_URL"),
+    "leaves": ("src.services.leaves.main:app", "LEAVE_SERVICE_URL"),
+    "expenses": ("src.services.expenses.main:app", "EXPENSE_SERVICE_URL"),
+    "hr_reporting": ("src.services.hr_reporting.main:app", "HR_REPORTING_SERVICE_URL"),
+    "approvals": ("src.services.approvals.main:app", "APPROVAL_SERVICE_URL"),
+    "smart_working": ("src.services.smart_working.main:app", "SMART_WORKING_SERVICE_URL"),
+}
+
+
+def assign_ports() -> dict[str, str]:
+    """Local URL for every service, keyed by service name."""
+    return {name: f"http://127.0.0.1:{free_port()}" for name in SERVICES}
+
+
+def service_environment(urls: dict[str, str]) -> dict[str, str]:
+    """``*_SERVICE_URL`` settings for the given service URLs."""
+    return {SERVICES[name][1]: url for name, url in urls.items()}
+
+
+class ServiceCluster:
+    """The service processes of one benchmark run."""
+
+    def __init__(self, urls: dict[str, str], env: dict[str, str], workers: int = 1) -> None:
+        self.urls = urls
+        self.env = {**os.environ, **env, "PYTHONPATH": str(BACKEND_DIR)}
+        self.workers = workers
+        self.log_dir = Path(tempfile.mkdtemp(prefix="kronos-bench-"))
+        self._processes: dict[str, subprocess.Popen] = {}
+
+    def start(self, timeout: float = 60.0) -> None:
+        for name, (app, _) in SERVICES.items():
+            port = self.urls[name].rsplit(":", 1)[1]
+            # The child inherits its own copy of the descriptor: ours can be closed at once
+            with open(self.log_dir / f"{name}.log", "wb") as log:
+                self._processes[name] = subprocess.Popen(
+                    [
+                        sys.executable, "-m", "uvicorn", app,
+                        "--host", "127.0.0.1", "--port", port,
+                        "--workers", str(self.workers),
+                        "--log-level", "warning", "--no-access-log",
+                    ],
+                    cwd=BACKEND_DIR,
+                    env=self.env,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                )
+        try:
+            for name in SERVICES:
+                self._wait_ready(name, timeout)
+        except Exception:
+            self.stop()
+            raise
+
+    def _wait_ready(self, name: str, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._processes[name].poll() is not None:
+                raise RuntimeError(f"Service {name} exited:\n{self.log_tail(name)}")
+            try:
+                if httpx.get(f"{self.urls[name]}/health", timeout=1.0).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"Service {name} not ready after {timeout:.0f}s:\n{self.log_tail(name)}")
+
+    def log_tail(self, name: str, lines: int = 30) -> str:
+        path = self.log_dir / f"{name}.log"
+        if not path.exists():
+            return ""
+        return "\n".join(path.read_text(errors="replace").splitlines()[-lines:])
+
+    def stop(self) -> None:
+        for process in self._processes.values():
+            if process.poll() is None:
+                process.terminate()
+        for process in self._processes.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self._processes.clear()
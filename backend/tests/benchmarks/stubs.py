@@ -0,0 +1,322 @@
+"""
+In-process stand-ins for the external systems the services talk to.
+
+- ``FakeKeycloak``: realm public key, JWKS and a password-grant token
+  endpoint; tokens are RS256-signed like Keycloak's, so services validate
+  them through the normal ``decode_token`` path.
+- ``FakeBrevo``: the transactional email API (``/smtp/email``) with a
+  configurable provider latency.
+- ``FakeMinio``: the subset of the S3 API used by ``MinioStorageBackend``
+  (buckets, single and multipart uploads, stat, get, delete), in memory.
+
+Each runs on its own uvicorn server in a background thread (``StubServer``).
+"""
+import asyncio
+import base64
+import hashlib
+import itertools
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from typing import Optional
+
+import uvicorn
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StubServer:
+    """Serves an ASGI app on 127.0.0.1 from a background thread."""
+
+    def __init__(self, app, port: Optional[int] = None) -> None:
+        self.port = port or free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", access_log=False)
+        )
+        self._thread = threading.Thread(target=self._server.run, name=f"stub-{self.port}", daemon=True)
+
+    def start(self, timeout: float = 10.0) -> "StubServer":
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError(f"Stub server on port {self.port} did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+def _b64url_uint(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Keycloak
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class FakeUser:
+    sub: str
+    username: str
+    email: str
+    name: str
+    roles: list[str] = field(default_factory=list)
+
+
+class FakeKeycloak:
+    """A Keycloak realm that signs tokens for registered users."""
+
+    def __init__(self, realm: str = "kronos", client_id: str = "kronos-backend") -> None:
+        self.realm = realm
+        self.client_id = client_id
+        self.kid = uuid.uuid4().hex
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._private_pem = self._key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        self._users: dict[str, FakeUser] = {}
+        self.issuer = ""
+        self.app = Starlette(routes=[
+            Route(f"/realms/{realm}", self._realm),
+            Route(f"/realms/{realm}/.well-known/openid-configuration", self._discovery),
+            Route(f"/realms/{realm}/protocol/openid-connect/certs", self._certs),
+            Route(f"/realms/{realm}/protocol/openid-connect/token", self._token, methods=["POST"]),
+        ])
+
+    def bind(self, url: str) -> None:
+        """Set the server URL tokens are issued from."""
+        self.issuer = f"{url}/realms/{self.realm}"
+
+    @property
+    def public_key(self) -> str:
+        """Base64 DER public key, as in Keycloak's realm info."""
+        der = self._key.public_key().public_bytes(
+            serialization.Encoding.DER,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        return base64.b64encode(der).decode()
+
+    def add_user(self, user: FakeUser) -> None:
+        self._users[user.username] = user
+
+    def issue_token(self, user: FakeUser, lifetime: int = 3600) -> str:
+        now = int(time.time())
+        claims = {
+            "iss": self.issuer,
+            "aud": [self.client_id, "account"],
+            "azp": self.client_id,
+            "sub": user.sub,
+            "typ": "Bearer",
+            "iat": now,
+            "exp": now + lifetime,
+            "jti": uuid.uuid4().hex,
+            "email": user.email,
+            "name": user.name,
+            "preferred_username": user.username,
+            "realm_access": {"roles": list(user.roles)},
+        }
+        return jwt.encode(claims, self._private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+    async def _realm(self, request: Request) -> Response:
+        return JSONResponse({
+            "realm": self.realm,
+            "public_key": self.public_key,
+            "token-service": f"{self.issuer}/protocol/openid-connect",
+            "account-service": f"{self.issuer}/account",
+            "tokens-not-before": 0,
+        })
+
+    async def _discovery(self, request: Request) -> Response:
+        return JSONResponse({
+            "issuer": self.issuer,
+            "token_endpoint": f"{self.issuer}/protocol/openid-connect/token",
+            "jwks_uri": f"{self.issuer}/protocol/openid-connect/certs",
+            "id_token_signing_alg_values_supported": ["RS256"],
+        })
+
+    async def _certs(self, request: Request) -> Response:
+        numbers = self._key.public_key().public_numbers()
+        return JSONResponse({"keys": [{
+            "kid": self.kid,
+            "kty": "RSA",
+            "alg": "RS256",
+            "use": "sig",
+            "n": _b64url_uint(numbers.n),
+            "e": _b64url_uint(numbers.e),
+        }]})
+
+    async def _token(self, request: Request) -> Response:
+        form = await request.form()
+        user = self._users.get(form.get("username", ""))
+        if form.get("grant_type") != "password" or user is None:
+            return JSONResponse({"error": "invalid_grant"}, status_code=401)
+        return JSONResponse({
+            "access_token": self.issue_token(user),
+            "token_type": "Bearer",
+            "expires_in": 3600,
+        })
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Brevo
+# ═══════════════════════════════════════════════════════════════════════════
+
+class FakeBrevo:
+    """Brevo transactional email API; accepts every message after ``latency`` seconds."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.requests = 0
+        self.messages = 0
+        self._ids = itertools.count(1)
+        self.app = Starlette(routes=[
+            Route("/v3/smtp/email", self._send, methods=["POST"]),
+            Route("/v3/smtp/templates", self._template, methods=["POST"]),
+            Route("/v3/smtp/templates/{template_id}", self._template, methods=["PUT"]),
+        ])
+
+    async def _send(self, request: Request) -> Response:
+        if not request.headers.get("api-key"):
+            return JSONResponse({"code": "unauthorized", "message": "Key not found"}, status_code=401)
+        payload = await request.json()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.requests += 1
+        versions = payload.get("messageVersions")
+        if versions:
+            self.messages += len(versions)
+            return JSONResponse(
+                {"messageIds": [f"<{next(self._ids)}@fake-brevo>" for _ in versions]}, status_code=201
+            )
+        self.messages += 1
+        return JSONResponse({"messageId": f"<{next(self._ids)}@fake-brevo>"}, status_code=201)
+
+    async def _template(self, request: Request) -> Response:
+        if request.method == "PUT":
+            return Response(status_code=204)
+        return JSONResponse({"id": next(self._ids)}, status_code=201)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MinIO (S3 subset)
+# ═══════════════════════════════════════════════════════════════════════════
+
+_S3_NS = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+@dataclass
+class _StoredObject:
+    data: bytes
+    content_type: str
+    etag: str
+    modified: float = field(default_factory=time.time)
+
+
+def _xml(root: str, **children: str) -> Response:
+    body = "".join(f"<{key}>{value}</{key}>" for key, value in children.items())
+    return Response(
+        f'<?xml version="1.0" encoding="UTF-8"?><{root} xmlns="{_S3_NS}">{body}</{root}>',
+        media_type="application/xml",
+    )
+
+
+def _s3_error(status: int, code: str, resource: str) -> Response:
+    response = _xml("Error", Code=code, Message=code, Resource=resource, RequestId="fake", HostId="fake")
+    response.status_code = status
+    return response
+
+
+class FakeMinio:
+    """In-memory S3 endpoint; signatures are not checked."""
+
+    def __init__(self) -> None:
+        self.buckets: dict[str, dict[str, _StoredObject]] = {}
+        self._uploads: dict[str, dict[int, bytes]] = {}
+        self.app = Starlette(routes=[
+            Route("/{bucket}", self._bucket, methods=["GET", "HEAD", "PUT", "DELETE"]),
+            Route("/{bucket}/{key:path}", self._object, methods=["GET", "HEAD", "PUT", "POST", "DELETE"]),
+        ])
+
+    async def _bucket(self, request: Request) -> Response:
+        name = request.path_params["bucket"]
+        if "location" in request.query_params:
+            return _xml("LocationConstraint")
+        if request.method == "PUT":
+            self.buckets.setdefault(name, {})
+            return Response(headers={"Location": f"/{name}"})
+        if name not in self.buckets:
+            return _s3_error(404, "NoSuchBucket", f"/{name}") if request.method != "HEAD" else Response(status_code=404)
+        if request.method == "DELETE":
+            del self.buckets[name]
+            return Response(status_code=204)
+        return Response()
+
+    async def _object(self, request: Request) -> Response:
+        name, key = request.path_params["bucket"], request.path_params["key"]
+        bucket = self.buckets.get(name)
+        if bucket is None:
+            return _s3_error(404, "NoSuchBucket", f"/{name}")
+        params = request.query_params
+
+        if request.method == "POST" and "uploads" in params:
+            upload_id = uuid.uuid4().hex
+            self._uploads[upload_id] = {}
+            return _xml("InitiateMultipartUploadResult", Bucket=name, Key=key, UploadId=upload_id)
+        if request.method == "POST" and "uploadId" in params:
+            parts = self._uploads.pop(params["uploadId"], None)
+            if parts is None:
+                return _s3_error(404, "NoSuchUpload", f"/{name}/{key}")
+            stored = self._store(bucket, key, b"".join(parts[n] for n in sorted(parts)), request)
+            return _xml("CompleteMultipartUploadResult", Location=f"/{name}/{key}", Bucket=name, Key=key, ETag=stored.etag)
+        if request.method == "PUT" and "uploadId" in params:
+            data = await request.body()
+            self._uploads[params["uploadId"]][int(params["partNumber"])] = data
+            return Response(headers={"ETag": f'"{hashlib.md5(data).hexdigest()}"'})
+        if request.method == "PUT":
+            stored = self._store(bucket, key, await request.body(), request)
+            return Response(headers={"ETag": stored.etag})
+
+        stored = bucket.get(key)
+        if request.method == "DELETE":
+            bucket.pop(key, None)
+            return Response(status_code=204)
+        if stored is None:
+            return _s3_error(404, "NoSuchKey", f"/{name}/{key}") if request.method != "HEAD" else Response(status_code=404)
+        headers = {
+            "ETag": stored.etag,
+            "Content-Type": stored.content_type,
+            "Last-Modified": formatdate(stored.modified, usegmt=True),
+        }
+        if request.method == "HEAD":
+            return Response(headers={**headers, "Content-Length": str(len(stored.data))})
+        return Response(stored.data, headers=headers)
+
+    def _store(self, bucket: dict, key: str, data: bytes, request: Request) -> _StoredObject:
+        stored = _StoredObject(
+            data=data,
+            content_type=request.headers.get("content-type", "application/octet-stream"),
+            etag=f'"{hashlib.md5(data).hexdigest()}"',
+        )
+        bucket[key] = stored
+        return stored
@@ -0,0 +1,56 @@
+"""Unit tests for the audit trail delta encoding."""
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.audit.delta import MissingCheckpointError, apply_patch, make_patch, replay
+
+
+def _checkpoint(version, before, after, operation="UPDATE"):
+    return SimpleNamespace(
+        entity_type="LeaveRequest", entity_id="1", version=version, operation=operation,
+        is_checkpoint=True, before_data=before, after_data=after, patch=None,
+    )
+
+
+def _delta(version, patch, operation="UPDATE"):
+    return SimpleNamespace(
+        entity_type="LeaveRequest", entity_id="1", version=version, operation=operation,
+        is_checkpoint=False, before_data=None, after_data=None, patch=patch,
+    )
+
+
+def test_patch_round_trip():
+    before = {"status": "draft", "days": 2, "notes": {"a": 1, "b/c": 2}, "old": True}
+    after = {"status": "approved", "days": 2, "notes": {"a": 1, "b/c": 3}, "new": [1, 2]}
+
+    assert apply_patch(before, make_patch(before, after)) == after
+    assert before["status"] == "draft"
+
+
+def test_replay_rebuilds_states_from_checkpoint():
+    v1 = {"status": "draft"}
+    v2 = {"status": "pending"}
+    v3 = {"status": "approved"}
+    chain = [
+        _checkpoint(1, None, v1, operation="INSERT"),
+        _delta(2, make_patch(v1, v2)),
+        _delta(3, make_patch(v2, v3)),
+        _delta(4, [], operation="DELETE"),
+    ]
+
+    states = [(entry.version, before, after) for entry, before, after in replay(chain)]
+
+    assert states == [(1, None, v1), (2, v1, v2), (3, v2, v3), (4, v3, None)]
+
+
+def test_replay_without_checkpoint_raises():
+    chain = [_delta(5, [{"op": "remove", "path": "/status"}])]
+
+    with pytest.raises(MissingCheckpointError) as exc:
+        list(replay(chain))
+    assert exc.value.details == {"entity_type": "LeaveRequest", "entity_id": "1", "version": 5}
+
+
+def test_replay_of_empty_chain_is_empty():
+    assert list(replay([])) == []
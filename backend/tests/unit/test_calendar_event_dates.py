@@ -0,0 +1,35 @@
+"""Unit tests for calendar event date validation and span queries."""
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+
+from src.services.calendar.repository import _overlaps
+from src.services.calendar.schemas import EventCreate, EventUpdate
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_create_rejects_end_before_start():
+    with pytest.raises(ValidationError, match="end_date must be >= start_date"):
+        EventCreate(title="Offsite", start_date=date(2026, 5, 10), end_date=date(2026, 5, 8))
+
+
+def test_update_checks_dates_only_when_both_are_set():
+    with pytest.raises(ValidationError):
+        EventUpdate(start_date=date(2026, 5, 10), end_date=date(2026, 5, 8))
+    assert EventUpdate(end_date=date(2026, 5, 8)).end_date == date(2026, 5, 8)
+
+
+def test_span_upper_bound_is_clamped():
+    sql = _sql(_overlaps(date(2026, 5, 1), date(2026, 5, 31)))
+
+    assert "CASE WHEN (calendar.events.series_end_date < calendar.events.start_date)" in sql
+    assert "daterange('2026-05-01', '2026-05-31', '[]')" in sql
+
+
+def test_reversed_window_matches_nothing():
+    assert _sql(_overlaps(date(2026, 5, 31), date(2026, 5, 1))) == "false"
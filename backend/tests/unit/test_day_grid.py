@@ -0,0 +1,128 @@
+"""Unit tests for the packed timesheet day grid."""
+from datetime import date, timedelta
+
+import pytest
+
+from src.services.hr_reporting.day_grid import DayGrid, DayStatus
+
+
+def _old_summary(days: list[dict]) -> dict:
+    """The per-day dict summary the grid replaced (TimesheetService._calculate_summary)."""
+    worked = 0
+    hours_worked = sickness = vacation = other = days_absent = 0.0
+    for d in days:
+        status = d.get("status", "")
+        h = d.get("hours_worked", 0)
+        hours_worked += h
+        if h > 0 or status in ("Presente", "Trasferta"):
+            worked += 1
+        if "Malattia" in status:
+            sickness += 1
+            days_absent += 1
+        elif "Ferie" in status:
+            vacation += 1
+            days_absent += 1
+        elif "Assente" in status or "ROL" in status:
+            other += 1
+            days_absent += 1
+    return {
+        "total_days": len(days),
+        "days_worked": float(worked),
+        "days_absent": float(days_absent),
+        "hours_worked": float(hours_worked),
+        "hours_absence": float(days_absent * 8.0),
+        "sickness_days": float(sickness),
+        "vacation_days": float(vacation),
+        "other_days": float(other),
+    }
+
+
+def _september_items() -> list[dict]:
+    """September 2026 as the attendance aggregator returns it."""
+    items = []
+    day = date(2026, 9, 1)
+    while day.month == 9:
+        item = {"date": day, "status": "Presente", "hours_worked": 8.0}
+        if day.weekday() >= 5:
+            item = {"date": day, "status": "Weekend", "hours_worked": 0.0}
+        elif day.day in (7, 8):
+            item = {"date": day, "status": "Ferie", "hours_worked": 0.0, "leave_type": "FER"}
+        elif day.day == 14:
+            item = {"date": day, "status": "Malattia", "hours_worked": 0.0}
+        elif day.day == 15:
+            item = {"date": day, "status": "ROL", "hours_worked": 4.0, "leave_type": "ROL"}
+        elif day.day == 16:
+            item = {"date": day, "status": "Assente (L104)", "hours_worked": 0.0, "leave_type": "L104"}
+        elif day.day == 17:
+            item = {"date": day, "status": "Trasferta", "hours_worked": 0.0, "notes": "Milano"}
+        elif day.day >= 28:
+            item = {"date": day, "status": "", "hours_worked": 0.0}
+        items.append(item)
+        day += timedelta(days=1)
+    return items
+
+
+def test_summary_matches_per_day_summary():
+    items = _september_items()
+    assert DayGrid.from_items(2026, 9, items).summary() == _old_summary(items)
+
+
+def test_storage_round_trip():
+    grid = DayGrid.from_items(2026, 9, _september_items())
+    packed, notes = grid.to_storage()
+
+    assert len(packed) == 3 * 30
+    restored = DayGrid.from_storage(2026, 9, packed, notes)
+    assert restored.status == grid.status
+    assert restored.minutes == grid.minutes
+    assert restored.notes == grid.notes
+    assert restored.to_items() == grid.to_items()
+
+
+def test_empty_storage_is_blank_month():
+    grid = DayGrid.from_storage(2026, 2, None)
+
+    assert len(grid) == 28
+    assert grid.to_storage() == (bytes(3 * 28), None)
+
+
+def test_items_keep_labels_and_notes():
+    items = {item["date"]: item for item in DayGrid.from_items(2026, 9, _september_items()).to_items()}
+
+    assert items[date(2026, 9, 16)]["status"] == "Assente (L104)"
+    assert items[date(2026, 9, 16)]["leave_type"] == "L104"
+    assert items[date(2026, 9, 17)]["notes"] == "Milano"
+    assert items[date(2026, 9, 6)]["hours_expected"] == 0.0
+    assert items[date(2026, 9, 15)]["hours_worked"] == 4.0
+
+
+def test_roll_elapsed_marks_past_weekdays_only():
+    grid = DayGrid.from_items(2026, 9, _september_items())
+
+    # 28-30 September are blank: Monday to Wednesday
+    assert grid.roll_elapsed(date(2026, 9, 29)) == 2
+    assert grid.status[27] == grid.status[28] == DayStatus.PRESENT
+    assert grid.minutes[28] == 8 * 60
+    assert grid.status[29] == DayStatus.BLANK
+
+
+def test_roll_elapsed_skips_weekends_of_blank_month():
+    grid = DayGrid(2026, 9)
+
+    assert grid.roll_elapsed(date(2026, 10, 18)) == 22
+    summary = grid.summary()
+    assert summary["days_worked"] == 22.0
+    assert summary["hours_worked"] == 176.0
+    assert grid.status[5] == DayStatus.BLANK  # Sunday 6 September
+
+
+def test_roll_elapsed_ignores_future_months():
+    grid = DayGrid(2026, 11)
+
+    assert grid.roll_elapsed(date(2026, 10, 18)) == 0
+    assert grid.status == bytearray(30)
+
+
+def test_unknown_status_is_rejected():
+    with pytest.raises(ValueError):
+        DayGrid.from_items(2026, 9, [{"date": date(2026, 9, 1), "status": "Boh"}])
@@ -0,0 +1,201 @@
+"""Unit tests for the service client resilience policies."""
+import pytest
+
+from src.core.config import settings
+from src.shared.clients import resilience
+from src.shared.clients.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    LatencyWindow,
+    ResiliencePolicy,
+    ServiceHealth,
+)
+
+POLICY = ResiliencePolicy(
+    breaker_failure_threshold=3,
+    breaker_reset_timeout=10.0,
+    hedge=True,
+    hedge_min_delay=0.05,
+    hedge_budget=0.1,
+    min_samples=5,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def hedging(monkeypatch):
+    monkeypatch.setattr(settings, "service_hedging_enabled", True)
+
+
+# LatencyWindow
+
+def test_latency_window_empty():
+    window = LatencyWindow()
+
+    assert len(window) == 0
+    assert window.quantile(0.5) is None
+
+
+def test_latency_window_quantiles():
+    window = LatencyWindow()
+    for ms in range(100, 0, -1):
+        window.add(ms / 1000)
+
+    assert len(window) == 100
+    assert window.quantile(0.0) == 0.001
+    assert window.quantile(0.5) == 0.051
+    assert window.quantile(0.99) == 0.1
+    assert window.quantile(1.0) == 0.1
+
+
+def test_latency_window_evicts_oldest_samples():
+    window = LatencyWindow(size=3)
+    for seconds in (5.0, 1.0, 2.0, 3.0, 4.0):
+        window.add(seconds)
+
+    assert len(window) == 3
+    assert window.quantile(0.0) == 2.0
+    assert window.quantile(1.0) == 4.0
+
+
+def test_latency_window_evicts_one_of_equal_samples():
+    window = LatencyWindow(size=2)
+    for seconds in (1.0, 1.0, 2.0):
+        window.add(seconds)
+
+    assert window.quantile(0.0) == 1.0
+    assert window.quantile(1.0) == 2.0
+
+
+# CircuitBreaker
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker()
+
+    assert not breaker.record_failure(POLICY)
+    assert not breaker.record_failure(POLICY)
+    assert breaker.allow(POLICY)
+    assert breaker.record_failure(POLICY)
+    assert breaker.state == OPEN
+    assert not breaker.allow(POLICY)
+    assert breaker.retry_after(POLICY) == 10.0
+
+
+def test_breaker_success_resets_failure_count(clock):
+    breaker = CircuitBreaker()
+    breaker.record_failure(POLICY)
+    breaker.record_failure(POLICY)
+    breaker.record_success()
+
+    assert not breaker.record_failure(POLICY)
+    assert breaker.state == CLOSED
+
+
+def test_breaker_allows_a_single_probe_after_reset_timeout(clock):
+    breaker = CircuitBreaker()
+    for _ in range(3):
+        breaker.record_failure(POLICY)
+
+    clock.now += 9.0
+    assert not breaker.allow(POLICY)
+    assert breaker.retry_after(POLICY) == pytest.approx(1.0)
+
+    clock.now += 1.0
+    assert breaker.allow(POLICY)
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow(POLICY)
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow(POLICY)
+
+
+def test_breaker_failed_probe_reopens(clock):
+    breaker = CircuitBreaker()
+    for _ in range(3):
+        breaker.record_failure(POLICY)
+    clock.now += 10.0
+    assert breaker.allow(POLICY)
+
+    assert breaker.record_failure(POLICY)
+    assert breaker.state == OPEN
+    assert not breaker.allow(POLICY)
+    assert breaker.retry_after(POLICY) == 10.0
+
+
+def test_breaker_released_probe_can_be_retried(clock):
+    breaker = CircuitBreaker()
+    for _ in range(3):
+        breaker.record_failure(POLICY)
+    clock.now += 10.0
+    assert breaker.allow(POLICY)
+
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow(POLICY)
+
+
+# ServiceHealth.hedge_delay
+
+def _health(samples: int, seconds: float = 0.2) -> ServiceHealth:
+    health = ServiceHealth()
+    for _ in range(samples):
+        health.latency.add(seconds)
+    return health
+
+
+def test_hedge_delay_is_p95(hedging):
+    health = _health(20)
+    health.latency.add(1.0)
+    health.requests = 100
+
+    assert health.hedge_delay(POLICY) == 0.2
+
+
+def test_hedge_delay_has_a_floor(hedging):
+    health = _health(20, seconds=0.001)
+    health.requests = 100
+
+    assert health.hedge_delay(POLICY) == POLICY.hedge_min_delay
+
+
+def test_no_hedge_without_enough_samples(hedging):
+    health = _health(4)
+    health.requests = 100
+
+    assert health.hedge_delay(POLICY) is None
+
+
+def test_no_hedge_when_policy_or_setting_disables_it(hedging, monkeypatch):
+    health = _health(20)
+    health.requests = 100
+
+    assert health.hedge_delay(ResiliencePolicy(hedge=False, min_samples=5)) is None
+    monkeypatch.setattr(settings, "service_hedging_enabled", False)
+    assert health.hedge_delay(POLICY) is None
+
+
+def test_no_hedge_over_budget(hedging):
+    health = _health(20)
+    health.requests = 100
+    health.hedges = 10
+
+    assert health.hedge_delay(POLICY) is None
+    health.requests = 101
+    assert health.hedge_delay(POLICY) == 0.2
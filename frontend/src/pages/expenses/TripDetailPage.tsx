@@ -80,6 +80,16 @@ export function TripDetailPage() {
         }
     };
 
+    const handleDownloadAttachment = async () => {
+        if (!id) return;
+        try {
+            const url = await tripsService.getAttachmentDownloadUrl(id);
+            window.open(url, '_blank', 'noopener');
+        } catch (error: any) {
+            toast.error(error.message || 'Errore durante il download');
+        }
+    };
+
     const handleComplete = async () => {
         if (!id) return;
         setActionLoading('complete');
@@ -417,7 +427,10 @@ export function TripDetailPage() {
                                         <FileText size={18} />
                                         Allegati
                                     </h3>
-                                    <button className="flex items-center gap-2 px-4 py-2 bg-white border border-gray-300 rounded-lg text-sm font-medium text-gray-700 hover:bg-gray-50 transition-colors">
+                                    <button
+                                        onClick={handleDownloadAttachment}
+                                        className="flex items-center gap-2 px-4 py-2 bg-white border border-gray-300 rounded-lg text-sm font-medium text-gray-700 hover:bg-gray-50 transition-colors"
+                                    >
                                         <Download size={16} />
                                         Scarica Documento
                                     </button>
@@ -84,6 +84,11 @@ export const tripsService = {
         return response.data;
     },
 
+    getAttachmentDownloadUrl: async (id: string): Promise<string> => {
+        const response = await expensesApi.get(`/trips/${id}/attachment/download-url`);
+        return response.data.download_url;
+    },
+
     // Daily Allowances
     getTripAllowances: async (tripId: string): Promise<DailyAllowance[]> => {
         const response = await expensesApi.get(`/trips/${tripId}/allowances`);
@@ -184,6 +189,11 @@ export const reportsService = {
         return response.data;
     },
 
+    getAttachmentDownloadUrl: async (id: string): Promise<string> => {
+        const response = await expensesApi.get(`/expenses/${id}/attachment/download-url`);
+        return response.data.download_url;
+    },
+
     // Expense Items
     addItem: async (reportId: string, data: Partial<ExpenseItem>): Promise<ExpenseItem> => {
         const payload = { ...data, report_id: reportId };